@@ -6,5 +6,10 @@ ORDERS_EXCHANGE_NAME = "orders_exchange"
 PAYMENTS_EXCHANGE_NAME = "payments_exchange"
 SUCCESS_PAYMENTS_QUEUE_NAME = "success_payments_queue"
 FAILED_PAYMENTS_QUEUE_NAME = "failed_payments_queue"
+PAYMENTS_RPC_QUEUE_NAME = "payments_rpc_queue"
 
-NOTIFICATION_EXCHANGE_NAME = "notification_exchange"
+NOTIFICATION_EXCHANGE_NAME = "notification_exchange"  # Legacy fanout exchange
+NOTIFICATION_TYPE_EXCHANGE_NAME = "notification_type_exchange"
+NOTIFICATION_QUEUE_NAME_TEMPLATE = "notifications_{type}_queue"
+# The correlation ids of the orders a digest of several notifications notifies.
+NOTIFICATION_DIGEST_HEADER = "x-digest-correlation-ids"
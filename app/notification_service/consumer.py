@@ -0,0 +1,188 @@
+"""Module handles the consuming of notification messages from their RabbitMQ queues."""
+
+import asyncio
+import json
+from collections.abc import Callable, Iterable
+from typing import get_args
+
+from aio_pika.abc import AbstractConnection, AbstractIncomingMessage
+
+from app.consts import NOTIFICATION_DIGEST_HEADER
+from app.notification_service.dispatcher import NotificationDispatcher
+from app.notification_service.pubsub import NotificationPubSub
+from app.notification_service.schemas import Notification, NotificationType
+from app.order_service.lifecycle import OrderLifecycleStore
+from config.acks import AckCoalescer
+from config.base import AsyncRabbitmqManager
+from config.correlation import current_correlation, track_stage
+from config.memory import accountant, get_body_size
+from config.metrics import instrument_acks, instrument_handler
+from config.profiling import profiler
+from config.tracing import process_message, trace_consumer, tracer
+from config.tuning import ConsumerTuning, TuningWatcher, bind_consumer
+from toolkit.concurrency import WorkerPool
+
+
+class NotificationConsumer(NotificationPubSub):
+    """Consume notification messages and deliver them through their providers."""
+
+    def __init__(
+        self,
+        rabbitmq_manager: AsyncRabbitmqManager,
+        dispatcher: NotificationDispatcher,
+        legacy_fanout: bool = True,
+        lifecycle: OrderLifecycleStore | None = None,
+    ) -> None:
+        """
+        Instantiate a `NotificationConsumer` object.
+
+        Parameters
+        ----------
+        rabbitmq_manager : AsyncRabbitmqManager
+            The RabbitMQ manager.
+        dispatcher : NotificationDispatcher
+            The dispatcher delivering the notifications.
+        legacy_fanout : bool, optional
+            Whether to keep feeding the legacy fanout exchange (default is True).
+        lifecycle : OrderLifecycleStore, optional
+            The store the delivered notifications are recorded in, by the order of
+            their correlation, or the orders of a digest (default is None).
+        """
+        super().__init__(rabbitmq_manager=rabbitmq_manager, legacy_fanout=legacy_fanout)
+        self.dispatcher = dispatcher
+        self.lifecycle = lifecycle
+        # The ack coalescer of the channel of every consumed type.
+        self.acks: dict[NotificationType, AckCoalescer] = {}
+
+    async def consume_notifications(
+        self,
+        notification_types: Iterable[NotificationType] = get_args(NotificationType),
+        tuning: TuningWatcher | None = None,
+    ) -> None:
+        """
+        Consume the notifications of some types from their queues.
+
+        Every type is consumed from its own queue, on its own channel, by its own
+        worker pool: the prefetch count applies per channel, so the unacknowledged
+        messages of a slow provider cannot starve the other types.
+
+        Parameters
+        ----------
+        notification_types : Iterable[NotificationType], optional
+            The types of the notifications to deliver (default is every type).
+        tuning : TuningWatcher, optional
+            The watcher of the `[tuning]` settings. The prefetch count, the pool
+            size and the ack batching of a type follow the `notifications_<type>`
+            consumer tuning live (default is None, use the default tuning).
+        """
+        async with await self.rabbitmq_manager.get_connection() as connection:
+            pools: list[WorkerPool[AbstractIncomingMessage]] = []
+            unbinds = []
+            try:
+                for notification_type in notification_types:
+                    pool, unbind = await self._consume_type(
+                        connection=connection,
+                        notification_type=notification_type,
+                        tuning=tuning,
+                    )
+                    pools.append(pool)
+                    if unbind is not None:
+                        unbinds.append(unbind)
+
+                await asyncio.Future()
+            finally:
+                for unbind in unbinds:
+                    unbind()
+                for pool in pools:
+                    await pool.stop()
+                for acks in self.acks.values():
+                    await acks.close()
+                await self.dispatcher.close()
+
+    async def _consume_type(
+        self,
+        connection: AbstractConnection,
+        notification_type: NotificationType,
+        tuning: TuningWatcher | None,
+    ) -> tuple[WorkerPool[AbstractIncomingMessage], Callable[[], None] | None]:
+        """Start consuming the queue of a type, on a channel of its own."""
+        name = f"notifications_{notification_type}"
+        consumer_tuning = tuning.settings.consumer(name) if tuning else ConsumerTuning()
+        channel = await self.rabbitmq_manager.get_channel(connection=connection)
+        await self.rabbitmq_manager.set_qos(
+            channel=channel, prefetch_count=consumer_tuning.prefetch_count
+        )
+        queue = await self.declare_notification_queue(
+            channel=channel, notification_type=notification_type
+        )
+
+        async def wrapped_on_message(message: AbstractIncomingMessage) -> None:
+            """Wrap `on_notification_message` to pass the notification type."""
+            await self.on_notification_message(
+                message=message, notification_type=notification_type
+            )
+
+        handler = track_stage(name, wrapped_on_message)
+        handler = instrument_handler(name, trace_consumer(name, handler))
+        pool = WorkerPool(
+            handler=profiler.attribute(name, handler),
+            size=consumer_tuning.concurrency,
+            name=name,
+            budget=accountant.get("prefetch"),
+            sizeof=get_body_size,
+        )
+        pool.start()
+        acks = self.acks[notification_type] = AckCoalescer(
+            max_batch=consumer_tuning.ack_batch_size,
+            interval=consumer_tuning.ack_interval,
+        )
+        instrument_acks(name, acks)
+        unbind = (
+            bind_consumer(tuning, name=name, channel=channel, pool=pool, acks=acks)
+            if tuning
+            else None
+        )
+        await queue.consume(acks.tracking(pool.submit))
+        return pool, unbind
+
+    async def on_notification_message(
+        self, message: AbstractIncomingMessage, notification_type: NotificationType
+    ) -> None:
+        """
+        Process a notification message, delivering it through its provider.
+
+        Parameters
+        ----------
+        message : AbstractIncomingMessage
+            The message received from a notification queue to be processed.
+        notification_type : NotificationType
+            The type of the notifications of the queue.
+        """
+        async with (
+            process_message(message, acks=self.acks.get(notification_type)),
+            accountant.reserve("decode", len(message.body)),
+        ):
+            with tracer.start_span("decode"):
+                notification = Notification(**json.loads(message.body.decode()))
+
+            with tracer.start_span("dispatch"):
+                await self.dispatcher.dispatch(notification)
+
+            if self.lifecycle is not None:
+                for order_id in self._get_notified_orders(message):
+                    self.lifecycle.on_notified(order_id)
+
+    @staticmethod
+    def _get_notified_orders(message: AbstractIncomingMessage) -> list[str]:
+        """Return the orders a notification message notifies, from its correlations."""
+        # The correlation of a notification is the order it notifies; a digest of
+        # several orders lists their correlation ids in a header instead.
+        correlation = current_correlation.get()
+        order_ids = [correlation.correlation_id] if correlation is not None else []
+        digested = (message.headers or {}).get(NOTIFICATION_DIGEST_HEADER)
+        if isinstance(digested, list | tuple):
+            order_ids.extend(
+                order_id.decode() if isinstance(order_id, bytes) else str(order_id)
+                for order_id in digested
+            )
+        return order_ids
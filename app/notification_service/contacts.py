@@ -0,0 +1,153 @@
+"""Module resolves the contact details of the customers notifications are sent to."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from app.notification_service.schemas import CustomerContact
+from toolkit.caching import DataLoader, TTLCache
+
+
+class ContactBackend(ABC):
+    """Base class of the backends holding the contact details of the customers."""
+
+    @abstractmethod
+    async def fetch_contacts(
+        self, customer_ids: Sequence[int]
+    ) -> Mapping[int, CustomerContact]:
+        """
+        Fetch the contact details of some customers, in one call.
+
+        Returns
+        -------
+        Mapping[int, CustomerContact]
+            The contacts by customer id, omitting the unknown customers.
+        """
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "ContactBackend":
+        """
+        Build the backend of the `[notifications.contacts]` settings table.
+
+        Parameters
+        ----------
+        config : dict[str, Any]
+            The contacts table: `backend`, only "local" for now, and the
+            `placeholder_email` of the local backend.
+        """
+        if config["backend"] != "local":
+            raise ValueError(f"Unknown contact backend: `{config['backend']}`")
+        return LocalContactBackend(placeholder_email=config.get("placeholder_email"))
+
+
+class LocalContactBackend(ContactBackend):
+    """
+    A stand-in for the customer service, keeping the contacts in memory.
+
+    With a `placeholder_email`, a customer with no contact is given one, with that
+    email only, so the notifications are still sent; without it, they are dropped.
+    """
+
+    def __init__(
+        self,
+        contacts: Mapping[int, CustomerContact] | None = None,
+        placeholder_email: str | None = None,
+    ) -> None:
+        """
+        Instantiate a `LocalContactBackend` object.
+
+        Parameters
+        ----------
+        contacts : Mapping[int, CustomerContact], optional
+            The contacts by customer id (default is None, no contact).
+        placeholder_email : str, optional
+            The email of the customers with no contact (default is None, such
+            customers are unknown).
+        """
+        self.contacts = dict(contacts or {})
+        self.placeholder_email = placeholder_email
+
+    async def fetch_contacts(
+        self, customer_ids: Sequence[int]
+    ) -> Mapping[int, CustomerContact]:
+        """Return the contacts of the customers, or their placeholder if any."""
+        contacts = {
+            customer_id: self.contacts[customer_id]
+            for customer_id in customer_ids
+            if customer_id in self.contacts
+        }
+        if self.placeholder_email:
+            for customer_id in customer_ids:
+                contacts.setdefault(
+                    customer_id,
+                    CustomerContact(
+                        customer_id=customer_id, email=self.placeholder_email
+                    ),
+                )
+        return contacts
+
+
+class ContactResolver:
+    """
+    Resolve the contacts of customers, batching and caching the backend lookups.
+
+    The lookups of the notifications produced concurrently are coalesced into one
+    call of the backend per event loop tick, instead of a call per payment. The
+    contacts are cached in a size-bounded LRU cache for `ttl` seconds, and unknown
+    customers for `negative_ttl` seconds; concurrent lookups of a customer share a
+    single backend lookup.
+    """
+
+    def __init__(
+        self,
+        backend: ContactBackend,
+        max_size: int = 10000,
+        ttl: float = 300.0,
+        negative_ttl: float = 30.0,
+        max_batch_size: int = 100,
+    ) -> None:
+        """
+        Instantiate a `ContactResolver` object.
+
+        Parameters
+        ----------
+        backend : ContactBackend
+            The backend holding the contacts.
+        max_size : int, optional
+            The maximum number of cached customers (default is 10000).
+        ttl : float, optional
+            Seconds a contact is cached (default is 300.0).
+        negative_ttl : float, optional
+            Seconds an unknown customer is cached (default is 30.0).
+        max_batch_size : int, optional
+            The maximum number of customers per backend call (default is 100).
+        """
+        self.backend = backend
+        self.loader: DataLoader[int, CustomerContact] = DataLoader(
+            batch_load=backend.fetch_contacts,
+            cache=TTLCache(max_size=max_size, ttl=ttl, negative_ttl=negative_ttl),
+            max_batch_size=max_batch_size,
+        )
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "ContactResolver":
+        """
+        Build a resolver from the `[notifications.contacts]` settings table.
+
+        Parameters
+        ----------
+        config : dict[str, Any]
+            The table: `backend`, `max_size`, `ttl`, `negative_ttl` and
+            `max_batch_size`.
+        """
+        return cls(
+            backend=ContactBackend.from_config(config),
+            max_size=config["max_size"],
+            ttl=config["ttl"],
+            negative_ttl=config["negative_ttl"],
+            max_batch_size=config["max_batch_size"],
+        )
+
+    async def resolve(self, customer_id: int) -> CustomerContact | None:
+        """Return the contact of a customer, or `None` if unknown."""
+        return await self.loader.load(customer_id)
@@ -0,0 +1,275 @@
+"""Module coalesces the notifications of a recipient into digests."""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+from app.notification_service.schemas import Notification, NotificationType
+
+logger = logging.getLogger(__name__)
+
+# The context published with a notification, e.g. its correlation.
+C = TypeVar("C")
+
+DigestKey = tuple[NotificationType, str]
+
+# Publishes a notification, or digest, with the contexts of the notifications in it.
+DigestPublisher = Callable[[Notification, Sequence[C]], Awaitable[None]]
+
+
+@dataclass(frozen=True, slots=True)
+class DigestStats:
+    """Point-in-time metrics of a `NotificationDigester`."""
+
+    windows: int
+    buffered: int
+    published: int
+    merged: int
+    evicted: int
+
+
+@dataclass(slots=True)
+class _Window(Generic[C]):
+    """The notifications buffered for a recipient, until the window closes."""
+
+    notifications: list[tuple[Notification, C | None]] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+def merge_notifications(notifications: list[Notification]) -> Notification:
+    """Merge the notifications of a recipient into a single digest notification."""
+    if len(notifications) == 1:
+        return notifications[0]
+    lines = "\n".join(f"- {notification.message}" for notification in notifications)
+    first = notifications[0]
+    return Notification(
+        type=first.type,
+        recipient=first.recipient,
+        message=f"You have {len(notifications)} updates:\n{lines}",
+    )
+
+
+class NotificationDigester(Generic[C]):
+    """
+    Buffer the notifications of every recipient for a window, then publish a digest.
+
+    The first notification of a recipient and type opens a window of `window`
+    seconds; the notifications added until it closes are merged into one digest,
+    costing a single delivery. A window holding only one notification publishes it
+    as is. Either way, the digest is published with the contexts of the
+    notifications it holds, e.g. the correlations of their orders.
+
+    The memory is bounded: at most `max_windows` windows are open, and opening one
+    more closes the oldest one early; a window reaching `max_notifications` closes
+    early too. A digest failing to publish is buffered again, first in line to be
+    evicted, and retried after `retry_interval` seconds; while publishing fails,
+    the windows may outgrow `max_windows`. `close` publishes every open window,
+    e.g. on shutdown.
+
+    The windows are held in memory only, while the messages the notifications come
+    from are already acknowledged: a crash loses the notifications of the open
+    windows, i.e. at most the last `window` seconds of them. The window is thus the
+    loss window too; a digester should not be used where no loss is acceptable.
+
+    The digester publishes through `publish`, given on creation or set by the
+    producer it is handed to.
+
+    Example
+    -------
+    ```python
+    digester = NotificationDigester(publish=publish_notification, window=60.0)
+    await digester.add(notification, correlation)
+    ...
+    await digester.close()
+    ```
+    """
+
+    def __init__(
+        self,
+        publish: DigestPublisher[C] | None = None,
+        window: float = 60.0,
+        max_windows: int = 10000,
+        max_notifications: int = 50,
+        retry_interval: float = 5.0,
+    ) -> None:
+        """
+        Instantiate a `NotificationDigester` object.
+
+        Parameters
+        ----------
+        publish : DigestPublisher[C], optional
+            The coroutine function publishing a notification, or digest, with the
+            contexts of the notifications it holds (default is None, set `publish`
+            before the first window closes).
+        window : float, optional
+            Seconds the notifications of a recipient are buffered, and may be lost
+            on a crash (default is 60.0).
+        max_windows : int, optional
+            The maximum number of open windows (default is 10000).
+        max_notifications : int, optional
+            The maximum number of notifications in a digest (default is 50).
+        retry_interval : float, optional
+            Seconds before a digest failing to publish is retried (default is 5.0).
+        """
+        if window <= 0 or max_windows < 1 or max_notifications < 1:
+            raise ValueError("The window and the maximums should be positive")
+        self.window = window
+        self.max_windows = max_windows
+        self.max_notifications = max_notifications
+        self.retry_interval = retry_interval
+        self.publish = publish
+        self._windows: OrderedDict[DigestKey, _Window[C]] = OrderedDict()
+        self._flushes: set[asyncio.Task[None]] = set()
+        self._buffered = 0
+        self._published = 0
+        self._merged = 0
+        self._evicted = 0
+
+    @classmethod
+    def from_config(
+        cls,
+        config: dict[str, Any],
+        publish: DigestPublisher[C] | None = None,
+    ) -> "NotificationDigester[C]":
+        """
+        Build a digester from the `[notifications.digest]` settings table.
+
+        Parameters
+        ----------
+        config : dict[str, Any]
+            The table: `window`, `max_windows`, `max_notifications` and
+            `retry_interval`.
+        publish : DigestPublisher[C], optional
+            The coroutine function publishing a notification, or digest (default is
+            None, set by the producer the digester is handed to).
+        """
+        return cls(
+            publish=publish,
+            window=config["window"],
+            max_windows=config["max_windows"],
+            max_notifications=config["max_notifications"],
+            retry_interval=config.get("retry_interval", 5.0),
+        )
+
+    def stats(self) -> DigestStats:
+        """Return the current metrics of the digester."""
+        return DigestStats(
+            windows=len(self._windows),
+            buffered=self._buffered,
+            published=self._published,
+            merged=self._merged,
+            evicted=self._evicted,
+        )
+
+    async def add(self, notification: Notification, context: C | None = None) -> None:
+        """
+        Buffer a notification in the window of its recipient, opening it if needed.
+
+        Parameters
+        ----------
+        notification : Notification
+            The notification to publish.
+        context : C, optional
+            The context to publish the notification with, e.g. its correlation.
+        """
+        if self.publish is None:
+            raise RuntimeError("The digester has no publish function")
+        key = (notification.type, notification.recipient)
+        window = self._windows.get(key)
+        if window is None:
+            if len(self._windows) >= self.max_windows:
+                self._evicted += 1
+                await self._flush_logged(next(iter(self._windows)))
+            window = self._windows[key] = _Window()
+            window.timer = asyncio.get_running_loop().call_later(
+                self.window, self._flush_later, key
+            )
+        window.notifications.append((notification, context))
+        self._buffered += 1
+        if len(window.notifications) >= self.max_notifications:
+            await self._flush_logged(key)
+
+    async def flush(self, key: DigestKey) -> None:
+        """
+        Close the window of a recipient and type, publishing its digest.
+
+        Raises
+        ------
+        Exception
+            Whatever `publish` raised; the notifications of the window are then
+            buffered again, and retried after `retry_interval` seconds.
+        """
+        publish = self.publish
+        if publish is None:
+            raise RuntimeError("The digester has no publish function")
+        window = self._windows.pop(key, None)
+        if window is None:
+            return
+        if window.timer is not None:
+            window.timer.cancel()
+        self._buffered -= len(window.notifications)
+        notification = merge_notifications(
+            [notification for notification, _ in window.notifications]
+        )
+        contexts = [
+            context for _, context in window.notifications if context is not None
+        ]
+        try:
+            await publish(notification, contexts)
+        except Exception:
+            self._reschedule(key, window)
+            raise
+        self._published += 1
+        if len(window.notifications) > 1:
+            self._merged += len(window.notifications)
+
+    async def close(self) -> None:
+        """Publish every open window, dropping the ones failing to publish."""
+        await asyncio.gather(*self._flushes, return_exceptions=True)
+        for key in list(self._windows):
+            try:
+                await self.flush(key)
+            except Exception as err:
+                logger.warning("Failed to publish a notification digest: %r", err)
+        for window in self._windows.values():
+            if window.timer is not None:
+                window.timer.cancel()
+        if self._windows:
+            logger.error("Dropped %d buffered notifications on close", self._buffered)
+            self._windows.clear()
+            self._buffered = 0
+
+    def _flush_later(self, key: DigestKey) -> None:
+        """Close a window from its timer, in a task."""
+        task = asyncio.create_task(self._flush_logged(key))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush_logged(self, key: DigestKey) -> None:
+        """Close a window, logging the failures of the timer flushes."""
+        try:
+            await self.flush(key)
+        except Exception as err:
+            logger.warning(
+                "Failed to publish a notification digest, retrying in %.1fs: %r",
+                self.retry_interval,
+                err,
+            )
+
+    def _reschedule(self, key: DigestKey, window: _Window[C]) -> None:
+        """Buffer again the notifications of a window failing to publish."""
+        self._buffered += len(window.notifications)
+        reopened = self._windows.get(key)
+        if reopened is not None:
+            # Notifications added while publishing opened a new window: keep the
+            # order, and the timer of the new window.
+            reopened.notifications[:0] = window.notifications
+            return
+        window.timer = asyncio.get_running_loop().call_later(
+            self.retry_interval, self._flush_later, key
+        )
+        self._windows[key] = window
+        self._windows.move_to_end(key, last=False)
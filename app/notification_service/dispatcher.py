@@ -0,0 +1,138 @@
+"""Module dispatches notifications to the sender of their type, within its limits."""
+
+import asyncio
+import logging
+import random
+from collections.abc import Mapping
+from typing import Any, get_args
+
+from app.notification_service.schemas import Notification, NotificationType
+from app.notification_service.senders import (
+    NotificationDeliveryError,
+    NotificationSender,
+)
+from toolkit.ratelimit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """
+    Deliver notifications through the sender of their type, rate limited by type.
+
+    Every type has its own sender, i.e. its own provider and connection pool, and its
+    own token bucket, set to the throughput cap of the provider. Each type is
+    consumed from its own queue and channel by its own worker pool, so a slow or
+    throttled provider holds back its own type only.
+
+    A delivery failing, e.g. on a provider timeout or a 5xx, is tried again up to
+    `retries` times, after a "full jitter" backoff: a random delay between zero and
+    `retry_backoff * 2 ** attempt`. Every attempt waits for its rate limit.
+
+    Example
+    -------
+    ```python
+    dispatcher = NotificationDispatcher(
+        senders={"sms": HttpSender("https://sms.example.com/send")},
+        rate_limits={"sms": TokenBucket(rate=50, burst=50)},
+    )
+    await dispatcher.dispatch(notification)
+    ```
+    """
+
+    def __init__(
+        self,
+        senders: Mapping[NotificationType, NotificationSender],
+        rate_limits: Mapping[NotificationType, TokenBucket] | None = None,
+        retries: int = 3,
+        retry_backoff: float = 0.5,
+    ) -> None:
+        """
+        Instantiate a `NotificationDispatcher` object.
+
+        Parameters
+        ----------
+        senders : Mapping[NotificationType, NotificationSender]
+            The sender of every notification type.
+        rate_limits : Mapping[NotificationType, TokenBucket], optional
+            The rate limit of every notification type, if any (default is None, no
+            rate limit).
+        retries : int, optional
+            Attempts after a failed delivery before giving up (default is 3).
+        retry_backoff : float, optional
+            The backoff ceiling, in seconds, after the first failed delivery
+            (default is 0.5).
+        """
+        self.senders = dict(senders)
+        self.rate_limits = dict(rate_limits or {})
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "NotificationDispatcher":
+        """
+        Build a dispatcher from the `[notifications.channels]` settings table.
+
+        Parameters
+        ----------
+        config : dict[str, Any]
+            The table of every notification type: its sender settings (see
+            `NotificationSender.from_config`), and its `rate` and `burst`. The
+            notifications of a type with no table cannot be dispatched. The
+            `retries` and `retry_backoff` keys apply to every type.
+        """
+        channels = {
+            notification_type: config[notification_type]
+            for notification_type in get_args(NotificationType)
+            if notification_type in config
+        }
+        return cls(
+            senders={
+                notification_type: NotificationSender.from_config(channel)
+                for notification_type, channel in channels.items()
+            },
+            rate_limits={
+                notification_type: TokenBucket(
+                    rate=channel["rate"], burst=channel["burst"]
+                )
+                for notification_type, channel in channels.items()
+            },
+            retries=config.get("retries", 3),
+            retry_backoff=config.get("retry_backoff", 0.5),
+        )
+
+    async def dispatch(self, notification: Notification) -> None:
+        """
+        Deliver a notification, once its rate limit allows it, retrying failures.
+
+        Raises
+        ------
+        KeyError
+            If no sender delivers the type of the notification.
+        NotificationDeliveryError
+            If the provider did not accept the notification after every retry.
+        """
+        sender = self.senders[notification.type]
+        rate_limit = self.rate_limits.get(notification.type)
+        for attempt in range(self.retries + 1):
+            if rate_limit is not None:
+                await rate_limit.acquire()
+            try:
+                await sender.send(notification)
+                return
+            except NotificationDeliveryError as err:
+                if attempt == self.retries:
+                    raise
+                delay = random.uniform(0, self.retry_backoff * 2**attempt)
+                logger.warning(
+                    "Delivering a %s notification failed, retrying in %.2fs: %s",
+                    notification.type,
+                    delay,
+                    err,
+                )
+                await asyncio.sleep(delay)
+
+    async def close(self) -> None:
+        """Close every sender."""
+        for sender in self.senders.values():
+            await sender.close()
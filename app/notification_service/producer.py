@@ -1,46 +1,223 @@
 """Module handles the publishing of notification messages to a RabbitMQ exchange."""
 
 import random
+from collections.abc import Sequence
 from typing import get_args
 
 from aio_pika import DeliveryMode, Message
 
+from app.consts import NOTIFICATION_DIGEST_HEADER, NOTIFICATION_TYPE_EXCHANGE_NAME
+from app.notification_service.contacts import ContactResolver
+from app.notification_service.digest import NotificationDigester
 from app.notification_service.pubsub import NotificationPubSub
 from app.notification_service.schemas import Notification, NotificationType
+from app.notification_service.templates import TemplateCatalog
 from app.payment_service.schemas import IncomingPayment
-from config.base import logger
+from config.base import AsyncRabbitmqManager, logger
+from config.correlation import Correlation, get_correlation
 
 
 class NotificationProducer(NotificationPubSub):
     """Produce and publish notification messages to a RabbitMQ exchange."""
 
+    def __init__(
+        self,
+        rabbitmq_manager: AsyncRabbitmqManager,
+        legacy_fanout: bool = True,
+        digester: NotificationDigester[Correlation] | None = None,
+        contacts: ContactResolver | None = None,
+        templates: TemplateCatalog | None = None,
+    ) -> None:
+        """
+        Instantiate a `NotificationProducer` object.
+
+        Parameters
+        ----------
+        rabbitmq_manager : AsyncRabbitmqManager
+            The RabbitMQ manager.
+        legacy_fanout : bool, optional
+            Whether to keep feeding the legacy fanout exchange (default is True).
+        digester : NotificationDigester[Correlation], optional
+            The digester buffering the notifications of a recipient for a window, to
+            publish them as one digest; it publishes through `publish_digest`
+            (default is None, publish every notification right away).
+        contacts : ContactResolver, optional
+            The resolver of the contacts of the customers the notifications are sent
+            to (default is None, use a placeholder recipient).
+        templates : TemplateCatalog, optional
+            The templates of the messages, by type and locale (default is None, use
+            the built-in message).
+        """
+        super().__init__(rabbitmq_manager=rabbitmq_manager, legacy_fanout=legacy_fanout)
+        self.digester = digester
+        if digester is not None:
+            digester.publish = self.publish_digest
+        self.contacts = contacts
+        self.templates = templates
+
     async def produce_notifications(self, payment: IncomingPayment) -> None:
         """
         Produce notification messages to a RabbitMQ exchange.
 
+        The recipient is resolved from the contacts of the customer of the payment;
+        no notification is produced for a customer with no known contact. With a
+        digester, the notification is buffered in the window of its recipient and
+        published later, merged with the next ones: the payment is then acknowledged
+        before its notification is published, see `NotificationDigester`.
+
         Parameters
         ----------
         payment : IncomingPayment
             The incoming payment object containing payment details to create the
             notification object.
         """
-        async with await self.rabbitmq_manager.get_connection() as connection:
-            channel = await self.rabbitmq_manager.get_channel(connection=connection)
-
-            notifications_exchange = await self.declare_notification_exchange(
-                channel=channel
+        notification = await self._resolve_notification(payment=payment)
+        if notification is None:
+            logger.warning(
+                "No contact to notify customer %s of order %s",
+                payment.customer_id,
+                payment.order_id,
             )
+            return
+        correlation = get_correlation(correlation_id=payment.order_id)
+        if self.digester is not None:
+            await self.digester.add(notification, correlation)
+        else:
+            await self.publish_notification(notification, correlation)
 
-            notification = self._get_notification(payment=payment)
-            message = Message(
-                body=notification.to_message(),
-                delivery_mode=DeliveryMode.PERSISTENT,
-            )
+    async def publish_notification(
+        self, notification: Notification, correlation: Correlation | None = None
+    ) -> None:
+        """
+        Publish a notification message to the notification exchange.
 
-            await notifications_exchange.publish(
-                message=message, routing_key=self._get_notification_routing_key()
-            )
-            logger.info("Notification published: %s", notification)
+        Parameters
+        ----------
+        notification : Notification
+            The notification, or digest, to publish.
+        correlation : Correlation, optional
+            The correlation of the notification, stamped on the message (default is
+            None).
+        """
+        await self._publish(notification=notification, correlation=correlation)
+
+    async def publish_digest(
+        self, notification: Notification, correlations: Sequence[Correlation]
+    ) -> None:
+        """
+        Publish a digest of notifications, with the correlations of their orders.
+
+        A digest of one order is stamped with its correlation; the correlation ids
+        of a digest of several orders are listed in the `NOTIFICATION_DIGEST_HEADER`
+        header instead, for the consumer to mark every order notified.
+
+        Parameters
+        ----------
+        notification : Notification
+            The digest to publish.
+        correlations : Sequence[Correlation]
+            The correlations of the orders of the notifications in the digest.
+        """
+        if len(correlations) == 1:
+            await self._publish(notification=notification, correlation=correlations[0])
+            return
+        await self._publish(
+            notification=notification,
+            correlation_ids=[
+                correlation.correlation_id for correlation in correlations
+            ],
+        )
+
+    async def publish_notifications(
+        self, notifications: Sequence[Notification]
+    ) -> None:
+        """
+        Publish a batch of notification messages, on the channel of the manager.
+
+        Parameters
+        ----------
+        notifications : Sequence[Notification]
+            The notifications to publish, e.g. the ones a scheduler found due.
+        """
+        for notification in notifications:
+            await self._publish(notification=notification)
+
+    async def close(self) -> None:
+        """Publish the notifications buffered by the digester, e.g. on shutdown."""
+        if self.digester is not None:
+            await self.digester.close()
+
+    async def _publish(
+        self,
+        notification: Notification,
+        correlation: Correlation | None = None,
+        correlation_ids: Sequence[str] = (),
+    ) -> None:
+        """Publish a notification message to the topic exchange, routed by its type."""
+        properties = correlation.get_message_properties() if correlation else {}
+        if correlation_ids:
+            properties["headers"] = {
+                **properties.get("headers", {}),
+                NOTIFICATION_DIGEST_HEADER: list(correlation_ids),
+            }
+        message = Message(
+            body=notification.to_message(),
+            delivery_mode=DeliveryMode.PERSISTENT,
+            **properties,
+        )
+
+        await self.rabbitmq_manager.publish_to(
+            exchange_name=NOTIFICATION_TYPE_EXCHANGE_NAME,
+            declare_exchange=self.declare_notification_exchange,
+            message=message,
+            routing_key=self._get_notification_routing_key(
+                notification_type=notification.type
+            ),
+        )
+        logger.info("Notification published: %s", notification)
+
+    async def _resolve_notification(
+        self, payment: IncomingPayment
+    ) -> Notification | None:
+        """
+        Create the notification of a payment, sent to the contact of its customer.
+
+        Parameters
+        ----------
+        payment : IncomingPayment
+            The incoming payment object containing payment details.
+
+        Returns
+        -------
+        Notification | None
+            The notification, of a type the customer has an address for, or `None`
+            if the customer has no known contact.
+        """
+        if self.contacts is None or payment.customer_id is None:
+            notification = self._get_notification(payment=payment)
+            if self.templates is None:
+                return notification
+            message = self.templates.render(notification.type, payment)
+            return notification.model_copy(update={"message": message})
+        contact = await self.contacts.resolve(payment.customer_id)
+        if contact is None:
+            return None
+        recipients = [
+            (notification_type, recipient)
+            for notification_type in get_args(NotificationType)
+            if (recipient := contact.get_recipient(notification_type))
+        ]
+        if not recipients:
+            return None
+        notification_type, recipient = random.choice(recipients)
+        message = (
+            self.templates.render(notification_type, payment, locale=contact.locale)
+            if self.templates is not None
+            else self._get_message(payment=payment)
+        )
+        return Notification(
+            type=notification_type, recipient=recipient, message=message
+        )
 
     @staticmethod
     def _get_notification(payment: IncomingPayment) -> Notification:
@@ -61,8 +238,11 @@ class NotificationProducer(NotificationPubSub):
         notification = Notification(
             type=random.choice(get_args(NotificationType)),
             recipient="alihezarpisheh@outlook.com",
-            message=(
-                f"Your payment status for order {payment.order_id} is: {payment.status}"
-            ),
+            message=NotificationProducer._get_message(payment=payment),
         )
         return notification
+
+    @staticmethod
+    def _get_message(payment: IncomingPayment) -> str:
+        """Return the text notifying the status of a payment."""
+        return f"Your payment status for order {payment.order_id} is: {payment.status}"
@@ -1,24 +1,57 @@
 """Module contains a subclass for order producers and consumers."""
 
 from aio_pika import ExchangeType
-from aio_pika.abc import AbstractChannel, AbstractExchange
+from aio_pika.abc import AbstractChannel, AbstractExchange, AbstractQueue
 
-from app.consts import NOTIFICATION_EXCHANGE_NAME
+from app.consts import (
+    NOTIFICATION_EXCHANGE_NAME,
+    NOTIFICATION_QUEUE_NAME_TEMPLATE,
+    NOTIFICATION_TYPE_EXCHANGE_NAME,
+)
+from app.notification_service.schemas import NotificationType
 from config.base import AsyncRabbitmqManager
 
 
 class NotificationPubSub:
-    """Base class for managing notification-related messaging via RabbitMQ."""
+    """
+    Base class for managing notification-related messaging via RabbitMQ.
 
-    def __init__(self, rabbitmq_manager: AsyncRabbitmqManager) -> None:
-        """Instantiate a `NotificationPubSub` object."""
+    Notifications are published to a topic exchange with the routing key
+    `notifications.<type>`, and every type has its own queue, so a worker receives
+    only the notifications it delivers.
+
+    Notifications used to be published to a fanout exchange, delivering every
+    notification to every subscriber. The type of an existing exchange cannot be
+    changed, so the fanout exchange is kept for the subscribers not migrated yet:
+    with `legacy_fanout`, it is bound to the topic exchange and still receives every
+    notification. Once every subscriber consumes a per-type queue, set
+    `legacy_fanout` to False and delete the fanout exchange.
+    """
+
+    def __init__(
+        self, rabbitmq_manager: AsyncRabbitmqManager, legacy_fanout: bool = True
+    ) -> None:
+        """
+        Instantiate a `NotificationPubSub` object.
+
+        Parameters
+        ----------
+        rabbitmq_manager : AsyncRabbitmqManager
+            The RabbitMQ manager.
+        legacy_fanout : bool, optional
+            Whether to keep feeding the legacy fanout exchange (default is True).
+        """
         self.rabbitmq_manager = rabbitmq_manager
+        self.legacy_fanout = legacy_fanout
 
     async def declare_notification_exchange(
         self, channel: AbstractChannel
     ) -> AbstractExchange:
         """
-        Declare the 'notifications' exchange on the specified channel.
+        Declare the 'notification_type' topic exchange on the specified channel.
+
+        With `legacy_fanout`, the legacy fanout exchange is declared as well, and bound
+        to receive every notification.
 
         Parameters
         ----------
@@ -28,24 +61,104 @@ class NotificationPubSub:
         Returns
         -------
         AbstractExchange
-            The declared exchange object.
+            The declared topic exchange object.
         """
         notification_exchange = await self.rabbitmq_manager.declare_exchange(
+            channel=channel,
+            name=NOTIFICATION_TYPE_EXCHANGE_NAME,
+            exchange_type=ExchangeType.TOPIC,
+        )
+        if self.legacy_fanout:
+            legacy_exchange = await self.declare_legacy_notification_exchange(
+                channel=channel
+            )
+            await legacy_exchange.bind(
+                notification_exchange, routing_key=self._get_notification_binding_key()
+            )
+        return notification_exchange
+
+    async def declare_legacy_notification_exchange(
+        self, channel: AbstractChannel
+    ) -> AbstractExchange:
+        """
+        Declare the legacy 'notifications' fanout exchange on the specified channel.
+
+        Parameters
+        ----------
+        channel : AbstractChannel
+            The channel on which to declare the exchange.
+
+        Returns
+        -------
+        AbstractExchange
+            The declared exchange object.
+        """
+        legacy_exchange = await self.rabbitmq_manager.declare_exchange(
             channel=channel,
             name=NOTIFICATION_EXCHANGE_NAME,
             exchange_type=ExchangeType.FANOUT,
         )
-        return notification_exchange
+        return legacy_exchange
+
+    async def declare_notification_queue(
+        self, channel: AbstractChannel, notification_type: NotificationType
+    ) -> AbstractQueue:
+        """
+        Declare the queue of a notification type, bound to the topic exchange.
+
+        Parameters
+        ----------
+        channel : AbstractChannel
+            The channel on which to declare the queue.
+        notification_type : NotificationType
+            The type of the notifications of the queue.
+
+        Returns
+        -------
+        AbstractQueue
+            The declared queue object.
+        """
+        notification_exchange = await self.declare_notification_exchange(
+            channel=channel
+        )
+        notification_queue = await self.rabbitmq_manager.declare_queue(
+            channel=channel,
+            name=NOTIFICATION_QUEUE_NAME_TEMPLATE.format(type=notification_type),
+        )
+        await notification_queue.bind(
+            notification_exchange,
+            routing_key=self._get_notification_routing_key(
+                notification_type=notification_type
+            ),
+        )
+        return notification_queue
+
+    @staticmethod
+    def _get_notification_routing_key(notification_type: NotificationType) -> str:
+        """
+        Retrieve the routing key for notifications of a type.
+
+        Parameters
+        ----------
+        notification_type : NotificationType
+            The type of the notification.
+
+        Returns
+        -------
+        str
+            The routing key for the notifications of the type, e.g.
+            'notifications.email'.
+        """
+        return f"notifications.{notification_type}"
 
     @staticmethod
-    def _get_notification_routing_key() -> str:
+    def _get_notification_binding_key() -> str:
         """
-        Retrieve the routing key for notifications.
+        Retrieve the binding key matching the notifications of every type.
 
         Returns
         -------
         str
-            The routing key for notifications. The routing key will be ignored because
-            of the FANOUT exchange type.
+            The binding key for every notification, 'notifications.*'.
         """
-        return "notifications"
+        return "notifications.*"
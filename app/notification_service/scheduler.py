@@ -0,0 +1,281 @@
+"""Module schedules delayed notifications on a hierarchical timing wheel."""
+
+import asyncio
+import datetime
+import logging
+import os
+import struct
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, get_args
+
+from app.notification_service.producer import NotificationProducer
+from app.notification_service.schemas import Notification, NotificationType
+from toolkit.scheduling import TimingWheel
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"NTFTIMER"
+_HEADER = struct.Struct("<8sI")  # magic, count
+_RECORD = struct.Struct("<dBHI")  # when, type, recipient length, message length
+_TYPES: tuple[NotificationType, ...] = get_args(NotificationType)
+
+
+class TimerSnapshotError(Exception):
+    """Raise when the snapshot of the pending timers does not match its layout."""
+
+    pass
+
+
+class NotificationScheduler:
+    """
+    Publish notifications at a later time, e.g. a reminder after a failed payment.
+
+    The pending notifications are held by a `TimingWheel`, scheduling or cancelling
+    one in O(1) however many are pending, instead of a sleeping task or a broker
+    TTL queue per notification. `run` advances the wheel every tick and publishes
+    the due notifications through the producer by batches of `batch_size`, on one
+    channel per batch; a batch failing to publish is retried on the next tick.
+
+    A notification due during the quiet hours, given in UTC, is deferred to their
+    end. The pending notifications are saved to a compact binary snapshot every
+    `snapshot_interval` seconds and on shutdown, and loaded back by `run`: a crash
+    loses the notifications scheduled since the last snapshot, and the ones due
+    while the service was down are published on start.
+
+    Example
+    -------
+    ```python
+    scheduler = NotificationScheduler(producer, snapshot_path="data/timers.bin")
+    scheduler.defer(notification, delay=30 * 60)
+    await scheduler.run()
+    ```
+    """
+
+    def __init__(
+        self,
+        producer: NotificationProducer,
+        tick: float = 1.0,
+        slots: int = 64,
+        levels: int = 4,
+        batch_size: int = 100,
+        snapshot_path: str | None = None,
+        snapshot_interval: float = 60.0,
+        quiet_hours: tuple[int, int] | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Instantiate a `NotificationScheduler` object, with no notification pending.
+
+        Parameters
+        ----------
+        producer : NotificationProducer
+            The producer publishing the due notifications.
+        tick : float, optional
+            Seconds per tick of the wheel, the precision of the schedule (default is
+            1.0).
+        slots : int, optional
+            Buckets per level of the wheel (default is 64).
+        levels : int, optional
+            Levels of the wheel (default is 4).
+        batch_size : int, optional
+            The maximum number of notifications published at once (default is 100).
+        snapshot_path : str, optional
+            The file the pending notifications are saved to (default is None, do not
+            persist them).
+        snapshot_interval : float, optional
+            Seconds between two snapshots (default is 60.0).
+        quiet_hours : tuple[int, int], optional
+            The UTC hours notifications are not sent within, from the first one
+            included to the second one excluded, e.g. `(22, 7)` (default is None).
+        clock : Callable[[], float], optional
+            A clock returning the epoch time in seconds (default is `time.time`).
+        """
+        if batch_size < 1:
+            raise ValueError("The batch size should be at least 1")
+        self.producer = producer
+        self.batch_size = batch_size
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.snapshot_interval = snapshot_interval
+        self.quiet_hours = quiet_hours
+        self._clock = clock
+        self.wheel: TimingWheel[Notification] = TimingWheel(
+            tick=tick, slots=slots, levels=levels, start=clock()
+        )
+
+    @classmethod
+    def from_config(
+        cls, config: dict[str, Any], producer: NotificationProducer
+    ) -> "NotificationScheduler":
+        """
+        Build a scheduler from the `[notifications.scheduler]` settings table.
+
+        Parameters
+        ----------
+        config : dict[str, Any]
+            The table: `tick`, `slots`, `levels`, `batch_size`, `snapshot_path`,
+            `snapshot_interval` and `quiet_hours`, an empty array for none.
+        producer : NotificationProducer
+            The producer publishing the due notifications.
+        """
+        quiet_hours = config["quiet_hours"]
+        return cls(
+            producer=producer,
+            tick=config["tick"],
+            slots=config["slots"],
+            levels=config["levels"],
+            batch_size=config["batch_size"],
+            snapshot_path=config["snapshot_path"] or None,
+            snapshot_interval=config["snapshot_interval"],
+            quiet_hours=(quiet_hours[0], quiet_hours[1]) if quiet_hours else None,
+        )
+
+    def __len__(self) -> int:
+        """Return the number of pending notifications."""
+        return len(self.wheel)
+
+    def schedule(self, notification: Notification, when: float) -> int:
+        """
+        Schedule a notification to be published at a time.
+
+        Parameters
+        ----------
+        notification : Notification
+            The notification to publish.
+        when : float
+            The epoch time to publish at, deferred past the quiet hours.
+
+        Returns
+        -------
+        int
+            The id of the timer, to cancel it.
+        """
+        return self.wheel.schedule(notification, when=self._defer_quiet_hours(when))
+
+    def defer(self, notification: Notification, delay: float) -> int:
+        """Schedule a notification to be published in `delay` seconds."""
+        return self.schedule(notification, when=self._clock() + delay)
+
+    def cancel(self, timer_id: int) -> bool:
+        """Cancel a scheduled notification, returning whether it was still pending."""
+        return self.wheel.cancel(timer_id)
+
+    async def run(self) -> None:
+        """Load the snapshot, then publish the due notifications every tick."""
+        self.load()
+        next_snapshot = self._clock() + self.snapshot_interval
+        try:
+            while True:
+                await asyncio.sleep(self.wheel.tick)
+                await self.flush()
+                if self.snapshot_path and self._clock() >= next_snapshot:
+                    self.save()
+                    next_snapshot = self._clock() + self.snapshot_interval
+        finally:
+            self.save()
+
+    async def flush(self) -> int:
+        """
+        Publish the notifications due by now, by batches.
+
+        Returns
+        -------
+        int
+            The number of notifications published.
+        """
+        due = self.wheel.advance(self._clock())
+        published = 0
+        for start in range(0, len(due), self.batch_size):
+            batch = due[start : start + self.batch_size]
+            try:
+                await self.producer.publish_notifications(batch)
+            except Exception as err:
+                logger.warning("Failed to publish scheduled notifications: %r", err)
+                retry_at = self.wheel.now + self.wheel.tick
+                for notification in batch:
+                    self.wheel.schedule(notification, when=retry_at)
+            else:
+                published += len(batch)
+        return published
+
+    def save(self) -> None:
+        """Write the pending notifications to the snapshot file, atomically."""
+        if self.snapshot_path is None:
+            return
+        chunks = [_HEADER.pack(_MAGIC, len(self.wheel))]
+        for when, notification in self.wheel.pending():
+            recipient = notification.recipient.encode()
+            message = notification.message.encode()
+            chunks.append(
+                _RECORD.pack(
+                    when, _TYPES.index(notification.type), len(recipient), len(message)
+                )
+            )
+            chunks.append(recipient)
+            chunks.append(message)
+
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.snapshot_path.with_suffix(".tmp")
+        with temporary_path.open(mode="wb") as file:
+            file.write(b"".join(chunks))
+            file.flush()
+            os.fsync(file.fileno())
+        temporary_path.replace(self.snapshot_path)
+
+    def load(self) -> int:
+        """
+        Schedule the notifications of the snapshot file, if any.
+
+        Returns
+        -------
+        int
+            The number of notifications loaded.
+
+        Raises
+        ------
+        TimerSnapshotError
+            If the snapshot file does not match the expected layout.
+        """
+        if self.snapshot_path is None or not self.snapshot_path.exists():
+            return 0
+        data = self.snapshot_path.read_bytes()
+        try:
+            magic, count = _HEADER.unpack_from(data)
+            count = int(count)
+            if magic != _MAGIC:
+                raise TimerSnapshotError(f"`{self.snapshot_path}` is not a snapshot!")
+            offset = _HEADER.size
+            for _ in range(count):
+                when, type_index, recipient_size, message_size = _RECORD.unpack_from(
+                    data, offset
+                )
+                offset += _RECORD.size
+                recipient = data[offset : offset + recipient_size].decode()
+                offset += recipient_size
+                message = data[offset : offset + message_size].decode()
+                offset += message_size
+                notification = Notification(
+                    type=_TYPES[type_index], recipient=recipient, message=message
+                )
+                self.wheel.schedule(notification, when=when)
+        except (struct.error, IndexError, UnicodeDecodeError) as err:
+            raise TimerSnapshotError(
+                f"`{self.snapshot_path}` is truncated or corrupted!"
+            ) from err
+        return count
+
+    def _defer_quiet_hours(self, when: float) -> float:
+        """Return the time to publish at, moved to the end of the quiet hours."""
+        if self.quiet_hours is None:
+            return when
+        start, end = self.quiet_hours
+        moment = datetime.datetime.fromtimestamp(when, tz=datetime.UTC)
+        hour = moment.hour
+        quiet = start <= hour < end if start <= end else hour >= start or hour < end
+        if not quiet:
+            return when
+        resume = moment.replace(hour=end, minute=0, second=0, microsecond=0)
+        if resume <= moment:
+            resume += datetime.timedelta(days=1)
+        return resume.timestamp()
@@ -15,3 +15,22 @@ class Notification(BaseSchema):
     type: Annotated[NotificationType, Field(description="The type of the notification")]
     recipient: Annotated[str, Field(description="The email address, phone number, etc")]
     message: Annotated[str, Field(description="The notification message")]
+
+
+class CustomerContact(BaseSchema):
+    """Pydantic schema, modeling the contact details of a customer."""
+
+    customer_id: Annotated[int, Field(description="Unique identifier of the customer")]
+    email: Annotated[str | None, Field(description="The email address")] = None
+    phone: Annotated[str | None, Field(description="The phone number")] = None
+    device_token: Annotated[
+        str | None, Field(description="The push token of the customer's device")
+    ] = None
+    locale: Annotated[
+        str | None, Field(description="The language of the messages, e.g. 'en'")
+    ] = None
+
+    def get_recipient(self, notification_type: NotificationType) -> str | None:
+        """Return the address notifications of a type are sent to, if known."""
+        recipients = {"email": self.email, "sms": self.phone, "push": self.device_token}
+        return recipients[notification_type]
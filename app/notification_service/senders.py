@@ -0,0 +1,237 @@
+"""Module defines the senders delivering notifications to their providers."""
+
+import asyncio
+import ssl
+from abc import ABC, abstractmethod
+from typing import Any
+from urllib.parse import urlsplit
+
+from app.notification_service.schemas import Notification
+from toolkit.concurrency import ConnectionPool
+
+Connection = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class NotificationDeliveryError(Exception):
+    """Raise when a provider refuses or fails to deliver a notification."""
+
+    pass
+
+
+class _ConnectionDone(Exception):
+    """Raise when a connection cannot be reused, with the status of its response."""
+
+    def __init__(self, status: int | None) -> None:
+        super().__init__(status)
+        self.status = status
+
+
+class NotificationSender(ABC):
+    """Base class of the senders, delivering notifications to a provider."""
+
+    @abstractmethod
+    async def send(self, notification: Notification) -> None:
+        """
+        Deliver a notification.
+
+        Raises
+        ------
+        NotificationDeliveryError
+            If the provider did not accept the notification.
+        """
+
+    async def close(self) -> None:
+        """Release the resources of the sender."""
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "NotificationSender":
+        """
+        Build the sender of a `[notifications.channels.<type>]` settings table.
+
+        Parameters
+        ----------
+        config : dict[str, Any]
+            The channel table: `sender` ("http" or "local"), and `url`,
+            `max_connections` and `timeout` for the HTTP sender.
+        """
+        if config["sender"] == "http":
+            return HttpSender(
+                url=config["url"],
+                max_connections=config["max_connections"],
+                timeout=config["timeout"],
+            )
+        return LocalSender()
+
+
+class LocalSender(NotificationSender):
+    """A stand-in for a provider, keeping the notifications it is sent in memory."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """
+        Instantiate a `LocalSender` object.
+
+        Parameters
+        ----------
+        latency : float, optional
+            Seconds every delivery takes (default is 0.0).
+        """
+        self.latency = latency
+        self.sent: list[Notification] = []
+
+    async def send(self, notification: Notification) -> None:
+        """Keep the notification, after `latency` seconds."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.sent.append(notification)
+
+
+class HttpSender(NotificationSender):
+    """
+    Deliver notifications with JSON `POST` requests to the HTTP API of a provider.
+
+    Requests go over HTTP/1.1 keep-alive connections, pooled by a `ConnectionPool`:
+    after a burst, the next deliveries skip the TCP and TLS handshakes, and at most
+    `max_connections` requests are in flight. A request whose reused connection was
+    closed by the provider while idle is sent again once, on a new connection.
+    """
+
+    def __init__(
+        self, url: str, max_connections: int = 10, timeout: float = 5.0
+    ) -> None:
+        """
+        Instantiate an `HttpSender` object.
+
+        Parameters
+        ----------
+        url : str
+            The URL the notifications are posted to.
+        max_connections : int, optional
+            The maximum number of open connections (default is 10).
+        timeout : float, optional
+            Seconds a delivery may take (default is 5.0).
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Invalid provider URL: `{url}`")
+        self.url = url
+        self.timeout = timeout
+        self._host = parts.hostname
+        self._port = parts.port or (443 if parts.scheme == "https" else 80)
+        self._ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self._target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self._headers = (
+            f"Host: {parts.netloc}\r\n"
+            "Content-Type: application/json\r\n"
+            "Connection: keep-alive\r\n"
+        )
+        self.pool: ConnectionPool[Connection] = ConnectionPool(
+            connect=self._connect, close=self._close, size=max_connections
+        )
+
+    async def send(self, notification: Notification) -> None:
+        """
+        Post the notification.
+
+        Raises
+        ------
+        NotificationDeliveryError
+            If the response is not 2xx, or the request failed, timed out or got a
+            malformed response.
+        """
+        body = notification.to_message()
+        try:
+            async with asyncio.timeout(self.timeout):
+                status = await self._send(body)
+                if status is None:
+                    status = await self._send(body)
+        except TimeoutError as err:
+            msg = f"{self.url} did not respond within {self.timeout}s"
+            raise NotificationDeliveryError(msg) from err
+        except (OSError, EOFError, ValueError, IndexError) as err:
+            msg = f"Failed to post to {self.url}: {err!r}"
+            raise NotificationDeliveryError(msg) from err
+        if status is None:
+            msg = f"{self.url} closed the connection without a response"
+            raise NotificationDeliveryError(msg)
+        if not 200 <= status < 300:
+            raise NotificationDeliveryError(f"{self.url} responded with {status}")
+
+    async def close(self) -> None:
+        """Close the pooled connections."""
+        await self.pool.close()
+
+    async def _send(self, body: bytes) -> int | None:
+        """Send a request on a pooled connection and return its response status."""
+        try:
+            async with self.pool.connection() as connection:
+                return await self._post(connection, body)
+        except _ConnectionDone as done:
+            return done.status
+
+    async def _post(self, connection: Connection, body: bytes) -> int:
+        """
+        Send a request on a connection and read its response.
+
+        Returns
+        -------
+        int
+            The status of the response.
+
+        Raises
+        ------
+        _ConnectionDone
+            If the connection cannot be reused, so the pool closes it.
+        """
+        reader, writer = connection
+        writer.write(
+            f"POST {self._target} HTTP/1.1\r\n{self._headers}"
+            f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1")
+            + body
+        )
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise _ConnectionDone(None)
+        status = int(status_line.split(maxsplit=2)[1])
+        length, chunked, keep_alive = None, False, True
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding":
+                chunked = value.endswith("chunked")
+            elif name == "connection" and value == "close":
+                keep_alive = False
+        if chunked:
+            await self._read_chunks(reader)
+        elif status in (204, 304) or 100 <= status < 200:
+            pass  # No body.
+        elif length is None:
+            await reader.read()  # The body ends with the connection.
+            raise _ConnectionDone(status)
+        else:
+            await reader.readexactly(length)
+        if not keep_alive:
+            raise _ConnectionDone(status)
+        return status
+
+    @staticmethod
+    async def _read_chunks(reader: asyncio.StreamReader) -> None:
+        """Read a body with the chunked transfer coding, and its trailers."""
+        while size := int((await reader.readline()).split(b";")[0], 16):
+            await reader.readexactly(size + 2)  # The chunk and its CRLF.
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass  # A trailer field.
+
+    async def _connect(self) -> Connection:
+        """Open a connection to the provider."""
+        return await asyncio.open_connection(self._host, self._port, ssl=self._ssl)
+
+    @staticmethod
+    async def _close(connection: Connection) -> None:
+        """Close a connection to the provider."""
+        _, writer = connection
+        writer.close()
+        await writer.wait_closed()
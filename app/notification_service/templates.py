@@ -0,0 +1,195 @@
+"""Module renders the notification messages from precompiled, localized templates."""
+
+import string
+from collections.abc import Iterable, Mapping
+from typing import Any, get_args
+
+from app.notification_service.schemas import NotificationType
+from app.payment_service.schemas import IncomingPayment
+
+_FORMATTER = string.Formatter()
+
+
+class TemplateError(Exception):
+    """Raise when a template uses an unknown variable or an unsupported syntax."""
+
+    pass
+
+
+class Template:
+    """
+    A message template, compiled once and rendered with `str.format_map`.
+
+    The source uses `{variable}` placeholders, `{{` and `}}` for literal braces.
+    Compiling parses the source once, checks every placeholder names a known
+    variable, with no attribute, index, conversion or format spec, and merges the
+    static fragments: rendering is then a single `format_map` call, in C, and a
+    template with no placeholder renders its cached text.
+    """
+
+    __slots__ = ("_format", "_text", "source", "variables")
+
+    def __init__(self, source: str, variables: Iterable[str]) -> None:
+        """
+        Compile a template.
+
+        Parameters
+        ----------
+        source : str
+            The text of the template.
+        variables : Iterable[str]
+            The names of the variables the template may use.
+
+        Raises
+        ------
+        TemplateError
+            If the template is malformed, or uses an unknown variable or a format
+            spec, a conversion, an attribute or an index.
+        """
+        allowed = frozenset(variables)
+        fragments = []
+        used = []
+        try:
+            parsed = list(_FORMATTER.parse(source))
+        except ValueError as err:
+            raise TemplateError(f"Malformed template `{source}`: {err}") from err
+        for literal, field, spec, conversion in parsed:
+            fragments.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is None:
+                continue
+            if spec or conversion or field not in allowed:
+                raise TemplateError(
+                    f"Unsupported placeholder `{{{field}}}` in template `{source}`"
+                )
+            fragments.append(f"{{{field}}}")
+            used.append(field)
+
+        self.source = source
+        self.variables = frozenset(used)
+        compiled = "".join(fragments)
+        self._text = None if used else source.replace("{{", "{").replace("}}", "}")
+        self._format = compiled.format_map
+
+    def render(self, variables: Mapping[str, Any]) -> str:
+        """Return the text of the template with the values of its variables."""
+        if self._text is not None:
+            return self._text
+        return self._format(variables)
+
+
+class TemplateCatalog:
+    """
+    The message templates of every notification type, with per-locale variants.
+
+    The variables of the templates are the fields of the `IncomingPayment` being
+    notified. A locale missing a type falls back to the template of the default
+    locale; every type must have one in the default locale.
+
+    Example
+    -------
+    ```python
+    catalog = TemplateCatalog(
+        {"en": {"sms": "Order {order_id}: {status}", ...}}, default_locale="en"
+    )
+    message = catalog.render("sms", payment, locale="fr")
+    ```
+    """
+
+    def __init__(
+        self,
+        templates: Mapping[str, Mapping[str, str]],
+        default_locale: str = "en",
+    ) -> None:
+        """
+        Compile the templates of a catalog.
+
+        Parameters
+        ----------
+        templates : Mapping[str, Mapping[str, str]]
+            The sources of the templates, by locale then notification type.
+        default_locale : str, optional
+            The locale used for the customers without a locale, or one with no
+            template of a type (default is "en").
+
+        Raises
+        ------
+        TemplateError
+            If a template does not compile, or a type has no template in the
+            default locale.
+        """
+        variables = IncomingPayment.model_fields.keys()
+        self.default_locale = default_locale
+        self._templates = {
+            (locale, notification_type): Template(source, variables=variables)
+            for locale, sources in templates.items()
+            for notification_type, source in sources.items()
+        }
+        for notification_type in get_args(NotificationType):
+            if (default_locale, notification_type) not in self._templates:
+                raise TemplateError(
+                    f"No `{notification_type}` template for locale `{default_locale}`"
+                )
+        self.locales = frozenset(templates)
+        # The template of every known locale and type rendered so far, fallbacks
+        # resolved; unknown locales are not cached, as any string may come up.
+        self._resolved: dict[tuple[str | None, NotificationType], Template] = {}
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "TemplateCatalog":
+        """
+        Build a catalog from the `[notifications.templates]` settings table.
+
+        Parameters
+        ----------
+        config : dict[str, Any]
+            The table: `default_locale`, and a table of templates by type for every
+            locale.
+        """
+        templates = {
+            locale: sources
+            for locale, sources in config.items()
+            if isinstance(sources, dict)
+        }
+        return cls(templates, default_locale=config["default_locale"])
+
+    def get(
+        self, notification_type: NotificationType, locale: str | None = None
+    ) -> Template:
+        """Return the template of a type in a locale, or in the default locale."""
+        template = self._templates.get(
+            (locale or self.default_locale, notification_type)
+        )
+        if template is None:
+            template = self._templates[(self.default_locale, notification_type)]
+        return template
+
+    def render(
+        self,
+        notification_type: NotificationType,
+        payment: IncomingPayment,
+        locale: str | None = None,
+    ) -> str:
+        """
+        Render the message notifying a payment.
+
+        Parameters
+        ----------
+        notification_type : NotificationType
+            The type of the notification.
+        payment : IncomingPayment
+            The payment, the values of the variables.
+        locale : str, optional
+            The locale of the customer (default is None, the default locale).
+
+        Returns
+        -------
+        str
+            The text of the message.
+        """
+        template = self._resolved.get((locale, notification_type))
+        if template is None:
+            template = self.get(notification_type, locale)
+            if locale is None or locale in self.locales:
+                self._resolved[locale, notification_type] = template
+        # The fields of a pydantic model are its `__dict__`: no copy per render.
+        return template.render(payment.__dict__)
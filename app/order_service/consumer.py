@@ -10,6 +10,14 @@ from aio_pika.abc import AbstractIncomingMessage
 from app.consts import ORDERS_QUEUE_NAME
 from app.order_service.pubsub import OrderPubSub
 from app.order_service.schemas import IncomingOrder
+from config.acks import AckCoalescer
+from config.correlation import track_stage
+from config.memory import accountant, get_body_size
+from config.metrics import instrument_acks, instrument_handler
+from config.profiling import profiler
+from config.tracing import process_message, trace_consumer, tracer
+from config.tuning import ConsumerTuning, TuningWatcher, bind_consumer
+from toolkit.concurrency import WorkerPool
 
 OrderMessageHandler = (
     Callable[[IncomingOrder], None] | Callable[[IncomingOrder], Awaitable[None]]
@@ -19,8 +27,14 @@ OrderMessageHandler = (
 class OrderConsumer(OrderPubSub):
     """Consume and receive new order messages from a RabbitMQ queue."""
 
+    # The ack coalescer of the consumed channel, set by the consume method; without
+    # it, every message is acknowledged on its own.
+    acks: AckCoalescer | None = None
+
     async def consume_new_order(
-        self, on_message_func: OrderMessageHandler = print
+        self,
+        on_message_func: OrderMessageHandler = print,
+        tuning: TuningWatcher | None = None,
     ) -> None:
         """
         Consume new order messages from the RabbitMQ queue.
@@ -28,11 +42,26 @@ class OrderConsumer(OrderPubSub):
         This method establishes a connection with RabbitMQ, declares the necessary
         exchange and queue, binds the queue to the exchange with the appropriate
         routing key, and starts consuming messages. The consumer will process
-        incoming messages by calling the `on_new_order_message` method.
+        incoming messages by calling the `on_new_order_message` method, in a worker
+        pool.
+
+        Parameters
+        ----------
+        on_message_func : OrderMessageHandler, optional
+            A callback function to handle the `IncomingOrder` objects.
+        tuning : TuningWatcher, optional
+            The watcher of the `[tuning]` settings. The prefetch count, the pool
+            size and the ack batching follow the `orders` consumer tuning live
+            (default is None, use the default tuning).
         """
+        consumer_tuning = (
+            tuning.settings.consumer("orders") if tuning else ConsumerTuning()
+        )
         async with await self.rabbitmq_manager.get_connection() as connection:
             channel = await self.rabbitmq_manager.get_channel(connection=connection)
-            await self.rabbitmq_manager.set_qos(channel=channel, prefetch_count=100)
+            await self.rabbitmq_manager.set_qos(
+                channel=channel, prefetch_count=consumer_tuning.prefetch_count
+            )
 
             order_exchange = await self.declare_order_exchange(channel=channel)
 
@@ -50,9 +79,37 @@ class OrderConsumer(OrderPubSub):
                     message=message, on_message_func=on_message_func
                 )
 
-            await order_queue.consume(wrapped_on_message)
+            handler = track_stage("orders", wrapped_on_message)
+            handler = instrument_handler("orders", trace_consumer("orders", handler))
+            pool = WorkerPool(
+                handler=profiler.attribute("orders", handler),
+                size=consumer_tuning.concurrency,
+                name="orders",
+                budget=accountant.get("prefetch"),
+                sizeof=get_body_size,
+            )
+            pool.start()
+            acks = self.acks = AckCoalescer(
+                max_batch=consumer_tuning.ack_batch_size,
+                interval=consumer_tuning.ack_interval,
+            )
+            instrument_acks("orders", acks)
+            unbind = (
+                bind_consumer(
+                    tuning, name="orders", channel=channel, pool=pool, acks=acks
+                )
+                if tuning
+                else None
+            )
+            try:
+                await order_queue.consume(acks.tracking(pool.submit))
 
-            await asyncio.Future()
+                await asyncio.Future()
+            finally:
+                if unbind is not None:
+                    unbind()
+                await pool.stop()
+                await acks.close()
 
     async def on_new_order_message(
         self,
@@ -71,10 +128,15 @@ class OrderConsumer(OrderPubSub):
         message : AbstractIncomingMessage
             The message received from the RabbitMQ queue to be processed.
         """
-        async with message.process():
-            order = IncomingOrder(**json.loads(message.body.decode()))
-
-            if asyncio.iscoroutinefunction(on_message_func):
-                await on_message_func(order)
-            else:
-                on_message_func(order)
+        async with (
+            process_message(message, acks=self.acks),
+            accountant.reserve("decode", len(message.body)),
+        ):
+            with tracer.start_span("decode"):
+                order = IncomingOrder(**json.loads(message.body.decode()))
+
+            with tracer.start_span("handler"):
+                if asyncio.iscoroutinefunction(on_message_func):
+                    await on_message_func(order)
+                else:
+                    on_message_func(order)
@@ -0,0 +1,417 @@
+"""Module tracks the lifecycle of the orders, from their creation to notification."""
+
+import datetime
+import sqlite3
+import time
+from array import array
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+from typing import Any
+
+from app.order_service.schemas import IncomingOrder
+from app.payment_service.schemas import IncomingPayment
+
+# The code of an order is its stage, with this bit set once it was notified.
+_NOTIFIED = 0x80
+_UNKNOWN_CUSTOMER = -1
+
+
+class OrderStage(IntEnum):
+    """The stage of an order in its lifecycle: created, then paid or failed."""
+
+    CREATED = 1
+    PAID = 2
+    FAILED = 3
+
+
+@dataclass(frozen=True, slots=True)
+class OrderState:
+    """The lifecycle of an order, as of its last event."""
+
+    order_id: str
+    stage: OrderStage
+    notified: bool
+    customer_id: int | None
+    created_at: float
+    updated_at: float
+
+
+@dataclass(frozen=True, slots=True)
+class LifecycleStats:
+    """Point-in-time metrics of an `OrderLifecycleStore`."""
+
+    orders: int
+    hot: int
+    spilled: int
+    promoted: int
+    forgotten: int
+
+
+class OrderLifecycleStore:
+    """
+    Track the stage of every order from the order, payment and notification events.
+
+    The orders are held in columns, one `array` per field, with the stage and the
+    notification interned in a one-byte code: an order takes 25 bytes of columns
+    plus its key and index entry, instead of an object per order. A lookup goes
+    through a dict of row numbers, kept in least recently used order: past
+    `max_orders`, the coldest orders are spilled to a SQLite file and their rows
+    reused, and looking one up again brings it back. Without a spill file, the
+    coldest orders are forgotten.
+
+    The store is in memory: the spill file is recreated on open, and the events
+    consumed again after a restart rebuild the lifecycles. A payment or a
+    notification of an order not seen yet, e.g. consumed before its creation,
+    records the order with what it knows.
+
+    Example
+    -------
+    ```python
+    store = OrderLifecycleStore(max_orders=1_000_000, spill_path="data/orders.db")
+    await order_consumer.consume_new_order(on_message_func=store.on_order)
+    ...
+    state = store.get(order_id)
+    ```
+    """
+
+    def __init__(
+        self,
+        max_orders: int | None = None,
+        spill_path: str | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Instantiate an `OrderLifecycleStore` object, with no order.
+
+        Parameters
+        ----------
+        max_orders : int, optional
+            The maximum number of orders held in memory (default is None, no
+            maximum).
+        spill_path : str, optional
+            The SQLite file the coldest orders are spilled to, past `max_orders`
+            (default is None, forget them).
+        clock : Callable[[], float], optional
+            A clock returning the epoch time in seconds (default is `time.time`).
+        """
+        if max_orders is not None and max_orders < 1:
+            raise ValueError("The maximum number of orders should be at least 1")
+        self.max_orders = max_orders
+        self._clock = clock
+        self._rows: OrderedDict[str, int] = OrderedDict()
+        self._free: list[int] = []
+        self._codes = array("B")
+        self._customers = array("q")
+        self._created = array("d")
+        self._updated = array("d")
+        self._counts: Counter[int] = Counter()
+        self._spilled = 0
+        self._promoted = 0
+        self._forgotten = 0
+        self._spill: sqlite3.Connection | None = None
+        if spill_path is not None:
+            Path(spill_path).parent.mkdir(parents=True, exist_ok=True)
+            self._spill = sqlite3.connect(spill_path, isolation_level=None)
+            self._spill.executescript(
+                """
+                PRAGMA journal_mode = OFF;
+                PRAGMA synchronous = OFF;
+                DROP TABLE IF EXISTS orders;
+                CREATE TABLE orders (
+                    order_id TEXT PRIMARY KEY,
+                    code INTEGER NOT NULL,
+                    customer_id INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                ) WITHOUT ROWID;
+                """
+            )
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "OrderLifecycleStore":
+        """
+        Build a store from the `[orders.lifecycle]` settings table.
+
+        Parameters
+        ----------
+        config : dict[str, Any]
+            The table: `max_orders`, 0 for no maximum, and `spill_path`, empty to
+            forget the coldest orders.
+        """
+        return cls(
+            max_orders=config["max_orders"] or None,
+            spill_path=config["spill_path"] or None,
+        )
+
+    def __len__(self) -> int:
+        """Return the number of orders, in memory or spilled."""
+        return self._counts.total()
+
+    def __contains__(self, order_id: object) -> bool:
+        """Return whether an order is known, without changing its recency."""
+        if order_id in self._rows:
+            return True
+        return self._spill is not None and (
+            self._spill.execute(
+                "SELECT 1 FROM orders WHERE order_id = ?", (order_id,)
+            ).fetchone()
+            is not None
+        )
+
+    def stats(self) -> LifecycleStats:
+        """Return the current metrics of the store."""
+        return LifecycleStats(
+            orders=len(self),
+            hot=len(self._rows),
+            spilled=self._spilled,
+            promoted=self._promoted,
+            forgotten=self._forgotten,
+        )
+
+    def on_order(self, order: IncomingOrder) -> None:
+        """Record the creation of an order, an `OrderMessageHandler`."""
+        try:
+            created = datetime.datetime.fromisoformat(order.created_at)
+        except ValueError:
+            created_at = self._clock()
+        else:
+            if created.tzinfo is None:
+                created = created.replace(tzinfo=datetime.UTC)
+            created_at = created.timestamp()
+        row = self._get_row(order.order_id)
+        if row is None:
+            self._insert(
+                order.order_id, OrderStage.CREATED, order.customer_id, created_at
+            )
+            return
+        # The payment was consumed first: complete the order, keeping its stage.
+        self._created[row] = created_at
+        self._customers[row] = order.customer_id
+
+    def on_payment(self, payment: IncomingPayment) -> None:
+        """Record the payment of an order, a `PaymentMessageHandler`."""
+        stage = OrderStage.PAID if payment.status == "success" else OrderStage.FAILED
+        row = self._get_row(payment.order_id)
+        if row is None:
+            self._insert(payment.order_id, stage, payment.customer_id)
+            return
+        code = self._codes[row]
+        self._set_code(row, stage | (code & _NOTIFIED))
+        if payment.customer_id is not None:
+            self._customers[row] = payment.customer_id
+
+    def on_notified(self, order_id: str) -> None:
+        """Record the notification of the customer of an order."""
+        row = self._get_row(order_id)
+        if row is None:
+            row = self._insert(order_id, OrderStage.CREATED, None)
+        self._set_code(row, self._codes[row] | _NOTIFIED)
+
+    def get(self, order_id: str) -> OrderState | None:
+        """Return the lifecycle of an order, or `None` if unknown."""
+        row = self._get_row(order_id)
+        if row is None:
+            return None
+        return self._get_state(order_id, row)
+
+    def count(self, stage: OrderStage, notified: bool | None = None) -> int:
+        """
+        Return the number of orders at a stage, in O(1).
+
+        Parameters
+        ----------
+        stage : OrderStage
+            The stage of the orders.
+        notified : bool, optional
+            Whether to count only the notified orders, or only the others (default
+            is None, count both).
+        """
+        if notified is None:
+            return self._counts[stage] + self._counts[stage | _NOTIFIED]
+        return self._counts[stage | _NOTIFIED if notified else stage]
+
+    def query(
+        self,
+        stage: OrderStage | None = None,
+        notified: bool | None = None,
+        customer_id: int | None = None,
+        updated_before: float | None = None,
+    ) -> Iterator[OrderState]:
+        """
+        Yield the orders matching every given criterion, e.g. the stuck ones.
+
+        The orders in memory are scanned first, then the spilled ones; the order
+        recency is left unchanged.
+
+        Parameters
+        ----------
+        stage : OrderStage, optional
+            The stage of the orders.
+        notified : bool, optional
+            Whether the orders were notified.
+        customer_id : int, optional
+            The customer of the orders.
+        updated_before : float, optional
+            An epoch time the last event of the orders is older than.
+        """
+        codes: set[int] = {
+            code
+            for code in self._counts
+            if (stage is None or code & ~_NOTIFIED == stage)
+            and (notified is None or bool(code & _NOTIFIED) == notified)
+        }
+        for order_id, row in list(self._rows.items()):
+            if (
+                self._codes[row] in codes
+                and (customer_id is None or self._customers[row] == customer_id)
+                and (updated_before is None or self._updated[row] < updated_before)
+            ):
+                yield self._get_state(order_id, row)
+
+        if self._spill is None or not codes:
+            return
+        clauses = [f"code IN ({', '.join(str(code) for code in sorted(codes))})"]
+        parameters: list[float] = []
+        if customer_id is not None:
+            clauses.append("customer_id = ?")
+            parameters.append(customer_id)
+        if updated_before is not None:
+            clauses.append("updated_at < ?")
+            parameters.append(updated_before)
+        rows = self._spill.execute(
+            "SELECT order_id, code, customer_id, created_at, updated_at FROM orders "
+            f"WHERE {' AND '.join(clauses)}",
+            parameters,
+        )
+        for order_id, code, customer, created_at, updated_at in rows.fetchall():
+            yield self._make_state(order_id, code, customer, created_at, updated_at)
+
+    def close(self) -> None:
+        """Close the spill file."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def _get_row(self, order_id: str) -> int | None:
+        """Return the row of an order, marked recent and brought back if spilled."""
+        row = self._rows.get(order_id)
+        if row is not None:
+            self._rows.move_to_end(order_id)
+            return row
+        if self._spill is None:
+            return None
+        record = self._spill.execute(
+            "DELETE FROM orders WHERE order_id = ? "
+            "RETURNING code, customer_id, created_at, updated_at",
+            (order_id,),
+        ).fetchone()
+        if record is None:
+            return None
+        code, customer_id, created_at, updated_at = record
+        self._promoted += 1
+        self._counts[code] -= 1
+        return self._add_row(order_id, code, customer_id, created_at, updated_at)
+
+    def _insert(
+        self,
+        order_id: str,
+        stage: OrderStage,
+        customer_id: int | None,
+        created_at: float | None = None,
+    ) -> int:
+        """Add the row of a new order."""
+        now = self._clock()
+        return self._add_row(
+            order_id,
+            stage,
+            _UNKNOWN_CUSTOMER if customer_id is None else customer_id,
+            now if created_at is None else created_at,
+            now,
+        )
+
+    def _add_row(
+        self,
+        order_id: str,
+        code: int,
+        customer_id: int,
+        created_at: float,
+        updated_at: float,
+    ) -> int:
+        """Fill a free row, or a new one, evicting the coldest orders past the max."""
+        if self._free:
+            row = self._free.pop()
+            self._codes[row] = code
+            self._customers[row] = customer_id
+            self._created[row] = created_at
+            self._updated[row] = updated_at
+        else:
+            row = len(self._codes)
+            self._codes.append(code)
+            self._customers.append(customer_id)
+            self._created.append(created_at)
+            self._updated.append(updated_at)
+        self._rows[order_id] = row
+        self._counts[code] += 1
+        if self.max_orders is not None:
+            while len(self._rows) > self.max_orders:
+                self._evict()
+        return row
+
+    def _evict(self) -> None:
+        """Spill, or forget, the least recently used order and free its row."""
+        order_id, row = self._rows.popitem(last=False)
+        self._free.append(row)
+        code = self._codes[row]
+        if self._spill is None:
+            self._counts[code] -= 1
+            self._forgotten += 1
+            return
+        self._spill.execute(
+            "INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?, ?)",
+            (
+                order_id,
+                code,
+                self._customers[row],
+                self._created[row],
+                self._updated[row],
+            ),
+        )
+        self._spilled += 1
+
+    def _set_code(self, row: int, code: int) -> None:
+        """Change the code of an order, keeping the counts by code."""
+        self._counts[self._codes[row]] -= 1
+        self._counts[code] += 1
+        self._codes[row] = code
+        self._updated[row] = self._clock()
+
+    def _get_state(self, order_id: str, row: int) -> OrderState:
+        """Return the lifecycle of the order of a row."""
+        return self._make_state(
+            order_id,
+            self._codes[row],
+            self._customers[row],
+            self._created[row],
+            self._updated[row],
+        )
+
+    @staticmethod
+    def _make_state(
+        order_id: str,
+        code: int,
+        customer_id: int,
+        created_at: float,
+        updated_at: float,
+    ) -> OrderState:
+        """Decode the fields of an order."""
+        return OrderState(
+            order_id=order_id,
+            stage=OrderStage(code & ~_NOTIFIED),
+            notified=bool(code & _NOTIFIED),
+            customer_id=None if customer_id == _UNKNOWN_CUSTOMER else customer_id,
+            created_at=created_at,
+            updated_at=updated_at,
+        )
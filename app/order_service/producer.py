@@ -5,6 +5,7 @@ from aio_pika import DeliveryMode, Message
 from app.consts import ORDERS_EXCHANGE_NAME
 from app.order_service.pubsub import OrderPubSub
 from config.base import logger
+from config.correlation import Correlation
 
 from .schemas import OutgoingOrder
 
@@ -21,21 +22,20 @@ class OrderProducer(OrderPubSub):
         order : Order
             The order object to be serialized and published.
         """
-        async with await self.rabbitmq_manager.get_connection() as connection:
-            logger.info("Opening connection and channel to publish order...")
-            channel = await self.rabbitmq_manager.get_channel(connection=connection)
-
-            order_exchange = await self.declare_order_exchange(channel=channel)
-
-            message = Message(
-                body=order.to_message(),
-                delivery_mode=DeliveryMode.PERSISTENT,
-            )
-            publish_result = await order_exchange.publish(
-                message=message, routing_key=self._get_new_order_routing_key()
-            )
-            logger.info(
-                "Published order to the %s exchange with the result: %s",
-                ORDERS_EXCHANGE_NAME,
-                publish_result,
-            )
+        correlation = Correlation.start(correlation_id=str(order.order_id))
+        message = Message(
+            body=order.to_message(),
+            delivery_mode=DeliveryMode.PERSISTENT,
+            **correlation.get_message_properties(),
+        )
+        publish_result = await self.rabbitmq_manager.publish_to(
+            exchange_name=ORDERS_EXCHANGE_NAME,
+            declare_exchange=self.declare_order_exchange,
+            message=message,
+            routing_key=self._get_new_order_routing_key(),
+        )
+        logger.info(
+            "Published order to the %s exchange with the result: %s",
+            ORDERS_EXCHANGE_NAME,
+            publish_result,
+        )
@@ -0,0 +1,117 @@
+"""Module handles the synchronous placement of orders, over RPC."""
+
+import json
+from types import TracebackType
+
+from aio_pika.abc import AbstractConnection
+
+from app.consts import PAYMENTS_RPC_QUEUE_NAME
+from app.order_service.pubsub import OrderPubSub
+from app.payment_service.schemas import IncomingPayment
+from config.base import AsyncRabbitmqManager
+from config.rpc import RpcClient, RpcError
+
+from .schemas import OutgoingOrder
+
+
+class CheckoutClient(OrderPubSub):
+    """
+    Place orders and wait for the result of their payment.
+
+    Unlike `OrderProducer`, which publishes and forgets, the client keeps a single
+    connection and channel open, over which any number of concurrent requests are
+    multiplexed by `RpcClient`.
+
+    Example
+    -------
+    ```python
+    async with CheckoutClient(rabbitmq_manager) as checkout:
+        payment = await checkout.place_order(order)
+    ```
+    """
+
+    def __init__(
+        self, rabbitmq_manager: AsyncRabbitmqManager, timeout: float = 5.0
+    ) -> None:
+        """
+        Instantiate a `CheckoutClient` object, connected by `start`.
+
+        Parameters
+        ----------
+        rabbitmq_manager : AsyncRabbitmqManager
+            The RabbitMQ manager.
+        timeout : float, optional
+            The default seconds to wait for the payment of an order (default is 5.0).
+        """
+        super().__init__(rabbitmq_manager=rabbitmq_manager)
+        self.timeout = timeout
+        self._connection: AbstractConnection | None = None
+        self._rpc: RpcClient | None = None
+
+    async def start(self) -> None:
+        """Open the connection and channel, and start consuming the replies."""
+        if self._rpc is None:
+            self._connection = await self.rabbitmq_manager.get_connection()
+            channel = await self.rabbitmq_manager.get_channel(
+                connection=self._connection
+            )
+            self._rpc = RpcClient(channel, timeout=self.timeout)
+            await self._rpc.start()
+
+    async def close(self) -> None:
+        """Fail the outstanding requests and close the connection."""
+        if self._rpc is not None:
+            await self._rpc.close()
+            self._rpc = None
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def __aenter__(self) -> "CheckoutClient":
+        """Start the client."""
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the client."""
+        await self.close()
+
+    async def place_order(
+        self, order: OutgoingOrder, timeout: float | None = None
+    ) -> IncomingPayment:
+        """
+        Send an order to the payment service and return its payment.
+
+        Parameters
+        ----------
+        order : OutgoingOrder
+            The order to pay.
+        timeout : float, optional
+            Seconds to wait for the payment (default is None, the client's timeout).
+
+        Returns
+        -------
+        IncomingPayment
+            The payment of the order, successful or failed.
+
+        Raises
+        ------
+        RpcTimeoutError
+            If the payment service did not answer within the timeout.
+        RpcError
+            If the payment service failed to handle the order, or the client is not
+            started.
+        """
+        if self._rpc is None:
+            raise RpcError("Checkout client not started")
+        reply = await self._rpc.call(
+            routing_key=PAYMENTS_RPC_QUEUE_NAME,
+            body=order.to_message(),
+            timeout=timeout,
+        )
+        return IncomingPayment(**json.loads(reply.decode()))
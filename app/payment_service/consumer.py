@@ -9,6 +9,14 @@ from aio_pika.abc import AbstractIncomingMessage
 
 from app.payment_service.pubsub import PaymentPubSub
 from app.payment_service.schemas import IncomingPayment
+from config.acks import AckCoalescer
+from config.correlation import track_stage
+from config.memory import accountant, get_body_size
+from config.metrics import instrument_acks, instrument_handler
+from config.profiling import profiler
+from config.tracing import process_message, trace_consumer, tracer
+from config.tuning import ConsumerTuning, TuningWatcher, bind_consumer
+from toolkit.concurrency import WorkerPool
 
 PaymentMessageHandler = (
     Callable[[IncomingPayment], None] | Callable[[IncomingPayment], Awaitable[None]]
@@ -18,8 +26,14 @@ PaymentMessageHandler = (
 class PaymentConsumer(PaymentPubSub):
     """Consume and receive payment messages from a RabbitMQ queue."""
 
+    # The ack coalescer of the consumed channel, set by the consume method; without
+    # it, every message is acknowledged on its own.
+    acks: AckCoalescer | None = None
+
     async def consume_payments(
-        self, on_message_func: PaymentMessageHandler = print
+        self,
+        on_message_func: PaymentMessageHandler = print,
+        tuning: TuningWatcher | None = None,
     ) -> None:
         """
         Consume payment messages from RabbitMQ queues.
@@ -27,10 +41,26 @@ class PaymentConsumer(PaymentPubSub):
         This method establishes a connection with RabbitMQ, declares the necessary
         exchange and queue, binds the queue to the exchange with the appropriate
         routing key, and starts consuming messages. The consumer will process
-        incoming messages by calling the `on_payment_message` method.
+        incoming messages by calling the `on_payment_message` method, in a worker
+        pool shared by both queues.
+
+        Parameters
+        ----------
+        on_message_func : PaymentMessageHandler, optional
+            A callback function to handle the `IncomingPayment` objects.
+        tuning : TuningWatcher, optional
+            The watcher of the `[tuning]` settings. The prefetch count, the pool
+            size and the ack batching follow the `payments` consumer tuning live
+            (default is None, use the default tuning).
         """
+        consumer_tuning = (
+            tuning.settings.consumer("payments") if tuning else ConsumerTuning()
+        )
         async with await self.rabbitmq_manager.get_connection() as connection:
             channel = await self.rabbitmq_manager.get_channel(connection=connection)
+            await self.rabbitmq_manager.set_qos(
+                channel=channel, prefetch_count=consumer_tuning.prefetch_count
+            )
 
             payment_exchange = await self.declare_payments_exchange(channel=channel)
 
@@ -56,11 +86,41 @@ class PaymentConsumer(PaymentPubSub):
                     on_message_func=on_message_func, message=message
                 )
 
-            await asyncio.gather(
-                success_payment_queue.consume(wrapped_on_message),
-                failed_payment_queue.consume(wrapped_on_message),
+            handler = track_stage("payments", wrapped_on_message)
+            handler = instrument_handler(
+                "payments", trace_consumer("payments", handler)
+            )
+            pool = WorkerPool(
+                handler=profiler.attribute("payments", handler),
+                size=consumer_tuning.concurrency,
+                name="payments",
+                budget=accountant.get("prefetch"),
+                sizeof=get_body_size,
             )
-            await asyncio.Future()
+            pool.start()
+            acks = self.acks = AckCoalescer(
+                max_batch=consumer_tuning.ack_batch_size,
+                interval=consumer_tuning.ack_interval,
+            )
+            instrument_acks("payments", acks)
+            unbind = (
+                bind_consumer(
+                    tuning, name="payments", channel=channel, pool=pool, acks=acks
+                )
+                if tuning
+                else None
+            )
+            try:
+                await asyncio.gather(
+                    success_payment_queue.consume(acks.tracking(pool.submit)),
+                    failed_payment_queue.consume(acks.tracking(pool.submit)),
+                )
+                await asyncio.Future()
+            finally:
+                if unbind is not None:
+                    unbind()
+                await pool.stop()
+                await acks.close()
 
     async def on_payment_message(
         self, on_message_func: PaymentMessageHandler, message: AbstractIncomingMessage
@@ -77,10 +137,15 @@ class PaymentConsumer(PaymentPubSub):
         message : AbstractIncomingMessage
             The message received from the RabbitMQ queue to be processed.
         """
-        async with message.process():
-            payment = IncomingPayment(**json.loads(message.body.decode()))
-
-            if asyncio.iscoroutinefunction(on_message_func):
-                await on_message_func(payment)
-            else:
-                on_message_func(payment)
+        async with (
+            process_message(message, acks=self.acks),
+            accountant.reserve("decode", len(message.body)),
+        ):
+            with tracer.start_span("decode"):
+                payment = IncomingPayment(**json.loads(message.body.decode()))
+
+            with tracer.start_span("handler"):
+                if asyncio.iscoroutinefunction(on_message_func):
+                    await on_message_func(payment)
+                else:
+                    on_message_func(payment)
@@ -1,46 +1,189 @@
 """Module handles the publishing of new payment messages to a RabbitMQ exchange."""
 
+import asyncio
+import datetime
+
 from aio_pika import DeliveryMode, Message
 
+from app.consts import PAYMENTS_EXCHANGE_NAME
 from app.order_service.schemas import IncomingOrder
+from app.payment_service.ledger import PaymentLedger
 from app.payment_service.pubsub import PaymentPubSub
 from app.payment_service.schemas import OutgoingPayment
 from app.payment_service.utils import is_order_payment_success
+from app.payment_service.verification import PaymentVerificationError, PaymentVerifier
+from config.base import AsyncRabbitmqManager, logger
+from config.correlation import get_correlation
 
 
 class PaymentProducer(PaymentPubSub):
-    """Produce and publish payment messages to a RabbitMQ exchange."""
+    """
+    Produce and publish payment messages to a RabbitMQ exchange.
+
+    With an `sla`, the orders are shed rather than verified late: an order older
+    than the SLA, from its `created_at`, is routed to the failed payments right
+    away, and the verification of the others is bounded by the time left to their
+    SLA. A verification failing, e.g. with the gateway circuit open, is retried
+    with an exponential backoff from `retry_backoff` seconds while the SLA has
+    time left; an order whose verification does not succeed within its SLA is then
+    routed to the failed payments too, instead of holding its prefetched message
+    while the gateway recovers.
+
+    With a ledger, every payment is recorded durably before it is published, so
+    the payment outcomes outlive the messages of the exchange.
+    """
+
+    def __init__(
+        self,
+        rabbitmq_manager: AsyncRabbitmqManager,
+        verifier: PaymentVerifier | None = None,
+        sla: float | None = None,
+        ledger: PaymentLedger | None = None,
+        retry_backoff: float = 0.1,
+    ) -> None:
+        """
+        Instantiate a `PaymentProducer` object.
+
+        Parameters
+        ----------
+        rabbitmq_manager : AsyncRabbitmqManager
+            The RabbitMQ manager.
+        verifier : PaymentVerifier, optional
+            The verifier of the payments, batching the verifications of the orders
+            produced concurrently (default is None, use `is_order_payment_success`).
+        sla : float, optional
+            Seconds from the creation of an order to its payment, past which the
+            order is shed (default is None, never shed).
+        ledger : PaymentLedger, optional
+            The ledger recording the payments before they are published (default
+            is None, do not record them).
+        retry_backoff : float, optional
+            Seconds before retrying a failed verification within the SLA, doubled
+            on every retry (default is 0.1).
+        """
+        super().__init__(rabbitmq_manager=rabbitmq_manager)
+        self.verifier = verifier
+        self.sla = sla
+        self.ledger = ledger
+        self.retry_backoff = retry_backoff
+        self.shed = 0
 
     async def produce_payments(self, order: IncomingOrder) -> None:
         """
         Produce payment messages to a RabbitMQ exchange.
 
+        The payment is verified, and recorded in the ledger, before it is published
+        on the connection of the manager, spooled if the broker is unreachable.
+
         Parameters
         ----------
         order : IncomingOrder
             The incoming order object containing order details to determine payment
             status.
+
+        Raises
+        ------
+        PaymentVerificationError
+            If the payment could not be verified with no SLA, e.g. the gateway
+            timed out.
         """
-        async with await self.rabbitmq_manager.get_connection() as connection:
-            channel = await self.rabbitmq_manager.get_channel(connection=connection)
+        is_payment_success = await self._verify(order=order)
+        outgoing_payment = self._get_outgoing_payment(
+            order=order, is_payment_success=is_payment_success
+        )
+        if self.ledger is not None:
+            await self.ledger.record(outgoing_payment)
 
-            payments_exchange = await self.declare_payments_exchange(channel=channel)
+        correlation = get_correlation(correlation_id=order.order_id)
+        message = Message(
+            body=outgoing_payment.to_message(),
+            delivery_mode=DeliveryMode.PERSISTENT,
+            **correlation.get_message_properties(),
+        )
 
-            is_payment_success = is_order_payment_success(order=order)
-            payment_routing_key = self._get_payment_routing_key(
+        await self.rabbitmq_manager.publish_to(
+            exchange_name=PAYMENTS_EXCHANGE_NAME,
+            declare_exchange=self.declare_payments_exchange,
+            message=message,
+            routing_key=self._get_payment_routing_key(
                 is_payment_success=is_payment_success
-            )
-            outgoing_payment = self._get_outgoing_payment(
-                order=order, is_payment_success=is_payment_success
-            )
-            message = Message(
-                body=outgoing_payment.to_message(),
-                delivery_mode=DeliveryMode.PERSISTENT,
-            )
-
-            await payments_exchange.publish(
-                message=message, routing_key=payment_routing_key
-            )
+            ),
+        )
+
+    async def close(self) -> None:
+        """Finish the verifications in flight, close the verifier and the ledger."""
+        if self.verifier is not None:
+            await self.verifier.close()
+        if self.ledger is not None:
+            await self.ledger.close()
+
+    async def _verify(self, order: IncomingOrder) -> bool:
+        """
+        Verify the payment of an order, shedding it past its SLA.
+
+        Parameters
+        ----------
+        order : IncomingOrder
+            The incoming order object containing order details.
+
+        Returns
+        -------
+        bool
+            Whether the payment is successful; False for a shed order.
+        """
+        if self.sla is None:
+            if self.verifier is None:
+                return is_order_payment_success(order=order)
+            return await self.verifier.verify(order)
+
+        remaining = self.sla - self._get_order_age(order=order)
+        if remaining <= 0:
+            return self._shed(order=order, reason="SLA exceeded before verification")
+        if self.verifier is None:
+            return is_order_payment_success(order=order)
+        try:
+            async with asyncio.timeout(remaining):
+                return await self._verify_with_retries(
+                    verifier=self.verifier, order=order
+                )
+        except TimeoutError:
+            return self._shed(order=order, reason="SLA exceeded during verification")
+
+    async def _verify_with_retries(
+        self, verifier: PaymentVerifier, order: IncomingOrder
+    ) -> bool:
+        """Verify the payment of an order, retrying the failures with a backoff."""
+        attempt = 0
+        while True:
+            try:
+                return await verifier.verify(order)
+            except PaymentVerificationError as err:
+                delay = self.retry_backoff * 2**attempt
+                logger.warning(
+                    "Verifying the payment of order %s failed, retrying in %.2fs: %s",
+                    order.order_id,
+                    delay,
+                    err,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def _shed(self, order: IncomingOrder, reason: str) -> bool:
+        """Count and log a shed order, returning its payment status: failed."""
+        self.shed += 1
+        logger.warning("Shed the payment of order %s: %s", order.order_id, reason)
+        return False
+
+    @staticmethod
+    def _get_order_age(order: IncomingOrder) -> float:
+        """Return the seconds since the creation of an order, 0 if unknown."""
+        try:
+            created_at = datetime.datetime.fromisoformat(order.created_at)
+        except ValueError:
+            return 0.0
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=datetime.UTC)
+        return (datetime.datetime.now(tz=datetime.UTC) - created_at).total_seconds()
 
     @staticmethod
     def _get_outgoing_payment(
@@ -63,6 +206,7 @@ class PaymentProducer(PaymentPubSub):
         """
         return OutgoingPayment(  # type: ignore
             order_id=order.order_id,
+            customer_id=order.customer_id,
             status=("success" if is_payment_success else "failed"),
         )
 
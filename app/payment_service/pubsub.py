@@ -6,6 +6,7 @@ from aio_pika.abc import AbstractChannel, AbstractExchange, AbstractQueue
 from app.consts import (
     FAILED_PAYMENTS_QUEUE_NAME,
     PAYMENTS_EXCHANGE_NAME,
+    PAYMENTS_RPC_QUEUE_NAME,
     SUCCESS_PAYMENTS_QUEUE_NAME,
 )
 from config.base import AsyncRabbitmqManager
@@ -85,6 +86,32 @@ class PaymentPubSub:
         )
         return failed_payments_queue
 
+    async def declare_payments_rpc_queue(
+        self, channel: AbstractChannel
+    ) -> AbstractQueue:
+        """
+        Declare the 'payments_rpc' queue on the specified channel.
+
+        The queue is not durable: its requests are worthless once their clients have
+        timed out, e.g. after a broker restart.
+
+        Parameters
+        ----------
+        channel : AbstractChannel
+            The channel on which to declare the queue.
+
+        Returns
+        -------
+        AbstractQueue
+            The declared queue object.
+        """
+        payments_rpc_queue = await self.rabbitmq_manager.declare_queue(
+            channel=channel,
+            name=PAYMENTS_RPC_QUEUE_NAME,
+            durable=False,
+        )
+        return payments_rpc_queue
+
     @staticmethod
     def _get_success_payment_routing_key() -> str:
         """
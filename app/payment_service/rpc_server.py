@@ -0,0 +1,118 @@
+"""Module handles the payment requests of the checkout, answered over RPC."""
+
+import asyncio
+import json
+
+from app.order_service.schemas import IncomingOrder
+from app.payment_service.ledger import PaymentLedger
+from app.payment_service.pubsub import PaymentPubSub
+from app.payment_service.schemas import OutgoingPayment
+from app.payment_service.utils import is_order_payment_success
+from app.payment_service.verification import PaymentVerifier
+from config.base import AsyncRabbitmqManager
+from config.rpc import RpcServer
+from config.tuning import ConsumerTuning, TuningWatcher
+
+
+class PaymentRpcServer(PaymentPubSub):
+    """
+    Verify the payment of orders on request, replying with the payment.
+
+    With a verifier, the payments are verified by batches through the gateway, like
+    the ones of `PaymentProducer`; a verification failing replies with the error.
+    With a ledger, every payment is recorded durably before it is replied, so the
+    ledger holds the payments of the checkout as well as the asynchronous ones.
+    """
+
+    def __init__(
+        self,
+        rabbitmq_manager: AsyncRabbitmqManager,
+        verifier: PaymentVerifier | None = None,
+        ledger: PaymentLedger | None = None,
+    ) -> None:
+        """
+        Instantiate a `PaymentRpcServer` object.
+
+        Parameters
+        ----------
+        rabbitmq_manager : AsyncRabbitmqManager
+            The RabbitMQ manager.
+        verifier : PaymentVerifier, optional
+            The verifier of the payments, e.g. shared with the `PaymentProducer`
+            (default is None, use `is_order_payment_success`).
+        ledger : PaymentLedger, optional
+            The ledger recording the payments before they are replied, e.g. shared
+            with the `PaymentProducer` (default is None, do not record them).
+        """
+        super().__init__(rabbitmq_manager=rabbitmq_manager)
+        self.verifier = verifier
+        self.ledger = ledger
+
+    async def serve_payments(self, tuning: TuningWatcher | None = None) -> None:
+        """
+        Answer the payment requests of the `payments_rpc` queue.
+
+        The replies are sent through direct reply-to, straight to the channel of the
+        requesting client.
+
+        Parameters
+        ----------
+        tuning : TuningWatcher, optional
+            The watcher of the `[tuning]` settings, whose `payments_rpc` consumer
+            tuning sets the prefetch count (default is None, use the default tuning).
+        """
+        consumer_tuning = (
+            tuning.settings.consumer("payments_rpc") if tuning else ConsumerTuning()
+        )
+        async with await self.rabbitmq_manager.get_connection() as connection:
+            channel = await self.rabbitmq_manager.get_channel(connection=connection)
+            await self.rabbitmq_manager.set_qos(
+                channel=channel, prefetch_count=consumer_tuning.prefetch_count
+            )
+            payments_rpc_queue = await self.declare_payments_rpc_queue(channel=channel)
+
+            server = RpcServer(
+                channel, name="payments_rpc", handler=self.on_payment_request
+            )
+            await server.serve(payments_rpc_queue)
+            await asyncio.Future()
+
+    async def on_payment_request(self, body: bytes) -> bytes:
+        """
+        Verify the payment of an order request.
+
+        Parameters
+        ----------
+        body : bytes
+            The body of the request, an `IncomingOrder` in JSON.
+
+        Returns
+        -------
+        bytes
+            The body of the reply, the `OutgoingPayment` of the order in JSON.
+
+        Raises
+        ------
+        PaymentVerificationError
+            If the payment could not be verified, e.g. the gateway timed out.
+        """
+        order = IncomingOrder(**json.loads(body.decode()))
+        if self.verifier is None:
+            is_payment_success = is_order_payment_success(order=order)
+        else:
+            is_payment_success = await self.verifier.verify(order)
+        payment = OutgoingPayment(  # type: ignore
+            order_id=order.order_id,
+            customer_id=order.customer_id,
+            status="success" if is_payment_success else "failed",
+        )
+        if self.ledger is not None:
+            await self.ledger.record(payment)
+        return payment.to_message()
+
+    async def close(self) -> None:
+        """Finish the verifications in flight, close the verifier and the ledger."""
+        if self.verifier is not None:
+            await self.verifier.close()
+        if self.ledger is not None:
+            await self.ledger.close()
@@ -19,6 +19,10 @@ class IncomingPayment(BaseSchema):
     ]
     order_id: Annotated[str, Field(description="The unique identifier of the order")]
     status: Annotated[str, Field(description="The state of the payment (in string)")]
+    customer_id: Annotated[
+        int | None,
+        Field(description="Unique identifier of the customer, if sent by the payer"),
+    ] = None
     created_at: Annotated[
         str,
         Field(
@@ -42,3 +46,6 @@ class OutgoingPayment(BaseSchema, TimestampMixin):
     status: Annotated[
         Literal["success", "failed"], Field(description="The state of the payment")
     ]
+    customer_id: Annotated[
+        int | None, Field(description="Unique identifier of the customer")
+    ] = None
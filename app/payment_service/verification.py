@@ -0,0 +1,321 @@
+"""Module verifies the payments of the orders, by batches, through a gateway."""
+
+import asyncio
+import logging
+import random
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from contextlib import AbstractAsyncContextManager, nullcontext
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from app.order_service.schemas import IncomingOrder
+from app.payment_service.utils import is_order_payment_success
+from config.metrics import instrument_breaker
+from toolkit.resilience import BreakerState, CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+LatencyKind = Literal["constant", "uniform", "exponential", "lognormal"]
+
+
+class PaymentVerificationError(Exception):
+    """Raise when the payment of an order could not be verified, e.g. timed out."""
+
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class VerifierStats:
+    """Point-in-time metrics of a `PaymentVerifier`."""
+
+    queued: int
+    inflight: int
+    batches: int
+    verified: int
+    failed: int
+
+
+@dataclass(frozen=True, slots=True)
+class LatencyDistribution:
+    """
+    The distribution of the latency of a simulated call, in seconds.
+
+    `constant` takes `mean` seconds, `uniform` between `low` and `high`,
+    `exponential` `mean` on average, and `lognormal` `mean` on median with a
+    long tail growing with `sigma`.
+    """
+
+    kind: LatencyKind = "constant"
+    mean: float = 0.0
+    low: float = 0.0
+    high: float = 0.0
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw a latency, in seconds."""
+        if self.kind == "uniform":
+            return rng.uniform(self.low, self.high)
+        if self.kind == "exponential":
+            return rng.expovariate(1 / self.mean) if self.mean > 0 else 0.0
+        if self.kind == "lognormal":
+            return self.mean * rng.lognormvariate(0.0, self.sigma)
+        return self.mean
+
+
+class VerificationBackend(ABC):
+    """Base class of the backends verifying payments, e.g. a payment gateway."""
+
+    @abstractmethod
+    async def verify_batch(self, orders: Sequence[IncomingOrder]) -> Sequence[bool]:
+        """
+        Verify the payments of some orders, in one call.
+
+        Returns
+        -------
+        Sequence[bool]
+            Whether the payment of every order, in order, is successful.
+        """
+
+    async def close(self) -> None:
+        """Release the resources of the backend."""
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "VerificationBackend":
+        """
+        Build the backend of the `[payments.verification]` settings table.
+
+        Parameters
+        ----------
+        config : dict[str, Any]
+            The verification table: `backend`, only "simulated" for now, and the
+            `latency` table of the simulated gateway.
+        """
+        if config["backend"] != "simulated":
+            raise ValueError(f"Unknown verification backend: `{config['backend']}`")
+        return SimulatedGateway(latency=LatencyDistribution(**config["latency"]))
+
+
+class SimulatedGateway(VerificationBackend):
+    """
+    A stand-in for a payment gateway, answering after a simulated latency.
+
+    A payment is successful if its order was just created, as with
+    `is_order_payment_success`; a batch takes one latency draw, as one call.
+    """
+
+    def __init__(
+        self, latency: LatencyDistribution | None = None, seed: int | None = None
+    ) -> None:
+        """
+        Instantiate a `SimulatedGateway` object.
+
+        Parameters
+        ----------
+        latency : LatencyDistribution, optional
+            The latency of a call (default is None, answer right away).
+        seed : int, optional
+            The seed of the latency draws (default is None, random).
+        """
+        self.latency = latency or LatencyDistribution()
+        self.calls = 0
+        self._rng = random.Random(seed)
+
+    async def verify_batch(self, orders: Sequence[IncomingOrder]) -> Sequence[bool]:
+        """Verify the payments after a latency draw."""
+        self.calls += 1
+        await asyncio.sleep(self.latency.sample(self._rng))
+        return [is_order_payment_success(order=order) for order in orders]
+
+
+class PaymentVerifier:
+    """
+    Verify the payments of orders concurrently, by batches, through a backend.
+
+    A verification joins the current batch, sent once it holds `max_batch_size`
+    orders or `max_wait` seconds after its first order: the handlers awaiting
+    their verification keep running concurrently, so a service can have hundreds
+    of verifications in flight with a few backend calls. At most `max_concurrency`
+    batches are in flight, the next ones waiting for a slot, and a batch failing
+    or taking more than `timeout` seconds fails its verifications with
+    `PaymentVerificationError`.
+
+    With a circuit breaker, the failures of the backend open it: the verifications
+    then fail right away, rather than queueing on an unhealthy gateway, until a
+    probe batch succeeds.
+
+    Example
+    -------
+    ```python
+    verifier = PaymentVerifier(SimulatedGateway(), max_batch_size=50)
+    is_payment_success = await verifier.verify(order)
+    ...
+    await verifier.close()
+    ```
+    """
+
+    def __init__(
+        self,
+        backend: VerificationBackend,
+        max_batch_size: int = 50,
+        max_wait: float = 0.005,
+        max_concurrency: int = 8,
+        timeout: float = 2.0,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        """
+        Instantiate a `PaymentVerifier` object.
+
+        Parameters
+        ----------
+        backend : VerificationBackend
+            The backend verifying the payments.
+        max_batch_size : int, optional
+            The maximum number of orders per backend call (default is 50).
+        max_wait : float, optional
+            Seconds an order waits for its batch to fill (default is 0.005).
+        max_concurrency : int, optional
+            The maximum number of backend calls in flight (default is 8).
+        timeout : float, optional
+            Seconds a backend call may take (default is 2.0).
+        breaker : CircuitBreaker, optional
+            The circuit breaker of the backend calls (default is None).
+        """
+        if max_batch_size < 1 or max_concurrency < 1:
+            raise ValueError("The batch size and the concurrency should be positive")
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self.breaker = breaker
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._batch: list[tuple[IncomingOrder, asyncio.Future[bool]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._queued = 0
+        self._inflight = 0
+        self._batches = 0
+        self._verified = 0
+        self._failed = 0
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "PaymentVerifier":
+        """
+        Build a verifier from the `[payments.verification]` settings table.
+
+        Parameters
+        ----------
+        config : dict[str, Any]
+            The table: `backend`, `max_batch_size`, `max_wait`, `max_concurrency`,
+            `timeout`, the `breaker` table and the `latency` table of the simulated
+            gateway. The breaker state is exported as `payment_gateway`.
+        """
+        breaker_config = config["breaker"]
+        breaker = None
+        if breaker_config["enabled"]:
+            breaker = CircuitBreaker(
+                failure_threshold=breaker_config["failure_threshold"],
+                reset_timeout=breaker_config["reset_timeout"],
+                half_open_max_calls=breaker_config["half_open_max_calls"],
+            )
+            instrument_breaker("payment_gateway", breaker)
+        return cls(
+            backend=VerificationBackend.from_config(config),
+            max_batch_size=config["max_batch_size"],
+            max_wait=config["max_wait"],
+            max_concurrency=config["max_concurrency"],
+            timeout=config["timeout"],
+            breaker=breaker,
+        )
+
+    def stats(self) -> VerifierStats:
+        """Return the current metrics of the verifier."""
+        return VerifierStats(
+            queued=self._queued,
+            inflight=self._inflight,
+            batches=self._batches,
+            verified=self._verified,
+            failed=self._failed,
+        )
+
+    async def verify(self, order: IncomingOrder) -> bool:
+        """
+        Verify the payment of an order, with the next batch.
+
+        Returns
+        -------
+        bool
+            Whether the payment is successful.
+
+        Raises
+        ------
+        PaymentVerificationError
+            If the backend failed or timed out, or the circuit breaker is open.
+        """
+        if self.breaker is not None and self.breaker.state is BreakerState.OPEN:
+            self._failed += 1
+            raise PaymentVerificationError(
+                f"The gateway circuit is open, retry in {self.breaker.retry_after:.1f}s"
+            )
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._batch.append((order, future))
+        self._queued += 1
+        if len(self._batch) >= self.max_batch_size:
+            self._send()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_wait, self._send
+            )
+        return await future
+
+    async def close(self) -> None:
+        """Send the pending batch, wait for the batches in flight, close the backend."""
+        if self._batch:
+            self._send()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.backend.close()
+
+    def _send(self) -> None:
+        """Send the current batch, in a task."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._batch = self._batch, []
+        self._queued -= len(batch)
+        task = asyncio.create_task(self._verify_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _verify_batch(
+        self, batch: list[tuple[IncomingOrder, asyncio.Future[bool]]]
+    ) -> None:
+        """Verify a batch, within the concurrency cap, and resolve its futures."""
+        async with self._semaphore:
+            self._inflight += 1
+            self._batches += 1
+            guard: AbstractAsyncContextManager[None] = (
+                self.breaker.guard() if self.breaker is not None else nullcontext()
+            )
+            try:
+                async with guard, asyncio.timeout(self.timeout):
+                    results = await self.backend.verify_batch(
+                        [order for order, _ in batch]
+                    )
+                    if len(results) != len(batch):
+                        raise ValueError(
+                            f"{len(results)} results for a batch of {len(batch)} orders"
+                        )
+            except Exception as err:
+                logger.warning("Failed to verify %s payments: %r", len(batch), err)
+                self._failed += len(batch)
+                error = PaymentVerificationError(f"Verification failed: {err!r}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                return
+            finally:
+                self._inflight -= 1
+        self._verified += len(batch)
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,107 @@
+"""
+Benchmark the cold import time of the worker entry points, against a startup budget.
+
+Every module is imported in a fresh interpreter run with `-X importtime`, which
+reports the self and cumulative import time of every module imported. The median
+cumulative time over `RUNS` runs is compared with the budget of the module in
+`STARTUP_BUDGETS`, and the slowest imports of the last run are listed, so a
+regression points at its cause.
+The interpreters run without `AMQP_URL` set, from a temporary directory: importing
+a worker must neither load the settings nor configure logging.
+
+Run it with: `python -m benchmarks.import_time`
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+# Seconds every module may take to import: about 1.4 times its measured median, so
+# a regression fails the benchmark. `config.base` imports neither aio-pika nor the
+# RabbitMQ manager; a worker entry point imports both, and pydantic.
+STARTUP_BUDGETS = {
+    "config.base": 0.1,
+    "app.order_service.producer": 0.4,
+    "app.order_service.consumer": 0.4,
+    "app.payment_service.producer": 0.4,
+    "app.payment_service.consumer": 0.4,
+    "app.notification_service.producer": 0.4,
+}
+RUNS = 5
+TOP = 8
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass(frozen=True, slots=True)
+class ImportTime:
+    """A line of the `-X importtime` report, with times in seconds."""
+
+    module: str
+    self_time: float
+    cumulative: float
+
+
+def parse_report(report: str) -> list[ImportTime]:
+    """Parse the `-X importtime` lines of a stderr output."""
+    import_times = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, cumulative, module = line.removeprefix("import time:").split("|")
+        import_times.append(
+            ImportTime(
+                module=module.strip(),
+                self_time=int(self_time) / 1e6,
+                cumulative=int(cumulative) / 1e6,
+            )
+        )
+    return import_times
+
+
+def measure(module: str, cwd: str) -> list[ImportTime]:
+    """Import `module` in a fresh interpreter and return its import times."""
+    env = {key: value for key, value in os.environ.items() if key != "AMQP_URL"}
+    env["PYTHONPATH"] = str(PROJECT_ROOT)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_report(process.stderr)
+
+
+def main() -> None:
+    """Run the benchmark for every entry point and exit non-zero over budget."""
+    over_budget = []
+    with tempfile.TemporaryDirectory() as cwd:
+        for module, budget in STARTUP_BUDGETS.items():
+            runs = [measure(module, cwd) for _ in range(RUNS)]
+            median = statistics.median(run[-1].cumulative for run in runs)
+            status = "ok" if median <= budget else "OVER BUDGET"
+            print(
+                f"{module:<36} {median * 1e3:7.1f} ms "
+                f"(budget {budget * 1e3:.0f} ms) {status}"
+            )
+            for import_time in sorted(runs[-1], key=lambda item: -item.self_time)[:TOP]:
+                print(
+                    f"    {import_time.module:<40} "
+                    f"self {import_time.self_time * 1e3:6.1f} ms   "
+                    f"cumulative {import_time.cumulative * 1e3:6.1f} ms"
+                )
+            if median > budget:
+                over_budget.append(module)
+
+    if over_budget:
+        sys.exit(f"Startup budget exceeded by: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark the event-loop stalls caused by logging on the hot path.
+
+A heartbeat task measures how late the event loop wakes it up while a producer-like
+task logs one line per message, first through handlers called on the loop thread
+(the previous setup), then through the queue-based pipeline of `LoggingConfig`.
+The handler simulates slow log I/O (a busy disk, a blocked console) with a short
+sleep, which is what turns synchronous handlers into loop stalls.
+
+Run it with: `python -m benchmarks.logging_pipeline`
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+
+from config.logging import LoggingConfig
+
+MESSAGES = 2000
+HANDLER_LATENCY = 0.0002  # Seconds spent by the handler per record.
+HEARTBEAT_INTERVAL = 0.001
+
+
+class SlowHandler(logging.Handler):
+    """A handler whose `emit` blocks for `HANDLER_LATENCY` seconds."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Simulate slow log I/O."""
+        self.format(record)
+        time.sleep(HANDLER_LATENCY)
+
+
+async def heartbeat(lags: list[float], stop: asyncio.Event) -> None:
+    """Record how late the loop resumes a task sleeping `HEARTBEAT_INTERVAL`."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(loop.time() - expected)
+
+
+async def produce(logger: logging.Logger) -> float:
+    """Log one line per message, yielding to the loop between messages."""
+    started_at = time.perf_counter()
+    for index in range(MESSAGES):
+        logger.info("Published order to the %s exchange: %s", "orders", index)
+        if index % 10 == 0:
+            await asyncio.sleep(0)
+    return time.perf_counter() - started_at
+
+
+async def run(logger: logging.Logger) -> tuple[float, list[float]]:
+    """Run the producer next to the heartbeat and return the elapsed time and lags."""
+    lags: list[float] = []
+    stop = asyncio.Event()
+    heartbeat_task = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(HEARTBEAT_INTERVAL * 5)
+    elapsed = await produce(logger)
+    stop.set()
+    await heartbeat_task
+    return elapsed, lags
+
+
+def report(name: str, elapsed: float, lags: list[float]) -> None:
+    """Print the results of a run."""
+    lags = sorted(lags)
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+    print(
+        f"{name:<12} log calls: {elapsed / MESSAGES * 1e6:8.1f} us/call   "
+        f"loop lag p50: {statistics.median(lags) * 1e3:6.2f} ms   "
+        f"p99: {p99 * 1e3:6.2f} ms   max: {lags[-1] * 1e3:6.2f} ms"
+    )
+
+
+def main() -> None:
+    """Run the benchmark for both pipelines."""
+    sync_logger = logging.getLogger("benchmark.sync")
+    sync_logger.propagate = False
+    sync_logger.setLevel(logging.INFO)
+    sync_logger.addHandler(SlowHandler())
+    report("synchronous", *asyncio.run(run(sync_logger)))
+
+    queued_logger = logging.getLogger("benchmark.queued")
+    queued_logger.propagate = False
+    queued_logger.setLevel(logging.INFO)
+    queued_logger.addHandler(SlowHandler())
+    logging_config = LoggingConfig()
+    logging_config.setup_queue(logger=queued_logger)
+    report("queued", *asyncio.run(run(queued_logger)))
+    logging_config.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark the cost of rendering a notification message, against a budget.
+
+The message of every notification is rendered from the templates of
+`settings.toml`, precompiled by `TemplateCatalog`, for a payment in the default
+locale, in a variant locale and in a locale with no template (falling back to the
+default one). It is compared with the inline f-string the producer used to build,
+and with compiling the template on every render, the cost the catalog saves.
+
+Run it with: `python -m benchmarks.template_rendering`
+"""
+
+import statistics
+import time
+from collections.abc import Callable
+
+from app.notification_service.templates import Template, TemplateCatalog
+from app.payment_service.schemas import IncomingPayment
+from toolkit.parsers import CachedTOMLParser
+
+RENDERS = 100_000
+RUNS = 5
+RENDER_BUDGET = 5e-6  # Seconds a notification message may take to render.
+
+PAYMENT = IncomingPayment(
+    payment_id="8eb2a79e-8b95-41dc-a67e-2350a8d326a1",
+    order_id="f01d3c8f-cb0f-4471-9369-50189103da3c",
+    status="success",
+    customer_id=1,
+    created_at="2024-12-22 12:50:40.659939+00:00",
+)
+
+
+def measure(render: Callable[[], object]) -> float:
+    """Return the median seconds per render over `RUNS` runs of `RENDERS` renders."""
+    timings = []
+    for _ in range(RUNS):
+        started_at = time.perf_counter()
+        for _ in range(RENDERS):
+            render()
+        timings.append((time.perf_counter() - started_at) / RENDERS)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """Render the message of a payment with every approach and report the costs."""
+    config = CachedTOMLParser(file_path="settings.toml").read()["notifications"]
+    catalog = TemplateCatalog.from_config(config["templates"])
+    source = catalog.get("email").source
+    variables = IncomingPayment.model_fields.keys()
+
+    results = {
+        "inline f-string": measure(
+            lambda: (
+                f"Your payment status for order {PAYMENT.order_id} is: {PAYMENT.status}"
+            )
+        ),
+        "catalog, default": measure(lambda: catalog.render("email", PAYMENT)),
+        "catalog, variant": measure(lambda: catalog.render("email", PAYMENT, "fr")),
+        "catalog, fallback": measure(lambda: catalog.render("email", PAYMENT, "de")),
+        "compile per render": measure(
+            lambda: Template(source, variables).render(PAYMENT.__dict__)
+        ),
+    }
+    for name, elapsed in results.items():
+        print(f"{name:<20} {elapsed * 1e6:6.2f} us/notification")
+    worst = max(value for name, value in results.items() if name.startswith("catalog"))
+    verdict = "within" if worst <= RENDER_BUDGET else "over"
+    print(f"Slowest catalog render {verdict} the {RENDER_BUDGET * 1e6:.0f} us budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark the overhead of tracing on the consuming path, against a 1% budget.
+
+An order message is consumed as by `OrderConsumer`: the consumer span continuing the
+`traceparent` of the message, the broker wait, the decode of the order, the handler
+publishing the next message (a producer span stamping its `traceparent`) and the ack,
+all with the application tracer. It runs without any span, with the tracer not
+configured (the spans only propagate the context), with 1% head sampling, then with
+tail sampling too, as in `settings.toml`. The upstream producers sample 1% of the
+messages too, and the recorded spans are exported to a file.
+
+The broker is not involved, so a message costs only its CPU time here; the overhead
+is compared with that time plus `STAGE_LATENCY`, the time the stage takes per
+message in production, against the 1% `OVERHEAD_BUDGET`.
+
+Run it with: `python -m benchmarks.tracing_overhead`
+"""
+
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+from app.order_service.schemas import IncomingOrder
+from config.correlation import PUBLISHED_AT_HEADER
+from config.tracing import process_message, setup_tracing, trace_consumer, tracer
+from toolkit.tracing import RatioSampler, SpanContext, SpanKind
+
+MESSAGES = 20_000
+RUNS = 5
+# Seconds a stage takes per message in production, out of this benchmark: the publish
+# of a persistent message is confirmed once written to disk, after a few ms.
+STAGE_LATENCY = 0.005
+OVERHEAD_BUDGET = 0.01
+
+BODY = json.dumps(
+    {
+        "order_id": "f01d3c8f-cb0f-4471-9369-50189103da3c",
+        "customer_id": 1,
+        "items": ["orange", "apple"],
+        "total_price": "120",
+        "status": "created",
+        "created_at": "2024-12-22 12:50:40.659939+00:00",
+    }
+).encode()
+
+
+class IncomingMessage:
+    """The parts of an incoming message used by the consuming path."""
+
+    def __init__(self, headers: dict[str, Any]) -> None:
+        """Instantiate an `IncomingMessage` with the order body and `headers`."""
+        self.body = BODY
+        self.headers = headers
+        self.redelivered = False
+
+    @asynccontextmanager
+    async def process(self) -> AsyncIterator[None]:
+        """Stand in for `message.process()`, acking nothing."""
+        yield
+
+
+async def on_message_untraced(message: Any) -> None:
+    """Handle an order as `on_message` does, without spans."""
+    async with message.process():
+        order = IncomingOrder(**json.loads(message.body.decode()))
+        order.model_dump_json()
+
+
+async def on_message(message: Any) -> None:
+    """Handle an order as the order consumer and the payment producer do."""
+    async with process_message(message):
+        with tracer.start_span("decode"):
+            order = IncomingOrder(**json.loads(message.body.decode()))
+        with tracer.start_span("handler"):
+            with tracer.start_span("publish payments", kind=SpanKind.PRODUCER):
+                headers: dict[str, Any] = {}
+                tracer.inject(headers)
+            order.model_dump_json()
+
+
+async def consume(traced: bool) -> float:
+    """Consume `MESSAGES` messages and return the seconds spent per message."""
+    handler = trace_consumer("orders", on_message) if traced else on_message_untraced
+    sampler = RatioSampler(0.01)
+    messages = []
+    for _ in range(MESSAGES):
+        trace_id = SpanContext.new_trace_id()
+        parent = SpanContext(
+            trace_id, SpanContext.new_span_id(), sampler.should_sample(trace_id)
+        )
+        headers = {"traceparent": parent.to_traceparent()}
+        headers[PUBLISHED_AT_HEADER] = time.time()  # type: ignore[assignment]
+        messages.append(IncomingMessage(headers))
+
+    started_at = time.perf_counter()
+    for message in messages:
+        await handler(message)  # type: ignore[arg-type]
+    return (time.perf_counter() - started_at) / MESSAGES
+
+
+def measure(traced: bool) -> float:
+    """Return the median seconds spent per message over `RUNS` runs."""
+    return statistics.median(asyncio.run(consume(traced)) for _ in range(RUNS))
+
+
+def configure(directory: str, *, tail_sampling: bool) -> None:
+    """Configure the tracer as in `settings.toml`, exporting to `directory`."""
+    setup_tracing(
+        {
+            "enabled": True,
+            "service_name": "benchmark",
+            "sample_ratio": 0.01,
+            "tail_sampling": tail_sampling,
+            "tail_latency_threshold": 1.0,
+            "max_pending_traces": 1000,
+            "exporter": "file",
+            "file_path": str(Path(directory) / "spans.jsonl"),
+            "otlp_endpoint": "",
+            "max_queue_size": 2048,
+            "max_batch_size": 512,
+            "schedule_delay": 1.0,
+        }
+    )
+
+
+def report(name: str, elapsed: float, untraced: float) -> None:
+    """Print the time per message and the overhead of a configuration."""
+    overhead = elapsed - untraced
+    print(
+        f"{name:<16} {elapsed * 1e6:7.1f} us/message   "
+        f"overhead: {overhead * 1e6:6.1f} us, "
+        f"{overhead / (untraced + STAGE_LATENCY):6.2%} of a stage"
+    )
+
+
+def main() -> None:
+    """Run the benchmark untraced and with every tracing configuration."""
+    measure(traced=False)  # Warm up.
+    untraced = measure(traced=False)
+    report("untraced", untraced, untraced)
+    report("unconfigured", measure(traced=True), untraced)
+    with tempfile.TemporaryDirectory() as directory:
+        configure(directory, tail_sampling=False)
+        report("head sampling", measure(traced=True), untraced)
+        configure(directory, tail_sampling=True)
+        report("head and tail", measure(traced=True), untraced)
+        if tracer.processor is not None:
+            tracer.processor.shutdown()
+    print(f"{tracer.stats().exported} spans exported, budget {OVERHEAD_BUDGET:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Module holding the coalescing of consumer acknowledgements."""
+
+import asyncio
+import bisect
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from aio_pika.abc import AbstractIncomingMessage
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[AbstractIncomingMessage], Awaitable[None]]
+
+
+@dataclass(frozen=True, slots=True)
+class AckStats:
+    """Point-in-time metrics of an `AckCoalescer`."""
+
+    pending: int
+    acked: int
+    frames: int
+
+
+class AckCoalescer:
+    """
+    Acknowledge the completed messages of a channel by batches, with `multiple=True`.
+
+    A `Basic.Ack` with `multiple=True` acknowledges every outstanding delivery of the
+    channel up to its delivery tag, so it may only be sent for a tag below which every
+    delivery has completed. The coalescer tracks the delivered tags in order and the
+    completed ones, which may complete in any order in a worker pool, and flushes one
+    ack for the highest contiguous completed tag once `max_batch` messages completed,
+    or `interval` seconds after the first completion of a batch. A message still being
+    handled holds back the acks of the ones delivered after it, up to the next flush
+    following its completion.
+
+    Rejected messages are rejected right away and settle their tag: an ack with
+    `multiple=True` skips deliveries that are not outstanding anymore. Every delivery
+    of the channel must go through `track`, or a multiple ack could acknowledge a
+    message not handled yet. With a `max_batch` of 1, every message is acknowledged
+    on its own as it completes.
+
+    Acks not flushed when the channel closes are lost and their messages redelivered,
+    as with any unacknowledged message: the delivery stays at least once.
+
+    Example
+    -------
+    ```python
+    acks = AckCoalescer(max_batch=32, interval=0.005)
+    await queue.consume(acks.tracking(pool.submit))
+    # In the handler, instead of `message.process()`:
+    async with process_message(message, acks=acks):
+        ...
+    ```
+    """
+
+    def __init__(self, max_batch: int = 1, interval: float = 0.005) -> None:
+        """
+        Instantiate an `AckCoalescer` object.
+
+        Parameters
+        ----------
+        max_batch : int, optional
+            Completed messages acknowledged by one frame (default is 1, acknowledge
+            every message on its own).
+        interval : float, optional
+            Seconds a completed message waits for its batch to fill (default is
+            0.005).
+        """
+        self.max_batch = max_batch
+        self.interval = interval
+        self._channel: Any = None
+        self._delivered: list[int] = []
+        self._done: dict[int, AbstractIncomingMessage | None] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task[None]] = set()
+        self._acked = 0
+        self._frames = 0
+
+    def stats(self) -> AckStats:
+        """Return the current metrics of the coalescer."""
+        return AckStats(pending=len(self._done), acked=self._acked, frames=self._frames)
+
+    def tracking(self, handler: MessageHandler) -> MessageHandler:
+        """Wrap a consumer callback to track every delivery before handling it."""
+
+        async def tracked(message: AbstractIncomingMessage) -> None:
+            self.track(message)
+            await handler(message)
+
+        return tracked
+
+    def track(self, message: AbstractIncomingMessage) -> None:
+        """Track a delivery, to be completed by `complete`."""
+        if message.channel is not self._channel:
+            # A new channel, e.g. after a reconnection: the deliveries of the
+            # previous one cannot be acknowledged anymore.
+            self._channel = message.channel
+            self._delivered.clear()
+            self._done.clear()
+        tag = message.delivery_tag
+        if tag is None:
+            return
+        if not self._delivered or tag > self._delivered[-1]:
+            self._delivered.append(tag)
+        else:
+            bisect.insort(self._delivered, tag)
+
+    async def complete(
+        self, message: AbstractIncomingMessage, *, settled: bool = False
+    ) -> None:
+        """
+        Complete a message, acknowledging it with the next flush.
+
+        Parameters
+        ----------
+        message : AbstractIncomingMessage
+            The handled message.
+        settled : bool, optional
+            Whether the message was already acknowledged or rejected on its own
+            (default is False).
+        """
+        tag = message.delivery_tag
+        if tag is None or not self._is_tracked(message.channel, tag):
+            if not settled:
+                await message.ack()
+            return
+        if not settled and self.max_batch <= 1:
+            await message.ack()
+            settled = True
+        self._done[tag] = None if settled else message
+        if len(self._done) >= self.max_batch:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.interval, self._flush_later
+            )
+
+    async def flush(self) -> None:
+        """Acknowledge every message completed below the first one still handled."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        flushed = 0
+        acked = 0
+        last: AbstractIncomingMessage | None = None
+        for tag in self._delivered:
+            if tag not in self._done:
+                break
+            message = self._done.pop(tag)
+            flushed += 1
+            if message is not None:
+                acked += 1
+                last = message
+        del self._delivered[:flushed]
+        if self._done and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.interval, self._flush_later
+            )
+        if last is not None:
+            self._acked += acked
+            self._frames += 1
+            await last.ack(multiple=True)
+
+    async def close(self) -> None:
+        """Flush the completed messages and stop the timer."""
+        await asyncio.gather(*self._flushes, return_exceptions=True)
+        await self.flush()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _is_tracked(self, channel: Any, tag: int) -> bool:
+        """Return whether a delivery was tracked and is not flushed yet."""
+        if channel is not self._channel:
+            return False
+        index = bisect.bisect_left(self._delivered, tag)
+        return index < len(self._delivered) and self._delivered[index] == tag
+
+    def _flush_later(self) -> None:
+        """Flush from the timer, in a task."""
+        self._timer = None
+        task = asyncio.create_task(self._flush_logged())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush_logged(self) -> None:
+        """Flush, logging the failures of the timer flushes."""
+        try:
+            await self.flush()
+        except Exception as err:
+            logger.warning("Failed to flush the coalesced acks: %r", err)
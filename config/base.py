@@ -1,16 +1,253 @@
-"""Module for defining base configurations."""
+"""
+Module for defining base configurations.
 
-from .logging import LoggingConfig
-from .rabbitmq import AsyncRabbitmqManager
-from .settings import Settings
+Importing this module has no side effects: the settings file, the `.env` file, the
+logging configuration and the RabbitMQ manager are all initialized on first use. The
+`logger` is a `LazyLogger`, and `settings`, `rabbitmq_config`, `rabbitmq_manager`,
+`notification_config`, `payment_config`, `order_config`, `tuning`, `metrics_server`,
+`tracer`, `profiling` and `memory` are resolved through the module `__getattr__`
+(PEP 562), so short-lived workers only pay for what they actually use. So is the
+`AsyncRabbitmqManager` class, keeping `config.rabbitmq` and its metrics, tracing and
+memory imports out of the import of this module.
+"""
+
+import functools
+import logging
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, cast
+
+from .logging import LazyLogger, LoggingConfig
+
+if TYPE_CHECKING:
+    from toolkit.memory import MemoryAccountant
+    from toolkit.metrics import MetricsServer
+    from toolkit.tracing import Tracer
+
+    from .profiling import ProfilingControl
+    from .rabbitmq import AsyncRabbitmqManager
+    from .settings import Settings
+    from .tuning import TuningWatcher
+
+    settings: Settings
+    rabbitmq_config: dict[str, Any]
+    rabbitmq_manager: AsyncRabbitmqManager
+    notification_config: dict[str, Any]
+    payment_config: dict[str, Any]
+    order_config: dict[str, Any]
+    tuning: TuningWatcher
+    metrics_server: MetricsServer
+    tracer: Tracer
+    profiling: ProfilingControl
+    memory: MemoryAccountant
 
 # Logging
-logger = LoggingConfig().get_logger()
+logging_config = LoggingConfig()
+logger = cast(logging.Logger, LazyLogger(logging_config))
+
 
 # Settings
-settings = Settings()
+@functools.cache
+def get_settings() -> "Settings":
+    """Return the application settings, loading them on the first call."""
+    from .settings import Settings
+
+    return Settings()
+
 
 # RabbitMQ
-rabbitmq_manager = AsyncRabbitmqManager(amqp_url=settings.AMQP_URL)
+@functools.cache
+def get_rabbitmq_config() -> dict[str, Any]:
+    """Return the `[rabbitmq]` settings table, parsing it on the first call."""
+    from toolkit.parsers import CachedTOMLParser
+
+    rabbitmq_config: dict[str, Any] = CachedTOMLParser(
+        file_path="settings.toml"
+    ).read()["rabbitmq"]
+    return rabbitmq_config
+
+
+@functools.cache
+def get_rabbitmq_manager() -> "AsyncRabbitmqManager":
+    """Return the RabbitMQ manager, building it on the first call."""
+    from .endpoints import EndpointSelector
+    from .flow_control import PublishFlowController
+    from .metrics import instrument_flow_control, instrument_spool
+    from .rabbitmq import AsyncRabbitmqManager
+    from .spool import PublishSpool
+
+    settings = get_settings()
+    rabbitmq_config = get_rabbitmq_config()
+    get_tracer()
+    memory = get_memory()
+
+    spool_config = rabbitmq_config["spool"]
+    spool = PublishSpool.from_config(spool_config) if spool_config["enabled"] else None
+    flow_control_config = rabbitmq_config["flow_control"]
+    flow_control = (
+        PublishFlowController.from_config(flow_control_config)
+        if flow_control_config["enabled"]
+        else None
+    )
+    if spool is not None:
+        instrument_spool(spool)
+    if flow_control is not None:
+        instrument_flow_control(flow_control)
+    endpoints = (
+        EndpointSelector.from_config(
+            urls=settings.amqp_urls, config=rabbitmq_config["endpoints"]
+        )
+        if len(settings.amqp_urls) > 1
+        else None
+    )
+    return AsyncRabbitmqManager(
+        amqp_url=settings.amqp_urls[0],
+        spool=spool,
+        flow_control=flow_control,
+        endpoints=endpoints,
+        publish_budget=memory.get("publish_window"),
+    )
+
+
+def get_rabbitmq_manager_class() -> type["AsyncRabbitmqManager"]:
+    """Return the `AsyncRabbitmqManager` class, importing its module on first use."""
+    from .rabbitmq import AsyncRabbitmqManager
+
+    return AsyncRabbitmqManager
+
+
+@functools.cache
+def get_notification_config() -> dict[str, Any]:
+    """Return the `[notifications]` settings table, parsing it on the first call."""
+    from toolkit.parsers import CachedTOMLParser
+
+    notification_config: dict[str, Any] = CachedTOMLParser(
+        file_path="settings.toml"
+    ).read()["notifications"]
+    return notification_config
+
+
+@functools.cache
+def get_payment_config() -> dict[str, Any]:
+    """Return the `[payments]` settings table, parsing it on the first call."""
+    from toolkit.parsers import CachedTOMLParser
+
+    payment_config: dict[str, Any] = CachedTOMLParser(file_path="settings.toml").read()[
+        "payments"
+    ]
+    return payment_config
+
+
+@functools.cache
+def get_order_config() -> dict[str, Any]:
+    """Return the `[orders]` settings table, parsing it on the first call."""
+    from toolkit.parsers import CachedTOMLParser
+
+    order_config: dict[str, Any] = CachedTOMLParser(file_path="settings.toml").read()[
+        "orders"
+    ]
+    return order_config
+
+
+# Tuning
+@functools.cache
+def get_tuning_watcher() -> "TuningWatcher":
+    """Return the watcher of the `[tuning]` settings, creating it on the first call."""
+    from .metrics import instrument_tuning
+    from .tuning import TuningWatcher
+
+    tuning = TuningWatcher(file_path="settings.toml")
+    instrument_tuning(tuning)
+    return tuning
+
+
+# Metrics
+@functools.cache
+def get_metrics_server() -> "MetricsServer":
+    """Return the server of the `[metrics]` settings, creating it on the first call."""
+    from toolkit.metrics import MetricsServer
+    from toolkit.parsers import CachedTOMLParser
+
+    from .correlation import render_exemplars
+    from .memory import get_routes as get_memory_routes
+    from .metrics import registry
+
+    metrics_config = CachedTOMLParser(file_path="settings.toml").read()["metrics"]
+    return MetricsServer(
+        registry=registry,
+        host=metrics_config["host"],
+        port=metrics_config["port"],
+        path=metrics_config["path"],
+        routes={
+            metrics_config["exemplars_path"]: render_exemplars,
+            **get_profiling().routes(),
+            **get_memory_routes(),
+        },
+    )
+
+
+# Tracing
+@functools.cache
+def get_tracer() -> "Tracer":
+    """Return the tracer, configured from the `[tracing]` settings on the first call."""
+    from toolkit.parsers import CachedTOMLParser
+
+    from .tracing import setup_tracing
+
+    tracing_config = CachedTOMLParser(file_path="settings.toml").read()["tracing"]
+    return setup_tracing(tracing_config)
+
+
+# Profiling
+@functools.cache
+def get_profiling() -> "ProfilingControl":
+    """Return the control of the profilers, configured on the first call."""
+    from toolkit.parsers import CachedTOMLParser
+
+    from .profiling import ProfilingControl
+
+    get_tracer()
+    profiling_config = CachedTOMLParser(file_path="settings.toml").read()["profiling"]
+    return ProfilingControl.from_config(profiling_config)
+
+
+# Memory
+@functools.cache
+def get_memory() -> "MemoryAccountant":
+    """Return the memory budgets of the stages, configured on the first call."""
+    from toolkit.parsers import CachedTOMLParser
+
+    from .memory import setup_memory
+    from .metrics import instrument_memory
+
+    memory_config = CachedTOMLParser(file_path="settings.toml").read()["memory"]
+    accountant = setup_memory(memory_config)
+    instrument_memory(accountant)
+    return accountant
+
+
+_LAZY_ATTRIBUTES: dict[str, Callable[[], Any]] = {
+    "AsyncRabbitmqManager": get_rabbitmq_manager_class,
+    "settings": get_settings,
+    "rabbitmq_config": get_rabbitmq_config,
+    "rabbitmq_manager": get_rabbitmq_manager,
+    "notification_config": get_notification_config,
+    "payment_config": get_payment_config,
+    "order_config": get_order_config,
+    "tuning": get_tuning_watcher,
+    "metrics_server": get_metrics_server,
+    "tracer": get_tracer,
+    "profiling": get_profiling,
+    "memory": get_memory,
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Initialize the lazy module attributes on first access."""
+    try:
+        factory = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    return factory()
+
 
 __all__ = ["AsyncRabbitmqManager"]
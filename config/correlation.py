@@ -0,0 +1,173 @@
+"""Module holding the correlation of messages across stages, for end-to-end latency."""
+
+import contextvars
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from aio_pika.abc import AbstractIncomingMessage
+
+from toolkit.metrics import SlowestExemplars
+
+from .metrics import stage_end_to_end, stage_processing, stage_queue_wait
+
+# Headers carrying the publish timestamps, in seconds since the epoch. The origin
+# timestamp is set once, by the first producer (the checkout), and propagated by the
+# next stages; the publish timestamp is set again by every producer.
+ORIGIN_PUBLISHED_AT_HEADER = "x-origin-published-at"
+PUBLISHED_AT_HEADER = "x-published-at"
+
+EXEMPLARS_PER_STAGE = 20
+
+MessageHandler = Callable[[AbstractIncomingMessage], Awaitable[None]]
+
+
+@dataclass(frozen=True, slots=True)
+class Correlation:
+    """The identity and the origin timestamp of a flow of messages, e.g. an order."""
+
+    correlation_id: str
+    origin_published_at: float
+
+    @classmethod
+    def start(cls, correlation_id: str) -> "Correlation":
+        """Start a new flow, originating now."""
+        return cls(correlation_id=correlation_id, origin_published_at=time.time())
+
+    @classmethod
+    def from_message(cls, message: AbstractIncomingMessage) -> "Correlation | None":
+        """Return the correlation stamped on a message, if any."""
+        origin_published_at = (message.headers or {}).get(ORIGIN_PUBLISHED_AT_HEADER)
+        if message.correlation_id is None or not isinstance(
+            origin_published_at, int | float
+        ):
+            return None
+        return cls(
+            correlation_id=message.correlation_id,
+            origin_published_at=float(origin_published_at),
+        )
+
+    def get_message_properties(self) -> dict[str, Any]:
+        """Return the `Message` keyword arguments stamping the correlation."""
+        return {
+            "correlation_id": self.correlation_id,
+            "headers": {
+                ORIGIN_PUBLISHED_AT_HEADER: self.origin_published_at,
+                PUBLISHED_AT_HEADER: time.time(),
+            },
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class StageExemplar:
+    """A slow message of a stage, kept for debugging the tail latency."""
+
+    correlation_id: str
+    queue_wait: float
+    processing: float
+    end_to_end: float
+    recorded_at: float
+
+
+# The correlation of the message being handled, so producers called by a handler
+# propagate it to the next stage.
+current_correlation: contextvars.ContextVar[Correlation | None] = (
+    contextvars.ContextVar("current_correlation", default=None)
+)
+
+exemplars: dict[str, SlowestExemplars[StageExemplar]] = {}
+
+
+def get_correlation(correlation_id: str) -> Correlation:
+    """
+    Return the correlation to stamp on a message of the flow `correlation_id`.
+
+    The correlation of the message being handled is propagated if it belongs to the
+    same flow; otherwise a new flow starts now.
+    """
+    correlation = current_correlation.get()
+    if correlation is not None and correlation.correlation_id == correlation_id:
+        return correlation
+    return Correlation.start(correlation_id)
+
+
+def track_stage(stage: str, handler: MessageHandler) -> MessageHandler:
+    """
+    Wrap a message handler to record the latency of a stage of correlated flows.
+
+    For every message stamped with a correlation, the queue wait (from its publish
+    to its handling), the processing time and the end-to-end latency (from the
+    origin of the flow to the end of this stage) are observed in histograms, and
+    the slowest messages are kept as exemplars. Timestamps come from the clocks of
+    different hosts, so the queue wait and end-to-end latency include their skew.
+
+    Parameters
+    ----------
+    stage : str
+        The name of the stage, used as the `stage` label.
+    handler : MessageHandler
+        The coroutine function handling a consumed message.
+
+    Returns
+    -------
+    MessageHandler
+        The tracked handler, running `handler` with `current_correlation` set.
+    """
+    queue_wait_histogram = stage_queue_wait.labels(stage)
+    processing_histogram = stage_processing.labels(stage)
+    end_to_end_histogram = stage_end_to_end.labels(stage)
+    slowest = exemplars.setdefault(stage, SlowestExemplars(EXEMPLARS_PER_STAGE))
+
+    async def tracked(message: AbstractIncomingMessage) -> None:
+        correlation = Correlation.from_message(message)
+        if correlation is None:
+            await handler(message)
+            return
+
+        received_at = time.time()
+        published_at = (message.headers or {}).get(PUBLISHED_AT_HEADER)
+        queue_wait = (
+            max(0.0, received_at - published_at)
+            if isinstance(published_at, int | float)
+            else 0.0
+        )
+        started_at = time.perf_counter()
+        token = current_correlation.set(correlation)
+        try:
+            await handler(message)
+        finally:
+            current_correlation.reset(token)
+            processing = time.perf_counter() - started_at
+            end_to_end = max(0.0, time.time() - correlation.origin_published_at)
+            queue_wait_histogram.observe(queue_wait)
+            processing_histogram.observe(processing)
+            end_to_end_histogram.observe(end_to_end)
+            slowest.offer(
+                end_to_end,
+                StageExemplar(
+                    correlation_id=correlation.correlation_id,
+                    queue_wait=queue_wait,
+                    processing=processing,
+                    end_to_end=end_to_end,
+                    recorded_at=received_at,
+                ),
+            )
+
+    return tracked
+
+
+def render_exemplars() -> str:
+    """Render the slowest messages of every stage as a plain-text report."""
+    lines = [
+        f"{'stage':<16} {'correlation_id':<36} {'end_to_end':>10} "
+        f"{'queue_wait':>10} {'processing':>10}"
+    ]
+    for stage, slowest in sorted(exemplars.items()):
+        for _, exemplar in slowest.snapshot():
+            lines.append(
+                f"{stage:<16} {exemplar.correlation_id:<36} "
+                f"{exemplar.end_to_end:10.4f} {exemplar.queue_wait:10.4f} "
+                f"{exemplar.processing:10.4f}"
+            )
+    return "\n".join(lines) + "\n"
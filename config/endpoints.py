@@ -0,0 +1,286 @@
+"""Module holding multi-node broker endpoint selection and failover."""
+
+import asyncio
+import logging
+import math
+import random
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from aio_pika.abc import AbstractRobustConnection
+from aio_pika.exceptions import CONNECTION_EXCEPTIONS
+from yarl import URL
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# The AMQP 0-9-1 protocol header. A broker answers it with a `Connection.Start`
+# frame, so the time to the first byte of the answer measures its responsiveness.
+AMQP_PROTOCOL_HEADER = b"AMQP\x00\x00\x09\x01"
+
+
+class BrokerUnavailableError(ConnectionError):
+    """Raise when none of the configured broker endpoints accepts a connection."""
+
+    pass
+
+
+@dataclass(slots=True)
+class BrokerEndpoint:
+    """
+    A broker node, with the outcome of its last probe and connection attempts.
+
+    `failures` counts the connection attempts that failed (or connections that were
+    lost) since the last successful connection, and ranks the node behind others
+    that answer probes just as fast.
+    """
+
+    url: str
+    latency: float | None = None
+    failures: int = 0
+
+    @property
+    def host(self) -> str:
+        """Return the host name of the broker node."""
+        return URL(self.url).host or "localhost"
+
+    @property
+    def port(self) -> int:
+        """Return the AMQP port of the broker node, 5671 for TLS by default."""
+        url = URL(self.url)
+        return url.port or (5671 if url.scheme == "amqps" else 5672)
+
+    @property
+    def healthy(self) -> bool:
+        """Return whether the node answered the last probe."""
+        return self.latency is not None
+
+
+class EndpointSelector:
+    """
+    Latency-aware selection of broker nodes, with jittered exponential backoff.
+
+    Every node is probed by sending the AMQP protocol header and timing the first
+    byte of the answer. Healthy nodes are tried from the lowest to the highest
+    latency; when a whole round fails, the selector waits a "full jitter" backoff,
+    a random delay between zero and `backoff_base * 2 ** round` (capped at
+    `backoff_max`), so a fleet of workers losing the same node does not reconnect
+    in lockstep.
+
+    Example
+    -------
+    ```python
+    selector = EndpointSelector(["amqp://rabbit-1/", "amqp://rabbit-2/"])
+    endpoint, connection = await selector.connect(
+        lambda url: connect_robust(url=url)
+    )
+    selector.watch(endpoint=endpoint, connection=connection)
+    ```
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        probe_timeout: float = 1.0,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        max_rounds: int = 5,
+        failover_timeout: float = 10.0,
+        rng: random.Random | None = None,
+    ) -> None:
+        """
+        Instantiate an `EndpointSelector` object.
+
+        Parameters
+        ----------
+        urls : Sequence[str]
+            The AMQP URLs of the broker nodes.
+        probe_timeout : float, optional
+            Seconds to wait for a node to answer a probe (default is 1).
+        backoff_base : float, optional
+            The backoff ceiling, in seconds, after the first failed round
+            (default is 0.5).
+        backoff_max : float, optional
+            The maximum backoff ceiling in seconds (default is 30).
+        max_rounds : int, optional
+            Rounds over every node before `connect` gives up (default is 5).
+        failover_timeout : float, optional
+            Seconds a robust connection may take to reconnect to the node chosen
+            during a failover before the next node is tried (default is 10).
+        rng : random.Random, optional
+            The random generator used for the jitter (default is a new generator).
+        """
+        if not urls:
+            raise ValueError("At least one broker endpoint is required")
+        self.endpoints = [BrokerEndpoint(url=url) for url in urls]
+        self.probe_timeout = probe_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_rounds = max_rounds
+        self.failover_timeout = failover_timeout
+        self._rng = rng or random.Random()
+        self._failover_tasks: set[asyncio.Task[None]] = set()
+
+    @classmethod
+    def from_config(
+        cls, urls: Sequence[str], config: dict[str, Any]
+    ) -> "EndpointSelector":
+        """Instantiate a selector from the `[rabbitmq.endpoints]` settings table."""
+        return cls(
+            urls=urls,
+            probe_timeout=config.get("probe_timeout", 1.0),
+            backoff_base=config.get("backoff_base", 0.5),
+            backoff_max=config.get("backoff_max", 30.0),
+            max_rounds=config.get("max_rounds", 5),
+            failover_timeout=config.get("failover_timeout", 10.0),
+        )
+
+    def __len__(self) -> int:
+        """Return the number of broker endpoints."""
+        return len(self.endpoints)
+
+    def ranked(self) -> list[BrokerEndpoint]:
+        """Return the endpoints, healthy ones first, by failures then latency."""
+        return sorted(
+            self.endpoints,
+            key=lambda endpoint: (
+                not endpoint.healthy,
+                endpoint.failures,
+                math.inf if endpoint.latency is None else endpoint.latency,
+            ),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Return a full-jitter backoff delay, in seconds, for the given attempt."""
+        ceiling = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return self._rng.uniform(0, ceiling)
+
+    async def probe(self) -> list[BrokerEndpoint]:
+        """Probe every endpoint concurrently and return them ranked."""
+        await asyncio.gather(*(self._probe(endpoint) for endpoint in self.endpoints))
+        return self.ranked()
+
+    async def connect(
+        self, factory: Callable[[str], Awaitable[T]]
+    ) -> tuple[BrokerEndpoint, T]:
+        """
+        Connect to the best available endpoint.
+
+        Parameters
+        ----------
+        factory : Callable[[str], Awaitable[T]]
+            Opens a connection to the given URL, e.g. `connect_robust`.
+
+        Returns
+        -------
+        tuple[BrokerEndpoint, T]
+            The endpoint connected to, and the connection returned by `factory`.
+
+        Raises
+        ------
+        BrokerUnavailableError
+            If no endpoint accepted a connection within `max_rounds` rounds.
+        """
+        for attempt in range(self.max_rounds):
+            for endpoint in await self.probe():
+                if not endpoint.healthy:
+                    continue
+                try:
+                    connection = await factory(endpoint.url)
+                except CONNECTION_EXCEPTIONS as err:
+                    logger.warning("Connecting to %s failed: %r", endpoint.url, err)
+                    endpoint.failures += 1
+                    continue
+                endpoint.failures = 0
+                return endpoint, connection
+
+            delay = self.backoff(attempt)
+            logger.warning("No broker endpoint available, retrying in %.2fs", delay)
+            await asyncio.sleep(delay)
+
+        raise BrokerUnavailableError(
+            f"No broker endpoint available after {self.max_rounds} rounds"
+        )
+
+    def watch(
+        self, *, endpoint: BrokerEndpoint, connection: AbstractRobustConnection
+    ) -> None:
+        """
+        Fail over to another node whenever `connection` loses `endpoint`.
+
+        A robust connection only ever reconnects to its own URL. When the connection
+        drops, the selector points it at the best remaining node instead and keeps
+        rotating through the nodes, with jittered backoff, until it reconnects. The
+        robust connection then restores its channels, exchanges, queues, bindings
+        and consumers on the new node by itself.
+        """
+        current = {"endpoint": endpoint}
+
+        def on_close(_: Any, exc: BaseException | None = None, /) -> None:
+            if connection.is_closed or exc is None:
+                return
+            task = asyncio.create_task(
+                self._failover(connection=connection, current=current)
+            )
+            self._failover_tasks.add(task)
+            task.add_done_callback(self._failover_tasks.discard)
+
+        connection.close_callbacks.add(on_close)
+
+    async def _failover(
+        self,
+        *,
+        connection: AbstractRobustConnection,
+        current: dict[str, BrokerEndpoint],
+    ) -> None:
+        """Rotate the URL of a dropped robust connection until it reconnects."""
+        current["endpoint"].failures += 1
+        reconnect_interval = connection.reconnect_interval  # type: ignore[attr-defined]
+        attempt = 0
+        while not connection.is_closed and not connection.connected.is_set():
+            target = (await self.probe())[0]
+            delay = self.backoff(attempt)
+            logger.warning(
+                "Failing over from %s to %s in %.2fs",
+                current["endpoint"].url,
+                target.url,
+                delay,
+            )
+            connection.url = URL(target.url)  # type: ignore[attr-defined]
+            connection.reconnect_interval = delay  # type: ignore[attr-defined]
+            current["endpoint"] = target
+            try:
+                async with asyncio.timeout(delay + self.failover_timeout):
+                    await connection.connected.wait()
+            except TimeoutError:
+                target.failures += 1
+                attempt += 1
+
+        # The jittered delays only pace the failover, not later reconnections.
+        connection.reconnect_interval = reconnect_interval  # type: ignore[attr-defined]
+        if connection.connected.is_set():
+            current["endpoint"].failures = 0
+            logger.info("Failed over to %s", current["endpoint"].url)
+
+    async def _probe(self, endpoint: BrokerEndpoint) -> None:
+        """Measure the time for `endpoint` to answer the AMQP protocol header."""
+        started_at = time.perf_counter()
+        writer = None
+        try:
+            async with asyncio.timeout(self.probe_timeout):
+                reader, writer = await asyncio.open_connection(
+                    endpoint.host, endpoint.port
+                )
+                writer.write(AMQP_PROTOCOL_HEADER)
+                await writer.drain()
+                answered = bool(await reader.read(1))
+        except (OSError, TimeoutError):
+            answered = False
+        finally:
+            if writer is not None:
+                writer.close()
+
+        endpoint.latency = time.perf_counter() - started_at if answered else None
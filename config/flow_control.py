@@ -0,0 +1,216 @@
+"""Module holding broker flow-control awareness for the publishing side."""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+from toolkit.ratelimit import AdaptiveTokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class FlowControlPolicy(StrEnum):
+    """What `PublishFlowController` does with a publish it cannot admit."""
+
+    FAIL_FAST = "fail_fast"
+    BUFFER = "buffer"
+    WAIT = "wait"
+
+
+class PublishFlowControlError(Exception):
+    """Raise when a publish is refused because the broker is applying flow control."""
+
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class FlowControlStats:
+    """Point-in-time metrics of a `PublishFlowController`."""
+
+    blocked: bool
+    rate: float
+    latency: float
+    waiting: int
+    refused: int
+
+
+class PublishFlowController:
+    """
+    Admission control for publishes, driven by broker flow control and latency.
+
+    When RabbitMQ raises a memory or disk alarm it sends `connection.blocked` and
+    stops reading from publishing connections, so every `exchange.publish` hangs
+    until `connection.unblocked`. The controller keeps producers from piling up
+    behind a blocked connection:
+
+    - It tracks the blocked state, either from explicit `on_blocked`/`on_unblocked`
+      calls or inferred from publishes that stall longer than `blocked_threshold`
+      (aio-pika handles the `connection.blocked` frames internally and does not
+      surface them, so the inference is what detects alarms in practice).
+    - It admits publishes through an `AdaptiveTokenBucket` whose rate backs off when
+      the publish latency (an EWMA) exceeds the target.
+    - It bounds the number of waiting publishers with `max_waiters`.
+
+    A publish that cannot be admitted is handled according to the policy: `fail_fast`
+    raises `PublishFlowControlError` right away, `wait` waits up to `wait_timeout`
+    seconds before raising, and `buffer` raises so the caller can hand the message to
+    the spool instead.
+    """
+
+    def __init__(
+        self,
+        limiter: AdaptiveTokenBucket,
+        policy: FlowControlPolicy = FlowControlPolicy.WAIT,
+        blocked_threshold: float = 5.0,
+        publish_timeout: float = 30.0,
+        wait_timeout: float = 5.0,
+        max_waiters: int = 1000,
+        latency_smoothing: float = 0.2,
+    ) -> None:
+        """Instantiate a `PublishFlowController` object."""
+        self.limiter = limiter
+        self.policy = FlowControlPolicy(policy)
+        self.blocked_threshold = blocked_threshold
+        self.publish_timeout = publish_timeout
+        self.wait_timeout = wait_timeout
+        self.max_waiters = max_waiters
+        self._smoothing = latency_smoothing
+        self._unblocked = asyncio.Event()
+        self._unblocked.set()
+        self._probe_handle: asyncio.TimerHandle | None = None
+        self._latency = 0.0
+        self._waiting = 0
+        self._refused = 0
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "PublishFlowController":
+        """Instantiate a controller from the `[rabbitmq.flow_control]` table."""
+        limiter = AdaptiveTokenBucket(
+            rate=config["initial_rate"],
+            burst=config["burst"],
+            min_rate=config["min_rate"],
+            max_rate=config["max_rate"],
+            target_latency=config["target_latency"],
+        )
+        return cls(
+            limiter=limiter,
+            policy=FlowControlPolicy(config.get("policy", "wait")),
+            blocked_threshold=config.get("blocked_threshold", 5.0),
+            publish_timeout=config.get("publish_timeout", 30.0),
+            wait_timeout=config.get("wait_timeout", 5.0),
+            max_waiters=config.get("max_waiters", 1000),
+        )
+
+    @property
+    def blocked(self) -> bool:
+        """Return whether the publishing connection is considered blocked."""
+        return not self._unblocked.is_set()
+
+    def stats(self) -> FlowControlStats:
+        """Return the current metrics of the controller."""
+        return FlowControlStats(
+            blocked=self.blocked,
+            rate=self.limiter.rate,
+            latency=self._latency,
+            waiting=self._waiting,
+            refused=self._refused,
+        )
+
+    def on_blocked(self, reason: str = "", inferred: bool = False) -> None:
+        """
+        Mark the connection as blocked by the broker.
+
+        Parameters
+        ----------
+        reason : str, optional
+            The reason reported by the broker, used for logging.
+        inferred : bool, optional
+            Whether the blocked state was inferred from a stalled publish rather than
+            reported by the broker (default is False). An inferred block expires after
+            `blocked_threshold` seconds, so the next publish probes the connection.
+        """
+        if not self.blocked:
+            logger.warning("Publishing connection blocked by the broker: %s", reason)
+        self._unblocked.clear()
+        self.limiter.penalize()
+
+        if self._probe_handle is not None:
+            self._probe_handle.cancel()
+            self._probe_handle = None
+        if inferred:
+            self._probe_handle = asyncio.get_running_loop().call_later(
+                self.blocked_threshold, self._unblocked.set
+            )
+
+    def on_unblocked(self) -> None:
+        """Mark the connection as unblocked by the broker."""
+        if self.blocked:
+            logger.warning("Publishing connection unblocked by the broker")
+        if self._probe_handle is not None:
+            self._probe_handle.cancel()
+            self._probe_handle = None
+        self._unblocked.set()
+
+    @asynccontextmanager
+    async def throttle(self) -> AsyncIterator[None]:
+        """
+        Admit a single publish, measuring its latency.
+
+        Raises
+        ------
+        PublishFlowControlError
+            If the publish is not admitted according to the policy, or if it does
+            not complete within `publish_timeout` seconds.
+        """
+        await self._admit()
+
+        started_at = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.publish_timeout):
+                yield
+        except TimeoutError as err:
+            self.on_blocked(
+                reason=f"publish timed out after {self.publish_timeout}s",
+                inferred=True,
+            )
+            raise PublishFlowControlError("Publish timed out") from err
+        self._observe(time.perf_counter() - started_at)
+
+    async def _admit(self) -> None:
+        """Wait for the connection to be unblocked and for a token, per policy."""
+        if not self.blocked and self.limiter.try_acquire():
+            return
+
+        if self.policy is not FlowControlPolicy.WAIT:
+            self._refuse("broker is applying flow control")
+        if self._waiting >= self.max_waiters:
+            self._refuse(f"{self._waiting} publishes are already waiting")
+
+        self._waiting += 1
+        try:
+            async with asyncio.timeout(self.wait_timeout):
+                await self._unblocked.wait()
+                await self.limiter.acquire()
+        except TimeoutError:
+            self._refuse(f"not admitted within {self.wait_timeout}s")
+        finally:
+            self._waiting -= 1
+
+    def _refuse(self, reason: str) -> None:
+        """Count and raise a refused publish."""
+        self._refused += 1
+        raise PublishFlowControlError(f"Publish refused: {reason}")
+
+    def _observe(self, latency: float) -> None:
+        """Feed a publish latency to the EWMA, the limiter and the blocked state."""
+        self._latency += self._smoothing * (latency - self._latency)
+        self.limiter.observe(latency)
+        if latency > self.blocked_threshold:
+            self.on_blocked(reason=f"publish stalled for {latency:.2f}s", inferred=True)
+        elif self.blocked:
+            self.on_unblocked()
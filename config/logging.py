@@ -1,18 +1,49 @@
 """Module for configuring logging settings."""
 
+import atexit
+import functools
 import logging
 import logging.config
 import logging.handlers
 import os
+import queue
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import Callable, Hashable
 from pathlib import Path
 from typing import Any
 
-from toolkit.parsers import TOMLParser
+from toolkit.parsers import CachedTOMLParser
+from toolkit.ratelimit import TokenBucket
+
+
+@functools.lru_cache(maxsize=1024)
+def get_relative_path(pathname: str, start: str) -> str:
+    """
+    Return `pathname` relative to `start`, stripped of any site-packages prefix.
+
+    The result is memoized: a process logs from a small, fixed set of source files,
+    so the path arithmetic runs once per file instead of once per record.
+    """
+    relativepath = os.path.relpath(pathname, start=start)
+
+    # If the record is for a third-party logger, remove the path to site-packages/.
+    if "site-packages" in relativepath:
+        try:
+            relativepath = relativepath.split("site-packages/")[1]
+        except IndexError:
+            pass  # Ignore if it doesn't match the expected structure.
+    return relativepath
 
 
 class RelativePathFilter:
     """A logging filter that adds a `relativepath` attribute to log records."""
 
+    def __init__(self) -> None:
+        """Instantiate a `RelativePathFilter`, capturing the working directory once."""
+        self._cwd = os.getcwd()
+
     def filter(self, record: logging.LogRecord) -> bool:
         """
         Modify the log record to include a `relativepath` attribute.
@@ -32,19 +63,172 @@ class RelativePathFilter:
         The `relativepath` is computed by checking for site-packages`paths.
         It strips these paths to show only the relevant file path for debugging.
         """
-        relativepath = os.path.relpath(record.pathname, start=os.getcwd())
-
-        # If the record is for a third-party logger, remove the path to site-packages/.
-        if "site-packages" in relativepath:
-            try:
-                relativepath = relativepath.split("site-packages/")[1]
-            except IndexError:
-                pass  # Ignore if it doesn't match the expected structure.
-        setattr(record, "relativepath", relativepath)
+        setattr(record, "relativepath", get_relative_path(record.pathname, self._cwd))
 
         return True
 
 
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    A `QueueHandler` that never blocks the emitting thread.
+
+    With a bounded queue, a record that does not fit is dropped and counted instead
+    of blocking the event loop until the listener catches up. Records are queued
+    as they are, unformatted, so the formatting runs on the listener thread.
+    """
+
+    def __init__(self, queue: "queue.Queue[logging.LogRecord]") -> None:
+        """Instantiate a `NonBlockingQueueHandler` object."""
+        super().__init__(queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Return the record to queue, as is.
+
+        The stdlib handler formats the record here, on the emitting thread, to make
+        it picklable for a queue of another process. The queue is drained by a
+        listener of this process, so its handlers format the record instead; the
+        arguments of a record are then rendered when it is handled, not emitted.
+        """
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put the record on the queue, dropping it if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class SuppressingFilter(logging.Filter, ABC):
+    """
+    Base class for filters that drop high-volume records and report what they drop.
+
+    Records at or above `exempt_level` always pass. Dropped records are counted per
+    key, and every `report_interval` seconds the counts are logged as summary records
+    ("Suppressed 1234 records ..."), so the volume stays visible without the lines.
+    """
+
+    def __init__(
+        self,
+        exempt_level: int = logging.WARNING,
+        report_interval: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Instantiate a `SuppressingFilter` object."""
+        super().__init__()
+        self.exempt_level = exempt_level
+        self.report_interval = report_interval
+        self._clock = clock
+        self._suppressed: defaultdict[Hashable, int] = defaultdict(int)
+        self._reported_at = clock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return whether the record should be logged, counting it if not."""
+        if record.levelno >= self.exempt_level or hasattr(record, "suppressed"):
+            return True
+
+        key = self.get_key(record)
+        admitted = self.admit(key)
+        if not admitted:
+            self._suppressed[key] += 1
+        if (
+            self._suppressed
+            and self._clock() - self._reported_at >= self.report_interval
+        ):
+            self.report(logger_name=record.name)
+        return admitted
+
+    def report(self, logger_name: str) -> None:
+        """Log one summary record per key with suppressed records, then reset."""
+        elapsed = self._clock() - self._reported_at
+        suppressed, self._suppressed = self._suppressed, defaultdict(int)
+        self._reported_at = self._clock()
+
+        logger = logging.getLogger(logger_name)
+        for key, count in suppressed.items():
+            logger.info(
+                "Suppressed %d records from %s in the last %.0fs",
+                count,
+                key,
+                elapsed,
+                extra={"suppressed": count},
+            )
+
+    @abstractmethod
+    def get_key(self, record: logging.LogRecord) -> Hashable:
+        """Return the key under which the record is limited and counted."""
+
+    @abstractmethod
+    def admit(self, key: Hashable) -> bool:
+        """Return whether a record with the given key should be logged."""
+
+
+class SamplingFilter(SuppressingFilter):
+    """Log 1 in `sample_rate` records per logger and message template."""
+
+    def __init__(self, sample_rate: int, **kwargs: Any) -> None:
+        """Instantiate a `SamplingFilter` object."""
+        if sample_rate < 1:
+            raise ValueError("The sample rate should be at least 1")
+        super().__init__(**kwargs)
+        self.sample_rate = sample_rate
+        self._seen: defaultdict[Hashable, int] = defaultdict(int)
+
+    def get_key(self, record: logging.LogRecord) -> Hashable:
+        """Key the record by its logger and unformatted message template."""
+        return (record.name, record.msg)
+
+    def admit(self, key: Hashable) -> bool:
+        """Admit the first record of every `sample_rate` records of the key."""
+        seen = self._seen[key]
+        self._seen[key] = seen + 1
+        return seen % self.sample_rate == 0
+
+
+class RateLimitFilter(SuppressingFilter):
+    """Limit the records of each call site with a token bucket."""
+
+    def __init__(self, rate: float, burst: float, **kwargs: Any) -> None:
+        """Instantiate a `RateLimitFilter` allowing `rate` records per second."""
+        super().__init__(**kwargs)
+        self.rate = rate
+        self.burst = burst
+        self._buckets: dict[Hashable, TokenBucket] = {}
+
+    def get_key(self, record: logging.LogRecord) -> Hashable:
+        """Key the record by its call site."""
+        return f"{record.pathname}:{record.lineno}"
+
+    def admit(self, key: Hashable) -> bool:
+        """Admit the record if the bucket of its call site has a token."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(
+                rate=self.rate, burst=self.burst, clock=self._clock
+            )
+        return bucket.try_acquire()
+
+
+class LazyLogger:
+    """
+    Stand-in for the application logger, configuring logging on first use.
+
+    Importing a module that holds a `LazyLogger` neither reads the settings file nor
+    touches the logging configuration or the log directories; `LoggingConfig.setup`
+    runs the first time an attribute of the logger, e.g. `info`, is accessed.
+    """
+
+    def __init__(self, logging_config: "LoggingConfig") -> None:
+        """Instantiate a `LazyLogger` backed by the given `LoggingConfig`."""
+        self._logging_config = logging_config
+
+    def __getattr__(self, name: str) -> Any:
+        """Return the attribute of the configured logger."""
+        return getattr(self._logging_config.get_logger(), name)
+
+
 class LoggingConfig:
     """Class for configuring logging settings based on a specified config file."""
 
@@ -52,8 +236,9 @@ class LoggingConfig:
         self, env: str = "development", config_path: str = "settings.toml"
     ) -> None:
         self._env = env
-        self._parser = TOMLParser(file_path=config_path)
+        self._parser = CachedTOMLParser(file_path=config_path)
         self._logger: logging.Logger | None = None
+        self._listener: logging.handlers.QueueListener | None = None
 
     def get_logger(self) -> logging.Logger:
         """Return a logger instance, initializing it if necessary."""
@@ -64,7 +249,8 @@ class LoggingConfig:
 
     def setup(self) -> None:
         """Set up the logging configurations."""
-        logging_config = self._parser.read()["logging"]
+        config = self._parser.read()
+        logging_config = config["logging"]
 
         # Check or create the dirs of log files specified in the config.
         handlers = logging_config.get("handlers", None)
@@ -80,6 +266,101 @@ class LoggingConfig:
         for handler in self._logger.handlers:
             handler.addFilter(RelativePathFilter())
 
+        sampling_config = config.get("logging_sampling", {}).get(self._env, {})
+        if sampling_config.get("enabled", False):
+            for sampling_filter in self.get_sampling_filters(config=sampling_config):
+                self._logger.addFilter(sampling_filter)
+
+        queue_config = config.get("logging_queue", {})
+        if queue_config.get("enabled", False):
+            self.setup_queue(
+                logger=self._logger,
+                maxsize=queue_config.get("maxsize", 0),
+                respect_handler_level=queue_config.get("respect_handler_level", True),
+            )
+
+    @staticmethod
+    def get_sampling_filters(config: dict[str, Any]) -> list[SuppressingFilter]:
+        """
+        Build the sampling and rate-limit filters from a `[logging_sampling]` table.
+
+        Parameters
+        ----------
+        config : dict[str, Any]
+            The sampling settings of the current environment.
+
+        Returns
+        -------
+        list[SuppressingFilter]
+            The filters to add to the logger, in the order they should run.
+        """
+        options = {
+            "exempt_level": logging.getLevelName(config.get("exempt_level", "WARNING")),
+            "report_interval": config.get("report_interval", 10.0),
+        }
+        filters: list[SuppressingFilter] = []
+        if config.get("sample_rate", 1) > 1:
+            filters.append(SamplingFilter(sample_rate=config["sample_rate"], **options))
+        if config.get("rate_limit", 0) > 0:
+            filters.append(
+                RateLimitFilter(
+                    rate=config["rate_limit"],
+                    burst=config.get("rate_limit_burst", config["rate_limit"]),
+                    **options,
+                )
+            )
+        return filters
+
+    def setup_queue(
+        self,
+        logger: logging.Logger,
+        maxsize: int = 0,
+        respect_handler_level: bool = True,
+    ) -> NonBlockingQueueHandler:
+        """
+        Move the logger's handlers behind a queue, drained by a background thread.
+
+        The calling thread (typically the event loop) only puts the unformatted
+        records on a queue; formatting, the console and the rotating file I/O all
+        happen on the thread of a `QueueListener`, which is stopped, flushing the
+        queue, at interpreter exit.
+
+        Parameters
+        ----------
+        logger : logging.Logger
+            The logger whose handlers are moved behind the queue.
+        maxsize : int, optional
+            The maximum number of queued records, beyond which records are dropped
+            (default is 0, unbounded).
+        respect_handler_level : bool, optional
+            Whether the listener applies the level of each handler (default is True).
+
+        Returns
+        -------
+        NonBlockingQueueHandler
+            The handler now attached to the logger.
+        """
+        handlers = list(logger.handlers)
+        record_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=maxsize)
+        queue_handler = NonBlockingQueueHandler(record_queue)
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(queue_handler)
+
+        self.shutdown()
+        self._listener = logging.handlers.QueueListener(
+            record_queue, *handlers, respect_handler_level=respect_handler_level
+        )
+        self._listener.start()
+        atexit.register(self.shutdown)
+        return queue_handler
+
+    def shutdown(self) -> None:
+        """Stop the queue listener, if any, after it has handled queued records."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
     @staticmethod
     def validate_and_create_dirs(handlers: dict[str, dict[str, Any]]) -> list[Path]:
         """
@@ -0,0 +1,62 @@
+"""Module holding the memory budgets of the stages and the allocation snapshots."""
+
+from collections.abc import Callable
+from typing import Any
+
+from aio_pika.abc import AbstractIncomingMessage
+
+from toolkit.memory import AllocationTracker, MemoryAccountant
+
+# Stages budgeted by the `[memory.budgets]` settings table:
+# - `prefetch`: messages delivered by the broker and not handled yet, queued for a
+#   worker or being handled; over budget, the consumers stop taking deliveries.
+# - `decode`: payloads decoded by the handlers, held until the handler returns.
+# - `publish_window`: published messages not confirmed by the broker yet; over
+#   budget, `AsyncRabbitmqManager.publish` waits.
+accountant = MemoryAccountant()
+tracker = AllocationTracker()
+
+
+def setup_memory(config: dict[str, Any]) -> MemoryAccountant:
+    """
+    Configure the budgets and the allocation snapshots from the `[memory]` table.
+
+    Parameters
+    ----------
+    config : dict[str, Any]
+        The `[memory]` table: `tracemalloc_frames`, and the `budgets` table of the
+        bytes each stage may hold.
+
+    Returns
+    -------
+    MemoryAccountant
+        The accountant of the application, configured.
+    """
+    tracker.frames = config["tracemalloc_frames"]
+    accountant.configure(config["budgets"])
+    return accountant
+
+
+def get_body_size(message: AbstractIncomingMessage) -> int:
+    """Return the bytes accounted for a consumed message: its body."""
+    return len(message.body)
+
+
+def take_snapshot() -> str:
+    """Take an allocation snapshot and render its growth by module."""
+    return tracker.render(tracker.snapshot())
+
+
+def stop_snapshots() -> str:
+    """Stop tracing the allocations."""
+    tracker.stop()
+    return "Allocation tracing stopped\n"
+
+
+def get_routes() -> dict[str, Callable[[], str]]:
+    """Return the memory pages of the admin endpoint, for the `MetricsServer`."""
+    return {
+        "/memory": accountant.render,
+        "/memory/snapshot": take_snapshot,
+        "/memory/stop": stop_snapshots,
+    }
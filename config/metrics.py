@@ -0,0 +1,314 @@
+"""Module holding the metrics of the application, served in the Prometheus format."""
+
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from aio_pika.abc import AbstractIncomingMessage
+
+from toolkit.metrics import CounterChild, HistogramChild, MetricsRegistry
+
+if TYPE_CHECKING:
+    from toolkit.memory import MemoryAccountant, MemoryBudget
+    from toolkit.resilience import CircuitBreaker
+
+    from .acks import AckCoalescer
+    from .flow_control import PublishFlowController
+    from .spool import PublishSpool
+    from .tuning import TuningWatcher
+
+MessageHandler = Callable[[AbstractIncomingMessage], Awaitable[None]]
+
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+registry = MetricsRegistry()
+
+# Publishing
+publish_duration = registry.histogram(
+    "rabbitmq_publish_duration_seconds",
+    "Time spent in `AsyncRabbitmqManager.publish`, admission and spool included.",
+    labelnames=["exchange"],
+)
+confirm_duration = registry.histogram(
+    "rabbitmq_publish_confirm_duration_seconds",
+    "Time from sending a message to its confirmation by the broker.",
+    labelnames=["exchange"],
+)
+published_messages = registry.counter(
+    "rabbitmq_published_messages_total",
+    "Messages handed to `AsyncRabbitmqManager.publish`, by outcome.",
+    labelnames=["exchange", "outcome"],
+)
+published_bytes = registry.histogram(
+    "rabbitmq_published_message_bytes",
+    "Body sizes of the published messages.",
+    labelnames=["exchange"],
+    buckets=SIZE_BUCKETS,
+)
+
+# Consuming
+handler_duration = registry.histogram(
+    "rabbitmq_consumer_handler_duration_seconds",
+    "Time spent handling a consumed message.",
+    labelnames=["consumer"],
+)
+consumed_messages = registry.counter(
+    "rabbitmq_consumed_messages_total",
+    "Consumed messages, by outcome of their handling.",
+    labelnames=["consumer", "outcome"],
+)
+in_flight_messages = registry.gauge(
+    "rabbitmq_consumer_messages_in_flight",
+    "Messages being handled.",
+    labelnames=["consumer"],
+)
+redelivered_messages = registry.counter(
+    "rabbitmq_consumer_redelivered_messages_total",
+    "Consumed messages flagged as redelivered by the broker.",
+    labelnames=["consumer"],
+)
+acked_messages = registry.counter(
+    "rabbitmq_consumer_acked_messages_total",
+    "Messages acknowledged by the ack coalescer.",
+    labelnames=["consumer"],
+)
+ack_frames = registry.counter(
+    "rabbitmq_consumer_ack_frames_total",
+    "Acks sent by the ack coalescer, each for one or more messages.",
+    labelnames=["consumer"],
+)
+pending_acks = registry.gauge(
+    "rabbitmq_consumer_pending_acks",
+    "Completed messages waiting for the next flush of the ack coalescer.",
+    labelnames=["consumer"],
+)
+consumed_bytes = registry.histogram(
+    "rabbitmq_consumed_message_bytes",
+    "Body sizes of the consumed messages.",
+    labelnames=["consumer"],
+    buckets=SIZE_BUCKETS,
+)
+
+# End-to-end latency of correlated flows, by stage.
+STAGE_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+stage_queue_wait = registry.histogram(
+    "order_stage_queue_wait_seconds",
+    "Time from the publish of a correlated message to the start of its handling.",
+    labelnames=["stage"],
+    buckets=STAGE_BUCKETS,
+)
+stage_processing = registry.histogram(
+    "order_stage_processing_seconds",
+    "Time spent handling a correlated message.",
+    labelnames=["stage"],
+    buckets=STAGE_BUCKETS,
+)
+stage_end_to_end = registry.histogram(
+    "order_stage_end_to_end_seconds",
+    "Time from the origin of a correlated flow to the end of a stage.",
+    labelnames=["stage"],
+    buckets=STAGE_BUCKETS,
+)
+
+# Components, read from their stats when scraped.
+spool_messages = registry.gauge(
+    "rabbitmq_spool_messages", "Messages waiting in the publish spool."
+)
+spool_bytes = registry.gauge(
+    "rabbitmq_spool_used_bytes", "Bytes used in the publish spool."
+)
+spool_dropped = registry.counter(
+    "rabbitmq_spool_dropped_messages_total",
+    "Messages dropped by the publish spool overflow policy.",
+)
+flow_control_blocked = registry.gauge(
+    "rabbitmq_flow_control_blocked",
+    "Whether the publishing connection is considered blocked by the broker.",
+)
+flow_control_rate = registry.gauge(
+    "rabbitmq_flow_control_rate", "Publishes per second admitted by flow control."
+)
+flow_control_waiting = registry.gauge(
+    "rabbitmq_flow_control_waiting", "Publishes waiting for admission."
+)
+tuning_generation = registry.gauge(
+    "tuning_generation", "Number of tuning settings applied since the start."
+)
+tuning_changes = registry.counter(
+    "tuning_changes_total", "Tuning settings changed by live reloads."
+)
+tuning_rejected = registry.counter(
+    "tuning_rejected_total", "Edits of the tuning settings rejected as invalid."
+)
+memory_budget_used = registry.gauge(
+    "memory_budget_used_bytes", "Bytes held by a stage.", labelnames=["stage"]
+)
+memory_budget_limit = registry.gauge(
+    "memory_budget_limit_bytes", "Bytes a stage may hold.", labelnames=["stage"]
+)
+memory_budget_waiting = registry.gauge(
+    "memory_budget_waiting",
+    "Items waiting for the memory budget of a stage.",
+    labelnames=["stage"],
+)
+memory_budget_throttled = registry.counter(
+    "memory_budget_throttled_total",
+    "Items that waited for the memory budget of a stage.",
+    labelnames=["stage"],
+)
+
+breaker_state = registry.gauge(
+    "circuit_breaker_state",
+    "Whether a circuit breaker is in a state (1) or not (0).",
+    labelnames=["breaker", "state"],
+)
+breaker_opened = registry.counter(
+    "circuit_breaker_opened_total",
+    "Times a circuit breaker opened.",
+    labelnames=["breaker"],
+)
+breaker_rejected = registry.counter(
+    "circuit_breaker_rejected_calls_total",
+    "Calls refused by an open circuit breaker.",
+    labelnames=["breaker"],
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PublishMetrics:
+    """The publishing metrics of an exchange, bound once and reused per publish."""
+
+    duration: HistogramChild
+    confirm_duration: HistogramChild
+    sizes: HistogramChild
+    confirmed: CounterChild
+    spooled: CounterChild
+    refused: CounterChild
+    failed: CounterChild
+
+    @classmethod
+    def bind(cls, exchange: str) -> "PublishMetrics":
+        """Bind the publishing metrics of `exchange`."""
+        return cls(
+            duration=publish_duration.labels(exchange),
+            confirm_duration=confirm_duration.labels(exchange),
+            sizes=published_bytes.labels(exchange),
+            confirmed=published_messages.labels(exchange, "confirmed"),
+            spooled=published_messages.labels(exchange, "spooled"),
+            refused=published_messages.labels(exchange, "refused"),
+            failed=published_messages.labels(exchange, "failed"),
+        )
+
+
+def instrument_handler(consumer: str, handler: MessageHandler) -> MessageHandler:
+    """
+    Wrap a message handler to record the consuming metrics of `consumer`.
+
+    Parameters
+    ----------
+    consumer : str
+        The name of the consumer, used as the `consumer` label.
+    handler : MessageHandler
+        The coroutine function handling a consumed message.
+
+    Returns
+    -------
+    MessageHandler
+        The instrumented handler.
+    """
+    duration = handler_duration.labels(consumer)
+    succeeded = consumed_messages.labels(consumer, "succeeded")
+    failed = consumed_messages.labels(consumer, "failed")
+    in_flight = in_flight_messages.labels(consumer)
+    redelivered = redelivered_messages.labels(consumer)
+    sizes = consumed_bytes.labels(consumer)
+
+    async def instrumented(message: AbstractIncomingMessage) -> None:
+        sizes.observe(len(message.body))
+        if message.redelivered:
+            redelivered.inc()
+        in_flight.inc()
+        started_at = time.perf_counter()
+        try:
+            await handler(message)
+        except BaseException:
+            failed.inc()
+            raise
+        else:
+            succeeded.inc()
+        finally:
+            duration.observe(time.perf_counter() - started_at)
+            in_flight.dec()
+
+    return instrumented
+
+
+def instrument_acks(consumer: str, acks: "AckCoalescer") -> None:
+    """Export the stats of the ack coalescer of `consumer`."""
+    acked_messages.labels(consumer).set_function(lambda: acks.stats().acked)
+    ack_frames.labels(consumer).set_function(lambda: acks.stats().frames)
+    pending_acks.labels(consumer).set_function(lambda: acks.stats().pending)
+
+
+def instrument_spool(spool: "PublishSpool") -> None:
+    """Export the stats of the publish spool."""
+    spool_messages.unlabelled.set_function(lambda: spool.stats().depth)
+    spool_bytes.unlabelled.set_function(lambda: spool.stats().used_bytes)
+    spool_dropped.unlabelled.set_function(lambda: spool.stats().dropped)
+
+
+def instrument_flow_control(flow_control: "PublishFlowController") -> None:
+    """Export the stats of the publish flow controller."""
+    flow_control_blocked.unlabelled.set_function(lambda: flow_control.blocked)
+    flow_control_rate.unlabelled.set_function(lambda: flow_control.limiter.rate)
+    flow_control_waiting.unlabelled.set_function(lambda: flow_control.stats().waiting)
+
+
+def instrument_tuning(tuning: "TuningWatcher") -> None:
+    """Export the stats of the tuning watcher."""
+    tuning_generation.unlabelled.set_function(lambda: tuning.stats().generation)
+    tuning_changes.unlabelled.set_function(lambda: tuning.stats().changes)
+    tuning_rejected.unlabelled.set_function(lambda: tuning.stats().rejected)
+
+
+def instrument_memory(accountant: "MemoryAccountant") -> None:
+    """Export the stats of the memory budgets."""
+    for stage, budget in accountant.budgets.items():
+        instrument_budget(stage, budget)
+
+
+def instrument_budget(stage: str, budget: "MemoryBudget") -> None:
+    """Export the stats of the memory budget of `stage`."""
+    memory_budget_used.labels(stage).set_function(lambda: budget.used)
+    memory_budget_limit.labels(stage).set_function(lambda: budget.limit)
+    memory_budget_waiting.labels(stage).set_function(lambda: budget.stats().waiting)
+    memory_budget_throttled.labels(stage).set_function(lambda: budget.stats().throttled)
+
+
+def instrument_breaker(name: str, breaker: "CircuitBreaker") -> None:
+    """Export the stats of the circuit breaker `name`, a gauge per state."""
+    from toolkit.resilience import BreakerState
+
+    def is_in(state: BreakerState) -> Callable[[], float]:
+        return lambda: float(breaker.state is state)
+
+    for state in BreakerState:
+        breaker_state.labels(name, state).set_function(is_in(state))
+    breaker_opened.labels(name).set_function(lambda: breaker.stats().opened)
+    breaker_rejected.labels(name).set_function(lambda: breaker.stats().rejected)
@@ -0,0 +1,162 @@
+"""Module holding the on-demand profiling of live consumers."""
+
+import asyncio
+import logging
+import os
+import signal
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Self
+
+from toolkit.profiling import PhaseProfile, SamplingProfiler
+from toolkit.tracing import Span, Tracer
+
+from .tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# The consumers attribute their samples through this profiler, idle until started.
+profiler = SamplingProfiler()
+
+
+class ProfilingControl:
+    """
+    Start and stop the profilers of a running process, from a signal or an endpoint.
+
+    Two profilers are available:
+
+    - the sampling profiler, toggled by `SIGUSR1` or `/profile/start` and
+      `/profile/stop`, writing its samples as collapsed stacks in `output_dir`;
+    - the phase profile of the next `messages` consumed messages, started by
+      `SIGUSR2` or `/profile/messages` and rendered by `/profile/phases`, then
+      written in `output_dir` once complete.
+
+    Example
+    -------
+    ```python
+    control = ProfilingControl(profiler, tracer, output_dir="profiles")
+    control.install_signal_handlers()
+    server = MetricsServer(registry, routes=control.routes())
+    ```
+    """
+
+    def __init__(
+        self,
+        sampler: SamplingProfiler,
+        tracer: Tracer,
+        output_dir: str = "profiles",
+        messages: int = 100,
+    ) -> None:
+        """
+        Instantiate a `ProfilingControl` object.
+
+        Parameters
+        ----------
+        sampler : SamplingProfiler
+            The sampling profiler, whose interval is kept.
+        tracer : Tracer
+            The tracer whose spans time the phases of the messages.
+        output_dir : str, optional
+            The directory of the written profiles (default is "profiles").
+        messages : int, optional
+            Messages profiled by a phase profile (default is 100).
+        """
+        self.sampler = sampler
+        self.tracer = tracer
+        self.output_dir = Path(output_dir)
+        self.messages = messages
+        self.phase_profile: PhaseProfile | None = None
+        self._unsubscribe: Callable[[], None] | None = None
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> Self:
+        """Create the control of the global profiler from the `[profiling]` table."""
+        profiler.interval = config["interval"]
+        return cls(
+            sampler=profiler,
+            tracer=tracer,
+            output_dir=config["output_dir"],
+            messages=config["messages"],
+        )
+
+    def start(self) -> str:
+        """Start the sampling profiler, attributing samples to the running loop."""
+        if self.sampler.running:
+            return "The sampling profiler is already running\n"
+        try:
+            loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        self.sampler.start(loop=loop)
+        logger.info("Sampling profiler started, every %ss", self.sampler.interval)
+        return "Sampling profiler started\n"
+
+    def stop(self) -> str:
+        """Stop the sampling profiler, write its samples and return them."""
+        if not self.sampler.running:
+            return "The sampling profiler is not running\n"
+        collapsed = self.sampler.stop()
+        path = self._write("cpu", "collapsed", collapsed)
+        logger.info(
+            "Sampling profiler stopped, %d samples written to %s",
+            self.sampler.samples,
+            path,
+        )
+        return collapsed
+
+    def toggle(self) -> None:
+        """Start the sampling profiler, or stop it if running."""
+        if self.sampler.running:
+            self.stop()
+        else:
+            self.start()
+
+    def profile_messages(self) -> str:
+        """Start timing the phases of the next `messages` consumed messages."""
+        if self._unsubscribe is not None:
+            return "A phase profile is already running\n"
+        profile = self.phase_profile = PhaseProfile(self.messages)
+
+        def observe(span: Span) -> None:
+            profile.add(span)
+            if profile.done and self._unsubscribe is not None:
+                self._unsubscribe()
+                self._unsubscribe = None
+                path = self._write("phases", "txt", profile.render())
+                logger.info("Phase profile written to %s", path)
+
+        self._unsubscribe = self.tracer.subscribe(observe)
+        logger.info("Profiling the phases of the next %d messages", self.messages)
+        return f"Profiling the phases of the next {self.messages} messages\n"
+
+    def render_phases(self) -> str:
+        """Return the last phase profile, complete or not."""
+        if self.phase_profile is None:
+            return "No phase profile yet\n"
+        return self.phase_profile.render()
+
+    def routes(self) -> dict[str, Callable[[], str]]:
+        """Return the pages of the admin endpoint, for the `MetricsServer`."""
+        return {
+            "/profile/start": self.start,
+            "/profile/stop": self.stop,
+            "/profile/messages": self.profile_messages,
+            "/profile/phases": self.render_phases,
+        }
+
+    def install_signal_handlers(
+        self, loop: asyncio.AbstractEventLoop | None = None
+    ) -> None:
+        """Toggle the sampling profiler on `SIGUSR1`, profile messages on `SIGUSR2`."""
+        loop = loop or asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGUSR1, self.toggle)
+        loop.add_signal_handler(signal.SIGUSR2, self.profile_messages)
+
+    def _write(self, kind: str, extension: str, content: str) -> Path:
+        """Write a profile in `output_dir`, named after its kind, time and process."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{kind}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.{extension}"
+        path = self.output_dir / name
+        path.write_text(content, encoding="utf-8")
+        return path
@@ -1,15 +1,54 @@
 """Module holding RabbitMQ management components."""
 
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 
-from aio_pika import ExchangeType, connect_robust
+from aio_pika import ExchangeType, Message, connect_robust
 from aio_pika.abc import (
     AbstractChannel,
     AbstractConnection,
     AbstractExchange,
     AbstractQueue,
+    AbstractRobustConnection,
+    PublishResultType,
+)
+from aio_pika.exceptions import (
+    AMQPConnectionError,
+    ChannelClosed,
+    ChannelInvalidStateError,
+)
+
+from toolkit.memory import MemoryBudget
+from toolkit.tracing import SpanKind
+
+from .endpoints import EndpointSelector
+from .flow_control import (
+    FlowControlPolicy,
+    PublishFlowControlError,
+    PublishFlowController,
+)
+from .metrics import PublishMetrics
+from .spool import PublishSpool
+from .tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Errors raised by `Exchange.publish` while the broker is unreachable or a robust
+# connection is still reconnecting.
+PUBLISH_CONNECTION_ERRORS = (
+    AMQPConnectionError,
+    ChannelClosed,
+    ChannelInvalidStateError,
+    ConnectionError,
 )
 
+# Declares an exchange on a channel, e.g. the `declare_*_exchange` methods of the
+# pubsub classes.
+ExchangeDeclarer = Callable[[AbstractChannel], Awaitable[AbstractExchange]]
+
 
 class AsyncRabbitmqManager:
     """
@@ -68,23 +107,383 @@ class AsyncRabbitmqManager:
     ```
     """
 
-    def __init__(self, amqp_url: str) -> None:
-        """Initialize an `AsyncRabbitmqManager` object."""
-        self._amqp_url = amqp_url
+    def __init__(
+        self,
+        amqp_url: str,
+        spool: PublishSpool | None = None,
+        flow_control: PublishFlowController | None = None,
+        endpoints: EndpointSelector | None = None,
+        publish_budget: MemoryBudget | None = None,
+        reconnect_interval: float = 5.0,
+    ) -> None:
+        """
+        Initialize an `AsyncRabbitmqManager` object.
 
-    async def get_connection(self) -> AbstractConnection:
+        Parameters
+        ----------
+        amqp_url : str
+            The URL of the RabbitMQ server.
+        spool : PublishSpool, optional
+            A local spool that holds messages published while the broker is
+            unreachable, replayed once the connection is back (default is None, which
+            makes `publish` raise connection errors to the caller).
+        flow_control : PublishFlowController, optional
+            Admission control applied to every publish, reacting to broker flow
+            control and publish latency (default is None, no admission control).
+        endpoints : EndpointSelector, optional
+            The nodes of a multi-node broker. When set, connections go to the
+            lowest-latency healthy node and fail over to the others, and `amqp_url`
+            is ignored (default is None, always connect to `amqp_url`).
+        publish_budget : MemoryBudget, optional
+            The memory budget of the messages published and not confirmed yet;
+            over budget, `publish` waits for confirmations (default is None,
+            unlimited).
+        reconnect_interval : float, optional
+            Seconds `publish_to` spools right away after failing to connect, instead
+            of trying to connect for every message (default is 5.0).
+        """
+        self._amqp_url = amqp_url
+        self.spool = spool
+        self.flow_control = flow_control
+        self.endpoints = endpoints
+        self.publish_budget = publish_budget
+        self.reconnect_interval = reconnect_interval
+        self._publish_metrics: dict[str, PublishMetrics] = {}
+        # The long-lived connection and channel of `publish_to`, and the exchanges
+        # declared on the channel, by name.
+        self._publish_connection: AbstractRobustConnection | None = None
+        self._publish_channel: AbstractChannel | None = None
+        self._publish_exchanges: dict[str, AbstractExchange] = {}
+        self._publish_lock = asyncio.Lock()
+        self._connect_retry_at = 0.0
+
+    async def get_connection(self) -> AbstractRobustConnection:
         """
         Get a connection to RabbitMQ.
 
         Establishes and returns a robust connection to RabbitMQ, connecting to
-        the URL provided during initialization.
+        the URL provided during initialization, or to the best node of the
+        configured endpoints, failing over to another node if it goes down. The
+        caller owns the connection and closes it; `publish_to` uses a connection of
+        the manager instead.
 
         Returns
         -------
-        AbstractConnection
+        AbstractRobustConnection
             The connection to the RabbitMQ server.
         """
-        return await connect_robust(url=self._amqp_url)
+        if self.endpoints is None:
+            connection = await connect_robust(url=self._amqp_url)
+        else:
+            endpoint, connection = await self.endpoints.connect(
+                lambda url: connect_robust(url=url)
+            )
+            self.endpoints.watch(endpoint=endpoint, connection=connection)
+        return connection
+
+    async def publish_to(
+        self,
+        *,
+        exchange_name: str,
+        declare_exchange: ExchangeDeclarer,
+        message: Message,
+        routing_key: str,
+    ) -> PublishResultType | None:
+        """
+        Publish a message on the connection of the manager, declaring its exchange.
+
+        The manager keeps one robust connection and channel for publishing, opened
+        on the first publish, and declares every exchange once on the channel. If
+        the connection, the channel or the exchange cannot be obtained, e.g. the
+        broker is unreachable, the message is spooled if a spool is configured: it
+        is replayed once the connection is restored, or by the next publish. After
+        a failed connection, the messages are spooled right away for
+        `reconnect_interval` seconds. Otherwise, the message goes through `publish`.
+
+        Parameters
+        ----------
+        exchange_name : str
+            The name of the exchange, used to spool the message.
+        declare_exchange : ExchangeDeclarer
+            Declares the exchange on the channel of the manager.
+        message : Message
+            The message to publish.
+        routing_key : str
+            The routing key of the message.
+
+        Returns
+        -------
+        PublishResultType | None
+            The broker confirmation, or None if the message was spooled.
+        """
+        try:
+            exchange = await self._get_publish_exchange(
+                exchange_name=exchange_name, declare_exchange=declare_exchange
+            )
+        except PUBLISH_CONNECTION_ERRORS as err:
+            if self.spool is None:
+                raise
+            logger.warning(
+                "Broker unreachable (%r), spooling message to the %s exchange",
+                err,
+                exchange_name,
+            )
+            await self.spool.put(
+                exchange=exchange_name, routing_key=routing_key, message=message
+            )
+            self._get_publish_metrics(exchange_name).spooled.inc()
+            return None
+        return await self.publish(
+            exchange=exchange, message=message, routing_key=routing_key
+        )
+
+    async def close(self) -> None:
+        """Close the connection of `publish_to`, if open."""
+        async with self._publish_lock:
+            connection = self._publish_connection
+            self._publish_connection = None
+            self._publish_channel = None
+            self._publish_exchanges.clear()
+        if connection is not None:
+            await connection.close()
+
+    async def _get_publish_exchange(
+        self, *, exchange_name: str, declare_exchange: ExchangeDeclarer
+    ) -> AbstractExchange:
+        """Return an exchange declared on the publish channel, opening it if needed."""
+        exchange = self._publish_exchanges.get(exchange_name)
+        if exchange is not None:
+            return exchange
+        async with self._publish_lock:
+            connection = self._publish_connection
+            if connection is None:
+                if time.monotonic() < self._connect_retry_at:
+                    raise ConnectionError(
+                        "The broker was unreachable, not retrying yet"
+                    )
+                try:
+                    connection = await self.get_connection()
+                except PUBLISH_CONNECTION_ERRORS:
+                    self._connect_retry_at = time.monotonic() + self.reconnect_interval
+                    raise
+                if self.spool is not None:
+                    connection.reconnect_callbacks.add(self._on_reconnect)
+                self._publish_connection = connection
+            if self._publish_channel is None:
+                self._publish_channel = await self.get_channel(connection=connection)
+            channel = self._publish_channel
+            exchange = self._publish_exchanges.get(exchange_name)
+            if exchange is None:
+                exchange = await declare_exchange(channel)
+                self._publish_exchanges[exchange_name] = exchange
+            return exchange
+
+    async def publish(
+        self,
+        *,
+        exchange: AbstractExchange,
+        message: Message,
+        routing_key: str,
+    ) -> PublishResultType | None:
+        """
+        Publish a message to an exchange, spooling it if the broker is unreachable.
+
+        While the spool holds messages, new messages are published only after the
+        spool has been replayed, so the publishing order is preserved. With flow
+        control configured, the publish must first be admitted by the controller;
+        a refused publish is spooled under the `buffer` policy and raises
+        `PublishFlowControlError` otherwise. The publish runs in a producer span,
+        whose context is stamped on the message as its `traceparent` header.
+
+        Parameters
+        ----------
+        exchange : AbstractExchange
+            The exchange to publish the message to.
+        message : Message
+            The message to publish.
+        routing_key : str
+            The routing key of the message.
+
+        Returns
+        -------
+        PublishResultType | None
+            The broker confirmation, or None if the message was spooled.
+        """
+        metrics = self._get_publish_metrics(exchange.name)
+        metrics.sizes.observe(len(message.body))
+        started_at = time.perf_counter()
+        try:
+            with tracer.start_span(
+                f"publish {exchange.name}",
+                kind=SpanKind.PRODUCER,
+                attributes={
+                    "messaging.destination": exchange.name,
+                    "messaging.rabbitmq.routing_key": routing_key,
+                    "messaging.message.body.size": len(message.body),
+                },
+            ):
+                tracer.inject(message.headers)
+                return await self._admit_and_publish(
+                    exchange=exchange,
+                    message=message,
+                    routing_key=routing_key,
+                    metrics=metrics,
+                )
+        except PublishFlowControlError:
+            metrics.refused.inc()
+            raise
+        except Exception:
+            metrics.failed.inc()
+            raise
+        finally:
+            metrics.duration.observe(time.perf_counter() - started_at)
+
+    def _get_publish_metrics(self, exchange_name: str) -> PublishMetrics:
+        """Return the publish metrics of an exchange, bound on first use."""
+        metrics = self._publish_metrics.get(exchange_name)
+        if metrics is None:
+            metrics = self._publish_metrics[exchange_name] = PublishMetrics.bind(
+                exchange_name
+            )
+        return metrics
+
+    async def _admit_and_publish(
+        self,
+        *,
+        exchange: AbstractExchange,
+        message: Message,
+        routing_key: str,
+        metrics: PublishMetrics,
+    ) -> PublishResultType | None:
+        """Publish a message once admitted by flow control, if configured."""
+        if self.flow_control is None:
+            return await self._publish_or_spool(
+                exchange=exchange,
+                message=message,
+                routing_key=routing_key,
+                metrics=metrics,
+            )
+
+        try:
+            async with self.flow_control.throttle():
+                return await self._publish_or_spool(
+                    exchange=exchange,
+                    message=message,
+                    routing_key=routing_key,
+                    metrics=metrics,
+                )
+        except PublishFlowControlError as err:
+            if (
+                self.flow_control.policy is not FlowControlPolicy.BUFFER
+                or self.spool is None
+            ):
+                raise
+            logger.warning(
+                "%s, spooling message to the %s exchange", err, exchange.name
+            )
+            await self.spool.put(
+                exchange=exchange.name, routing_key=routing_key, message=message
+            )
+            metrics.spooled.inc()
+            return None
+
+    async def _publish_or_spool(
+        self,
+        *,
+        exchange: AbstractExchange,
+        message: Message,
+        routing_key: str,
+        metrics: PublishMetrics,
+    ) -> PublishResultType | None:
+        """Publish a message, spooling it on connection errors if a spool is set."""
+        if self.spool is None:
+            return await self._publish_and_confirm(
+                exchange=exchange,
+                message=message,
+                routing_key=routing_key,
+                metrics=metrics,
+            )
+
+        try:
+            if len(self.spool):
+                await self.spool.replay(
+                    channel=exchange.channel  # type: ignore[attr-defined]
+                )
+            return await self._publish_and_confirm(
+                exchange=exchange,
+                message=message,
+                routing_key=routing_key,
+                metrics=metrics,
+            )
+        except PUBLISH_CONNECTION_ERRORS as err:
+            logger.warning(
+                "Broker unreachable (%r), spooling message to the %s exchange",
+                err,
+                exchange.name,
+            )
+            await self.spool.put(
+                exchange=exchange.name, routing_key=routing_key, message=message
+            )
+            metrics.spooled.inc()
+            return None
+
+    async def _publish_and_confirm(
+        self,
+        *,
+        exchange: AbstractExchange,
+        message: Message,
+        routing_key: str,
+        metrics: PublishMetrics,
+    ) -> PublishResultType | None:
+        """Publish a message within the publish budget, timing its confirmation."""
+        size = len(message.body)
+        if self.publish_budget is not None:
+            await self.publish_budget.acquire(size)
+        started_at = time.perf_counter()
+        try:
+            result = await exchange.publish(message=message, routing_key=routing_key)
+        finally:
+            if self.publish_budget is not None:
+                self.publish_budget.release(size)
+        metrics.confirm_duration.observe(time.perf_counter() - started_at)
+        metrics.confirmed.inc()
+        return result
+
+    async def replay_spool(self, channel: AbstractChannel) -> int:
+        """
+        Replay the spooled messages through `channel`.
+
+        Parameters
+        ----------
+        channel : AbstractChannel
+            An open channel used to publish the spooled messages.
+
+        Returns
+        -------
+        int
+            The number of messages replayed, zero if no spool is configured or the
+            broker became unreachable again.
+        """
+        if self.spool is None or not len(self.spool):
+            return 0
+        try:
+            return await self.spool.replay(channel=channel)
+        except PUBLISH_CONNECTION_ERRORS as err:
+            logger.warning("Spool replay interrupted: %r", err)
+            return 0
+
+    async def _on_reconnect(
+        self, connection: AbstractRobustConnection | None, /, *args: Any, **kwargs: Any
+    ) -> None:
+        """Replay the spool once a robust connection has been restored."""
+        if connection is None:
+            return
+        channel = await self.get_channel(connection=connection)
+        try:
+            replayed = await self.replay_spool(channel=channel)
+            logger.info("Replayed %s spooled messages after reconnecting", replayed)
+        finally:
+            await channel.close()
 
     @staticmethod
     async def get_channel(
@@ -0,0 +1,274 @@
+"""Module holding request/reply RPC over the RabbitMQ direct reply-to pseudo-queue."""
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from aio_pika import Message
+from aio_pika.abc import AbstractChannel, AbstractIncomingMessage, AbstractQueue
+
+from toolkit.tracing import SpanKind
+
+from .tracing import process_message, trace_consumer, tracer
+
+logger = logging.getLogger(__name__)
+
+# The pseudo-queue of direct reply-to: the broker routes the replies straight to the
+# consumer of the requesting channel, with no queue declared per client or request.
+REPLY_TO_QUEUE_NAME = "amq.rabbitmq.reply-to"
+# Header carrying the error of a failed request, instead of a reply body.
+RPC_ERROR_HEADER = "x-rpc-error"
+
+RpcHandler = Callable[[bytes], Awaitable[bytes]]
+
+
+class RpcError(Exception):
+    """Raise when the server failed to handle an RPC request."""
+
+    pass
+
+
+class RpcTimeoutError(RpcError):
+    """Raise when an RPC request got no reply within its timeout."""
+
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class RpcStats:
+    """Point-in-time metrics of an `RpcClient`."""
+
+    pending: int
+    calls: int
+    timed_out: int
+    late_replies: int
+
+
+class RpcClient:
+    """
+    Send RPC requests and wait for their replies through direct reply-to.
+
+    Every request is published with `reply_to` set to `amq.rabbitmq.reply-to` and a
+    unique `correlation_id`; the replies are consumed from the same channel, without
+    acknowledgements as direct reply-to requires, and resolve the future of their
+    request. A single channel thus multiplexes any number of outstanding requests.
+
+    A request with no reply within its timeout raises `RpcTimeoutError`; it is also
+    published with the timeout as its expiration, so the broker drops it rather than
+    have the server handle a request nobody waits for anymore. A reply arriving
+    after the timeout is counted and discarded.
+
+    Example
+    -------
+    ```python
+    client = RpcClient(channel)
+    await client.start()
+    reply = await client.call(routing_key="payments_rpc_queue", body=b"...")
+    ```
+    """
+
+    def __init__(self, channel: AbstractChannel, timeout: float = 5.0) -> None:
+        """
+        Instantiate an `RpcClient` object, consuming no reply until `start`.
+
+        Parameters
+        ----------
+        channel : AbstractChannel
+            The channel publishing the requests and consuming the replies.
+        timeout : float, optional
+            The default seconds to wait for a reply (default is 5.0).
+        """
+        self.channel = channel
+        self.timeout = timeout
+        self._pending: dict[str, asyncio.Future[bytes]] = {}
+        self._queue: AbstractQueue | None = None
+        self._consumer_tag: str | None = None
+        self._calls = 0
+        self._timed_out = 0
+        self._late_replies = 0
+
+    def stats(self) -> RpcStats:
+        """Return the current metrics of the client."""
+        return RpcStats(
+            pending=len(self._pending),
+            calls=self._calls,
+            timed_out=self._timed_out,
+            late_replies=self._late_replies,
+        )
+
+    async def start(self) -> None:
+        """Start consuming the replies, which must precede the first request."""
+        if self._consumer_tag is None:
+            self._queue = await self.channel.get_queue(
+                REPLY_TO_QUEUE_NAME, ensure=False
+            )
+            self._consumer_tag = await self._queue.consume(self._on_reply, no_ack=True)
+
+    async def close(self) -> None:
+        """Stop consuming the replies, failing the outstanding requests."""
+        if self._queue is not None and self._consumer_tag is not None:
+            await self._queue.cancel(self._consumer_tag)
+        self._queue = self._consumer_tag = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(RpcError("RPC client closed"))
+        self._pending.clear()
+
+    async def call(
+        self,
+        *,
+        routing_key: str,
+        body: bytes,
+        exchange: str = "",
+        timeout: float | None = None,
+    ) -> bytes:
+        """
+        Send a request and return the body of its reply.
+
+        Parameters
+        ----------
+        routing_key : str
+            The routing key of the request, the queue name of the server through the
+            default exchange.
+        body : bytes
+            The body of the request.
+        exchange : str, optional
+            The name of the exchange to publish the request to (default is "", the
+            default exchange).
+        timeout : float, optional
+            Seconds to wait for the reply (default is None, the client's timeout).
+
+        Returns
+        -------
+        bytes
+            The body of the reply.
+
+        Raises
+        ------
+        RpcTimeoutError
+            If no reply arrived within the timeout.
+        RpcError
+            If the server failed to handle the request, or the client is not started.
+        """
+        if self._consumer_tag is None:
+            raise RpcError("RPC client not started")
+        timeout = self.timeout if timeout is None else timeout
+        correlation_id = uuid.uuid4().hex
+        future = self._pending[correlation_id] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._calls += 1
+        try:
+            with tracer.start_span(
+                f"rpc {routing_key}",
+                kind=SpanKind.PRODUCER,
+                attributes={"messaging.rabbitmq.routing_key": routing_key},
+            ):
+                message = Message(
+                    body=body,
+                    correlation_id=correlation_id,
+                    reply_to=REPLY_TO_QUEUE_NAME,
+                    expiration=timeout,
+                    headers={},
+                )
+                tracer.inject(message.headers)
+                target = (
+                    await self.channel.get_exchange(exchange, ensure=False)
+                    if exchange
+                    else self.channel.default_exchange
+                )
+                await target.publish(message=message, routing_key=routing_key)
+                return await asyncio.wait_for(future, timeout)
+        except TimeoutError:
+            self._timed_out += 1
+            msg = f"No reply to the RPC request to `{routing_key}` in {timeout}s"
+            raise RpcTimeoutError(msg) from None
+        finally:
+            self._pending.pop(correlation_id, None)
+
+    async def _on_reply(self, message: AbstractIncomingMessage) -> None:
+        """Resolve the request a reply correlates to."""
+        future = self._pending.pop(message.correlation_id or "", None)
+        if future is None or future.done():
+            self._late_replies += 1
+            logger.debug("Discarded an RPC reply with no request waiting for it")
+            return
+        error = (message.headers or {}).get(RPC_ERROR_HEADER)
+        if error is not None:
+            future.set_exception(RpcError(str(error)))
+        else:
+            future.set_result(message.body)
+
+
+class RpcServer:
+    """
+    Handle RPC requests from a queue and publish their replies.
+
+    The reply goes through the default exchange to the `reply_to` of the request,
+    with its `correlation_id`. A handler raising an exception replies with the
+    error in the `x-rpc-error` header, so the client fails right away instead of
+    timing out; the request is acknowledged either way, a retry being the client's
+    decision. Requests with no `reply_to` are handled and acknowledged with no reply.
+
+    Example
+    -------
+    ```python
+    server = RpcServer(channel, name="payments", handler=verify_payment)
+    await server.serve(queue)
+    ```
+    """
+
+    def __init__(
+        self, channel: AbstractChannel, *, name: str, handler: RpcHandler
+    ) -> None:
+        """
+        Instantiate an `RpcServer` object.
+
+        Parameters
+        ----------
+        channel : AbstractChannel
+            The channel publishing the replies.
+        name : str
+            The name of the server, used in traces and logs.
+        handler : RpcHandler
+            The coroutine function returning the reply body to a request body.
+        """
+        self.channel = channel
+        self.name = name
+        self.handler = handler
+        self.on_request = trace_consumer(name, self._on_request)
+
+    async def serve(self, queue: AbstractQueue) -> str:
+        """
+        Start handling the requests of `queue`.
+
+        Returns
+        -------
+        str
+            The consumer tag of the server.
+        """
+        return await queue.consume(self.on_request)
+
+    async def _on_request(self, message: AbstractIncomingMessage) -> None:
+        """Handle a request and publish its reply."""
+        async with process_message(message):
+            headers: dict[str, Any] = {}
+            try:
+                body = await self.handler(message.body)
+            except Exception as err:
+                logger.exception("Failed to handle an RPC request of %s", self.name)
+                body, headers[RPC_ERROR_HEADER] = b"", repr(err)
+            if message.reply_to is None:
+                return
+            with tracer.start_span("reply", kind=SpanKind.PRODUCER):
+                await self.channel.default_exchange.publish(
+                    Message(
+                        body=body,
+                        correlation_id=message.correlation_id,
+                        headers=headers,
+                    ),
+                    routing_key=message.reply_to,
+                )
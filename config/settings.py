@@ -1,13 +1,45 @@
 """Module for handling all the settings in the application."""
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+import json
+from typing import Annotated, Self
+
+from pydantic import field_validator, model_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Class for handling all the settings in the application."""
 
-    AMQP_URL: str
+    AMQP_URL: str | None = None
+    AMQP_URLS: Annotated[list[str], NoDecode] = []
 
     model_config = SettingsConfigDict(
         env_file=".env", case_sensitive=False, extra="forbid"
     )
+
+    @field_validator("AMQP_URLS", mode="before")
+    @classmethod
+    def split_amqp_urls(cls, value: str | list[str]) -> list[str]:
+        """Accept the broker endpoints as a JSON list or a comma-separated string."""
+        if not isinstance(value, str):
+            return value
+        if value.lstrip().startswith("["):
+            urls = json.loads(value)
+            if not isinstance(urls, list) or not all(
+                isinstance(url, str) for url in urls
+            ):
+                raise ValueError("`AMQP_URLS` should be a JSON list of strings")
+            return [url.strip() for url in urls if url.strip()]
+        return [url.strip() for url in value.split(",") if url.strip()]
+
+    @model_validator(mode="after")
+    def check_amqp_urls(self) -> Self:
+        """Check that at least one broker endpoint is configured."""
+        if not self.AMQP_URL and not self.AMQP_URLS:
+            raise ValueError("Either `AMQP_URL` or `AMQP_URLS` should be set")
+        return self
+
+    @property
+    def amqp_urls(self) -> list[str]:
+        """Return the broker endpoints, falling back to the single `AMQP_URL`."""
+        return self.AMQP_URLS or [self.AMQP_URL]  # type: ignore[list-item]
@@ -0,0 +1,230 @@
+"""Module holding the local publish spool, used while RabbitMQ is unreachable."""
+
+import asyncio
+import json
+import struct
+from dataclasses import dataclass
+from typing import Any
+
+from aio_pika import DeliveryMode, Message
+from aio_pika.abc import AbstractChannel
+
+from toolkit.spool import DropPolicy, MmapRingBuffer
+from toolkit.spool.helpers.exceptions import SpoolFullError
+
+_META_LENGTH = struct.Struct("<I")
+
+# Message properties that survive a round trip through the spool.
+_SPOOLED_PROPERTIES = (
+    "app_id",
+    "content_encoding",
+    "content_type",
+    "correlation_id",
+    "headers",
+    "message_id",
+    "priority",
+    "reply_to",
+    "type",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SpoolStats:
+    """Point-in-time metrics of a `PublishSpool`."""
+
+    depth: int
+    used_bytes: int
+    capacity: int
+    spooled: int
+    replayed: int
+    dropped: int
+
+
+@dataclass(frozen=True, slots=True)
+class SpooledMessage:
+    """A message waiting in the spool, with the destination it was published to."""
+
+    exchange: str
+    routing_key: str
+    message: Message
+
+    def encode(self) -> bytes:
+        """Encode the spooled message as a single spool record."""
+        properties: dict[str, Any] = {
+            name: getattr(self.message, name) for name in _SPOOLED_PROPERTIES
+        }
+        properties["delivery_mode"] = int(self.message.delivery_mode)
+        meta = json.dumps(
+            {
+                "exchange": self.exchange,
+                "routing_key": self.routing_key,
+                "properties": properties,
+            },
+            separators=(",", ":"),
+            default=str,
+        ).encode("utf-8")
+        return _META_LENGTH.pack(len(meta)) + meta + self.message.body
+
+    @classmethod
+    def decode(cls, record: bytes) -> "SpooledMessage":
+        """Decode a spool record produced by `encode`."""
+        (meta_length,) = _META_LENGTH.unpack_from(record)
+        meta_end = _META_LENGTH.size + meta_length
+        meta = json.loads(record[_META_LENGTH.size : meta_end])
+        properties = meta["properties"]
+        properties["delivery_mode"] = DeliveryMode(properties["delivery_mode"])
+        return cls(
+            exchange=meta["exchange"],
+            routing_key=meta["routing_key"],
+            message=Message(body=record[meta_end:], **properties),
+        )
+
+
+class PublishSpool:
+    """
+    Durable, ordered holding area for messages that could not be published.
+
+    Messages are encoded into a `MmapRingBuffer`, so they survive process restarts,
+    and replayed in the order they were spooled once a channel is available again.
+
+    When the ring is full, the overflow policy decides what happens:
+
+    - `block`: apply backpressure, waiting up to `block_timeout` seconds for a replay
+      to free space before raising `SpoolFullError`.
+    - `reject`: raise `SpoolFullError` immediately.
+    - `drop_oldest` / `drop_newest`: discard a message and count it as dropped.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        capacity: int,
+        overflow_policy: str = "block",
+        block_timeout: float = 5.0,
+        sync: bool = False,
+    ) -> None:
+        """Instantiate a `PublishSpool` object backed by the file at `file_path`."""
+        self._block = overflow_policy == "block"
+        self._block_timeout = block_timeout
+        drop_policy = DropPolicy.REJECT if self._block else DropPolicy(overflow_policy)
+        self._ring = MmapRingBuffer(
+            file_path=file_path, capacity=capacity, drop_policy=drop_policy, sync=sync
+        )
+        self._space_freed = asyncio.Event()
+        self._replay_lock = asyncio.Lock()
+        self._spooled = 0
+        self._replayed = 0
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "PublishSpool":
+        """Instantiate a `PublishSpool` from the `[rabbitmq.spool]` settings table."""
+        return cls(
+            file_path=config["path"],
+            capacity=config["capacity"],
+            overflow_policy=config.get("overflow_policy", "block"),
+            block_timeout=config.get("block_timeout", 5.0),
+            sync=config.get("sync", False),
+        )
+
+    def __len__(self) -> int:
+        """Return the number of messages waiting in the spool."""
+        return len(self._ring)
+
+    def stats(self) -> SpoolStats:
+        """Return the current metrics of the spool."""
+        return SpoolStats(
+            depth=len(self._ring),
+            used_bytes=self._ring.used_bytes,
+            capacity=self._ring.capacity,
+            spooled=self._spooled,
+            replayed=self._replayed,
+            dropped=self._ring.dropped,
+        )
+
+    async def put(self, *, exchange: str, routing_key: str, message: Message) -> bool:
+        """
+        Spool a message for a later replay.
+
+        Parameters
+        ----------
+        exchange : str
+            The name of the exchange the message is published to.
+        routing_key : str
+            The routing key of the message.
+        message : Message
+            The message to spool.
+
+        Returns
+        -------
+        bool
+            True if the message was spooled, False if the overflow policy dropped it.
+
+        Raises
+        ------
+        SpoolFullError
+            If the spool is full and the overflow policy does not allow dropping.
+        """
+        record = SpooledMessage(
+            exchange=exchange, routing_key=routing_key, message=message
+        ).encode()
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._block_timeout
+        while True:
+            try:
+                stored = self._ring.append(record)
+                break
+            except SpoolFullError:
+                remaining = deadline - loop.time()
+                if not self._block or remaining <= 0:
+                    raise
+                self._space_freed.clear()
+                try:
+                    await asyncio.wait_for(self._space_freed.wait(), remaining)
+                except TimeoutError as err:
+                    raise SpoolFullError(
+                        f"Spool stayed full for {self._block_timeout} seconds"
+                    ) from err
+
+        self._spooled += stored
+        return stored
+
+    async def replay(self, channel: AbstractChannel) -> int:
+        """
+        Publish the spooled messages through `channel`, oldest first.
+
+        A message is removed from the spool only after it has been published, so a
+        failure during the replay leaves it (and everything after it) in place for the
+        next attempt.
+
+        Parameters
+        ----------
+        channel : AbstractChannel
+            An open channel used to publish the spooled messages.
+
+        Returns
+        -------
+        int
+            The number of messages replayed.
+        """
+        replayed = 0
+        async with self._replay_lock:
+            try:
+                while (record := self._ring.peek()) is not None:
+                    spooled = SpooledMessage.decode(record)
+                    exchange = await channel.get_exchange(
+                        spooled.exchange, ensure=False
+                    )
+                    await exchange.publish(
+                        message=spooled.message, routing_key=spooled.routing_key
+                    )
+                    self._ring.pop()
+                    self._space_freed.set()
+                    replayed += 1
+            finally:
+                self._replayed += replayed
+        return replayed
+
+    def close(self) -> None:
+        """Close the underlying ring buffer."""
+        self._ring.close()
@@ -0,0 +1,182 @@
+"""Module holding the tracer of the application and its messaging instrumentation."""
+
+import time
+from collections.abc import Awaitable, Callable
+from types import TracebackType
+from typing import Any
+
+from aio_pika.abc import AbstractIncomingMessage
+
+from toolkit.tracing import (
+    BatchSpanProcessor,
+    FileSpanExporter,
+    OTLPHttpSpanExporter,
+    RatioSampler,
+    SpanExporter,
+    SpanKind,
+    TailSampler,
+    Tracer,
+)
+
+from .acks import AckCoalescer
+from .correlation import PUBLISHED_AT_HEADER
+
+MessageHandler = Callable[[AbstractIncomingMessage], Awaitable[None]]
+
+# The tracer records nothing until `setup_tracing` configures it, so the spans only
+# propagate the context of the traces.
+tracer = Tracer()
+
+
+def setup_tracing(config: dict[str, Any]) -> Tracer:
+    """
+    Configure the tracer from the `[tracing]` settings table.
+
+    Parameters
+    ----------
+    config : dict[str, Any]
+        The `[tracing]` table: `enabled`, `service_name`, `sample_ratio`,
+        `tail_sampling`, `tail_latency_threshold`, `max_pending_traces`, `exporter`
+        ("file" or "otlp"), `file_path`, `otlp_endpoint`, `max_queue_size`,
+        `max_batch_size` and `schedule_delay`.
+
+    Returns
+    -------
+    Tracer
+        The tracer of the application, configured.
+    """
+    if not config["enabled"]:
+        return tracer
+
+    exporter: SpanExporter
+    if config["exporter"] == "otlp":
+        exporter = OTLPHttpSpanExporter(
+            service_name=config["service_name"], endpoint=config["otlp_endpoint"]
+        )
+    elif config["exporter"] == "file":
+        exporter = FileSpanExporter(
+            service_name=config["service_name"], file_path=config["file_path"]
+        )
+    else:
+        raise ValueError(f"Unknown span exporter: {config['exporter']!r}")
+
+    tracer.sampler = RatioSampler(config["sample_ratio"])
+    tracer.tail_sampler = (
+        TailSampler(latency_threshold=config["tail_latency_threshold"])
+        if config["tail_sampling"]
+        else None
+    )
+    tracer.max_pending_traces = config["max_pending_traces"]
+    tracer.processor = BatchSpanProcessor(
+        exporter,
+        max_queue_size=config["max_queue_size"],
+        max_batch_size=config["max_batch_size"],
+        schedule_delay=config["schedule_delay"],
+    )
+    return tracer
+
+
+def trace_consumer(consumer: str, handler: MessageHandler) -> MessageHandler:
+    """
+    Wrap a message handler to run it in a consumer span, continuing the trace.
+
+    The consumer span is the child of the publish span stamped on the message, and
+    the wait of the message in the broker, from its `x-published-at` header to its
+    handling, is recorded as a `broker wait` span before it.
+
+    Parameters
+    ----------
+    consumer : str
+        The name of the consumer, used in the span names.
+    handler : MessageHandler
+        The coroutine function handling a consumed message.
+
+    Returns
+    -------
+    MessageHandler
+        The traced handler.
+    """
+    span_name = f"consume {consumer}"
+
+    async def traced(message: AbstractIncomingMessage) -> None:
+        received_at = time.time_ns()
+        with tracer.start_span(
+            span_name,
+            kind=SpanKind.CONSUMER,
+            parent=tracer.extract(message.headers),
+            attributes={
+                "messaging.consumer": consumer,
+                "messaging.message.body.size": len(message.body),
+                "messaging.rabbitmq.redelivered": message.redelivered,
+            },
+        ):
+            published_at = (message.headers or {}).get(PUBLISHED_AT_HEADER)
+            if isinstance(published_at, int | float):
+                tracer.record_span("broker wait", int(published_at * 1e9), received_at)
+            await handler(message)
+
+    return traced
+
+
+class MessageProcess:
+    """
+    Process a message like `message.process()`, tracing its acknowledgement.
+
+    The body runs in the current span; the ack, or the reject of a failed message,
+    runs in an `ack` span. With an `AckCoalescer`, the ack is left to the coalescer
+    and sent with the next batch, while a reject is still sent right away. A class
+    rather than an `asynccontextmanager`, as one runs per consumed message.
+    """
+
+    __slots__ = ("_acks", "_message", "_process")
+
+    def __init__(
+        self, message: AbstractIncomingMessage, acks: AckCoalescer | None = None
+    ) -> None:
+        """Prepare the processing of `message`."""
+        self._message = message
+        self._acks = acks
+        self._process = message.process() if acks is None else None
+
+    async def __aenter__(self) -> None:
+        """Start processing the message."""
+        if self._process is not None:
+            await self._process.__aenter__()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Ack the message, or reject it if an exception escaped the body."""
+        outcome = "ack" if exc_type is None else "reject"
+        with tracer.start_span("ack", attributes={"messaging.ack": outcome}):
+            if self._process is not None:
+                await self._process.__aexit__(exc_type, exc_value, traceback)
+            elif self._acks is not None:
+                if exc_type is not None:
+                    await self._message.reject()
+                await self._acks.complete(self._message, settled=exc_type is not None)
+
+
+def process_message(
+    message: AbstractIncomingMessage, acks: AckCoalescer | None = None
+) -> MessageProcess:
+    """
+    Return a context manager processing `message`, tracing its acknowledgement.
+
+    Parameters
+    ----------
+    message : AbstractIncomingMessage
+        The message to process.
+    acks : AckCoalescer, optional
+        The coalescer of the acks of the consumer, which must track the message
+        (default is None, ack every message on its own).
+
+    Returns
+    -------
+    MessageProcess
+        The asynchronous context manager processing the message.
+    """
+    return MessageProcess(message, acks)
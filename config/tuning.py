@@ -0,0 +1,281 @@
+"""Module holding the runtime tuning knobs, reloaded live from the settings file."""
+
+import asyncio
+import inspect
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from aio_pika.abc import AbstractChannel
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    NonNegativeInt,
+    PositiveFloat,
+    PositiveInt,
+    ValidationError,
+)
+
+from toolkit.concurrency import WorkerPool
+from toolkit.parsers import CachedTOMLParser
+from toolkit.parsers.helpers.exceptions import TOMLParseError
+
+from .acks import AckCoalescer
+
+logger = logging.getLogger(__name__)
+
+LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+TuningCallback = Callable[["TuningSettings", "TuningSettings"], Awaitable[None] | None]
+
+
+class ConsumerTuning(BaseModel):
+    """Tuning knobs of a consumer."""
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    prefetch_count: NonNegativeInt = Field(
+        default=100, description="Unacknowledged messages per channel, 0 is no limit"
+    )
+    concurrency: PositiveInt = Field(
+        default=100, description="Messages handled concurrently by the worker pool"
+    )
+    ack_batch_size: PositiveInt = Field(
+        default=1, description="Completed messages acknowledged by one frame"
+    )
+    ack_interval: PositiveFloat = Field(
+        default=0.005, description="Seconds a completed message waits for its batch"
+    )
+
+
+class TuningSettings(BaseModel):
+    """The `[tuning]` settings table, validated."""
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    reload_interval: PositiveFloat = Field(
+        default=1.0, description="Seconds between two checks of the settings file"
+    )
+    log_levels: dict[str, LogLevel] = Field(
+        default_factory=dict, description="Levels by logger name"
+    )
+    consumers: dict[str, ConsumerTuning] = Field(
+        default_factory=dict, description="Consumer tuning by consumer name"
+    )
+
+    def consumer(self, name: str) -> ConsumerTuning:
+        """Return the tuning of the consumer `name`, or the defaults."""
+        return self.consumers.get(name, ConsumerTuning())
+
+
+@dataclass(frozen=True, slots=True)
+class TuningStats:
+    """Point-in-time metrics of a `TuningWatcher`."""
+
+    generation: int
+    changes: int
+    rejected: int
+    reloaded_at: float | None
+
+
+def get_changes(
+    old: dict[str, Any], new: dict[str, Any], prefix: str = ""
+) -> list[tuple[str, Any, Any]]:
+    """Return the `(dotted key, old value, new value)` of every changed setting."""
+    changes = []
+    for key in old.keys() | new.keys():
+        old_value, new_value = old.get(key), new.get(key)
+        if isinstance(old_value, dict) or isinstance(new_value, dict):
+            changes.extend(
+                get_changes(old_value or {}, new_value or {}, f"{prefix}{key}.")
+            )
+        elif old_value != new_value:
+            changes.append((f"{prefix}{key}", old_value, new_value))
+    return sorted(changes)
+
+
+class TuningWatcher:
+    """
+    Watch the `[tuning]` table of the settings file and apply its changes live.
+
+    The file is checked every `reload_interval` seconds; thanks to the mtime-keyed
+    cache of `CachedTOMLParser`, an unchanged file costs a single `stat`. A changed
+    table is validated by `TuningSettings` as a whole: an invalid edit is rejected
+    and logged, and the previous settings stay in force. A valid one is logged key by
+    key, log levels are applied right away, and every subscriber is called with the
+    old and new settings, e.g. to update the QoS of a channel or resize a pool.
+
+    Example
+    -------
+    ```python
+    tuning = TuningWatcher("settings.toml")
+    await tuning.start()
+    unsubscribe = bind_consumer(tuning, name="orders", channel=channel, pool=pool)
+    ```
+    """
+
+    def __init__(
+        self, file_path: str = "settings.toml", section: str = "tuning"
+    ) -> None:
+        """
+        Instantiate a `TuningWatcher` object, with the default settings until `start`.
+
+        Parameters
+        ----------
+        file_path : str, optional
+            The path of the settings file (default is "settings.toml").
+        section : str, optional
+            The name of the tuning table (default is "tuning").
+        """
+        self.section = section
+        self._parser = CachedTOMLParser(file_path=file_path)
+        self._subscribers: list[TuningCallback] = []
+        self._task: asyncio.Task[None] | None = None
+        self._raw: dict[str, Any] | None = None
+        self._error: str | None = None
+        self._generation = 0
+        self._changes = 0
+        self._rejected = 0
+        self._reloaded_at: float | None = None
+        self.settings = TuningSettings()
+
+    def stats(self) -> TuningStats:
+        """Return the current metrics of the watcher."""
+        return TuningStats(
+            generation=self._generation,
+            changes=self._changes,
+            rejected=self._rejected,
+            reloaded_at=self._reloaded_at,
+        )
+
+    def subscribe(self, callback: TuningCallback) -> Callable[[], None]:
+        """
+        Call `callback(old, new)` after every applied change of the settings.
+
+        Returns
+        -------
+        Callable[[], None]
+            A function removing the subscription.
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    async def start(self) -> None:
+        """Load the settings and start watching the file, if not watching yet."""
+        if self._task is None or self._task.done():
+            await self.reload()
+            self._task = asyncio.create_task(self._watch(), name="tuning-watcher")
+
+    async def stop(self) -> None:
+        """Stop watching the file."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def reload(self) -> bool:
+        """
+        Read the tuning table and apply it if it changed.
+
+        Returns
+        -------
+        bool
+            True if new settings were applied, False if the table is unchanged or
+            was rejected.
+        """
+        try:
+            raw = self._parser.read().get(self.section, {})
+            if raw is self._raw:
+                return False
+            self._raw = raw
+            settings = TuningSettings.model_validate(raw)
+        except (OSError, TOMLParseError, ValidationError) as err:
+            self._reject(err)
+            return False
+
+        self._error = None
+        old, self.settings = self.settings, settings
+        changes = get_changes(old.model_dump(), settings.model_dump())
+        if self._generation and not changes:
+            return False
+
+        self._generation += 1
+        self._changes += len(changes)
+        self._reloaded_at = time.time()
+        for key, old_value, new_value in changes:
+            logger.info("Tuning changed: %s: %r -> %r", key, old_value, new_value)
+
+        self._apply_log_levels(settings)
+        for callback in list(self._subscribers):
+            try:
+                result = callback(old, settings)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("Failed to apply the tuning changes")
+        return True
+
+    async def _watch(self) -> None:
+        """Reload the settings every `reload_interval` seconds."""
+        while True:
+            await asyncio.sleep(self.settings.reload_interval)
+            await self.reload()
+
+    def _reject(self, err: Exception) -> None:
+        """Count and log a rejected edit, once until the error changes."""
+        if str(err) != self._error:
+            self._error = str(err)
+            self._rejected += 1
+            logger.error("Tuning rejected, keeping the current settings: %s", err)
+
+    @staticmethod
+    def _apply_log_levels(settings: TuningSettings) -> None:
+        """Set the level of every logger listed in the settings."""
+        for name, level in settings.log_levels.items():
+            logging.getLogger(name).setLevel(level)
+
+
+def bind_consumer(
+    tuning: TuningWatcher,
+    *,
+    name: str,
+    channel: AbstractChannel,
+    pool: WorkerPool[Any],
+    acks: AckCoalescer | None = None,
+) -> Callable[[], None]:
+    """
+    Apply the changes of a consumer's tuning to its channel, worker pool and acks.
+
+    Parameters
+    ----------
+    tuning : TuningWatcher
+        The watcher of the tuning settings.
+    name : str
+        The name of the consumer in the `[tuning.consumers]` table.
+    channel : AbstractChannel
+        The channel the consumer consumes from, whose QoS follows `prefetch_count`.
+    pool : WorkerPool[Any]
+        The pool handling the messages, whose size follows `concurrency`.
+    acks : AckCoalescer, optional
+        The coalescer of the consumer's acks, following `ack_batch_size` and
+        `ack_interval` (default is None).
+
+    Returns
+    -------
+    Callable[[], None]
+        A function removing the binding.
+    """
+
+    async def on_change(old: TuningSettings, new: TuningSettings) -> None:
+        before, after = old.consumer(name), new.consumer(name)
+        if after.prefetch_count != before.prefetch_count:
+            await channel.set_qos(prefetch_count=after.prefetch_count)
+        if after.concurrency != before.concurrency:
+            pool.resize(after.concurrency)
+        if acks is not None:
+            acks.max_batch = after.ack_batch_size
+            acks.interval = after.ack_interval
+
+    return tuning.subscribe(on_change)
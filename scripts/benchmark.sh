@@ -0,0 +1,15 @@
+#!/usr/bin/env bash
+
+set -e
+
+GREEN='\033[0;32m'
+NC='\033[0m' # No Color
+
+for benchmark in benchmarks/*.py; do
+    module=$(basename "$benchmark" .py)
+    if [ "$module" != "__init__" ]; then
+        echo -e "${GREEN}Executing benchmarks.${module}...${NC}"
+        python -m "benchmarks.${module}"
+        echo
+    fi
+done
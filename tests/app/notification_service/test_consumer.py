@@ -0,0 +1,206 @@
+"""Test suite for validating `NotificationConsumer` class."""
+
+from unittest import mock
+
+import aio_pika
+import pytest
+
+from app.notification_service.consumer import NotificationConsumer
+from app.notification_service.contacts import ContactResolver, LocalContactBackend
+from app.notification_service.digest import NotificationDigester
+from app.notification_service.dispatcher import NotificationDispatcher
+from app.notification_service.producer import NotificationProducer
+from app.notification_service.schemas import CustomerContact, Notification
+from app.notification_service.senders import LocalSender, NotificationDeliveryError
+from app.order_service.lifecycle import OrderLifecycleStore
+from app.payment_service.schemas import IncomingPayment
+from config.base import AsyncRabbitmqManager
+from config.correlation import Correlation, current_correlation
+
+
+@pytest.fixture
+def mock_rabbitmq_manager() -> mock.AsyncMock:
+    """Mock an instance of AsyncRabbitmqManager for testing purposes."""
+    return mock.AsyncMock(spec_set=AsyncRabbitmqManager)
+
+
+@pytest.fixture
+def sender() -> LocalSender:
+    """Return the in-memory sender of every notification type."""
+    return LocalSender()
+
+
+@pytest.fixture
+def notification_consumer(
+    mock_rabbitmq_manager: mock.AsyncMock, sender: LocalSender
+) -> NotificationConsumer:
+    """Create a NotificationConsumer, delivering through `sender`."""
+    dispatcher = NotificationDispatcher(
+        senders={"sms": sender, "email": sender, "push": sender}
+    )
+    return NotificationConsumer(
+        rabbitmq_manager=mock_rabbitmq_manager, dispatcher=dispatcher
+    )
+
+
+@pytest.mark.asyncio
+async def test_consume_notifications(
+    mock_rabbitmq_manager: mock.AsyncMock, notification_consumer: NotificationConsumer
+) -> None:
+    """Test every type is consumed from its own queue, on its own channel."""
+    # Arrange
+    mock_channels = [mock.AsyncMock(), mock.AsyncMock()]
+    mock_queue = mock.AsyncMock()
+    mock_rabbitmq_manager.get_channel.side_effect = mock_channels
+    mock_rabbitmq_manager.declare_queue.return_value = mock_queue
+
+    # Act
+    with mock.patch(
+        "app.notification_service.consumer.asyncio.Future",
+        new_callable=mock.AsyncMock,
+    ):
+        await notification_consumer.consume_notifications(
+            notification_types=["sms", "email"]
+        )
+
+    # Assert
+    assert mock_rabbitmq_manager.set_qos.await_count == 2
+    assert [
+        call.kwargs for call in mock_rabbitmq_manager.declare_queue.await_args_list
+    ] == [
+        {"channel": mock_channels[0], "name": "notifications_sms_queue"},
+        {"channel": mock_channels[1], "name": "notifications_email_queue"},
+    ]
+    assert mock_queue.consume.await_count == 2
+    assert set(notification_consumer.acks) == {"sms", "email"}
+
+
+@pytest.mark.asyncio
+async def test_on_notification_message(
+    notification: Notification,
+    notification_consumer: NotificationConsumer,
+    sender: LocalSender,
+) -> None:
+    """Test a notification message is delivered, then acknowledged."""
+    # Arrange
+    message = mock.AsyncMock(spec_set=aio_pika.IncomingMessage)
+    message.body = notification.to_message()
+
+    # Act
+    await notification_consumer.on_notification_message(
+        message=message, notification_type=notification.type
+    )
+
+    # Assert
+    assert sender.sent == [notification]
+    message.process.return_value.__aexit__.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_on_notification_message_retries_failed_deliveries(
+    notification: Notification,
+    mock_rabbitmq_manager: mock.AsyncMock,
+    sender: LocalSender,
+) -> None:
+    """Test a transient provider failure is retried before the message is acked."""
+    # Arrange
+    send = mock.AsyncMock(side_effect=[NotificationDeliveryError("Timed out"), None])
+    notification_consumer = NotificationConsumer(
+        rabbitmq_manager=mock_rabbitmq_manager,
+        dispatcher=NotificationDispatcher(
+            senders={notification.type: sender}, retry_backoff=0.001
+        ),
+    )
+    message = mock.AsyncMock(spec_set=aio_pika.IncomingMessage)
+    message.body = notification.to_message()
+
+    # Act
+    with mock.patch.object(sender, "send", send):
+        await notification_consumer.on_notification_message(
+            message=message, notification_type=notification.type
+        )
+
+    # Assert
+    assert send.await_count == 2
+    message.process.return_value.__aexit__.assert_awaited_once_with(None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_on_notification_message_records_the_lifecycle(
+    notification: Notification,
+    mock_rabbitmq_manager: mock.AsyncMock,
+    sender: LocalSender,
+) -> None:
+    """Test a delivered notification marks the order of its correlation notified."""
+    lifecycle = OrderLifecycleStore()
+    notification_consumer = NotificationConsumer(
+        rabbitmq_manager=mock_rabbitmq_manager,
+        dispatcher=NotificationDispatcher(
+            senders={"sms": sender, "email": sender, "push": sender}
+        ),
+        lifecycle=lifecycle,
+    )
+    message = mock.AsyncMock(spec_set=aio_pika.IncomingMessage)
+    message.body = notification.to_message()
+
+    token = current_correlation.set(Correlation.start("order-1"))
+    try:
+        await notification_consumer.on_notification_message(
+            message=message, notification_type=notification.type
+        )
+    finally:
+        current_correlation.reset(token)
+
+    state = lifecycle.get("order-1")
+    assert state is not None
+    assert state.notified
+
+
+@pytest.mark.asyncio
+async def test_on_notification_message_records_the_orders_of_a_digest(
+    incoming_payment: IncomingPayment,
+    mock_rabbitmq_manager: mock.AsyncMock,
+    sender: LocalSender,
+) -> None:
+    """Test a digest of several orders marks every one of them notified."""
+    # Arrange
+    notification_producer = NotificationProducer(
+        rabbitmq_manager=mock_rabbitmq_manager,
+        digester=NotificationDigester(window=60.0),
+        contacts=ContactResolver(
+            LocalContactBackend(
+                contacts={7: CustomerContact(customer_id=7, email="a@x.io")}
+            )
+        ),
+    )
+    for order_id in ("order-1", "order-2"):
+        await notification_producer.produce_notifications(
+            payment=incoming_payment.model_copy(
+                update={"order_id": order_id, "customer_id": 7}
+            )
+        )
+    await notification_producer.close()
+    published = mock_rabbitmq_manager.publish_to.await_args.kwargs["message"]
+
+    lifecycle = OrderLifecycleStore()
+    notification_consumer = NotificationConsumer(
+        rabbitmq_manager=mock_rabbitmq_manager,
+        dispatcher=NotificationDispatcher(senders={"email": sender}),
+        lifecycle=lifecycle,
+    )
+    message = mock.AsyncMock(spec_set=aio_pika.IncomingMessage)
+    message.body = published.body
+    message.headers = published.headers
+
+    # Act
+    await notification_consumer.on_notification_message(
+        message=message, notification_type="email"
+    )
+
+    # Assert
+    mock_rabbitmq_manager.publish_to.assert_awaited_once()
+    assert sender.sent[0].message.startswith("You have 2 updates:")
+    for order_id in ("order-1", "order-2"):
+        state = lifecycle.get(order_id)
+        assert state is not None
+        assert state.notified
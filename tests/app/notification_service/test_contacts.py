@@ -0,0 +1,67 @@
+"""Test suite for validating `ContactResolver` class."""
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+from app.notification_service.contacts import ContactResolver, LocalContactBackend
+from app.notification_service.schemas import CustomerContact
+
+
+@pytest.mark.asyncio
+async def test_resolve_batches_and_caches_the_lookups() -> None:
+    """Test concurrent lookups cost one backend call, and are cached after."""
+    contact = CustomerContact(customer_id=1, email="a@x.io")
+    backend = LocalContactBackend(contacts={1: contact})
+    with mock.patch.object(
+        backend, "fetch_contacts", wraps=backend.fetch_contacts
+    ) as fetch_contacts:
+        resolver = ContactResolver(backend=backend)
+
+        contacts = await asyncio.gather(
+            resolver.resolve(1), resolver.resolve(2), resolver.resolve(1)
+        )
+        assert contacts == [contact, None, contact]
+        assert await resolver.resolve(2) is None
+
+    fetch_contacts.assert_awaited_once_with([1, 2])
+
+
+@pytest.mark.asyncio
+async def test_local_backend_falls_back_to_the_placeholder_email() -> None:
+    """Test a customer with no contact gets the placeholder email, if any."""
+    contact = CustomerContact(customer_id=1, phone="+100")
+    backend = LocalContactBackend(contacts={1: contact}, placeholder_email="p@x.io")
+
+    contacts = await backend.fetch_contacts([1, 2])
+
+    assert contacts == {1: contact, 2: CustomerContact(customer_id=2, email="p@x.io")}
+    assert await LocalContactBackend().fetch_contacts([2]) == {}
+
+
+def test_get_recipient() -> None:
+    """Test the recipient of a type is the matching address of the contact."""
+    contact = CustomerContact(customer_id=1, email="a@x.io", phone="+100")
+
+    assert contact.get_recipient("email") == "a@x.io"
+    assert contact.get_recipient("sms") == "+100"
+    assert contact.get_recipient("push") is None
+
+
+def test_from_config() -> None:
+    """Test building a resolver from its settings table."""
+    resolver = ContactResolver.from_config(
+        {
+            "backend": "local",
+            "max_size": 10,
+            "ttl": 60.0,
+            "negative_ttl": 5.0,
+            "max_batch_size": 20,
+            "placeholder_email": "p@x.io",
+        }
+    )
+
+    assert isinstance(resolver.backend, LocalContactBackend)
+    assert resolver.backend.placeholder_email == "p@x.io"
+    assert resolver.loader.max_batch_size == 20
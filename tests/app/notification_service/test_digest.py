@@ -0,0 +1,171 @@
+"""Test suite for validating `NotificationDigester` class."""
+
+import asyncio
+from collections.abc import Sequence
+
+import pytest
+
+from app.notification_service.digest import NotificationDigester, merge_notifications
+from app.notification_service.schemas import Notification
+
+
+class Publisher:
+    """Keep the published notifications and their contexts in memory."""
+
+    def __init__(self) -> None:
+        """Start with nothing published."""
+        self.published: list[tuple[Notification, list[str]]] = []
+
+    async def __call__(
+        self, notification: Notification, contexts: Sequence[str]
+    ) -> None:
+        """Keep a published notification."""
+        self.published.append((notification, list(contexts)))
+
+
+def make_notification(recipient: str, message: str) -> Notification:
+    """Return an email notification."""
+    return Notification(type="email", recipient=recipient, message=message)
+
+
+def test_merge_notifications() -> None:
+    """Test a digest lists the messages of the merged notifications in order."""
+    digest = merge_notifications(
+        [make_notification("a@x.io", "first"), make_notification("a@x.io", "second")]
+    )
+
+    assert digest.type == "email"
+    assert digest.recipient == "a@x.io"
+    assert digest.message == "You have 2 updates:\n- first\n- second"
+
+
+@pytest.mark.asyncio
+async def test_window_merges_the_notifications_of_a_recipient() -> None:
+    """Test the notifications of a window are published as one digest."""
+    publisher = Publisher()
+    digester: NotificationDigester[str] = NotificationDigester(
+        publish=publisher, window=0.02
+    )
+
+    for index in range(3):
+        await digester.add(make_notification("a@x.io", f"order {index}"), f"c{index}")
+    await digester.add(make_notification("b@x.io", "order 9"), "corr-b")
+    assert publisher.published == []
+
+    await asyncio.sleep(0.05)
+
+    published = dict(
+        (notification.recipient, (notification, contexts))
+        for notification, contexts in publisher.published
+    )
+    digest, contexts = published["a@x.io"]
+    assert digest.message.startswith("You have 3 updates:")
+    assert contexts == ["c0", "c1", "c2"]
+    assert published["b@x.io"] == (make_notification("b@x.io", "order 9"), ["corr-b"])
+    stats = digester.stats()
+    assert (stats.windows, stats.buffered, stats.published, stats.merged) == (
+        0,
+        0,
+        2,
+        3,
+    )
+
+
+@pytest.mark.asyncio
+async def test_oldest_window_is_evicted_early() -> None:
+    """Test opening a window past `max_windows` publishes the oldest one."""
+    publisher = Publisher()
+    digester: NotificationDigester[str] = NotificationDigester(
+        publish=publisher, window=60.0, max_windows=2
+    )
+
+    await digester.add(make_notification("a@x.io", "1"))
+    await digester.add(make_notification("b@x.io", "2"))
+    await digester.add(make_notification("a@x.io", "3"))
+    await digester.add(make_notification("c@x.io", "4"))
+
+    assert [n.recipient for n, _ in publisher.published] == ["a@x.io"]
+    assert digester.stats().windows == 2
+    assert digester.stats().evicted == 1
+
+    await digester.close()
+
+
+@pytest.mark.asyncio
+async def test_full_window_is_published_early() -> None:
+    """Test a window reaching `max_notifications` is published right away."""
+    publisher = Publisher()
+    digester: NotificationDigester[str] = NotificationDigester(
+        publish=publisher, window=60.0, max_notifications=2
+    )
+
+    await digester.add(make_notification("a@x.io", "1"))
+    await digester.add(make_notification("a@x.io", "2"))
+
+    assert len(publisher.published) == 1
+    assert digester.stats().windows == 0
+
+
+@pytest.mark.asyncio
+async def test_close_publishes_every_window() -> None:
+    """Test closing the digester publishes the open windows, e.g. on shutdown."""
+    publisher = Publisher()
+    digester: NotificationDigester[str] = NotificationDigester(
+        publish=publisher, window=60.0
+    )
+    await digester.add(make_notification("a@x.io", "1"))
+    await digester.add(make_notification("b@x.io", "2"))
+
+    await digester.close()
+
+    assert len(publisher.published) == 2
+    assert digester.stats().buffered == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_rescheduled() -> None:
+    """Test a digest failing to publish is buffered again, then retried."""
+    publisher = Publisher()
+    failures = [ConnectionError("Broker down")]
+
+    async def publish(notification: Notification, contexts: Sequence[str]) -> None:
+        if failures:
+            raise failures.pop()
+        await publisher(notification, contexts)
+
+    digester: NotificationDigester[str] = NotificationDigester(
+        publish=publish, window=0.01, retry_interval=0.05
+    )
+    await digester.add(make_notification("a@x.io", "1"), "corr")
+    await digester.add(make_notification("a@x.io", "2"))
+
+    await asyncio.sleep(0.03)
+    assert publisher.published == []
+    assert digester.stats().buffered == 2
+
+    await asyncio.sleep(0.1)
+    [(digest, contexts)] = publisher.published
+    assert digest.message == "You have 2 updates:\n- 1\n- 2"
+    assert contexts == ["corr"]
+    stats = digester.stats()
+    assert (stats.windows, stats.buffered, stats.published, stats.merged) == (
+        0,
+        0,
+        1,
+        2,
+    )
+
+
+@pytest.mark.asyncio
+async def test_add_requires_a_publish_function() -> None:
+    """Test a digester with no publish function refuses notifications."""
+    digester: NotificationDigester[str] = NotificationDigester(window=60.0)
+
+    with pytest.raises(RuntimeError):
+        await digester.add(make_notification("a@x.io", "1"))
+
+
+def test_invalid_window() -> None:
+    """Test a non-positive window is refused."""
+    with pytest.raises(ValueError):
+        NotificationDigester(publish=Publisher(), window=0)
@@ -0,0 +1,139 @@
+"""Test suite for validating `NotificationDispatcher` class."""
+
+import time
+
+import pytest
+
+from app.notification_service.dispatcher import NotificationDispatcher
+from app.notification_service.schemas import Notification
+from app.notification_service.senders import (
+    HttpSender,
+    LocalSender,
+    NotificationDeliveryError,
+)
+from toolkit.concurrency import WorkerPool
+from toolkit.ratelimit import TokenBucket
+
+
+@pytest.mark.asyncio
+async def test_dispatch_to_the_sender_of_the_type(notification: Notification) -> None:
+    """Test a notification is delivered by the sender of its type only."""
+    senders = {"sms": LocalSender(), "email": LocalSender(), "push": LocalSender()}
+    dispatcher = NotificationDispatcher(senders=senders)
+
+    await dispatcher.dispatch(notification)
+
+    assert senders[notification.type].sent == [notification]
+    assert sum(len(sender.sent) for sender in senders.values()) == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_are_independent() -> None:
+    """Test a throttled type does not slow down the other types."""
+    senders = {"sms": LocalSender(latency=0.001), "email": LocalSender(latency=0.001)}
+    dispatcher = NotificationDispatcher(
+        senders=senders,
+        rate_limits={
+            "sms": TokenBucket(rate=20, burst=1),
+            "email": TokenBucket(rate=10_000, burst=100),
+        },
+    )
+    pools = {
+        notification_type: WorkerPool(dispatcher.dispatch, size=10)
+        for notification_type in senders
+    }
+    for pool in pools.values():
+        pool.start()
+
+    started_at = time.perf_counter()
+    for index in range(50):
+        for notification_type, pool in pools.items():
+            await pool.submit(
+                Notification(
+                    type=notification_type, recipient=str(index), message="Hello"
+                )
+            )
+    await pools["email"].join()
+    email_duration = time.perf_counter() - started_at
+    sms_sent = len(senders["sms"].sent)
+    for pool in pools.values():
+        await pool.stop()
+
+    assert len(senders["email"].sent) == 50
+    assert email_duration < 0.5
+    assert sms_sent <= 2 + 20 * email_duration  # The burst, plus the refill.
+
+
+class FlakySender(LocalSender):
+    """A local sender failing its first `failures` deliveries."""
+
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+        self.attempts = 0
+
+    async def send(self, notification: Notification) -> None:
+        """Fail, then keep the notification once the failures are spent."""
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise NotificationDeliveryError("503")
+        await super().send(notification)
+
+
+@pytest.mark.asyncio
+async def test_dispatch_retries_failed_deliveries(notification: Notification) -> None:
+    """Test a transient provider failure is retried after a backoff."""
+    sender = FlakySender(failures=2)
+    dispatcher = NotificationDispatcher(
+        senders={notification.type: sender}, retries=3, retry_backoff=0.001
+    )
+
+    await dispatcher.dispatch(notification)
+
+    assert sender.attempts == 3
+    assert sender.sent == [notification]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_raises_once_the_retries_are_spent(
+    notification: Notification,
+) -> None:
+    """Test a delivery failing on every attempt raises."""
+    sender = FlakySender(failures=10)
+    dispatcher = NotificationDispatcher(
+        senders={notification.type: sender}, retries=2, retry_backoff=0.001
+    )
+
+    with pytest.raises(NotificationDeliveryError):
+        await dispatcher.dispatch(notification)
+
+    assert sender.attempts == 3
+    assert sender.sent == []
+
+
+def test_from_config() -> None:
+    """Test the senders and rate limits of the channel tables."""
+    channel = {
+        "sender": "http",
+        "url": "http://127.0.0.1:8081/sms",
+        "max_connections": 5,
+        "timeout": 1.0,
+        "rate": 50.0,
+        "burst": 10.0,
+    }
+
+    dispatcher = NotificationDispatcher.from_config(
+        {"sms": channel, "email": {**channel, "sender": "local"}, "retries": 5}
+    )
+
+    assert isinstance(dispatcher.senders["sms"], HttpSender)
+    assert isinstance(dispatcher.senders["email"], LocalSender)
+    assert "push" not in dispatcher.senders
+    assert (
+        dispatcher.rate_limits["sms"].rate,
+        dispatcher.rate_limits["sms"].burst,
+    ) == (
+        50.0,
+        10.0,
+    )
+    assert (dispatcher.retries, dispatcher.retry_backoff) == (5, 0.5)
@@ -5,8 +5,16 @@ from unittest import mock
 
 import pytest
 
+from app.consts import NOTIFICATION_TYPE_EXCHANGE_NAME
+from app.notification_service.contacts import ContactResolver, LocalContactBackend
+from app.notification_service.digest import NotificationDigester
 from app.notification_service.producer import NotificationProducer
-from app.notification_service.schemas import Notification, NotificationType
+from app.notification_service.schemas import (
+    CustomerContact,
+    Notification,
+    NotificationType,
+)
+from app.notification_service.templates import TemplateCatalog
 from app.payment_service.schemas import IncomingPayment
 from config.base import AsyncRabbitmqManager
 
@@ -32,26 +40,83 @@ async def test_produce_notifications(
     notification_producer: NotificationProducer,
 ) -> None:
     """Test producing notifications and publishing to the correct RabbitMQ exchange."""
-    # Arrange
-    mock_connection = mock.AsyncMock()
-    mock_channel = mock.AsyncMock()
-    mock_exchange = mock.AsyncMock()
-    mock_rabbitmq_manager.get_connection.return_value.__aenter__.return_value = (
-        mock_connection
-    )
-    mock_rabbitmq_manager.get_channel.return_value = mock_channel
-    mock_rabbitmq_manager.declare_exchange.return_value = mock_exchange
-
     # Act
     await notification_producer.produce_notifications(payment=incoming_payment)
 
     # Assert
-    mock_rabbitmq_manager.get_connection.return_value.__aenter__.assert_awaited_once_with()
-    mock_rabbitmq_manager.get_channel.assert_awaited_once_with(
-        connection=mock_connection
+    mock_rabbitmq_manager.publish_to.assert_awaited_once_with(
+        exchange_name=NOTIFICATION_TYPE_EXCHANGE_NAME,
+        declare_exchange=notification_producer.declare_notification_exchange,
+        message=mock.ANY,
+        routing_key=mock.ANY,
+    )
+    message = mock_rabbitmq_manager.publish_to.await_args.kwargs["message"]
+    notification = Notification.model_validate_json(message.body)
+    assert mock_rabbitmq_manager.publish_to.await_args.kwargs["routing_key"] == (
+        f"notifications.{notification.type}"
+    )
+
+
+@pytest.mark.asyncio
+async def test_produce_notifications_into_digests(
+    incoming_payment: IncomingPayment, mock_rabbitmq_manager: mock.AsyncMock
+) -> None:
+    """Test the notifications are buffered by the digester until closed."""
+    notification_producer = NotificationProducer(
+        rabbitmq_manager=mock_rabbitmq_manager,
+        digester=NotificationDigester.from_config(
+            {"window": 60.0, "max_windows": 100, "max_notifications": 100}
+        ),
     )
-    mock_rabbitmq_manager.declare_exchange.assert_awaited_once()
-    mock_exchange.publish.assert_awaited_once()
+    await notification_producer.produce_notifications(payment=incoming_payment)
+    await notification_producer.produce_notifications(payment=incoming_payment)
+    mock_rabbitmq_manager.publish_to.assert_not_awaited()
+
+    await notification_producer.close()
+
+    published = [
+        Notification.model_validate_json(call.kwargs["message"].body)
+        for call in mock_rabbitmq_manager.publish_to.await_args_list
+    ]
+    assert (
+        sum(
+            notification.message.count(incoming_payment.order_id)
+            for notification in published
+        )
+        == 2
+    )
+
+
+@pytest.mark.asyncio
+async def test_produce_notifications_to_the_customer_contact(
+    incoming_payment: IncomingPayment, mock_rabbitmq_manager: mock.AsyncMock
+) -> None:
+    """Test the recipient is resolved from the contact of the customer."""
+    contact = CustomerContact(customer_id=7, phone="+100", locale="fr")
+    templates = TemplateCatalog(
+        {
+            "en": {"sms": "{status}", "email": "{status}", "push": "{status}"},
+            "fr": {"sms": "Commande {order_id}"},
+        }
+    )
+    notification_producer = NotificationProducer(
+        rabbitmq_manager=mock_rabbitmq_manager,
+        contacts=ContactResolver(LocalContactBackend(contacts={7: contact})),
+        templates=templates,
+    )
+
+    await notification_producer.produce_notifications(
+        payment=incoming_payment.model_copy(update={"customer_id": 7})
+    )
+    await notification_producer.produce_notifications(
+        payment=incoming_payment.model_copy(update={"customer_id": 8})
+    )
+
+    mock_rabbitmq_manager.publish_to.assert_awaited_once()
+    message = mock_rabbitmq_manager.publish_to.await_args.kwargs["message"]
+    notification = Notification.model_validate_json(message.body)
+    assert (notification.type, notification.recipient) == ("sms", "+100")
+    assert notification.message == f"Commande {incoming_payment.order_id}"
 
 
 def test_get_notification(
@@ -5,7 +5,10 @@ from unittest import mock
 import aio_pika
 import pytest
 
-from app.consts import NOTIFICATION_EXCHANGE_NAME
+from app.consts import (
+    NOTIFICATION_EXCHANGE_NAME,
+    NOTIFICATION_TYPE_EXCHANGE_NAME,
+)
 from app.notification_service.pubsub import NotificationPubSub
 from config.base import AsyncRabbitmqManager
 
@@ -26,25 +29,85 @@ def notification_pubsub(mock_rabbitmq_manager: mock.AsyncMock) -> NotificationPu
 async def test_declare_notification_exchange(
     mock_rabbitmq_manager: mock.AsyncMock, notification_pubsub: NotificationPubSub
 ) -> None:
-    """Test declaring notification exchange."""
+    """Test declaring the topic exchange, feeding the legacy fanout exchange."""
     # Arrange
     mock_channel = mock.AsyncMock()
+    mock_topic_exchange, mock_fanout_exchange = mock.AsyncMock(), mock.AsyncMock()
+    mock_rabbitmq_manager.declare_exchange.side_effect = [
+        mock_topic_exchange,
+        mock_fanout_exchange,
+    ]
 
     # Act
-    await notification_pubsub.declare_notification_exchange(channel=mock_channel)
+    exchange = await notification_pubsub.declare_notification_exchange(
+        channel=mock_channel
+    )
 
     # Assert
-    mock_rabbitmq_manager.declare_exchange.assert_awaited_once_with(
-        channel=mock_channel,
-        name=NOTIFICATION_EXCHANGE_NAME,
-        exchange_type=aio_pika.ExchangeType.FANOUT,
+    assert exchange is mock_topic_exchange
+    assert mock_rabbitmq_manager.declare_exchange.await_args_list == [
+        mock.call(
+            channel=mock_channel,
+            name=NOTIFICATION_TYPE_EXCHANGE_NAME,
+            exchange_type=aio_pika.ExchangeType.TOPIC,
+        ),
+        mock.call(
+            channel=mock_channel,
+            name=NOTIFICATION_EXCHANGE_NAME,
+            exchange_type=aio_pika.ExchangeType.FANOUT,
+        ),
+    ]
+    mock_fanout_exchange.bind.assert_awaited_once_with(
+        mock_topic_exchange, routing_key="notifications.*"
     )
 
 
+@pytest.mark.asyncio
+async def test_declare_notification_exchange_without_legacy_fanout(
+    mock_rabbitmq_manager: mock.AsyncMock,
+) -> None:
+    """Test the legacy fanout exchange is left alone once migrated."""
+    # Arrange
+    notification_pubsub = NotificationPubSub(
+        rabbitmq_manager=mock_rabbitmq_manager, legacy_fanout=False
+    )
+
+    # Act
+    await notification_pubsub.declare_notification_exchange(channel=mock.AsyncMock())
+
+    # Assert
+    mock_rabbitmq_manager.declare_exchange.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_declare_notification_queue(
+    mock_rabbitmq_manager: mock.AsyncMock, notification_pubsub: NotificationPubSub
+) -> None:
+    """Test declaring the queue of a type, bound to its routing key."""
+    # Arrange
+    mock_channel = mock.AsyncMock()
+    mock_queue = mock.AsyncMock()
+    mock_rabbitmq_manager.declare_queue.return_value = mock_queue
+
+    # Act
+    queue = await notification_pubsub.declare_notification_queue(
+        channel=mock_channel, notification_type="sms"
+    )
+
+    # Assert
+    assert queue is mock_queue
+    mock_rabbitmq_manager.declare_queue.assert_awaited_once_with(
+        channel=mock_channel, name="notifications_sms_queue"
+    )
+    mock_queue.bind.assert_awaited_once_with(mock.ANY, routing_key="notifications.sms")
+
+
 def test_get_notification_routing_key(notification_pubsub: NotificationPubSub) -> None:
-    """Test retrieving notifications routing key."""
+    """Test retrieving the routing key of a notification type."""
     # Act
-    routing_key = notification_pubsub._get_notification_routing_key()
+    routing_key = notification_pubsub._get_notification_routing_key(
+        notification_type="push"
+    )
 
     # Assert
-    assert routing_key == "notifications"
+    assert routing_key == "notifications.push"
@@ -0,0 +1,121 @@
+"""Test suite for validating `NotificationScheduler` class."""
+
+import datetime
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from app.notification_service.producer import NotificationProducer
+from app.notification_service.scheduler import (
+    NotificationScheduler,
+    TimerSnapshotError,
+)
+from app.notification_service.schemas import Notification
+
+
+class Clock:
+    """A clock advanced by hand."""
+
+    def __init__(self, now: float) -> None:
+        """Start the clock at `now`."""
+        self.now = now
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def mock_producer() -> mock.AsyncMock:
+    """Mock the producer publishing the due notifications."""
+    return mock.AsyncMock(spec_set=NotificationProducer)
+
+
+@pytest.mark.asyncio
+async def test_due_notifications_are_published_by_batches(
+    mock_producer: mock.AsyncMock, notification: Notification
+) -> None:
+    """Test the due notifications are published in batches of `batch_size`."""
+    clock = Clock(1000.0)
+    scheduler = NotificationScheduler(mock_producer, batch_size=2, clock=clock)
+    for _ in range(3):
+        scheduler.defer(notification, delay=30)
+    scheduler.defer(notification, delay=90)
+
+    clock.now += 30
+    assert await scheduler.flush() == 3
+
+    assert [
+        len(call.args[0])
+        for call in mock_producer.publish_notifications.await_args_list
+    ] == [2, 1]
+    assert len(scheduler) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried(
+    mock_producer: mock.AsyncMock, notification: Notification
+) -> None:
+    """Test a batch failing to publish is scheduled again for the next tick."""
+    clock = Clock(1000.0)
+    scheduler = NotificationScheduler(mock_producer, clock=clock)
+    scheduler.defer(notification, delay=1)
+    mock_producer.publish_notifications.side_effect = [ConnectionError, None]
+
+    clock.now += 1
+    assert await scheduler.flush() == 0
+    clock.now += 1
+    assert await scheduler.flush() == 1
+
+
+def test_cancel(mock_producer: mock.AsyncMock, notification: Notification) -> None:
+    """Test a cancelled notification is not pending anymore."""
+    scheduler = NotificationScheduler(mock_producer)
+    timer_id = scheduler.defer(notification, delay=60)
+
+    assert scheduler.cancel(timer_id) is True
+    assert len(scheduler) == 0
+
+
+def test_quiet_hours_defer_to_their_end(
+    mock_producer: mock.AsyncMock, notification: Notification
+) -> None:
+    """Test a notification due in the quiet hours is deferred to their end."""
+    night = datetime.datetime(2024, 1, 1, 23, 30, tzinfo=datetime.UTC)
+    morning = datetime.datetime(2024, 1, 2, 7, tzinfo=datetime.UTC)
+    noon = datetime.datetime(2024, 1, 2, 12, tzinfo=datetime.UTC)
+    scheduler = NotificationScheduler(mock_producer, quiet_hours=(22, 7))
+    scheduler.schedule(notification, when=night.timestamp())
+    scheduler.schedule(notification, when=noon.timestamp())
+
+    assert sorted(when for when, _ in scheduler.wheel.pending()) == [
+        morning.timestamp(),
+        noon.timestamp(),
+    ]
+
+
+def test_snapshot_round_trip(
+    mock_producer: mock.AsyncMock, notification: Notification, tmp_path: Path
+) -> None:
+    """Test the pending notifications are saved and loaded back."""
+    snapshot_path = str(tmp_path / "timers.bin")
+    scheduler = NotificationScheduler(mock_producer, snapshot_path=snapshot_path)
+    scheduler.defer(notification, delay=60)
+    scheduler.defer(notification.model_copy(update={"message": "é"}), delay=120)
+    scheduler.save()
+
+    restored = NotificationScheduler(mock_producer, snapshot_path=snapshot_path)
+
+    assert restored.load() == 2
+    assert sorted(restored.wheel.pending()) == sorted(scheduler.wheel.pending())
+
+
+def test_corrupted_snapshot(mock_producer: mock.AsyncMock, tmp_path: Path) -> None:
+    """Test loading a file that is not a snapshot raises `TimerSnapshotError`."""
+    snapshot_path = tmp_path / "timers.bin"
+    snapshot_path.write_bytes(b"not a snapshot at all")
+    scheduler = NotificationScheduler(mock_producer, snapshot_path=str(snapshot_path))
+
+    with pytest.raises(TimerSnapshotError):
+        scheduler.load()
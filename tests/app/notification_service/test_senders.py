@@ -0,0 +1,172 @@
+"""Test suite for validating the notification senders."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.notification_service.schemas import Notification
+from app.notification_service.senders import (
+    HttpSender,
+    LocalSender,
+    NotificationDeliveryError,
+    NotificationSender,
+)
+
+
+class Provider:
+    """A stand-in HTTP provider, answering every request with `response`."""
+
+    def __init__(
+        self,
+        status: int = 200,
+        keep_alive: int = 100,
+        response: bytes | None = None,
+        delay: float = 0.0,
+    ) -> None:
+        self.response = response or (
+            f"HTTP/1.1 {status} Status\r\nContent-Length: 2\r\n\r\nok".encode()
+        )
+        self.delay = delay
+        self.keep_alive = keep_alive  # Requests served per connection.
+        self.connections = 0
+        self.received: list[dict[str, str]] = []
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve the requests of a connection, up to `keep_alive` of them."""
+        self.connections += 1
+        for _ in range(self.keep_alive):
+            try:
+                headers = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                break  # Closed by the client.
+            length = next(
+                int(line.split(b":")[1])
+                for line in headers.split(b"\r\n")
+                if line.lower().startswith(b"content-length")
+            )
+            self.received.append(json.loads(await reader.readexactly(length)))
+            await asyncio.sleep(self.delay)
+            writer.write(self.response)
+            await writer.drain()
+        writer.close()
+
+    @asynccontextmanager
+    async def serve(self) -> AsyncIterator[str]:
+        """Serve on a free local port, yielding the URL to post to."""
+        server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            yield f"http://127.0.0.1:{port}/send"
+
+
+@pytest.mark.asyncio
+async def test_http_sender_reuses_connections(notification: Notification) -> None:
+    """Test deliveries go over pooled keep-alive connections."""
+    provider = Provider()
+    async with provider.serve() as url:
+        sender = HttpSender(url, max_connections=2)
+        for _ in range(3):
+            await sender.send(notification)
+        await asyncio.gather(*(sender.send(notification) for _ in range(4)))
+        await sender.close()
+
+    assert len(provider.received) == 7
+    assert provider.received[0]["recipient"] == notification.recipient
+    assert provider.connections == 2
+
+
+@pytest.mark.asyncio
+async def test_http_sender_retries_a_closed_connection(
+    notification: Notification,
+) -> None:
+    """Test a request on a connection closed by the provider goes on a new one."""
+    provider = Provider(keep_alive=1)
+    async with provider.serve() as url:
+        sender = HttpSender(url, max_connections=1)
+        await sender.send(notification)
+        await asyncio.sleep(0.01)
+        await sender.send(notification)
+        await sender.close()
+
+    assert len(provider.received) == 2
+    assert provider.connections == 2
+
+
+@pytest.mark.asyncio
+async def test_http_sender_raises_on_error_status(notification: Notification) -> None:
+    """Test a delivery refused by the provider raises."""
+    async with Provider(status=503).serve() as url:
+        sender = HttpSender(url)
+        with pytest.raises(NotificationDeliveryError, match="503"):
+            await sender.send(notification)
+        await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_http_sender_reads_chunked_responses(notification: Notification) -> None:
+    """Test a chunked response is read to its end, keeping the connection."""
+    response = (
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+        b"2;ext=1\r\nok\r\na\r\n, accepted\r\n0\r\nX-Trailer: 1\r\n\r\n"
+    )
+    provider = Provider(response=response)
+    async with provider.serve() as url:
+        sender = HttpSender(url, max_connections=1, timeout=1.0)
+        await sender.send(notification)
+        await sender.send(notification)
+        await sender.close()
+
+    assert len(provider.received) == 2
+    assert provider.connections == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("provider", "match"),
+    [
+        (Provider(response=b"garbage\r\n\r\n"), "Failed to post"),
+        (Provider(response=b"HTTP/1.1 OK\r\n\r\n"), "Failed to post"),
+        (Provider(delay=1.0), "did not respond"),
+    ],
+)
+async def test_http_sender_raises_on_failed_requests(
+    notification: Notification, provider: Provider, match: str
+) -> None:
+    """Test malformed responses and timeouts raise `NotificationDeliveryError`."""
+    async with provider.serve() as url:
+        sender = HttpSender(url, timeout=0.1)
+        with pytest.raises(NotificationDeliveryError, match=match):
+            await sender.send(notification)
+        await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_http_sender_raises_on_refused_connections(
+    notification: Notification,
+) -> None:
+    """Test a provider that cannot be reached raises `NotificationDeliveryError`."""
+    async with Provider().serve() as url:
+        pass
+    sender = HttpSender(url, timeout=1.0)
+    with pytest.raises(NotificationDeliveryError, match="Failed to post"):
+        await sender.send(notification)
+    await sender.close()
+
+
+def test_sender_from_config() -> None:
+    """Test the sender of a channel table."""
+    config = {"url": "https://sms.test/send", "max_connections": 3, "timeout": 1.0}
+
+    http_sender = NotificationSender.from_config({"sender": "http", **config})
+    local_sender = NotificationSender.from_config({"sender": "local", **config})
+
+    assert isinstance(http_sender, HttpSender)
+    assert http_sender.pool.size == 3
+    assert isinstance(local_sender, LocalSender)
+    with pytest.raises(ValueError):
+        HttpSender("sms.test/send")
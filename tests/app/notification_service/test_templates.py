@@ -0,0 +1,67 @@
+"""Test suite for validating `Template` and `TemplateCatalog` classes."""
+
+import pytest
+
+from app.notification_service.templates import Template, TemplateCatalog, TemplateError
+from app.payment_service.schemas import IncomingPayment
+
+SOURCES = {
+    "en": {
+        "sms": "Order {order_id}: {status}",
+        "email": "Payment {status} for order {order_id}",
+        "push": "Payment update",
+    },
+    "fr": {"sms": "Commande {order_id} : {status}"},
+}
+
+
+def test_render_template() -> None:
+    """Test a template renders its variables, and literal braces."""
+    template = Template("{{order}} {order_id} is {status}", ["order_id", "status"])
+
+    assert template.render({"order_id": "1", "status": "paid"}) == "{order} 1 is paid"
+    assert template.variables == {"order_id", "status"}
+
+
+def test_static_template() -> None:
+    """Test a template with no placeholder renders its text."""
+    assert Template("No {{variable}}", []).render({}) == "No {variable}"
+
+
+@pytest.mark.parametrize(
+    "source",
+    ["{unknown}", "{status!r}", "{status:>10}", "{status.upper}", "{}", "{status"],
+)
+def test_invalid_template(source: str) -> None:
+    """Test unknown variables and unsupported syntax are refused on compile."""
+    with pytest.raises(TemplateError):
+        Template(source, ["status"])
+
+
+def test_catalog_locales(incoming_payment: IncomingPayment) -> None:
+    """Test a locale variant is used, and the default locale as a fallback."""
+    catalog = TemplateCatalog(SOURCES, default_locale="en")
+    order_id, status = incoming_payment.order_id, incoming_payment.status
+
+    assert catalog.render("sms", incoming_payment) == f"Order {order_id}: {status}"
+    assert catalog.render("sms", incoming_payment, locale="fr") == (
+        f"Commande {order_id} : {status}"
+    )
+    assert catalog.render("email", incoming_payment, locale="fr") == (
+        f"Payment {status} for order {order_id}"
+    )
+    assert catalog.render("push", incoming_payment, locale="de") == "Payment update"
+
+
+def test_catalog_requires_default_templates() -> None:
+    """Test a type with no template in the default locale is refused."""
+    with pytest.raises(TemplateError):
+        TemplateCatalog({"en": {"sms": "Hi"}}, default_locale="en")
+
+
+def test_from_config(incoming_payment: IncomingPayment) -> None:
+    """Test building a catalog from its settings table."""
+    catalog = TemplateCatalog.from_config({"default_locale": "en", **SOURCES})
+
+    assert catalog.locales == {"en", "fr"}
+    assert catalog.render("push", incoming_payment) == "Payment update"
@@ -0,0 +1,130 @@
+"""Test suite for validating `OrderLifecycleStore` class."""
+
+from pathlib import Path
+
+from app.order_service.lifecycle import OrderLifecycleStore, OrderStage
+from app.order_service.schemas import IncomingOrder
+from app.payment_service.schemas import IncomingPayment
+
+
+class Clock:
+    """A clock advanced by hand."""
+
+    def __init__(self) -> None:
+        """Start the clock at 0."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+def get_order(order_id: str, customer_id: int = 1) -> IncomingOrder:
+    """Return a new order."""
+    return IncomingOrder(
+        order_id=order_id,
+        customer_id=customer_id,
+        items=["orange"],
+        total_price="10",
+        status="created",
+        created_at="2024-12-22 12:50:40+00:00",
+    )
+
+
+def get_payment(order_id: str, status: str = "success") -> IncomingPayment:
+    """Return the payment of an order."""
+    return IncomingPayment(
+        payment_id="payment",
+        order_id=order_id,
+        status=status,
+        created_at="2024-12-22 12:50:41+00:00",
+    )
+
+
+def test_lifecycle_of_an_order() -> None:
+    """Test an order goes from created to paid, then notified."""
+    clock = Clock()
+    store = OrderLifecycleStore(clock=clock)
+
+    store.on_order(get_order("order-1"))
+    assert store.count(OrderStage.CREATED) == 1
+    clock.now = 5.0
+    store.on_payment(get_payment("order-1"))
+    store.on_notified("order-1")
+
+    state = store.get("order-1")
+    assert state is not None
+    assert state.stage is OrderStage.PAID
+    assert state.notified
+    assert state.customer_id == 1
+    assert state.created_at == 1734871840.0
+    assert state.updated_at == 5.0
+    assert store.get("order-2") is None
+
+
+def test_events_out_of_order() -> None:
+    """Test a payment consumed before its order keeps its stage."""
+    store = OrderLifecycleStore()
+
+    store.on_payment(get_payment("order-1", status="failed"))
+    store.on_order(get_order("order-1", customer_id=7))
+
+    state = store.get("order-1")
+    assert state is not None
+    assert state.stage is OrderStage.FAILED
+    assert state.customer_id == 7
+
+
+def test_counts_and_query() -> None:
+    """Test the orders are counted by stage and queried by criteria."""
+    clock = Clock()
+    store = OrderLifecycleStore(clock=clock)
+    for index in range(6):
+        store.on_order(get_order(f"order-{index}", customer_id=index % 2))
+    clock.now = 10.0
+    store.on_payment(get_payment("order-0"))
+    store.on_payment(get_payment("order-1", status="failed"))
+    store.on_notified("order-0")
+
+    assert len(store) == 6
+    assert store.count(OrderStage.CREATED) == 4
+    assert store.count(OrderStage.PAID, notified=True) == 1
+    assert store.count(OrderStage.FAILED, notified=False) == 1
+    stuck = store.query(stage=OrderStage.CREATED, customer_id=0, updated_before=5.0)
+    assert [state.order_id for state in stuck] == ["order-2", "order-4"]
+
+
+def test_cold_orders_are_spilled_and_promoted(tmp_path: Path) -> None:
+    """Test the least recently used orders are spilled, then brought back."""
+    store = OrderLifecycleStore(max_orders=2, spill_path=str(tmp_path / "orders.db"))
+    for index in range(4):
+        store.on_order(get_order(f"order-{index}"))
+
+    assert store.stats().hot == 2
+    assert "order-0" in store
+    assert len(store) == 4
+    store.on_payment(get_payment("order-0"))
+
+    state = store.get("order-0")
+    assert state is not None
+    assert state.stage is OrderStage.PAID
+    stats = store.stats()
+    assert (stats.hot, stats.spilled, stats.promoted) == (2, 3, 1)
+    assert sorted(state.order_id for state in store.query(OrderStage.CREATED)) == [
+        "order-1",
+        "order-2",
+        "order-3",
+    ]
+    assert store.count(OrderStage.CREATED) == 3
+    store.close()
+
+
+def test_cold_orders_are_forgotten_without_spill() -> None:
+    """Test the least recently used orders are dropped with no spill file."""
+    store = OrderLifecycleStore(max_orders=2)
+    for index in range(3):
+        store.on_order(get_order(f"order-{index}"))
+
+    assert store.get("order-0") is None
+    assert len(store) == 2
+    assert store.stats().forgotten == 1
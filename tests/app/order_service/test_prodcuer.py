@@ -30,27 +30,32 @@ async def test_produce_new_order(
     order_producer: OrderProducer,
 ) -> None:
     """Test the produce_new_order method of the OrderProducer class."""
-    # Arrange
-    mock_exchange = mock.AsyncMock()
-    mock_connection = mock.AsyncMock()
-    mock_channel = mock.AsyncMock()
-    mock_rabbitmq_manager.declare_exchange.return_value = mock_exchange
-    mock_rabbitmq_manager.get_connection.return_value.__aenter__.return_value = (
-        mock_connection
-    )
-    mock_rabbitmq_manager.get_channel.return_value = mock_channel
-
     # Act
     await order_producer.produce_new_order(order=outgoing_order)
 
     # Asserts
-    mock_rabbitmq_manager.get_connection.return_value.__aenter__.assert_awaited_once()
-    mock_rabbitmq_manager.get_channel.assert_awaited_once_with(
-        connection=mock_connection
+    mock_rabbitmq_manager.publish_to.assert_awaited_once_with(
+        exchange_name=ORDERS_EXCHANGE_NAME,
+        declare_exchange=order_producer.declare_order_exchange,
+        message=mock.ANY,
+        routing_key=order_producer._get_new_order_routing_key(),
     )
+    message = mock_rabbitmq_manager.publish_to.await_args.kwargs["message"]
+    assert message.correlation_id == str(outgoing_order.order_id)
+    assert "x-origin-published-at" in message.headers
+
+
+@pytest.mark.asyncio
+async def test_declare_order_exchange(
+    mock_rabbitmq_manager: mock.AsyncMock, order_producer: OrderProducer
+) -> None:
+    """Test the order exchange is declared as a durable direct exchange."""
+    mock_channel = mock.AsyncMock()
+
+    await order_producer.declare_order_exchange(channel=mock_channel)
+
     mock_rabbitmq_manager.declare_exchange.assert_awaited_once_with(
         channel=mock_channel,
         name=ORDERS_EXCHANGE_NAME,
         exchange_type=ExchangeType.DIRECT,
     )
-    mock_exchange.publish.assert_awaited_once()
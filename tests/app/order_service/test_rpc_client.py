@@ -0,0 +1,56 @@
+"""Test suite for validating `CheckoutClient` class."""
+
+from unittest import mock
+
+import pytest
+
+from app.consts import PAYMENTS_RPC_QUEUE_NAME
+from app.order_service.rpc_client import CheckoutClient
+from app.order_service.schemas import OutgoingOrder
+from app.payment_service.schemas import OutgoingPayment
+from config.base import AsyncRabbitmqManager
+from config.rpc import RpcError
+
+
+@pytest.mark.asyncio
+async def test_place_order(outgoing_order: OutgoingOrder) -> None:
+    """Test placing an order sends it over RPC and returns its payment."""
+    # Arrange
+    outgoing_payment = OutgoingPayment(  # type: ignore
+        order_id=str(outgoing_order.order_id), status="success"
+    )
+    mock_rabbitmq_manager = mock.AsyncMock(spec_set=AsyncRabbitmqManager)
+    mock_connection = mock_rabbitmq_manager.get_connection.return_value
+    checkout = CheckoutClient(rabbitmq_manager=mock_rabbitmq_manager, timeout=2.0)
+
+    with mock.patch("app.order_service.rpc_client.RpcClient") as mock_rpc_client:
+        mock_rpc = mock_rpc_client.return_value
+        mock_rpc.start = mock.AsyncMock()
+        mock_rpc.close = mock.AsyncMock()
+        mock_rpc.call = mock.AsyncMock(return_value=outgoing_payment.to_message())
+
+        # Act
+        async with checkout:
+            payment = await checkout.place_order(outgoing_order)
+
+    # Assert
+    mock_rpc_client.assert_called_once_with(
+        mock_rabbitmq_manager.get_channel.return_value, timeout=2.0
+    )
+    mock_rpc.call.assert_awaited_once_with(
+        routing_key=PAYMENTS_RPC_QUEUE_NAME,
+        body=outgoing_order.to_message(),
+        timeout=None,
+    )
+    assert payment.order_id == outgoing_payment.order_id
+    mock_rpc.close.assert_awaited_once()
+    mock_connection.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_place_order_requires_start(outgoing_order: OutgoingOrder) -> None:
+    """Test placing an order before `start` is refused."""
+    checkout = CheckoutClient(mock.AsyncMock(spec_set=AsyncRabbitmqManager))
+
+    with pytest.raises(RpcError):
+        await checkout.place_order(outgoing_order)
@@ -0,0 +1,62 @@
+"""Test suite for validating `PaymentLedger` class."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.payment_service.ledger import PaymentLedger
+from app.payment_service.schemas import OutgoingPayment
+
+
+def get_payment(order_id: str, status: str = "success") -> OutgoingPayment:
+    """Return an outgoing payment of an order."""
+    return OutgoingPayment(order_id=order_id, status=status)  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_record_and_get(tmp_path: Path) -> None:
+    """Test a recorded payment is returned by its order, the last one winning."""
+    ledger = PaymentLedger(str(tmp_path))
+    payment = get_payment("order-1", status="failed")
+    retry = get_payment("order-1")
+
+    await ledger.record(payment)
+    await ledger.record(retry)
+
+    assert ledger.get("order-1") == retry
+    assert ledger.get("order-2") is None
+    assert len(ledger) == 2
+    await ledger.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_records_share_syncs(tmp_path: Path) -> None:
+    """Test the payments recorded concurrently are synced with group commit."""
+    ledger = PaymentLedger(str(tmp_path))
+
+    await asyncio.gather(
+        *(ledger.record(get_payment(f"order-{index}")) for index in range(100))
+    )
+
+    stats = ledger.stats()
+    assert stats.records == stats.orders == 100
+    assert 1 <= stats.fsyncs < 100
+    await ledger.close()
+
+
+@pytest.mark.asyncio
+async def test_index_is_rebuilt_on_open(tmp_path: Path) -> None:
+    """Test reopening the ledger, e.g. after a crash, recovers the payments."""
+    ledger = PaymentLedger(str(tmp_path), segment_size=256)
+    payments = [get_payment(f"order-{index}") for index in range(10)]
+    for payment in payments:
+        await ledger.record(payment)
+    await ledger.close()
+
+    reopened = PaymentLedger(str(tmp_path), segment_size=256)
+
+    assert reopened.stats().segments > 1
+    assert reopened.index == ledger.index
+    assert [reopened.get(payment.order_id) for payment in payments] == payments
+    await reopened.close()
@@ -1,16 +1,26 @@
 """Test suite for validating `PaymentProducer` class."""
 
+import asyncio
 import uuid
-from datetime import datetime
+from datetime import UTC, datetime
+from pathlib import Path
 from unittest import mock
 
 import aio_pika
 import pytest
 
 from app.consts import PAYMENTS_EXCHANGE_NAME
+from app.order_service.consumer import OrderConsumer
 from app.order_service.schemas import IncomingOrder
+from app.payment_service.ledger import PaymentLedger
 from app.payment_service.producer import PaymentProducer
 from app.payment_service.schemas import OutgoingPayment
+from app.payment_service.verification import (
+    LatencyDistribution,
+    PaymentVerificationError,
+    PaymentVerifier,
+    SimulatedGateway,
+)
 from config.base import AsyncRabbitmqManager
 
 
@@ -33,30 +43,140 @@ async def test_produce_payments(
     incoming_order: IncomingOrder,
 ) -> None:
     """Test producing payments and publishing to the correct RabbitMQ exchange."""
+    # Act
+    await payment_producer.produce_payments(order=incoming_order)
+
+    # Assert
+    mock_rabbitmq_manager.publish_to.assert_awaited_once_with(
+        exchange_name=PAYMENTS_EXCHANGE_NAME,
+        declare_exchange=payment_producer.declare_payments_exchange,
+        message=mock.ANY,
+        routing_key=payment_producer._get_success_payment_routing_key(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_produce_payments_with_verifier(
+    mock_rabbitmq_manager: mock.AsyncMock, incoming_order: IncomingOrder
+) -> None:
+    """Test the payments are verified through the verifier, by batches."""
+    gateway = SimulatedGateway()
+    payment_producer = PaymentProducer(
+        rabbitmq_manager=mock_rabbitmq_manager,
+        verifier=PaymentVerifier(gateway, max_batch_size=10),
+    )
+
+    await asyncio.gather(
+        *(payment_producer.produce_payments(order=incoming_order) for _ in range(10))
+    )
+    await payment_producer.close()
+
+    assert gateway.calls == 1
+    assert mock_rabbitmq_manager.publish_to.await_count == 10
+    assert mock_rabbitmq_manager.publish_to.await_args.kwargs["routing_key"] == (
+        payment_producer._get_success_payment_routing_key()
+    )
+
+
+@pytest.mark.asyncio
+async def test_produce_payments_sheds_orders_past_their_sla(
+    mock_rabbitmq_manager: mock.AsyncMock, incoming_order: IncomingOrder
+) -> None:
+    """Test an order older than the SLA is routed to the failed payments."""
+    gateway = SimulatedGateway()
+    payment_producer = PaymentProducer(
+        rabbitmq_manager=mock_rabbitmq_manager,
+        verifier=PaymentVerifier(gateway),
+        sla=30.0,
+    )
+
+    await payment_producer.produce_payments(order=incoming_order)
+
+    assert gateway.calls == 0
+    assert payment_producer.shed == 1
+    assert mock_rabbitmq_manager.publish_to.await_args.kwargs["routing_key"] == (
+        payment_producer._get_failed_payment_routing_key()
+    )
+
+
+@pytest.mark.asyncio
+async def test_produce_payments_sheds_slow_verifications(
+    mock_rabbitmq_manager: mock.AsyncMock, incoming_order: IncomingOrder
+) -> None:
+    """Test a verification outlasting the SLA left is shed to the failed payments."""
+    order = incoming_order.model_copy(
+        update={"created_at": datetime.now(tz=UTC).isoformat()}
+    )
+    payment_producer = PaymentProducer(
+        rabbitmq_manager=mock_rabbitmq_manager,
+        verifier=PaymentVerifier(SimulatedGateway(LatencyDistribution(mean=1.0))),
+        sla=0.05,
+    )
+
+    await payment_producer.produce_payments(order=order)
+
+    assert payment_producer.shed == 1
+    assert mock_rabbitmq_manager.publish_to.await_args.kwargs["routing_key"] == (
+        payment_producer._get_failed_payment_routing_key()
+    )
+
+
+@pytest.mark.asyncio
+async def test_produce_payments_retries_failed_verifications_within_the_sla(
+    mock_rabbitmq_manager: mock.AsyncMock, incoming_order: IncomingOrder
+) -> None:
+    """Test a verification failing with SLA left is retried, not shed."""
+    verifier = mock.AsyncMock(spec_set=PaymentVerifier)
+    verifier.verify.side_effect = [PaymentVerificationError("Circuit open"), True]
+    payment_producer = PaymentProducer(
+        rabbitmq_manager=mock_rabbitmq_manager,
+        verifier=verifier,
+        sla=30.0,
+        retry_backoff=0.001,
+    )
+
+    with mock.patch.object(PaymentProducer, "_get_order_age", return_value=0.0):
+        await payment_producer.produce_payments(order=incoming_order)
+
+    assert verifier.verify.await_count == 2
+    assert payment_producer.shed == 0
+    assert mock_rabbitmq_manager.publish_to.await_args.kwargs["routing_key"] == (
+        payment_producer._get_success_payment_routing_key()
+    )
+
+
+@pytest.mark.asyncio
+async def test_order_failing_verification_is_published_failed_and_acked(
+    mock_rabbitmq_manager: mock.AsyncMock, incoming_order: IncomingOrder
+) -> None:
+    """Test an order the gateway keeps failing is retried, then shed and acked."""
     # Arrange
-    mock_connection = mock.AsyncMock()
-    mock_channel = mock.AsyncMock()
-    mock_exchange = mock.AsyncMock()
-    mock_rabbitmq_manager.get_connection.return_value.__aenter__.return_value = (
-        mock_connection
+    verifier = mock.AsyncMock(spec_set=PaymentVerifier)
+    verifier.verify.side_effect = PaymentVerificationError("Circuit open")
+    payment_producer = PaymentProducer(
+        rabbitmq_manager=mock_rabbitmq_manager,
+        verifier=verifier,
+        sla=0.1,
+        retry_backoff=0.01,
     )
-    mock_rabbitmq_manager.get_channel.return_value = mock_channel
-    mock_rabbitmq_manager.declare_exchange.return_value = mock_exchange
+    order_consumer = OrderConsumer(rabbitmq_manager=mock_rabbitmq_manager)
+    message = mock.AsyncMock(spec_set=aio_pika.IncomingMessage)
+    message.body = incoming_order.model_copy(
+        update={"created_at": datetime.now(tz=UTC).isoformat()}
+    ).to_message()
 
     # Act
-    await payment_producer.produce_payments(order=incoming_order)
+    await order_consumer.on_new_order_message(
+        on_message_func=payment_producer.produce_payments, message=message
+    )
 
     # Assert
-    mock_rabbitmq_manager.get_connection.return_value.__aenter__.assert_awaited_once()
-    mock_rabbitmq_manager.get_channel.assert_awaited_once_with(
-        connection=mock_connection
-    )
-    mock_rabbitmq_manager.declare_exchange.assert_awaited_once_with(
-        channel=mock_channel,
-        name=PAYMENTS_EXCHANGE_NAME,
-        exchange_type=aio_pika.ExchangeType.DIRECT,
+    assert verifier.verify.await_count > 1
+    assert payment_producer.shed == 1
+    assert mock_rabbitmq_manager.publish_to.await_args.kwargs["routing_key"] == (
+        payment_producer._get_failed_payment_routing_key()
     )
-    await mock_exchange.publish.asset_awaited_once()
+    message.process.return_value.__aexit__.assert_awaited_once_with(None, None, None)
 
 
 def test_get_outgoing_success_payment(
@@ -115,3 +235,24 @@ def test_get_payment_routing_key_failed(payment_producer: PaymentProducer) -> No
     # Assert
     expected_routing_key = payment_producer._get_failed_payment_routing_key()
     assert actual_routing_key == expected_routing_key
+
+
+@pytest.mark.asyncio
+async def test_produce_payments_records_the_ledger(
+    mock_rabbitmq_manager: mock.AsyncMock,
+    incoming_order: IncomingOrder,
+    tmp_path: Path,
+) -> None:
+    """Test the payments are recorded in the ledger before being published."""
+    ledger = PaymentLedger(str(tmp_path))
+    payment_producer = PaymentProducer(
+        rabbitmq_manager=mock_rabbitmq_manager, ledger=ledger
+    )
+
+    await payment_producer.produce_payments(order=incoming_order)
+    await payment_producer.close()
+
+    payment = PaymentLedger(str(tmp_path)).get(incoming_order.order_id)
+    assert payment is not None
+    assert payment.status == "success"
+    mock_rabbitmq_manager.publish_to.assert_awaited_once()
@@ -0,0 +1,95 @@
+"""Test suite for validating `PaymentRpcServer` class."""
+
+import asyncio
+import json
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from app.consts import PAYMENTS_RPC_QUEUE_NAME
+from app.order_service.schemas import IncomingOrder
+from app.payment_service.ledger import PaymentLedger
+from app.payment_service.rpc_server import PaymentRpcServer
+from app.payment_service.verification import PaymentVerifier, SimulatedGateway
+from config.base import AsyncRabbitmqManager
+
+
+@pytest.fixture
+def mock_rabbitmq_manager() -> mock.AsyncMock:
+    """Mock an instance of AsyncRabbitmqManager for testing purposes."""
+    return mock.AsyncMock(spec_set=AsyncRabbitmqManager)
+
+
+@pytest.mark.asyncio
+async def test_serve_payments(mock_rabbitmq_manager: mock.AsyncMock) -> None:
+    """Test serving payment requests from the non-durable `payments_rpc` queue."""
+    # Arrange
+    mock_channel = mock.AsyncMock()
+    mock_queue = mock.AsyncMock()
+    mock_rabbitmq_manager.get_channel.return_value = mock_channel
+    mock_rabbitmq_manager.declare_queue.return_value = mock_queue
+    server = PaymentRpcServer(rabbitmq_manager=mock_rabbitmq_manager)
+
+    # Act
+    with mock.patch(
+        "app.payment_service.rpc_server.asyncio.Future", new_callable=mock.AsyncMock
+    ):
+        await server.serve_payments()
+
+    # Assert
+    mock_rabbitmq_manager.declare_queue.assert_awaited_once_with(
+        channel=mock_channel, name=PAYMENTS_RPC_QUEUE_NAME, durable=False
+    )
+    mock_queue.consume.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_on_payment_request(
+    mock_rabbitmq_manager: mock.AsyncMock, incoming_order: IncomingOrder
+) -> None:
+    """Test the reply to a payment request is the payment of the order."""
+    server = PaymentRpcServer(rabbitmq_manager=mock_rabbitmq_manager)
+
+    reply = await server.on_payment_request(incoming_order.to_message())
+
+    payment = json.loads(reply)
+    assert payment["order_id"] == incoming_order.order_id
+    assert payment["status"] == "success"
+
+
+@pytest.mark.asyncio
+async def test_on_payment_request_with_verifier(
+    mock_rabbitmq_manager: mock.AsyncMock, incoming_order: IncomingOrder
+) -> None:
+    """Test the payment requests are verified through the verifier, by batches."""
+    gateway = SimulatedGateway()
+    server = PaymentRpcServer(
+        rabbitmq_manager=mock_rabbitmq_manager,
+        verifier=PaymentVerifier(gateway, max_batch_size=5),
+    )
+
+    replies = await asyncio.gather(
+        *(server.on_payment_request(incoming_order.to_message()) for _ in range(5))
+    )
+    await server.close()
+
+    assert gateway.calls == 1
+    assert {json.loads(reply)["status"] for reply in replies} == {"success"}
+
+
+@pytest.mark.asyncio
+async def test_on_payment_request_records_the_ledger(
+    mock_rabbitmq_manager: mock.AsyncMock, incoming_order: IncomingOrder, tmp_path: Path
+) -> None:
+    """Test the payments of the checkout are recorded in the ledger."""
+    server = PaymentRpcServer(
+        rabbitmq_manager=mock_rabbitmq_manager, ledger=PaymentLedger(str(tmp_path))
+    )
+
+    await server.on_payment_request(incoming_order.to_message())
+    await server.close()
+
+    payment = PaymentLedger(str(tmp_path)).get(incoming_order.order_id)
+    assert payment is not None
+    assert payment.status == "success"
@@ -0,0 +1,149 @@
+"""Test suite for validating `PaymentVerifier` class."""
+
+import asyncio
+import random
+from collections.abc import Sequence
+
+import pytest
+
+from app.order_service.schemas import IncomingOrder
+from app.payment_service.verification import (
+    LatencyDistribution,
+    PaymentVerificationError,
+    PaymentVerifier,
+    SimulatedGateway,
+    VerificationBackend,
+)
+from toolkit.resilience import BreakerState, CircuitBreaker
+
+
+class SlowGateway(VerificationBackend):
+    """A gateway recording its batches and its peak concurrency."""
+
+    def __init__(self, latency: float) -> None:
+        """Answer every call after `latency` seconds."""
+        self.latency = latency
+        self.batches: list[int] = []
+        self.inflight = 0
+        self.peak = 0
+
+    async def verify_batch(self, orders: Sequence[IncomingOrder]) -> Sequence[bool]:
+        """Approve every payment after the latency."""
+        self.batches.append(len(orders))
+        self.inflight += 1
+        self.peak = max(self.peak, self.inflight)
+        await asyncio.sleep(self.latency)
+        self.inflight -= 1
+        return [True] * len(orders)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_verifications_are_batched(
+    incoming_order: IncomingOrder,
+) -> None:
+    """Test hundreds of verifications in flight take a few capped backend calls."""
+    gateway = SlowGateway(latency=0.01)
+    verifier = PaymentVerifier(gateway, max_batch_size=50, max_concurrency=2)
+
+    results = await asyncio.gather(
+        *(verifier.verify(incoming_order) for _ in range(300))
+    )
+
+    assert results == [True] * 300
+    assert gateway.batches == [50] * 6
+    assert gateway.peak == 2
+    assert verifier.stats().verified == 300
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_sent_after_max_wait(
+    incoming_order: IncomingOrder,
+) -> None:
+    """Test a batch not filled is sent after `max_wait` seconds."""
+    gateway = SlowGateway(latency=0.0)
+    verifier = PaymentVerifier(gateway, max_batch_size=50, max_wait=0.001)
+
+    assert await verifier.verify(incoming_order) is True
+    assert gateway.batches == [1]
+
+
+@pytest.mark.asyncio
+async def test_timed_out_batch_fails(incoming_order: IncomingOrder) -> None:
+    """Test the verifications of a batch timing out fail."""
+    verifier = PaymentVerifier(SlowGateway(latency=1.0), max_wait=0.0, timeout=0.01)
+
+    with pytest.raises(PaymentVerificationError):
+        await verifier.verify(incoming_order)
+    assert verifier.stats().failed == 1
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_fails_fast(incoming_order: IncomingOrder) -> None:
+    """Test failing batches open the breaker, then verifications fail right away."""
+    gateway = SlowGateway(latency=1.0)
+    verifier = PaymentVerifier(
+        gateway,
+        max_wait=0.0,
+        timeout=0.01,
+        breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60.0),
+    )
+    with pytest.raises(PaymentVerificationError):
+        await verifier.verify(incoming_order)
+    assert verifier.breaker is not None
+    assert verifier.breaker.state is BreakerState.OPEN
+
+    with pytest.raises(PaymentVerificationError, match="circuit is open"):
+        await verifier.verify(incoming_order)
+    assert len(gateway.batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_simulated_gateway(incoming_order: IncomingOrder) -> None:
+    """Test the simulated gateway approves the created orders only."""
+    gateway = SimulatedGateway()
+    paid = incoming_order.model_copy(update={"status": "paid"})
+
+    assert await gateway.verify_batch([incoming_order, paid]) == [True, False]
+
+
+@pytest.mark.parametrize(
+    ("distribution", "low", "high"),
+    [
+        (LatencyDistribution("constant", mean=0.1), 0.1, 0.1),
+        (LatencyDistribution("uniform", low=0.1, high=0.2), 0.1, 0.2),
+        (LatencyDistribution("exponential", mean=0.1), 0.0, float("inf")),
+        (LatencyDistribution("lognormal", mean=0.1, sigma=0.5), 0.0, float("inf")),
+    ],
+)
+def test_latency_distributions(
+    distribution: LatencyDistribution, low: float, high: float
+) -> None:
+    """Test the latency draws of every distribution are in its range."""
+    rng = random.Random(0)
+
+    assert all(low <= distribution.sample(rng) <= high for _ in range(100))
+
+
+def test_from_config() -> None:
+    """Test building a verifier from its settings table."""
+    verifier = PaymentVerifier.from_config(
+        {
+            "backend": "simulated",
+            "max_batch_size": 20,
+            "max_wait": 0.01,
+            "max_concurrency": 4,
+            "timeout": 1.0,
+            "breaker": {
+                "enabled": True,
+                "failure_threshold": 3,
+                "reset_timeout": 5.0,
+                "half_open_max_calls": 1,
+            },
+            "latency": {"kind": "uniform", "low": 0.0, "high": 0.1},
+        }
+    )
+
+    assert isinstance(verifier.backend, SimulatedGateway)
+    assert verifier.backend.latency.kind == "uniform"
+    assert verifier.breaker is not None
+    assert verifier.breaker.failure_threshold == 3
@@ -0,0 +1,125 @@
+"""Test suite for validating the `AckCoalescer` class."""
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+from config.acks import AckCoalescer, AckStats
+from config.tracing import process_message
+
+CHANNEL = object()
+
+
+def deliver(
+    acks: AckCoalescer, *tags: int, channel: object = CHANNEL
+) -> list[mock.Mock]:
+    """Return messages delivered with `tags`, tracked by `acks`."""
+    messages = []
+    for tag in tags:
+        message = mock.Mock(channel=channel, delivery_tag=tag)
+        message.ack = mock.AsyncMock()
+        message.reject = mock.AsyncMock()
+        acks.track(message)
+        messages.append(message)
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_completion() -> None:
+    """Test the ack covers the highest tag below which every message completed."""
+    acks = AckCoalescer(max_batch=3, interval=60)
+    first, second, third, fourth = deliver(acks, 1, 2, 3, 4)
+
+    await acks.complete(fourth)
+    await acks.complete(second)
+    await acks.complete(third)  # A full batch, held back by the first message.
+    for message in (second, third, fourth):
+        message.ack.assert_not_awaited()
+
+    await acks.complete(first)
+
+    fourth.ack.assert_awaited_once_with(multiple=True)
+    for message in (first, second, third):
+        message.ack.assert_not_awaited()
+    assert acks.stats() == AckStats(pending=0, acked=4, frames=1)
+    await acks.close()
+
+
+@pytest.mark.asyncio
+async def test_flush_after_interval() -> None:
+    """Test a batch that does not fill up is flushed after `interval`."""
+    acks = AckCoalescer(max_batch=100, interval=0.01)
+    first, second = deliver(acks, 1, 2)
+
+    await acks.complete(first)
+    await acks.complete(second)
+    second.ack.assert_not_awaited()
+    await asyncio.sleep(0.05)
+
+    second.ack.assert_awaited_once_with(multiple=True)
+    assert acks.stats().frames == 1
+
+
+@pytest.mark.asyncio
+async def test_settled_messages_are_skipped() -> None:
+    """Test a rejected message is not covered by the ack, nor used as its tag."""
+    acks = AckCoalescer(max_batch=100, interval=60)
+    first, second, third = deliver(acks, 1, 2, 3)
+
+    await acks.complete(first)
+    await acks.complete(third, settled=True)
+    await acks.complete(second)
+    await acks.flush()
+
+    second.ack.assert_awaited_once_with(multiple=True)
+    third.ack.assert_not_awaited()
+    assert acks.stats().acked == 2
+
+
+@pytest.mark.asyncio
+async def test_single_acks_and_untracked_messages() -> None:
+    """Test a batch of 1, or an untracked message, is acknowledged on its own."""
+    acks = AckCoalescer(max_batch=1)
+    first, second = deliver(acks, 1, 2)
+    [untracked] = deliver(AckCoalescer(), 3)
+
+    await acks.complete(second)
+    await acks.complete(untracked)
+    await acks.complete(first)
+
+    for message in (first, second, untracked):
+        message.ack.assert_awaited_once_with()
+    assert acks.stats().frames == 0
+
+
+@pytest.mark.asyncio
+async def test_new_channel_resets_tracking() -> None:
+    """Test the deliveries of a previous channel are never acknowledged."""
+    acks = AckCoalescer(max_batch=2, interval=60)
+    [stale] = deliver(acks, 1)
+    [fresh] = deliver(acks, 1, channel=object())
+
+    await acks.complete(fresh)
+    await acks.close()
+
+    fresh.ack.assert_awaited_once_with(multiple=True)
+    stale.ack.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_process_message_with_acks() -> None:
+    """Test a processed message is completed, and a failed one rejected at once."""
+    acks = AckCoalescer(max_batch=10, interval=60)
+    succeeded, failed = deliver(acks, 1, 2)
+
+    async with process_message(succeeded, acks=acks):
+        pass
+    with pytest.raises(ValueError):
+        async with process_message(failed, acks=acks):
+            raise ValueError
+    await acks.flush()
+
+    failed.reject.assert_awaited_once_with()
+    succeeded.ack.assert_awaited_once_with(multiple=True)
+    succeeded.process.assert_not_called()
@@ -0,0 +1,80 @@
+"""Test suite for validating the lazy initialization of `config.base`."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+import config.base
+from config.logging import LazyLogger
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_import_has_no_side_effects(tmp_path: Path) -> None:
+    """Test importing a worker neither loads the settings nor configures logging."""
+    env = {key: value for key, value in os.environ.items() if key != "AMQP_URL"}
+    env["PYTHONPATH"] = str(PROJECT_ROOT)
+    code = (
+        "import sys, app.order_service.producer; "
+        "print(sorted({'pydantic_settings', 'tomlkit'} & set(sys.modules)))"
+    )
+
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert process.returncode == 0, process.stderr
+    assert process.stdout.strip() == "[]"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_import_leaves_out_the_rabbitmq_manager(tmp_path: Path) -> None:
+    """Test importing `config.base` does not import `config.rabbitmq`."""
+    env = {key: value for key, value in os.environ.items() if key != "AMQP_URL"}
+    env["PYTHONPATH"] = str(PROJECT_ROOT)
+    code = (
+        "import sys, config.base; "
+        "print('config.rabbitmq' in sys.modules); "
+        "config.base.AsyncRabbitmqManager; "
+        "print('config.rabbitmq' in sys.modules)"
+    )
+
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert process.returncode == 0, process.stderr
+    assert process.stdout.split() == ["False", "True"]
+
+
+def test_lazy_logger_sets_up_on_first_use() -> None:
+    """Test the logging configuration runs on the first access, and only once."""
+    mock_logging_config = mock.Mock()
+    logger = LazyLogger(mock_logging_config)
+    mock_logging_config.get_logger.assert_not_called()
+
+    logger.info("first")
+    logger.info("second")
+
+    assert mock_logging_config.get_logger.call_count == 2
+    mock_logger = mock_logging_config.get_logger.return_value
+    assert mock_logger.info.call_args_list == [mock.call("first"), mock.call("second")]
+
+
+@pytest.mark.exception
+def test_unknown_attribute_raises() -> None:
+    """Test the module `__getattr__` only resolves the lazy attributes."""
+    with pytest.raises(AttributeError):
+        config.base.unknown
@@ -0,0 +1,74 @@
+"""Test suite for validating the correlation of messages across stages."""
+
+import time
+from unittest import mock
+
+import pytest
+from aio_pika import Message
+
+from config import correlation as correlation_module
+from config import metrics
+from config.correlation import (
+    PUBLISHED_AT_HEADER,
+    Correlation,
+    current_correlation,
+    get_correlation,
+    render_exemplars,
+    track_stage,
+)
+
+
+def get_incoming_message(message: Message) -> mock.Mock:
+    """Return a stand-in for the incoming message delivered for `message`."""
+    return mock.Mock(
+        body=message.body,
+        correlation_id=message.correlation_id,
+        headers=message.headers,
+    )
+
+
+def test_correlation_round_trip() -> None:
+    """Test a correlation stamped on a message is read back by the next stage."""
+    correlation = Correlation.start("order-1")
+
+    message = Message(b"{}", **correlation.get_message_properties())
+
+    assert Correlation.from_message(get_incoming_message(message)) == correlation
+    assert Correlation.from_message(mock.Mock(correlation_id=None)) is None
+
+
+@pytest.mark.asyncio
+async def test_track_stage_propagates_and_records() -> None:
+    """Test a tracked handler propagates the correlation and records its latency."""
+    # Arrange
+    origin = Correlation(correlation_id="order-2", origin_published_at=time.time() - 2)
+    message = Message(b"{}", **origin.get_message_properties())
+    message.headers[PUBLISHED_AT_HEADER] = time.time() - 1
+    propagated = []
+
+    async def handler(_: object) -> None:
+        propagated.append(get_correlation("order-2"))
+
+    # Act
+    await track_stage("test_stage", handler)(get_incoming_message(message))
+
+    # Assert
+    assert propagated == [origin]
+    assert current_correlation.get() is None
+    assert metrics.stage_queue_wait.labels("test_stage").sum >= 1
+    assert metrics.stage_end_to_end.labels("test_stage").sum >= 2
+    [(end_to_end, exemplar)] = correlation_module.exemplars["test_stage"].snapshot()
+    assert exemplar.correlation_id == "order-2"
+    assert end_to_end >= 2
+    assert "order-2" in render_exemplars()
+
+
+def test_get_correlation_starts_unrelated_flows() -> None:
+    """Test a correlation of another flow is not propagated."""
+    token = current_correlation.set(Correlation.start("order-3"))
+    try:
+        correlation = get_correlation("order-4")
+    finally:
+        current_correlation.reset(token)
+
+    assert correlation.correlation_id == "order-4"
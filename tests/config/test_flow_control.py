@@ -0,0 +1,128 @@
+"""Test suite for validating the `PublishFlowController` class."""
+
+import asyncio
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from aio_pika import Message
+
+from config.flow_control import (
+    FlowControlPolicy,
+    PublishFlowControlError,
+    PublishFlowController,
+)
+from config.rabbitmq import AsyncRabbitmqManager
+from config.spool import PublishSpool
+from toolkit.ratelimit import AdaptiveTokenBucket
+
+
+def get_controller(
+    policy: FlowControlPolicy = FlowControlPolicy.WAIT, **kwargs: float
+) -> PublishFlowController:
+    """Return a `PublishFlowController` with a fast limiter."""
+    limiter = AdaptiveTokenBucket(
+        rate=1000, burst=10, min_rate=1, max_rate=2000, target_latency=0.05
+    )
+    return PublishFlowController(limiter=limiter, policy=policy, **kwargs)  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_throttle_admits_and_observes_latency() -> None:
+    """Test a publish is admitted and its latency feeds the limiter."""
+    controller = get_controller()
+
+    async with controller.throttle():
+        pass
+
+    assert controller.stats().blocked is False
+    assert controller.limiter.rate == 1001
+
+
+@pytest.mark.asyncio
+@pytest.mark.exception
+async def test_fail_fast_while_blocked() -> None:
+    """Test the `fail_fast` policy refuses publishes while blocked."""
+    controller = get_controller(policy=FlowControlPolicy.FAIL_FAST)
+    controller.on_blocked(reason="memory alarm")
+
+    with pytest.raises(PublishFlowControlError):
+        async with controller.throttle():
+            pass  # pragma: no cover
+
+    assert controller.stats().refused == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_policy_resumes_after_unblock() -> None:
+    """Test the `wait` policy admits the publish once the connection is unblocked."""
+    controller = get_controller(wait_timeout=1)
+    controller.on_blocked(reason="disk alarm")
+
+    async def publish() -> None:
+        async with controller.throttle():
+            pass
+
+    task = asyncio.create_task(publish())
+    await asyncio.sleep(0)
+    assert controller.stats().waiting == 1
+
+    controller.on_unblocked()
+    await task
+    assert controller.stats().waiting == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.exception
+async def test_max_waiters_bounds_pending_publishes() -> None:
+    """Test publishes beyond `max_waiters` are refused instead of piling up."""
+    controller = get_controller(wait_timeout=1, max_waiters=1)
+    controller.on_blocked()
+
+    async def publish() -> None:
+        async with controller.throttle():
+            pass
+
+    task = asyncio.create_task(publish())
+    await asyncio.sleep(0)
+    with pytest.raises(PublishFlowControlError, match="already waiting"):
+        await publish()
+
+    controller.on_unblocked()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_stalled_publish_marks_connection_blocked() -> None:
+    """Test a publish that times out marks the connection as blocked."""
+    controller = get_controller(publish_timeout=0.01, blocked_threshold=10)
+
+    with pytest.raises(PublishFlowControlError, match="timed out"):
+        async with controller.throttle():
+            await asyncio.sleep(1)
+
+    assert controller.blocked is True
+
+
+@pytest.mark.asyncio
+async def test_manager_buffers_refused_publishes(tmp_path: Path) -> None:
+    """Test the `buffer` policy hands refused messages to the spool."""
+    # Arrange
+    spool = PublishSpool(file_path=str(tmp_path / "publish.spool"), capacity=4096)
+    controller = get_controller(policy=FlowControlPolicy.BUFFER)
+    controller.on_blocked()
+    manager = AsyncRabbitmqManager(
+        amqp_url="amqp://localhost/", spool=spool, flow_control=controller
+    )
+    mock_exchange = mock.AsyncMock()
+    mock_exchange.name = "orders"
+
+    # Act
+    result = await manager.publish(
+        exchange=mock_exchange, message=Message(b"order"), routing_key="orders.new"
+    )
+
+    # Assert
+    assert result is None
+    mock_exchange.publish.assert_not_awaited()
+    assert len(spool) == 1
@@ -0,0 +1,186 @@
+"""Test suite for validating the logging configuration components."""
+
+import logging
+import queue
+import threading
+
+import pytest
+
+from config.logging import (
+    LoggingConfig,
+    NonBlockingQueueHandler,
+    RateLimitFilter,
+    RelativePathFilter,
+    SamplingFilter,
+    get_relative_path,
+)
+
+
+class ListHandler(logging.Handler):
+    """A handler collecting the records it handles, used as a listener target."""
+
+    def __init__(self) -> None:
+        """Instantiate a `ListHandler` object."""
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Collect the record."""
+        self.records.append(record)
+
+
+class FormattingHandler(ListHandler):
+    """A `ListHandler` formatting the records, recording the threads it runs on."""
+
+    def __init__(self) -> None:
+        """Instantiate a `FormattingHandler` object."""
+        super().__init__()
+        self.threads: list[int] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Format and collect the record, recording the current thread."""
+        self.threads.append(threading.get_ident())
+        self.format(record)
+        super().emit(record)
+
+
+def get_record(pathname: str) -> logging.LogRecord:
+    """Return a log record emitted from `pathname`."""
+    return logging.LogRecord("test", logging.INFO, pathname, 1, "message", None, None)
+
+
+def test_relative_path_filter() -> None:
+    """Test the filter sets a relative path, stripping site-packages prefixes."""
+    relative_path_filter = RelativePathFilter()
+    record = get_record("/venv/lib/python3.13/site-packages/aio_pika/connection.py")
+
+    assert relative_path_filter.filter(record) is True
+    assert getattr(record, "relativepath") == "aio_pika/connection.py"
+
+
+def test_relative_path_is_memoized() -> None:
+    """Test the path resolution runs once per source file."""
+    get_relative_path.cache_clear()
+
+    for _ in range(3):
+        get_relative_path("/srv/app/producer.py", "/srv")
+
+    assert get_relative_path.cache_info().hits == 2
+    assert get_relative_path("/srv/app/producer.py", "/srv") == "app/producer.py"
+
+
+def test_queue_handler_drops_when_full() -> None:
+    """Test a full queue drops records instead of blocking the caller."""
+    record_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=1)
+    handler = NonBlockingQueueHandler(record_queue)
+
+    handler.handle(get_record(__file__))
+    handler.handle(get_record(__file__))
+
+    assert record_queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+@pytest.mark.smoke
+def test_setup_queue_moves_handlers_behind_listener() -> None:
+    """Test records reach the original handlers through the background listener."""
+    # Arrange
+    logging_config = LoggingConfig()
+    logger = logging.getLogger("test_setup_queue")
+    target = ListHandler()
+    logger.addHandler(target)
+
+    # Act
+    queue_handler = logging_config.setup_queue(logger=logger)
+    logger.warning("queued %s", "record")
+    logging_config.shutdown()
+
+    # Assert
+    assert logger.handlers == [queue_handler]
+    assert [record.getMessage() for record in target.records] == ["queued record"]
+
+
+def test_queued_records_are_formatted_on_the_listener_thread() -> None:
+    """Test the queue handler enqueues raw records, formatted by the listener."""
+    # Arrange
+    logging_config = LoggingConfig()
+    logger = logging.getLogger("test_queue_formatting")
+    target = FormattingHandler()
+    logger.addHandler(target)
+
+    # Act
+    logging_config.setup_queue(logger=logger)
+    logger.warning("queued %s", "record")
+    logging_config.shutdown()
+
+    # Assert
+    record = target.records[0]
+    assert (record.msg, record.args) == ("queued %s", ("record",))
+    assert target.threads
+    assert threading.get_ident() not in target.threads
+
+
+class FakeClock:
+    """A manually advanced clock, used to make the filters deterministic."""
+
+    def __init__(self) -> None:
+        """Instantiate a `FakeClock` object."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time of the clock."""
+        return self.now
+
+
+def test_sampling_filter_logs_one_in_n() -> None:
+    """Test the sampling filter admits 1 in N records per message template."""
+    sampling_filter = SamplingFilter(sample_rate=3)
+    records = [get_record(__file__) for _ in range(7)]
+
+    admitted = [sampling_filter.filter(record) for record in records]
+
+    assert admitted == [True, False, False, True, False, False, True]
+
+
+def test_sampling_filter_exempts_warnings() -> None:
+    """Test records at or above the exempt level are never sampled."""
+    sampling_filter = SamplingFilter(sample_rate=1000)
+    record = get_record(__file__)
+    record.levelno = logging.ERROR
+
+    assert all(sampling_filter.filter(record) for _ in range(3))
+
+
+def test_rate_limit_filter_reports_suppressed_counts(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the rate limit applies per call site and suppressed counts are logged."""
+    # Arrange
+    clock = FakeClock()
+    rate_limit_filter = RateLimitFilter(
+        rate=1, burst=2, report_interval=10, clock=clock
+    )
+    logger = logging.getLogger("test_rate_limit")
+    logger.addFilter(rate_limit_filter)
+
+    # Act
+    with caplog.at_level(logging.INFO, logger="test_rate_limit"):
+        for _ in range(5):
+            logger.info("Published order")
+        clock.now = 11.0
+        logger.info("Published order")
+
+    # Assert
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages.count("Published order") == 3
+    assert messages[-2].startswith("Suppressed 3 records from ")
+
+
+def test_get_sampling_filters() -> None:
+    """Test the filters are built from the settings of an environment."""
+    filters = LoggingConfig.get_sampling_filters(
+        config={"sample_rate": 10, "rate_limit": 5.0, "exempt_level": "ERROR"}
+    )
+
+    assert [type(item) for item in filters] == [SamplingFilter, RateLimitFilter]
+    assert filters[0].exempt_level == logging.ERROR
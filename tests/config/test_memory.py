@@ -0,0 +1,46 @@
+"""Test suite for validating the memory budgets of the application."""
+
+from unittest import mock
+
+import pytest
+from aio_pika import Message
+
+from config import memory
+from config.rabbitmq import AsyncRabbitmqManager
+from toolkit.memory import MemoryBudget
+
+
+def test_setup_memory_and_routes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the budgets are configured from the `[memory]` table and served."""
+    monkeypatch.setattr(memory.accountant, "budgets", {})
+
+    accountant = memory.setup_memory(
+        {"tracemalloc_frames": 2, "budgets": {"prefetch": 1024}}
+    )
+
+    assert accountant is memory.accountant
+    assert memory.tracker.frames == 2
+    routes = memory.get_routes()
+    assert "prefetch" in routes["/memory"]()
+    try:
+        assert routes["/memory/snapshot"]().startswith("module")
+    finally:
+        assert routes["/memory/stop"]() == "Allocation tracing stopped\n"
+
+
+@pytest.mark.asyncio
+async def test_publish_window_is_released() -> None:
+    """Test a publish holds its size in the publish window until confirmed."""
+    budget = MemoryBudget("publish_window", limit=1024)
+    manager = AsyncRabbitmqManager(amqp_url="amqp://x/", publish_budget=budget)
+    exchange = mock.AsyncMock()
+    exchange.name = "orders"
+    held = []
+    exchange.publish.side_effect = lambda **_: held.append(budget.used)
+
+    await manager.publish(
+        exchange=exchange, message=Message(b"x" * 100), routing_key=""
+    )
+
+    assert held == [100]
+    assert budget.used == 0
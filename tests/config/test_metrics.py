@@ -0,0 +1,75 @@
+"""Test suite for validating the instrumentation of publishers and consumers."""
+
+from unittest import mock
+
+import pytest
+from aio_pika import Message
+from aio_pika.exceptions import AMQPConnectionError
+
+from config import metrics
+from config.metrics import instrument_breaker, instrument_handler
+from config.rabbitmq import AsyncRabbitmqManager
+from toolkit.resilience import CircuitBreaker
+
+
+@pytest.mark.asyncio
+async def test_instrument_handler_records_outcomes() -> None:
+    """Test the consuming metrics of successful and failed messages."""
+    # Arrange
+    handler = mock.AsyncMock(side_effect=[None, ValueError()])
+    instrumented = instrument_handler("test_instrument", handler)
+    message = mock.Mock(body=b"12345", redelivered=True)
+
+    # Act
+    await instrumented(message)
+    with pytest.raises(ValueError):
+        await instrumented(message)
+
+    # Assert
+    assert metrics.consumed_messages.labels("test_instrument", "succeeded").value == 1
+    assert metrics.consumed_messages.labels("test_instrument", "failed").value == 1
+    assert metrics.redelivered_messages.labels("test_instrument").value == 2
+    assert metrics.in_flight_messages.labels("test_instrument").value == 0
+    assert metrics.handler_duration.labels("test_instrument").count == 2
+    assert metrics.consumed_bytes.labels("test_instrument").sum == 10
+
+
+@pytest.mark.asyncio
+async def test_manager_records_publish_outcomes() -> None:
+    """Test the publishing metrics of confirmed and failed publishes."""
+    # Arrange
+    manager = AsyncRabbitmqManager(amqp_url="amqp://localhost/")
+    mock_exchange = mock.AsyncMock()
+    mock_exchange.name = "test_publish"
+    mock_exchange.publish.side_effect = [None, AMQPConnectionError()]
+
+    # Act
+    await manager.publish(
+        exchange=mock_exchange, message=Message(b"order"), routing_key="a"
+    )
+    with pytest.raises(AMQPConnectionError):
+        await manager.publish(
+            exchange=mock_exchange, message=Message(b"order"), routing_key="a"
+        )
+
+    # Assert
+    assert metrics.published_messages.labels("test_publish", "confirmed").value == 1
+    assert metrics.published_messages.labels("test_publish", "failed").value == 1
+    assert metrics.publish_duration.labels("test_publish").count == 2
+    assert metrics.confirm_duration.labels("test_publish").count == 1
+    assert metrics.published_bytes.labels("test_publish").sum == 10
+
+
+def test_instrument_breaker_exports_its_state() -> None:
+    """Test the state gauges of a circuit breaker follow its state."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    instrument_breaker("test_breaker", breaker)
+    closed = metrics.breaker_state.labels("test_breaker", "closed")
+    opened = metrics.breaker_state.labels("test_breaker", "open")
+    assert [next(closed.collect())[2], next(opened.collect())[2]] == [1, 0]
+
+    breaker._record(probe=False, success=False)
+
+    assert [next(closed.collect())[2], next(opened.collect())[2]] == [0, 1]
+    opened_total = metrics.breaker_opened.labels("test_breaker")
+    assert next(opened_total.collect())[2] == 1
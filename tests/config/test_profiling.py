@@ -0,0 +1,76 @@
+"""Test suite for validating the control of the profilers."""
+
+import asyncio
+import os
+import signal
+from pathlib import Path
+
+import pytest
+
+from config.profiling import ProfilingControl
+from toolkit.profiling import SamplingProfiler
+from toolkit.tracing import SpanKind, Tracer
+
+
+@pytest.mark.asyncio
+async def test_sampling_profiler_routes(tmp_path: Path) -> None:
+    """Test the sampling profiler is started and stopped by the admin routes."""
+    control = ProfilingControl(
+        SamplingProfiler(interval=0.001), Tracer(), output_dir=str(tmp_path)
+    )
+    routes = control.routes()
+
+    assert routes["/profile/start"]() == "Sampling profiler started\n"
+    assert "already" in routes["/profile/start"]()
+    await asyncio.sleep(0.05)
+    collapsed = routes["/profile/stop"]()
+
+    [written] = tmp_path.glob("cpu-*.collapsed")
+    assert written.read_text() == collapsed
+    assert "not running" in routes["/profile/stop"]()
+
+
+@pytest.mark.asyncio
+async def test_profile_next_messages(tmp_path: Path) -> None:
+    """Test the phases of the next messages are profiled, then written."""
+    tracer = Tracer()
+    control = ProfilingControl(
+        SamplingProfiler(), tracer, output_dir=str(tmp_path), messages=2
+    )
+    assert control.render_phases() == "No phase profile yet\n"
+
+    control.profile_messages()
+    for _ in range(3):
+        with tracer.start_span("consume orders", kind=SpanKind.CONSUMER):
+            with tracer.start_span("decode"):
+                pass
+
+    [written] = tmp_path.glob("phases-*.txt")
+    assert written.read_text() == control.render_phases()
+    assert control.render_phases().startswith("2/2 messages profiled")
+    with tracer.start_span("consume orders") as span:
+        pass
+    assert not span.recording
+
+
+@pytest.mark.asyncio
+async def test_signal_handlers(tmp_path: Path) -> None:
+    """Test `SIGUSR1` toggles the sampling profiler and `SIGUSR2` profiles messages."""
+    control = ProfilingControl(
+        SamplingProfiler(interval=0.001), Tracer(), output_dir=str(tmp_path)
+    )
+    loop = asyncio.get_running_loop()
+    control.install_signal_handlers(loop)
+    try:
+        os.kill(os.getpid(), signal.SIGUSR1)
+        await asyncio.sleep(0.02)
+        assert control.sampler.running
+        os.kill(os.getpid(), signal.SIGUSR1)
+        os.kill(os.getpid(), signal.SIGUSR2)
+        await asyncio.sleep(0.02)
+    finally:
+        loop.remove_signal_handler(signal.SIGUSR1)
+        loop.remove_signal_handler(signal.SIGUSR2)
+
+    assert not control.sampler.running
+    assert control.phase_profile is not None
@@ -0,0 +1,149 @@
+"""Test suite for validating the `RpcClient` and `RpcServer` classes."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+from unittest import mock
+
+import pytest
+from aio_pika import Message
+
+from config.rpc import (
+    REPLY_TO_QUEUE_NAME,
+    RpcClient,
+    RpcError,
+    RpcServer,
+    RpcTimeoutError,
+)
+
+Callback = Callable[[Any], Awaitable[None]]
+
+
+class Broker:
+    """An in-memory stand-in for the broker, routing by queue name."""
+
+    def __init__(self) -> None:
+        self.consumers: dict[str, Callback] = {}
+        self.published: list[tuple[Message, str]] = []
+
+    def channel(self) -> mock.MagicMock:
+        """Return a channel publishing and consuming through the broker."""
+        channel = mock.MagicMock()
+        channel.default_exchange.publish = self.publish
+        channel.get_queue = mock.AsyncMock(side_effect=self.queue)
+        return channel
+
+    def queue(self, name: str, ensure: bool = True) -> mock.MagicMock:
+        """Return a queue whose consumers are registered in the broker."""
+
+        async def consume(callback: Callback, no_ack: bool = False) -> str:
+            self.consumers[name] = callback
+            return f"ctag-{name}"
+
+        queue = mock.MagicMock()
+        queue.consume = consume
+        queue.cancel = mock.AsyncMock()
+        return queue
+
+    async def publish(self, message: Message, routing_key: str) -> None:
+        """Deliver a message to the consumer of `routing_key`, in the background."""
+        self.published.append((message, routing_key))
+        callback = self.consumers.get(routing_key)
+        if callback is not None:
+            incoming = mock.MagicMock(
+                body=message.body,
+                headers=message.headers,
+                correlation_id=message.correlation_id,
+                reply_to=message.reply_to,
+                redelivered=False,
+            )
+            asyncio.get_running_loop().call_soon(
+                asyncio.ensure_future, callback(incoming)
+            )
+
+
+async def echo(body: bytes) -> bytes:
+    """Reply with the request body, reversed, after yielding."""
+    await asyncio.sleep(0.01)
+    return body[::-1]
+
+
+async def start_client() -> RpcClient:
+    """Return a started client, served by an `echo` server and a `fail` server."""
+    broker = Broker()
+
+    async def fail(body: bytes) -> bytes:
+        raise ValueError(body.decode())
+
+    for name, handler in (("echo", echo), ("fail", fail)):
+        server = RpcServer(broker.channel(), name=name, handler=handler)
+        await server.serve(broker.queue(name))
+
+    client = RpcClient(broker.channel(), timeout=1.0)
+    await client.start()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_multiplexed() -> None:
+    """Test concurrent requests over one channel get their own replies."""
+    client = await start_client()
+    bodies = [f"request-{index}".encode() for index in range(50)]
+
+    replies = await asyncio.gather(
+        *(client.call(routing_key="echo", body=body) for body in bodies)
+    )
+
+    assert replies == [body[::-1] for body in bodies]
+    stats = client.stats()
+    assert (stats.pending, stats.calls, stats.timed_out) == (0, 50, 0)
+
+
+@pytest.mark.asyncio
+async def test_call_publishes_to_direct_reply_to() -> None:
+    """Test a request asks for its reply through the direct reply-to queue."""
+    client = await start_client()
+    publish = mock.AsyncMock()
+    client.channel.default_exchange.publish = publish
+    with pytest.raises(RpcTimeoutError):
+        await client.call(routing_key="echo", body=b"x", timeout=0.01)
+
+    message = publish.await_args.kwargs["message"]
+    assert message.reply_to == REPLY_TO_QUEUE_NAME
+    assert message.correlation_id
+    assert message.expiration == 0.01
+
+
+@pytest.mark.asyncio
+async def test_call_timeout_and_late_reply() -> None:
+    """Test a request times out on its own, and its late reply is discarded."""
+    client = await start_client()
+    with pytest.raises(RpcTimeoutError):
+        await client.call(routing_key="echo", body=b"slow", timeout=0.001)
+    await asyncio.sleep(0.05)
+
+    assert await client.call(routing_key="echo", body=b"fast") == b"tsaf"
+    stats = client.stats()
+    assert (stats.pending, stats.timed_out, stats.late_replies) == (0, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_server_error_is_raised() -> None:
+    """Test a failed request fails the call with the error, without a timeout."""
+    client = await start_client()
+    with pytest.raises(RpcError, match="boom"):
+        await client.call(routing_key="fail", body=b"boom")
+
+
+@pytest.mark.asyncio
+async def test_call_requires_start() -> None:
+    """Test a request before `start`, or after `close`, is refused."""
+    client = RpcClient(Broker().channel())
+
+    with pytest.raises(RpcError, match="not started"):
+        await client.call(routing_key="echo", body=b"")
+
+    await client.start()
+    await client.close()
+    with pytest.raises(RpcError, match="not started"):
+        await client.call(routing_key="echo", body=b"")
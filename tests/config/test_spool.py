@@ -0,0 +1,233 @@
+"""Test suite for validating the `PublishSpool` class."""
+
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from aio_pika import DeliveryMode, Message
+from aio_pika.exceptions import AMQPConnectionError
+
+from config.rabbitmq import AsyncRabbitmqManager
+from config.spool import PublishSpool, SpooledMessage
+from toolkit.spool.helpers.exceptions import SpoolFullError
+
+
+@pytest.fixture
+def publish_spool(tmp_path: Path) -> PublishSpool:
+    """Return a `PublishSpool` backed by a file in a temporary directory."""
+    return PublishSpool(
+        file_path=str(tmp_path / "publish.spool"), capacity=4096, block_timeout=0.01
+    )
+
+
+def test_spooled_message_round_trip() -> None:
+    """Test encoding and decoding a spooled message keeps its properties."""
+    message = Message(
+        body=b'{"order_id": "1"}',
+        delivery_mode=DeliveryMode.PERSISTENT,
+        correlation_id="1",
+        headers={"x-published-at": 1.5},
+    )
+
+    decoded = SpooledMessage.decode(
+        SpooledMessage(
+            exchange="orders", routing_key="orders.new", message=message
+        ).encode()
+    )
+
+    assert decoded.exchange == "orders"
+    assert decoded.routing_key == "orders.new"
+    assert decoded.message.body == message.body
+    assert decoded.message.delivery_mode == DeliveryMode.PERSISTENT
+    assert decoded.message.correlation_id == "1"
+    assert decoded.message.headers == {"x-published-at": 1.5}
+
+
+@pytest.mark.asyncio
+async def test_replay_publishes_in_order(publish_spool: PublishSpool) -> None:
+    """Test replaying the spool publishes every message in the spooled order."""
+    # Arrange
+    for index in range(3):
+        await publish_spool.put(
+            exchange="orders",
+            routing_key="orders.new",
+            message=Message(body=b"%d" % index),
+        )
+    mock_channel = mock.AsyncMock()
+    mock_exchange = mock_channel.get_exchange.return_value
+
+    # Act
+    replayed = await publish_spool.replay(channel=mock_channel)
+
+    # Assert
+    assert replayed == 3
+    bodies = [
+        call.kwargs["message"].body for call in mock_exchange.publish.await_args_list
+    ]
+    assert bodies == [b"0", b"1", b"2"]
+    assert publish_spool.stats().depth == 0
+    assert publish_spool.stats().replayed == 3
+
+
+@pytest.mark.asyncio
+async def test_replay_keeps_unpublished_messages(publish_spool: PublishSpool) -> None:
+    """Test a failed replay keeps the message that could not be published."""
+    # Arrange
+    await publish_spool.put(exchange="orders", routing_key="a", message=Message(b"a"))
+    await publish_spool.put(exchange="orders", routing_key="b", message=Message(b"b"))
+    mock_channel = mock.AsyncMock()
+    mock_channel.get_exchange.return_value.publish.side_effect = [
+        None,
+        AMQPConnectionError(),
+    ]
+
+    # Act
+    with pytest.raises(AMQPConnectionError):
+        await publish_spool.replay(channel=mock_channel)
+
+    # Assert
+    assert len(publish_spool) == 1
+    assert publish_spool.stats().replayed == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.exception
+async def test_block_policy_times_out(tmp_path: Path) -> None:
+    """Test the `block` policy raises once the spool stays full past the timeout."""
+    spool = PublishSpool(
+        file_path=str(tmp_path / "publish.spool"), capacity=512, block_timeout=0.01
+    )
+    await spool.put(exchange="orders", routing_key="a", message=Message(b"x" * 256))
+
+    with pytest.raises(SpoolFullError):
+        await spool.put(exchange="orders", routing_key="a", message=Message(b"x" * 256))
+
+
+@pytest.mark.asyncio
+async def test_manager_spools_when_broker_unreachable(
+    publish_spool: PublishSpool,
+) -> None:
+    """Test `AsyncRabbitmqManager.publish` spools messages on connection errors."""
+    # Arrange
+    manager = AsyncRabbitmqManager(amqp_url="amqp://localhost/", spool=publish_spool)
+    mock_exchange = mock.AsyncMock()
+    mock_exchange.name = "orders"
+    mock_exchange.publish.side_effect = AMQPConnectionError()
+
+    # Act
+    result = await manager.publish(
+        exchange=mock_exchange, message=Message(b"order"), routing_key="orders.new"
+    )
+
+    # Assert
+    assert result is None
+    assert publish_spool.stats().spooled == 1
+
+
+@pytest.mark.asyncio
+async def test_manager_replays_spool_before_publishing(
+    publish_spool: PublishSpool,
+) -> None:
+    """Test `AsyncRabbitmqManager.publish` drains the spool first to keep ordering."""
+    # Arrange
+    manager = AsyncRabbitmqManager(amqp_url="amqp://localhost/", spool=publish_spool)
+    await publish_spool.put(
+        exchange="orders", routing_key="orders.new", message=Message(b"old")
+    )
+    mock_exchange = mock.AsyncMock()
+    spooled_exchange = mock_exchange.channel.get_exchange.return_value
+
+    # Act
+    await manager.publish(
+        exchange=mock_exchange, message=Message(b"new"), routing_key="orders.new"
+    )
+
+    # Assert
+    spooled_exchange.publish.assert_awaited_once()
+    mock_exchange.publish.assert_awaited_once()
+    assert len(publish_spool) == 0
+
+
+@pytest.mark.asyncio
+async def test_publish_to_spools_when_the_connection_fails(
+    publish_spool: PublishSpool,
+) -> None:
+    """Test `publish_to` spools messages when `get_connection` itself raises."""
+    # Arrange
+    manager = AsyncRabbitmqManager(amqp_url="amqp://localhost/", spool=publish_spool)
+    declare_exchange = mock.AsyncMock()
+
+    # Act
+    with mock.patch.object(
+        manager, "get_connection", side_effect=AMQPConnectionError()
+    ) as get_connection:
+        for body in (b"first", b"second"):
+            result = await manager.publish_to(
+                exchange_name="orders",
+                declare_exchange=declare_exchange,
+                message=Message(body),
+                routing_key="orders.new",
+            )
+            assert result is None
+
+    # Assert: the second publish is spooled without connecting again.
+    get_connection.assert_awaited_once()
+    declare_exchange.assert_not_awaited()
+    assert publish_spool.stats().spooled == 2
+
+
+@pytest.mark.asyncio
+async def test_publish_to_raises_without_spool() -> None:
+    """Test `publish_to` raises the connection error when no spool is set."""
+    manager = AsyncRabbitmqManager(amqp_url="amqp://localhost/")
+
+    with (
+        mock.patch.object(manager, "get_connection", side_effect=ConnectionError()),
+        pytest.raises(ConnectionError),
+    ):
+        await manager.publish_to(
+            exchange_name="orders",
+            declare_exchange=mock.AsyncMock(),
+            message=Message(b"order"),
+            routing_key="orders.new",
+        )
+
+
+@pytest.mark.asyncio
+async def test_publish_to_reuses_one_connection_and_replays_on_reconnect(
+    publish_spool: PublishSpool,
+) -> None:
+    """Test `publish_to` keeps one connection, whose reconnects replay the spool."""
+    # Arrange
+    manager = AsyncRabbitmqManager(amqp_url="amqp://localhost/", spool=publish_spool)
+    connection = mock.AsyncMock()
+    connection.reconnect_callbacks = set()
+    declare_exchange = mock.AsyncMock()
+    exchange = declare_exchange.return_value
+    exchange.name = "orders"
+
+    # Act
+    with mock.patch.object(
+        manager, "get_connection", return_value=connection
+    ) as get_connection:
+        for body in (b"first", b"second"):
+            await manager.publish_to(
+                exchange_name="orders",
+                declare_exchange=declare_exchange,
+                message=Message(body),
+                routing_key="orders.new",
+            )
+    await publish_spool.put(
+        exchange="orders", routing_key="orders.new", message=Message(b"spooled")
+    )
+    for callback in connection.reconnect_callbacks:
+        await callback(connection)
+    await manager.close()
+
+    # Assert
+    get_connection.assert_awaited_once()
+    declare_exchange.assert_awaited_once()
+    assert exchange.publish.await_count == 2
+    assert len(publish_spool) == 0
+    connection.channel.return_value.get_exchange.return_value.publish.assert_awaited()
+    connection.close.assert_awaited_once()
@@ -0,0 +1,127 @@
+"""Test suite for validating the tracing of the messaging."""
+
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+from aio_pika import Message
+
+from config import tracing
+from config.correlation import PUBLISHED_AT_HEADER
+from toolkit.tracing import (
+    BatchSpanProcessor,
+    FileSpanExporter,
+    RatioSampler,
+    Span,
+    SpanExporter,
+    TailSampler,
+)
+
+
+class InMemoryExporter(SpanExporter):
+    """Keep the exported spans in a list."""
+
+    def __init__(self) -> None:
+        """Instantiate an empty `InMemoryExporter`."""
+        super().__init__("test")
+        self.spans: list[Span] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Keep the spans."""
+        self.spans.extend(spans)
+
+
+@pytest.fixture
+def exporter(monkeypatch: pytest.MonkeyPatch) -> InMemoryExporter:
+    """Record every span of the application tracer in memory."""
+    exporter = InMemoryExporter()
+    monkeypatch.setattr(tracing.tracer, "sampler", RatioSampler(1.0))
+    monkeypatch.setattr(
+        tracing.tracer,
+        "processor",
+        BatchSpanProcessor(exporter, schedule_delay=0.01),
+    )
+    return exporter
+
+
+@pytest.mark.asyncio
+async def test_trace_consumer_continues_the_trace(exporter: InMemoryExporter) -> None:
+    """Test a consumed message continues the trace of its publish."""
+    # Arrange
+    with tracing.tracer.start_span("publish orders") as publish:
+        message = Message(b"{}", headers={PUBLISHED_AT_HEADER: time.time() - 1})
+        tracing.tracer.inject(message.headers)
+    incoming = mock.MagicMock(body=message.body, headers=message.headers)
+
+    async def handler(message: Any) -> None:
+        async with tracing.process_message(message):
+            with tracing.tracer.start_span("decode"):
+                pass
+
+    # Act
+    await tracing.trace_consumer("orders", handler)(incoming)
+    tracing.tracer.processor.shutdown()  # type: ignore[union-attr]
+
+    # Assert
+    spans = {span.name: span for span in exporter.spans}
+    consume = spans["consume orders"]
+    assert consume.parent_id == publish.context.span_id
+    assert consume.context.trace_id == publish.context.trace_id
+    for name in ("broker wait", "decode", "ack"):
+        assert spans[name].parent_id == consume.context.span_id
+    assert spans["broker wait"].duration >= 1
+    assert spans["ack"].attributes == {"messaging.ack": "ack"}
+    incoming.process.return_value.__aexit__.assert_awaited_once_with(None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_process_message_traces_rejects(exporter: InMemoryExporter) -> None:
+    """Test a failed message is rejected in an `ack` span, and the error re-raised."""
+    incoming = mock.MagicMock()
+
+    with pytest.raises(ValueError):
+        async with tracing.process_message(incoming):
+            raise ValueError("invalid order")
+    tracing.tracer.processor.shutdown()  # type: ignore[union-attr]
+
+    [ack] = exporter.spans
+    assert ack.attributes == {"messaging.ack": "reject"}
+    assert ack.error is None
+    exc_type, *_ = incoming.process.return_value.__aexit__.await_args.args
+    assert exc_type is ValueError
+
+
+def test_setup_tracing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the tracer is configured from the `[tracing]` settings table."""
+    for name in ("sampler", "tail_sampler", "processor", "max_pending_traces"):
+        monkeypatch.setattr(tracing.tracer, name, getattr(tracing.tracer, name))
+    config = {
+        "enabled": True,
+        "service_name": "orders",
+        "sample_ratio": 0.5,
+        "tail_sampling": True,
+        "tail_latency_threshold": 2.0,
+        "max_pending_traces": 10,
+        "exporter": "file",
+        "file_path": str(tmp_path / "spans.jsonl"),
+        "otlp_endpoint": "http://127.0.0.1:4318/v1/traces",
+        "max_queue_size": 16,
+        "max_batch_size": 4,
+        "schedule_delay": 0.01,
+    }
+
+    assert tracing.setup_tracing({**config, "enabled": False}).processor is None
+    tracer = tracing.setup_tracing(config)
+
+    assert tracer is tracing.tracer
+    assert tracer.sampler.ratio == 0.5
+    assert isinstance(tracer.tail_sampler, TailSampler)
+    assert tracer.tail_sampler.latency_threshold == 2.0
+    assert tracer.processor is not None
+    assert isinstance(tracer.processor.exporter, FileSpanExporter)
+    tracer.processor.shutdown()
+    with pytest.raises(ValueError):
+        tracing.setup_tracing({**config, "exporter": "jaeger"})
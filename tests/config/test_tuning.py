@@ -0,0 +1,124 @@
+"""Test suite for validating the `TuningWatcher` class."""
+
+import logging
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from config.acks import AckCoalescer
+from config.tuning import TuningSettings, TuningWatcher, bind_consumer
+from toolkit.parsers import CachedTOMLParser
+
+TUNING = """
+[tuning]
+reload_interval = 0.01
+
+[tuning.log_levels]
+"test_tuning" = "{level}"
+
+[tuning.consumers.orders]
+prefetch_count = {prefetch_count}
+concurrency = 10
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> Iterator[None]:
+    """Start and end every test with an empty parse cache."""
+    CachedTOMLParser.clear_cache()
+    yield
+    CachedTOMLParser.clear_cache()
+
+
+def write_settings(path: Path, content: str) -> None:
+    """Write the settings file, moving its mtime forward so the edit is detected."""
+    mtime = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(content)
+    os.utime(path, ns=(mtime + 1_000_000, mtime + 1_000_000))
+
+
+@pytest.fixture
+def settings_path(tmp_path: Path) -> Path:
+    """Return the path of a settings file with a valid tuning table."""
+    path = tmp_path / "settings.toml"
+    write_settings(path, TUNING.format(level="INFO", prefetch_count=100))
+    return path
+
+
+@pytest.mark.asyncio
+async def test_reload_applies_changes(settings_path: Path) -> None:
+    """Test a valid edit is applied, passed to subscribers and counted."""
+    # Arrange
+    watcher = TuningWatcher(file_path=str(settings_path))
+    await watcher.reload()
+    callback = mock.Mock()
+    watcher.subscribe(callback)
+
+    # Act
+    write_settings(settings_path, TUNING.format(level="ERROR", prefetch_count=20))
+    applied = await watcher.reload()
+
+    # Assert
+    assert applied is True
+    assert watcher.settings.consumer("orders").prefetch_count == 20
+    assert logging.getLogger("test_tuning").level == logging.ERROR
+    old, new = callback.call_args.args
+    assert old.consumer("orders").prefetch_count == 100
+    assert new is watcher.settings
+    assert watcher.stats().generation == 2
+    assert await watcher.reload() is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.exception
+async def test_invalid_edit_is_rejected(settings_path: Path) -> None:
+    """Test an invalid edit keeps the current settings and is counted once."""
+    watcher = TuningWatcher(file_path=str(settings_path))
+    await watcher.reload()
+
+    write_settings(settings_path, TUNING.format(level="LOUD", prefetch_count=-1))
+    assert await watcher.reload() is False
+    assert await watcher.reload() is False
+
+    assert watcher.settings.consumer("orders").prefetch_count == 100
+    assert watcher.stats().rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_bind_consumer_updates_qos_pool_and_acks() -> None:
+    """Test a changed consumer tuning updates the QoS, the pool and the acks."""
+    # Arrange
+    watcher = TuningWatcher()
+    mock_channel = mock.AsyncMock()
+    mock_pool = mock.Mock()
+    acks = AckCoalescer()
+    unbind = bind_consumer(
+        watcher, name="orders", channel=mock_channel, pool=mock_pool, acks=acks
+    )
+    [callback] = watcher._subscribers
+    old = TuningSettings()
+    new = TuningSettings.model_validate(
+        {
+            "consumers": {
+                "orders": {
+                    "prefetch_count": 5,
+                    "concurrency": 2,
+                    "ack_batch_size": 16,
+                    "ack_interval": 0.01,
+                }
+            }
+        }
+    )
+
+    # Act
+    await callback(old, new)
+    unbind()
+
+    # Assert
+    mock_channel.set_qos.assert_awaited_once_with(prefetch_count=5)
+    mock_pool.resize.assert_called_once_with(2)
+    assert (acks.max_batch, acks.interval) == (16, 0.01)
+    assert watcher._subscribers == []
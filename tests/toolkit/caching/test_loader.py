@@ -0,0 +1,81 @@
+"""Test suite for validating `DataLoader` class."""
+
+import asyncio
+from collections.abc import Mapping, Sequence
+
+import pytest
+
+from toolkit.caching import DataLoader, TTLCache
+
+
+class Backend:
+    """A backend squaring the positive keys, recording its calls."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+        """Answer after `delay` seconds, or fail if `fail`."""
+        self.delay = delay
+        self.fail = fail
+        self.calls: list[Sequence[int]] = []
+
+    async def __call__(self, keys: Sequence[int]) -> Mapping[int, int]:
+        """Return the squares of the positive keys."""
+        self.calls.append(list(keys))
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("backend down")
+        return {key: key * key for key in keys if key > 0}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_are_batched() -> None:
+    """Test the loads of a tick are sent in one call, by `max_batch_size` keys."""
+    backend = Backend()
+    loader = DataLoader(backend, max_batch_size=3)
+
+    values = await asyncio.gather(*(loader.load(key) for key in range(1, 6)))
+
+    assert values == [1, 4, 9, 16, 25]
+    assert backend.calls == [[1, 2, 3], [4, 5]]
+
+
+@pytest.mark.asyncio
+async def test_unknown_key_is_cached_as_a_miss() -> None:
+    """Test a key the backend omits resolves to `None`, cached."""
+    backend = Backend()
+    loader = DataLoader(backend, cache=TTLCache(max_size=10, ttl=10.0))
+
+    assert await loader.load(-1) is None
+    assert await loader.load(-1) is None
+    assert await loader.load(2) == 4
+    assert await loader.load(2) == 4
+
+    assert backend.calls == [[-1], [2]]
+
+
+@pytest.mark.asyncio
+async def test_single_flight() -> None:
+    """Test the loads of a key being loaded share the pending lookup."""
+    backend = Backend(delay=0.01)
+    loader = DataLoader(backend)
+
+    first = asyncio.create_task(loader.load(3))
+    await asyncio.sleep(0.005)  # The batch is in flight.
+    values = await asyncio.gather(first, *(loader.load(3) for _ in range(10)))
+
+    assert values == [9] * 11
+    assert backend.calls == [[3]]
+    assert loader.stats().coalesced == 10
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_not_cached() -> None:
+    """Test a failed batch fails its loads, and the next load calls again."""
+    backend = Backend(fail=True)
+    loader = DataLoader(backend, cache=TTLCache(max_size=10, ttl=10.0))
+
+    with pytest.raises(ConnectionError):
+        await loader.load(1)
+    backend.fail = False
+
+    assert await loader.load(1) == 1
+    assert len(backend.calls) == 2
@@ -0,0 +1,65 @@
+"""Test suite for validating `TTLCache` class."""
+
+import pytest
+
+from toolkit.caching import TTLCache
+
+
+class Clock:
+    """A clock advanced by hand."""
+
+    def __init__(self) -> None:
+        """Start the clock at 0."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+def test_get_and_set() -> None:
+    """Test a cached value is found, and an unknown key is not."""
+    cache: TTLCache[int, str] = TTLCache(max_size=2, ttl=10.0)
+    cache.set(1, "one")
+
+    assert cache.get(1) == (True, "one")
+    assert cache.get(2) == (False, None)
+    assert (cache.stats().hits, cache.stats().misses) == (1, 1)
+
+
+def test_entries_expire() -> None:
+    """Test values expire after the TTL, and misses after the negative TTL."""
+    clock = Clock()
+    cache: TTLCache[int, str] = TTLCache(
+        max_size=10, ttl=10.0, negative_ttl=1.0, clock=clock
+    )
+    cache.set(1, "one")
+    cache.set(2, None)
+    assert cache.get(2) == (True, None)
+
+    clock.now = 5.0
+    assert cache.get(1) == (True, "one")
+    assert cache.get(2) == (False, None)
+
+    clock.now = 10.0
+    assert cache.get(1) == (False, None)
+    assert len(cache) == 0
+
+
+def test_least_recently_used_is_evicted() -> None:
+    """Test the least recently used entry is evicted past the maximum size."""
+    cache: TTLCache[int, str] = TTLCache(max_size=2, ttl=10.0)
+    cache.set(1, "one")
+    cache.set(2, "two")
+    cache.get(1)
+    cache.set(3, "three")
+
+    assert cache.get(2) == (False, None)
+    assert cache.get(1) == (True, "one")
+    assert cache.stats().evictions == 1
+
+
+def test_invalid_parameters() -> None:
+    """Test a cache with no room is refused."""
+    with pytest.raises(ValueError):
+        TTLCache(max_size=0, ttl=1.0)
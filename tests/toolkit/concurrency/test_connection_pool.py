@@ -0,0 +1,97 @@
+"""Test suite for validating the `ConnectionPool` class."""
+
+import asyncio
+import itertools
+
+import pytest
+
+from toolkit.concurrency import ConnectionPool
+
+
+class Connections:
+    """Open numbered connections, and record the closed ones."""
+
+    def __init__(self) -> None:
+        self.numbers = itertools.count()
+        self.closed: list[int] = []
+
+    async def connect(self) -> int:
+        """Open the next connection."""
+        return next(self.numbers)
+
+    async def close(self, connection: int) -> None:
+        """Close a connection."""
+        self.closed.append(connection)
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused() -> None:
+    """Test sequential requests reuse a single connection."""
+    connections = Connections()
+    pool = ConnectionPool(connections.connect, connections.close, size=4)
+
+    for _ in range(3):
+        async with pool.connection() as connection:
+            assert connection == 0
+
+    stats = pool.stats()
+    assert (stats.opened, stats.idle, stats.connects) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_pool_is_bounded() -> None:
+    """Test at most `size` connections are open, and the others wait."""
+    connections = Connections()
+    pool = ConnectionPool(connections.connect, connections.close, size=2)
+    active = peak = 0
+
+    async def request() -> None:
+        nonlocal active, peak
+        async with pool.connection():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(request() for _ in range(6)))
+
+    assert peak == 2
+    assert pool.stats().connects == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_connection_is_closed() -> None:
+    """Test a connection released by a failed request is not reused."""
+    connections = Connections()
+    pool = ConnectionPool(connections.connect, connections.close, size=1)
+
+    with pytest.raises(OSError):
+        async with pool.connection():
+            raise OSError
+    async with pool.connection() as connection:
+        assert connection == 1
+
+    assert connections.closed == [0]
+
+
+@pytest.mark.asyncio
+async def test_close() -> None:
+    """Test closing closes the idle connections, and the busy ones on release."""
+    connections = Connections()
+    pool = ConnectionPool(connections.connect, connections.close, size=2)
+    released = asyncio.Event()
+
+    async def hold() -> None:
+        async with pool.connection():
+            await released.wait()
+
+    async with pool.connection():
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+    await pool.close()
+    assert connections.closed == [0]
+
+    released.set()
+    await holder
+    assert connections.closed == [0, 1]
+    assert pool.stats().opened == 0
@@ -0,0 +1,142 @@
+"""Test suite for validating the `WorkerPool` class."""
+
+import asyncio
+
+import pytest
+
+from toolkit.concurrency import WorkerPool
+from toolkit.memory import MemoryBudget
+
+
+class Handler:
+    """A handler recording its peak concurrency, released by an event."""
+
+    def __init__(self) -> None:
+        """Instantiate a `Handler` object."""
+        self.release = asyncio.Event()
+        self.running = 0
+        self.peak = 0
+        self.handled: list[int] = []
+
+    async def __call__(self, item: int) -> None:
+        """Handle an item once released, failing on negative items."""
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await self.release.wait()
+            if item < 0:
+                raise ValueError(item)
+            self.handled.append(item)
+        finally:
+            self.running -= 1
+
+
+@pytest.mark.asyncio
+async def test_pool_limits_concurrency() -> None:
+    """Test at most `size` items are handled at once, and all are handled."""
+    handler = Handler()
+    pool = WorkerPool(handler=handler, size=3)
+    pool.start()
+
+    for item in range(10):
+        await pool.submit(item)
+    await asyncio.sleep(0.01)
+    handler.release.set()
+    await pool.join()
+
+    assert handler.peak == 3
+    assert sorted(handler.handled) == list(range(10))
+    assert pool.processed == 10
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_resize_grows_and_shrinks() -> None:
+    """Test growing starts workers at once, and shrinking retires idle ones."""
+    handler = Handler()
+    pool = WorkerPool(handler=handler, size=2)
+    pool.start()
+    for item in range(6):
+        await pool.submit(item)
+    await asyncio.sleep(0.01)
+
+    pool.resize(4)
+    await asyncio.sleep(0.01)
+    assert handler.running == 4
+
+    handler.release.set()
+    await pool.join()
+    pool.resize(1)
+    await asyncio.sleep(0.01)
+
+    assert pool.workers == 1
+    assert len(handler.handled) == 6
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_shrinking_does_not_interrupt_busy_workers() -> None:
+    """Test busy workers finish their item before retiring."""
+    handler = Handler()
+    pool = WorkerPool(handler=handler, size=3)
+    pool.start()
+    for item in range(3):
+        await pool.submit(item)
+    await asyncio.sleep(0.01)
+
+    pool.resize(1)
+    handler.release.set()
+    await pool.join()
+    await asyncio.sleep(0.01)
+
+    assert sorted(handler.handled) == [0, 1, 2]
+    assert pool.workers == 1
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_items_do_not_stop_workers() -> None:
+    """Test an exception raised by the handler is counted and the worker goes on."""
+    handler = Handler()
+    handler.release.set()
+    pool = WorkerPool(handler=handler, size=1)
+    pool.start()
+
+    await pool.submit(-1)
+    await pool.submit(1)
+    await pool.join()
+
+    assert pool.failed == 1
+    assert handler.handled == [1]
+    await pool.stop()
+
+
+@pytest.mark.exception
+def test_invalid_size() -> None:
+    """Test a pool needs at least one worker."""
+    with pytest.raises(ValueError):
+        WorkerPool(handler=Handler(), size=0)
+
+
+@pytest.mark.asyncio
+async def test_pool_budget_applies_backpressure() -> None:
+    """Test `submit` waits while the items held exceed the memory budget."""
+    handler = Handler()
+    budget = MemoryBudget("prefetch", limit=10)
+    pool = WorkerPool(handler=handler, size=5, budget=budget, sizeof=lambda item: item)
+    pool.start()
+
+    await pool.submit(6)
+    blocked = asyncio.create_task(pool.submit(5))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+    assert budget.used == 6
+
+    handler.release.set()
+    await blocked
+    await pool.join()
+    await pool.stop()
+
+    assert handler.handled == [6, 5]
+    assert budget.used == 0
+    assert budget.stats().throttled == 1
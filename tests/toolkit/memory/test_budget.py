@@ -0,0 +1,75 @@
+"""Test suite for validating the `MemoryBudget` and `MemoryAccountant` classes."""
+
+import asyncio
+
+import pytest
+
+from toolkit.memory import MemoryAccountant, MemoryBudget
+
+
+@pytest.mark.asyncio
+async def test_budget_waiters_are_admitted_in_order() -> None:
+    """Test acquires over the limit wait, and are admitted first in first out."""
+    budget = MemoryBudget("decode", limit=100)
+    await budget.acquire(60)
+    admitted = []
+
+    async def acquire(size: int) -> None:
+        await budget.acquire(size)
+        admitted.append(size)
+
+    waiters = [asyncio.create_task(acquire(size)) for size in (50, 10)]
+    await asyncio.sleep(0)
+    assert admitted == []
+    assert not budget.try_acquire(10)  # No overtaking of the waiters.
+
+    budget.release(60)
+    await asyncio.gather(*waiters)
+
+    assert admitted == [50, 10]
+    stats = budget.stats()
+    assert (stats.used, stats.peak, stats.waiting, stats.throttled) == (60, 60, 0, 2)
+
+
+@pytest.mark.asyncio
+async def test_budget_admits_oversized_items_alone() -> None:
+    """Test an item larger than the budget is admitted once nothing is held."""
+    budget = MemoryBudget("decode", limit=10)
+
+    async with budget.reserve(50):
+        assert budget.used == 50
+
+    assert budget.used == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_is_forgotten() -> None:
+    """Test a cancelled acquire leaves the budget and the next waiters consistent."""
+    budget = MemoryBudget("decode", limit=10)
+    await budget.acquire(10)
+    cancelled = asyncio.create_task(budget.acquire(5))
+    waiting = asyncio.create_task(budget.acquire(5))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    await asyncio.gather(cancelled, return_exceptions=True)
+    budget.release(10)
+    await waiting
+
+    assert budget.used == 5
+    assert budget.stats().waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_accountant() -> None:
+    """Test only the configured stages are limited, and limits can change."""
+    accountant = MemoryAccountant()
+    accountant.configure({"decode": 10})
+
+    async with accountant.reserve("decode", 8), accountant.reserve("other", 10**9):
+        assert accountant.stats()["decode"].used == 8
+        accountant.configure({"decode": 20})
+        assert accountant.budgets["decode"].limit == 20
+
+    assert accountant.get("other") is None
+    assert "decode" in accountant.render()
@@ -0,0 +1,27 @@
+"""Test suite for validating the `AllocationTracker` class."""
+
+import tracemalloc
+
+from toolkit.memory import AllocationTracker
+
+retained: list[bytes] = []
+
+
+def test_snapshot_diff_is_grouped_by_module() -> None:
+    """Test the growth between two snapshots is attributed to its module."""
+    tracker = AllocationTracker()
+    try:
+        tracker.snapshot()
+        assert tracker.tracing
+
+        retained.extend(bytes(1024) for _ in range(1000))
+        allocations = tracker.snapshot()
+    finally:
+        tracker.stop()
+        retained.clear()
+
+    assert not tracemalloc.is_tracing()
+    [grown] = [item for item in allocations if item.module == __name__]
+    assert grown.size_diff > 1000 * 1024
+    assert grown.count_diff >= 1000
+    assert __name__ in tracker.render(allocations)
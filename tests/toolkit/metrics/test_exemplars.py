@@ -0,0 +1,22 @@
+"""Test suite for validating the `SlowestExemplars` class."""
+
+import pytest
+
+from toolkit.metrics import SlowestExemplars
+
+
+def test_keeps_the_slowest() -> None:
+    """Test only the `capacity` slowest observations are kept, slowest first."""
+    exemplars: SlowestExemplars[str] = SlowestExemplars(capacity=3)
+
+    kept = [exemplars.offer(value, f"order-{value}") for value in (5, 1, 3, 4, 2, 6)]
+
+    assert kept == [True, True, True, True, False, True]
+    assert exemplars.snapshot() == [(6, "order-6"), (5, "order-5"), (4, "order-4")]
+
+
+@pytest.mark.exception
+def test_invalid_capacity() -> None:
+    """Test at least one observation should be kept."""
+    with pytest.raises(ValueError):
+        SlowestExemplars(capacity=0)
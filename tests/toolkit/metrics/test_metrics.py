@@ -0,0 +1,79 @@
+"""Test suite for validating the metrics and their Prometheus exposition."""
+
+import pytest
+
+from toolkit.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry() -> MetricsRegistry:
+    """Return an empty metrics registry."""
+    return MetricsRegistry()
+
+
+def test_counter_and_gauge(registry: MetricsRegistry) -> None:
+    """Test counters only increase and gauges go both ways."""
+    counter = registry.counter("messages_total", "Messages.", labelnames=["queue"])
+    gauge = registry.gauge("in_flight", "In flight.")
+
+    counter.labels("orders").inc()
+    counter.labels("orders").inc(2)
+    gauge.inc(3)
+    gauge.dec()
+
+    assert counter.labels("orders").value == 3
+    assert gauge.unlabelled.value == 2
+    with pytest.raises(ValueError):
+        counter.labels("orders").inc(-1)
+
+
+def test_labels_are_bound_once(registry: MetricsRegistry) -> None:
+    """Test the same child is returned for the same label values."""
+    counter = registry.counter("messages_total", "Messages.", labelnames=["queue"])
+
+    assert counter.labels("orders") is counter.labels("orders")
+    with pytest.raises(ValueError):
+        counter.labels("orders", "extra")
+
+
+def test_histogram_buckets(registry: MetricsRegistry) -> None:
+    """Test observations land in the first bucket not below them."""
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=[0.1, 1])
+
+    for value in (0.05, 0.1, 0.5, 5):
+        histogram.observe(value)
+
+    samples = list(histogram.collect())
+    assert samples == [
+        ("_bucket", (("le", "0.1"),), 2),
+        ("_bucket", (("le", "1.0"),), 3),
+        ("_bucket", (("le", "+Inf"),), 4),
+        ("_sum", (), 5.65),
+        ("_count", (), 4),
+    ]
+
+
+def test_render_text_format(registry: MetricsRegistry) -> None:
+    """Test the registry renders the Prometheus text exposition format."""
+    counter = registry.counter("messages_total", "Messages.", labelnames=["queue"])
+    counter.labels('say "hi"').inc()
+    gauge = registry.gauge("depth", "Depth.")
+    gauge.unlabelled.set_function(lambda: 7)
+
+    assert registry.render() == (
+        "# HELP messages_total Messages.\n"
+        "# TYPE messages_total counter\n"
+        'messages_total{queue="say \\"hi\\""} 1.0\n'
+        "# HELP depth Depth.\n"
+        "# TYPE depth gauge\n"
+        "depth 7.0\n"
+    )
+
+
+@pytest.mark.exception
+def test_duplicate_name(registry: MetricsRegistry) -> None:
+    """Test two metrics cannot share a name."""
+    registry.counter("messages_total", "Messages.")
+
+    with pytest.raises(ValueError):
+        registry.gauge("messages_total", "Messages.")
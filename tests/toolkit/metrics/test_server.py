@@ -0,0 +1,54 @@
+"""Test suite for validating the `MetricsServer` class."""
+
+import asyncio
+
+import pytest
+
+from toolkit.metrics import CONTENT_TYPE, MetricsRegistry, MetricsServer
+
+
+async def get(port: int, path: str, method: str = "GET") -> tuple[str, str]:
+    """Send a request to the local server and return the head and the body."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    response = (await reader.read()).decode()
+    writer.close()
+    head, _, body = response.partition("\r\n\r\n")
+    return head, body
+
+
+@pytest.mark.asyncio
+async def test_serves_metrics() -> None:
+    """Test `GET /metrics` returns the rendered registry."""
+    registry = MetricsRegistry()
+    registry.counter("messages_total", "Messages.").inc()
+
+    async with MetricsServer(registry, port=0) as server:
+        head, body = await get(server.port, "/metrics")
+
+    assert head.startswith("HTTP/1.1 200 OK")
+    assert f"Content-Type: {CONTENT_TYPE}" in head
+    assert body == registry.render()
+
+
+@pytest.mark.asyncio
+async def test_rejects_other_requests() -> None:
+    """Test other paths and methods are answered with an error status."""
+    async with MetricsServer(MetricsRegistry(), port=0) as server:
+        not_found, _ = await get(server.port, "/")
+        not_allowed, _ = await get(server.port, "/metrics", method="POST")
+
+    assert not_found.startswith("HTTP/1.1 404")
+    assert not_allowed.startswith("HTTP/1.1 405")
+
+
+@pytest.mark.asyncio
+async def test_serves_extra_routes() -> None:
+    """Test the extra plain-text pages are rendered on request."""
+    routes = {"/exemplars": lambda: "slowest\n"}
+
+    async with MetricsServer(MetricsRegistry(), port=0, routes=routes) as server:
+        head, body = await get(server.port, "/exemplars")
+
+    assert head.startswith("HTTP/1.1 200 OK")
+    assert body == "slowest\n"
@@ -0,0 +1,90 @@
+"""Unit tests for the CachedTOMLParser class."""
+
+import os
+import tomllib
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from toolkit.parsers import CachedTOMLParser, TOMLParser
+from toolkit.parsers.helpers.exceptions import TOMLParseError
+
+SAMPLE_TOML_CONTENT = """
+[info]
+name = "John"
+age = 30
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> Iterator[None]:
+    """Start and end every test with an empty parse cache."""
+    CachedTOMLParser.clear_cache()
+    yield
+    CachedTOMLParser.clear_cache()
+
+
+@pytest.fixture
+def toml_file(tmp_path: Path) -> Path:
+    """Return the path of a valid TOML file."""
+    path = tmp_path / "settings.toml"
+    path.write_text(SAMPLE_TOML_CONTENT)
+    return path
+
+
+@pytest.mark.smoke
+def test_read(toml_file: Path) -> None:
+    """Test reading a valid TOML file."""
+    content = CachedTOMLParser(file_path=str(toml_file)).read()
+
+    assert content == {"info": {"name": "John", "age": 30}}
+
+
+def test_read_is_shared_between_parsers(toml_file: Path) -> None:
+    """Test parsers of the same file share a single parse."""
+    first = CachedTOMLParser(file_path=str(toml_file))
+    second = CachedTOMLParser(file_path=str(toml_file))
+
+    with patch("tomllib.load", wraps=tomllib.load) as mock_load:
+        assert first.read() is second.read()
+
+    mock_load.assert_called_once()
+
+
+def test_read_invalidated_by_modification(toml_file: Path) -> None:
+    """Test an edited file is parsed again."""
+    parser = CachedTOMLParser(file_path=str(toml_file))
+    parser.read()
+
+    toml_file.write_text('[info]\nname = "Jane"\n')
+    stat = toml_file.stat()
+    os.utime(toml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert parser.read() == {"info": {"name": "Jane"}}
+
+
+@pytest.mark.exception
+def test_read_invalid_syntax_toml_file(tmp_path: Path) -> None:
+    """Test reading an invalid TOML file."""
+    path = tmp_path / "invalid.toml"
+    path.write_text("invalid syntax")
+
+    with pytest.raises(TOMLParseError, match="Syntax Error in: "):
+        CachedTOMLParser(file_path=str(path)).read()
+
+
+def test_round_trip_edit_preserves_comments(toml_file: Path) -> None:
+    """Test `TOMLParser` edits a file without losing its comments."""
+    toml_file.write_text("# The user.\n" + SAMPLE_TOML_CONTENT)
+    parser = TOMLParser(file_path=str(toml_file))
+
+    document = parser.read()
+    document["info"]["age"] = 31
+    parser.write(document)
+
+    assert toml_file.read_text() == "# The user.\n" + SAMPLE_TOML_CONTENT.replace(
+        "30", "31"
+    )
+    assert CachedTOMLParser(file_path=str(toml_file)).read()["info"]["age"] == 31
@@ -0,0 +1,43 @@
+"""Test suite for validating the `PhaseProfile` class."""
+
+from toolkit.profiling import PhaseProfile
+from toolkit.tracing import Span, SpanContext, SpanKind
+
+
+def get_span(name: str, milliseconds: int, kind: SpanKind = SpanKind.INTERNAL) -> Span:
+    """Return a finished span of `milliseconds`, a local root if a consumer span."""
+    return Span(
+        name=name,
+        context=SpanContext("0" * 31 + "1", "0" * 15 + "1", sampled=False),
+        parent_id=None,
+        start_time=0,
+        end_time=milliseconds * 1_000_000,
+        kind=kind,
+        local_root=kind is SpanKind.CONSUMER,
+    )
+
+
+def test_phase_profile() -> None:
+    """Test the phases of the next messages are timed, then the profile is done."""
+    profile = PhaseProfile(messages=2)
+
+    for milliseconds in (1, 3, 5):
+        profile.add(get_span("decode", milliseconds))
+        profile.add(get_span("consume orders", 10 * milliseconds, SpanKind.CONSUMER))
+
+    assert profile.done
+    assert profile.durations["decode"] == [0.001, 0.003]
+    report = profile.render()
+    assert report.startswith("2/2 messages profiled")
+    consume, decode = report.splitlines()[2:]
+    assert consume.split() == [
+        "consume",
+        "orders",
+        "2",
+        "20.000",
+        "20.000",
+        "30.000",
+        "30.000",
+        "40.0",
+    ]
+    assert decode.startswith("decode")
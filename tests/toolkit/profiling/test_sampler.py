@@ -0,0 +1,58 @@
+"""Test suite for validating the `SamplingProfiler` class."""
+
+import asyncio
+import time
+
+import pytest
+
+from toolkit.profiling import SamplingProfiler
+
+
+def spin(seconds: float) -> None:
+    """Keep the CPU busy for `seconds`."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_samples_are_attributed_to_tasks_and_handlers() -> None:
+    """Test the samples are collapsed stacks prefixed by their task and handler."""
+    # Arrange
+    profiler = SamplingProfiler(interval=0.001)
+
+    async def handle(seconds: float) -> None:
+        spin(seconds)
+
+    handler = profiler.attribute("orders", handle)
+
+    # Act
+    profiler.start(loop=asyncio.get_running_loop())
+    await asyncio.create_task(handler(0.2), name="orders-worker-1")
+    collapsed = profiler.stop()
+
+    # Assert
+    assert not profiler.running
+    assert profiler.samples > 0
+    lines = collapsed.splitlines()
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == profiler.samples
+    attributed = [line for line in lines if "test_sampler:spin" in line]
+    assert attributed
+    assert all(
+        line.startswith("task:orders-worker-1;handler:orders;") for line in attributed
+    )
+
+
+@pytest.mark.asyncio
+async def test_attribute_is_transparent_when_stopped() -> None:
+    """Test an attributed handler runs as is while the profiler is stopped."""
+    profiler = SamplingProfiler()
+    handled = []
+
+    async def handle(item: int) -> None:
+        handled.append(item)
+
+    await profiler.attribute("orders", handle)(1)
+
+    assert handled == [1]
+    assert profiler.stop() == ""
@@ -0,0 +1,95 @@
+"""Unit tests for the TokenBucket and AdaptiveTokenBucket classes."""
+
+import pytest
+
+from toolkit.ratelimit import AdaptiveTokenBucket, TokenBucket
+
+
+class FakeClock:
+    """A manually advanced clock, used to make the refill deterministic."""
+
+    def __init__(self) -> None:
+        """Instantiate a `FakeClock` object."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time of the clock."""
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Return a `FakeClock` starting at zero."""
+    return FakeClock()
+
+
+@pytest.mark.smoke
+def test_try_acquire_until_empty(clock: FakeClock) -> None:
+    """Test the bucket admits `burst` operations, then refuses."""
+    bucket = TokenBucket(rate=1, burst=3, clock=clock)
+
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+
+def test_refill_over_time(clock: FakeClock) -> None:
+    """Test tokens are refilled at `rate` per second, capped at `burst`."""
+    bucket = TokenBucket(rate=2, burst=4, clock=clock)
+    for _ in range(4):
+        bucket.try_acquire()
+
+    clock.now = 1.0
+    assert bucket.tokens == pytest.approx(2)
+    assert bucket.delay(tokens=3) == pytest.approx(0.5)
+
+    clock.now = 10.0
+    assert bucket.tokens == pytest.approx(4)
+
+
+@pytest.mark.asyncio
+async def test_acquire_gives_up_after_timeout(clock: FakeClock) -> None:
+    """Test `acquire` returns False when the tokens won't be available in time."""
+    bucket = TokenBucket(rate=1, burst=1, clock=clock)
+    bucket.try_acquire()
+
+    assert await bucket.acquire(timeout=0.5) is False
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_refill() -> None:
+    """Test `acquire` waits for the refill with the real clock."""
+    bucket = TokenBucket(rate=1000, burst=1)
+    bucket.try_acquire()
+
+    assert await bucket.acquire(timeout=1) is True
+
+
+@pytest.mark.exception
+def test_invalid_rate() -> None:
+    """Test a non-positive rate is refused."""
+    with pytest.raises(ValueError, match="should be positive"):
+        TokenBucket(rate=0, burst=1)
+
+
+def test_adaptive_rate_follows_latency(clock: FakeClock) -> None:
+    """Test AIMD: fast observations increase the rate, slow ones halve it."""
+    bucket = AdaptiveTokenBucket(
+        rate=10,
+        burst=10,
+        min_rate=4,
+        max_rate=12,
+        target_latency=0.1,
+        increase=1,
+        decrease=0.5,
+        clock=clock,
+    )
+
+    bucket.observe(latency=0.01)
+    assert bucket.rate == 11
+    bucket.observe(latency=0.01)
+    bucket.observe(latency=0.01)
+    assert bucket.rate == 12
+
+    bucket.observe(latency=1.0)
+    assert bucket.rate == 6
+    bucket.penalize()
+    assert bucket.rate == 4
@@ -0,0 +1,79 @@
+"""Test suite for validating `CircuitBreaker` class."""
+
+import pytest
+
+from toolkit.resilience import BreakerState, CircuitBreaker
+from toolkit.resilience.helpers.exceptions import CircuitOpenError
+
+
+class Clock:
+    """A clock advanced by hand."""
+
+    def __init__(self) -> None:
+        """Start the clock at 0."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+async def fail(breaker: CircuitBreaker) -> None:
+    """Run a failing call through the breaker."""
+    with pytest.raises(ConnectionError):
+        async with breaker.guard():
+            raise ConnectionError
+
+
+@pytest.mark.asyncio
+async def test_consecutive_failures_open_the_breaker() -> None:
+    """Test the breaker opens after `failure_threshold` consecutive failures."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, clock=Clock())
+    await fail(breaker)
+    async with breaker.guard():
+        pass  # A success resets the count.
+    await fail(breaker)
+    assert breaker.state is BreakerState.CLOSED
+
+    await fail(breaker)
+
+    assert breaker.state is BreakerState.OPEN
+    with pytest.raises(CircuitOpenError):
+        async with breaker.guard():
+            pass
+    assert breaker.stats().rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_successful_probe_closes_the_breaker() -> None:
+    """Test a half-open breaker lets one probe through, and closes if it succeeds."""
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0, clock=clock)
+    await fail(breaker)
+    assert breaker.retry_after == 10.0
+
+    clock.now = 10.0
+    assert breaker.state is BreakerState.HALF_OPEN
+    async with breaker.guard():
+        with pytest.raises(CircuitOpenError):
+            async with breaker.guard():
+                pass  # The probe is in flight.
+
+    assert breaker.state is BreakerState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_opens_the_breaker_again() -> None:
+    """Test a failed probe opens the breaker for another reset timeout."""
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10.0, clock=clock)
+    for _ in range(3):
+        await fail(breaker)
+
+    clock.now = 10.0
+    await fail(breaker)
+
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.stats().opened == 2
+    clock.now = 19.0
+    assert breaker.state is BreakerState.OPEN
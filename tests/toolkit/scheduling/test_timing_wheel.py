@@ -0,0 +1,77 @@
+"""Test suite for validating `TimingWheel` class."""
+
+import random
+
+import pytest
+
+from toolkit.scheduling import TimingWheel
+
+
+def test_timers_expire_on_their_tick() -> None:
+    """Test timers expire once the wheel advances past their time."""
+    wheel: TimingWheel[str] = TimingWheel(tick=1.0, slots=4, levels=2)
+    wheel.schedule("a", when=2.0)
+    wheel.schedule("b", when=3.0)
+
+    assert wheel.advance(1.0) == []
+    assert wheel.advance(2.0) == ["a"]
+    assert wheel.advance(5.0) == ["b"]
+    assert len(wheel) == 0
+
+
+def test_timers_cascade_from_the_upper_levels() -> None:
+    """Test timers far ahead cascade down and expire on time."""
+    wheel: TimingWheel[int] = TimingWheel(tick=1.0, slots=4, levels=3, start=3.0)
+    whens = random.sample(range(4, 200), 60)
+    for when in whens:
+        wheel.schedule(when, when=when)
+
+    expired = []
+    for now in range(4, 201):
+        due = wheel.advance(now)
+        assert all(when == now for when in due)
+        expired.extend(due)
+
+    assert sorted(expired) == sorted(whens)
+
+
+def test_past_time_expires_on_the_next_tick() -> None:
+    """Test a timer scheduled in the past expires on the next tick."""
+    wheel: TimingWheel[str] = TimingWheel(tick=0.5, start=10.0)
+    wheel.schedule("late", when=3.0)
+
+    assert wheel.advance(10.5) == ["late"]
+
+
+def test_cancel() -> None:
+    """Test a cancelled timer does not expire, and cannot be cancelled twice."""
+    wheel: TimingWheel[str] = TimingWheel(tick=1.0, slots=4, levels=2)
+    timer_id = wheel.schedule("a", when=9.0)
+    wheel.schedule("b", when=9.0)
+
+    assert wheel.cancel(timer_id) is True
+    assert wheel.cancel(timer_id) is False
+    assert wheel.advance(10.0) == ["b"]
+
+
+def test_overflow_beyond_the_range() -> None:
+    """Test timers beyond the range of the wheel wait in the overflow bucket."""
+    wheel: TimingWheel[str] = TimingWheel(tick=1.0, slots=2, levels=2)
+    wheel.schedule("far", when=11.0)
+
+    assert wheel.advance(10.0) == []
+    assert wheel.advance(11.0) == ["far"]
+
+
+def test_pending() -> None:
+    """Test the pending timers are listed with their original time."""
+    wheel: TimingWheel[str] = TimingWheel(tick=1.0)
+    wheel.schedule("a", when=2.5)
+
+    assert list(wheel.pending()) == [(2.5, "a")]
+
+
+def test_invalid_parameters() -> None:
+    """Test a wheel with a non-positive tick is refused."""
+    with pytest.raises(ValueError):
+        TimingWheel(tick=0)
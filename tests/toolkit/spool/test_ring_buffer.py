@@ -0,0 +1,115 @@
+"""Unit tests for the MmapRingBuffer class."""
+
+from pathlib import Path
+
+import pytest
+
+from toolkit.spool import DropPolicy, MmapRingBuffer
+from toolkit.spool.helpers.exceptions import SpoolCorruptedError, SpoolFullError
+
+
+@pytest.fixture
+def spool_path(tmp_path: Path) -> str:
+    """Return the path of a spool file inside a temporary directory."""
+    return str(tmp_path / "spool" / "test.spool")
+
+
+@pytest.mark.smoke
+def test_append_and_pop_in_order(spool_path: str) -> None:
+    """Test records are returned in the order they were appended."""
+    with MmapRingBuffer(file_path=spool_path, capacity=128) as ring:
+        ring.append(b"first")
+        ring.append(b"second")
+
+        assert len(ring) == 2
+        assert ring.peek() == b"first"
+        assert ring.pop() == b"first"
+        assert ring.pop() == b"second"
+        assert ring.pop() is None
+        assert ring.used_bytes == 0
+
+
+def test_records_wrap_around_the_data_region(spool_path: str) -> None:
+    """Test records split across the end of the data region are read back intact."""
+    with MmapRingBuffer(file_path=spool_path, capacity=32) as ring:
+        for index in range(20):
+            record = f"record-{index:02}".encode()
+            ring.append(record)
+            assert ring.pop() == record
+
+
+def test_records_persist_across_reopen(spool_path: str) -> None:
+    """Test the ring buffer is restored with its records after being reopened."""
+    with MmapRingBuffer(file_path=spool_path, capacity=64) as ring:
+        ring.append(b"first")
+        ring.append(b"second")
+        ring.pop()
+
+    with MmapRingBuffer(file_path=spool_path, capacity=64) as ring:
+        assert len(ring) == 1
+        assert ring.pop() == b"second"
+
+
+@pytest.mark.exception
+def test_reject_policy_raises_when_full(spool_path: str) -> None:
+    """Test the `REJECT` policy raises `SpoolFullError` when a record doesn't fit."""
+    with MmapRingBuffer(file_path=spool_path, capacity=16) as ring:
+        ring.append(b"12345678")
+
+        with pytest.raises(SpoolFullError):
+            ring.append(b"12345678")
+
+
+def test_drop_oldest_policy(spool_path: str) -> None:
+    """Test the `DROP_OLDEST` policy evicts the oldest records to make room."""
+    with MmapRingBuffer(
+        file_path=spool_path, capacity=16, drop_policy=DropPolicy.DROP_OLDEST
+    ) as ring:
+        ring.append(b"aaaa")
+        ring.append(b"bbbb")
+
+        assert ring.append(b"cccc") is True
+        assert ring.dropped == 1
+        assert ring.pop() == b"bbbb"
+        assert ring.pop() == b"cccc"
+
+
+def test_drop_newest_policy(spool_path: str) -> None:
+    """Test the `DROP_NEWEST` policy discards the incoming record."""
+    with MmapRingBuffer(
+        file_path=spool_path, capacity=16, drop_policy=DropPolicy.DROP_NEWEST
+    ) as ring:
+        ring.append(b"aaaa")
+        ring.append(b"bbbb")
+
+        assert ring.append(b"cccc") is False
+        assert ring.dropped == 1
+        assert ring.pop() == b"aaaa"
+
+
+@pytest.mark.exception
+def test_record_larger_than_capacity(spool_path: str) -> None:
+    """Test appending a record larger than the whole ring buffer."""
+    with MmapRingBuffer(file_path=spool_path, capacity=16) as ring:
+        with pytest.raises(ValueError, match="does not fit"):
+            ring.append(b"x" * 16)
+
+
+@pytest.mark.exception
+def test_reopen_with_different_capacity(spool_path: str) -> None:
+    """Test reopening a spool file with another capacity is refused."""
+    MmapRingBuffer(file_path=spool_path, capacity=64).close()
+
+    with pytest.raises(SpoolCorruptedError):
+        MmapRingBuffer(file_path=spool_path, capacity=128)
+
+
+@pytest.mark.exception
+def test_reopen_foreign_file(spool_path: str) -> None:
+    """Test opening a file that is not a spool file."""
+    path = Path(spool_path)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"\x00" * (64 + 64))
+
+    with pytest.raises(SpoolCorruptedError, match="not a valid spool file"):
+        MmapRingBuffer(file_path=spool_path, capacity=64)
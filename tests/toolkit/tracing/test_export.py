@@ -0,0 +1,112 @@
+"""Test suite for validating the span exporters."""
+
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from toolkit.tracing import (
+    BatchSpanProcessor,
+    FileSpanExporter,
+    OTLPHttpSpanExporter,
+    Span,
+    SpanContext,
+    SpanKind,
+)
+
+
+def get_span(error: str | None = None) -> Span:
+    """Return a finished span, used in tests."""
+    return Span(
+        name="publish orders",
+        context=SpanContext(
+            "0af7651916cd43dd8448eb211c80319c", "b7ad6b7169203331", True
+        ),
+        parent_id="00f067aa0ba902b7",
+        start_time=1_000,
+        end_time=2_000,
+        kind=SpanKind.PRODUCER,
+        attributes={"size": 42, "exchange": "orders"},
+        error=error,
+    )
+
+
+@pytest.fixture
+def collector() -> Iterator[tuple[str, list[dict[str, Any]]]]:
+    """Run a stand-in OTLP/HTTP collector, yielding its URL and received requests."""
+    received: list[dict[str, Any]] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append(json.loads(body))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/v1/traces", received
+    server.shutdown()
+    server.server_close()
+
+
+def test_file_exporter(tmp_path: Path) -> None:
+    """Test batches are appended to the file as OTLP/JSON lines."""
+    exporter = FileSpanExporter("orders", str(tmp_path / "traces" / "spans.jsonl"))
+    processor = BatchSpanProcessor(exporter, schedule_delay=0.01)
+
+    processor.on_end([get_span(), get_span(error="ValueError: invalid")])
+    processor.shutdown()
+
+    [line] = exporter.file_path.read_text().splitlines()
+    [resource_spans] = json.loads(line)["resourceSpans"]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "orders"}}
+    ]
+    ok, failed = resource_spans["scopeSpans"][0]["spans"]
+    assert ok["traceId"] == "0af7651916cd43dd8448eb211c80319c"
+    assert ok["parentSpanId"] == "00f067aa0ba902b7"
+    assert ok["kind"] == SpanKind.PRODUCER
+    assert ok["startTimeUnixNano"] == "1000"
+    assert ok["attributes"] == [
+        {"key": "size", "value": {"intValue": "42"}},
+        {"key": "exchange", "value": {"stringValue": "orders"}},
+    ]
+    assert ok["status"] == {"code": 1}
+    assert failed["status"] == {"code": 2, "message": "ValueError: invalid"}
+    assert processor.exported == 2
+
+
+def test_otlp_exporter(collector: tuple[str, list[dict[str, Any]]]) -> None:
+    """Test batches are posted to the collector."""
+    url, received = collector
+    processor = BatchSpanProcessor(OTLPHttpSpanExporter("orders", url))
+
+    processor.on_end([get_span()])
+    processor.shutdown()
+
+    [request] = received
+    [span] = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert span["name"] == "publish orders"
+
+
+def test_processor_drops_overflow() -> None:
+    """Test spans not fitting in the queue are dropped, and export errors logged."""
+    processor = BatchSpanProcessor(
+        OTLPHttpSpanExporter("orders", "http://127.0.0.1:9/v1/traces", timeout=0.1),
+        max_queue_size=1,
+        schedule_delay=0.01,
+    )
+    processor.shutdown()
+
+    processor.on_end([get_span(), get_span()])
+
+    assert processor.dropped == 1
@@ -0,0 +1,39 @@
+"""Test suite for validating the `traceparent` format of span contexts."""
+
+import pytest
+
+from toolkit.tracing import SpanContext
+
+
+def test_traceparent_round_trip() -> None:
+    """Test a context formatted as `traceparent` is parsed back, as remote."""
+    context = SpanContext(
+        trace_id=SpanContext.new_trace_id(),
+        span_id=SpanContext.new_span_id(),
+        sampled=True,
+    )
+
+    value = context.to_traceparent()
+
+    assert value == f"00-{context.trace_id}-{context.span_id}-01"
+    parsed = SpanContext.from_traceparent(value)
+    assert parsed == SpanContext(
+        context.trace_id, context.span_id, sampled=True, is_remote=True
+    )
+    assert SpanContext.from_traceparent(value.encode()) == parsed
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        None,
+        "",
+        "00-abc-def-01",
+        "01-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01",
+        f"00-{'0' * 32}-b7ad6b7169203331-01",
+        f"00-0af7651916cd43dd8448eb211c80319c-{'0' * 16}-01",
+    ],
+)
+def test_invalid_traceparent(value: object) -> None:
+    """Test malformed and invalid `traceparent` values are ignored."""
+    assert SpanContext.from_traceparent(value) is None
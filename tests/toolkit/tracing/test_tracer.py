@@ -0,0 +1,144 @@
+"""Test suite for validating the `Tracer` class and its sampling."""
+
+from collections.abc import Sequence
+
+import pytest
+
+from toolkit.tracing import (
+    BatchSpanProcessor,
+    RatioSampler,
+    Span,
+    SpanContext,
+    SpanExporter,
+    TailSampler,
+    Tracer,
+)
+
+
+class InMemoryExporter(SpanExporter):
+    """Keep the exported spans in a list."""
+
+    def __init__(self) -> None:
+        """Instantiate an empty `InMemoryExporter`."""
+        super().__init__("test")
+        self.spans: list[Span] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Keep the spans."""
+        self.spans.extend(spans)
+
+
+def get_tracer(
+    ratio: float, tail_sampler: TailSampler | None = None
+) -> tuple[Tracer, BatchSpanProcessor, InMemoryExporter]:
+    """Return a tracer exporting to memory, with its processor and exporter."""
+    exporter = InMemoryExporter()
+    processor = BatchSpanProcessor(exporter, schedule_delay=0.01)
+    tracer = Tracer(
+        sampler=RatioSampler(ratio), tail_sampler=tail_sampler, processor=processor
+    )
+    return tracer, processor, exporter
+
+
+def test_spans_nest_and_propagate() -> None:
+    """Test spans nest in the current span and continue an extracted context."""
+    tracer, processor, exporter = get_tracer(ratio=1.0)
+    headers: dict[str, object] = {}
+
+    with tracer.start_span("publish") as publish:
+        tracer.inject(headers)
+    with tracer.start_span("consume", parent=tracer.extract(headers)) as consume:
+        with tracer.start_span("handler") as handler:
+            assert tracer.current_span() is handler
+    processor.shutdown()
+
+    assert tracer.current_span() is None
+    assert consume.context.trace_id == publish.context.trace_id
+    assert consume.parent_id == publish.context.span_id
+    assert consume.local_root
+    assert handler.parent_id == consume.context.span_id
+    assert not handler.local_root
+    assert [span.name for span in exporter.spans] == ["publish", "handler", "consume"]
+
+
+def test_head_sampling_drops_unsampled_traces() -> None:
+    """Test unsampled traces are not exported, but still propagated."""
+    tracer, processor, exporter = get_tracer(ratio=0.0)
+    headers: dict[str, object] = {}
+
+    with tracer.start_span("consume") as root:
+        with tracer.start_span("publish") as publish:
+            tracer.inject(headers)
+        tracer.record_span("broker wait", start_time=0, end_time=1)
+    processor.shutdown()
+
+    assert not root.context.sampled
+    assert publish is root
+    assert tracer.extract(headers) == root.context._replace(is_remote=True)
+    assert exporter.spans == []
+    assert tracer.stats().started == 1
+
+
+def test_tail_sampling_keeps_failed_traces() -> None:
+    """Test the tail sampler keeps the failed unsampled traces, whole."""
+    tracer, processor, exporter = get_tracer(
+        ratio=0.0, tail_sampler=TailSampler(latency_threshold=60)
+    )
+
+    with tracer.start_span("consume ok"), tracer.start_span("handler"):
+        pass
+    with pytest.raises(ValueError):
+        with tracer.start_span("consume failed"), tracer.start_span("handler"):
+            raise ValueError("invalid order")
+    processor.shutdown()
+
+    assert [span.name for span in exporter.spans] == ["handler", "consume failed"]
+    assert exporter.spans[0].error == "ValueError: invalid order"
+    stats = tracer.stats()
+    assert (stats.tail_kept, stats.tail_discarded, stats.pending_traces) == (1, 1, 0)
+
+
+def test_tail_sampling_keeps_slow_traces() -> None:
+    """Test the tail sampler keeps the traces whose local root is slow."""
+    tracer, processor, exporter = get_tracer(
+        ratio=0.0, tail_sampler=TailSampler(latency_threshold=1)
+    )
+
+    with tracer.start_span("consume"):
+        tracer.record_span("broker wait", start_time=0, end_time=10**9)
+    tracer.record_span("slow", start_time=0, end_time=2 * 10**9)
+    processor.shutdown()
+
+    assert [span.name for span in exporter.spans] == ["slow"]
+    assert tracer.stats().tail_kept == 1
+
+
+def test_tail_sampling_buffer_is_bounded() -> None:
+    """Test the oldest pending trace is evicted when the buffer is full."""
+    tracer, processor, _ = get_tracer(ratio=0.0, tail_sampler=TailSampler(60))
+    tracer.max_pending_traces = 2
+
+    for _ in range(3):
+        # A child of a local span still running keeps its trace pending.
+        running = SpanContext(
+            SpanContext.new_trace_id(), SpanContext.new_span_id(), sampled=False
+        )
+        with tracer.start_span("handler", parent=running):
+            pass
+    processor.shutdown()
+
+    stats = tracer.stats()
+    assert (stats.pending_traces, stats.evicted_traces) == (2, 1)
+
+
+def test_ratio_sampler() -> None:
+    """Test the ratio sampler keeps about its ratio of the traces."""
+    sampler = RatioSampler(0.25)
+
+    sampled = sum(
+        sampler.should_sample(SpanContext.new_trace_id()) for _ in range(4000)
+    )
+
+    assert 800 < sampled < 1200
+    with pytest.raises(ValueError):
+        RatioSampler(1.5)
@@ -0,0 +1,96 @@
+"""Test suite for validating `SegmentedLog` class."""
+
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from toolkit.wal import SegmentedLog
+from toolkit.wal.helpers.exceptions import WalCorruptedError
+
+
+def test_append_and_read(tmp_path: Path) -> None:
+    """Test the records are read back by offset, and replayed in order."""
+    log = SegmentedLog(str(tmp_path))
+
+    offsets = [log.append(f"record-{index}".encode()) for index in range(3)]
+    log.sync()
+
+    assert [log.read(offset) for offset in offsets] == [
+        b"record-0",
+        b"record-1",
+        b"record-2",
+    ]
+    assert list(log.replay()) == [
+        (offset, f"record-{index}".encode()) for index, offset in enumerate(offsets)
+    ]
+    log.close()
+
+
+def test_segments_roll_past_their_size(tmp_path: Path) -> None:
+    """Test a new segment, named after its first offset, starts past the size."""
+    log = SegmentedLog(str(tmp_path), segment_size=16)
+
+    offsets = [log.append(b"x" * 20) for _ in range(3)]
+    log.close()
+
+    assert len(log) == 3
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        f"{offset:020d}.wal" for offset in offsets
+    ]
+    reopened = SegmentedLog(str(tmp_path), segment_size=16)
+    assert reopened.end == log.end
+    assert [offset for offset, _ in reopened.replay()] == offsets
+    reopened.close()
+
+
+def test_new_directory_entries_are_synced(tmp_path: Path) -> None:
+    """Test the directory is synced once created, and on every new segment."""
+    directory = tmp_path / "wal"
+    with mock.patch.object(
+        SegmentedLog, "_sync_directory", wraps=SegmentedLog._sync_directory
+    ) as sync_directory:
+        log = SegmentedLog(str(directory), segment_size=16)
+        assert sync_directory.call_args_list == [
+            mock.call(tmp_path),
+            mock.call(directory),
+        ]
+
+        log.append(b"x" * 20)
+        log.append(b"x" * 20)
+        log.close()
+
+    assert sync_directory.call_count == 3
+    assert sync_directory.call_args == mock.call(directory)
+
+
+def test_torn_record_is_truncated_on_open(tmp_path: Path) -> None:
+    """Test a record torn by a crash, at the end of the log, is dropped."""
+    log = SegmentedLog(str(tmp_path))
+    log.append(b"durable")
+    torn = log.append(b"torn record")
+    log.close()
+    segment = next(tmp_path.iterdir())
+    segment.write_bytes(segment.read_bytes()[:-4])
+
+    reopened = SegmentedLog(str(tmp_path))
+
+    assert [payload for _, payload in reopened.replay()] == [b"durable"]
+    assert reopened.end == torn
+    assert reopened.read(reopened.append(b"next")) == b"next"
+    reopened.close()
+
+
+def test_corrupted_sealed_segment_raises(tmp_path: Path) -> None:
+    """Test an invalid record in a sealed segment is not silently dropped."""
+    log = SegmentedLog(str(tmp_path), segment_size=16)
+    log.append(b"x" * 20)
+    log.append(b"y" * 20)
+    log.close()
+    sealed = min(tmp_path.iterdir())
+    data = bytearray(sealed.read_bytes())
+    data[-1] ^= 0xFF
+    sealed.write_bytes(bytes(data))
+
+    with pytest.raises(WalCorruptedError):
+        SegmentedLog(str(tmp_path), segment_size=16)
@@ -0,0 +1,4 @@
+from .loader import DataLoader, LoaderStats
+from .lru_cache import CacheStats, TTLCache
+
+__all__ = ["CacheStats", "DataLoader", "LoaderStats", "TTLCache"]
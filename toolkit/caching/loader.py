@@ -0,0 +1,145 @@
+"""Module defines a loader batching the concurrent lookups of a backend."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from .lru_cache import TTLCache
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True, slots=True)
+class LoaderStats:
+    """Point-in-time metrics of a `DataLoader`."""
+
+    loads: int
+    coalesced: int
+    batches: int
+    inflight: int
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Coalesce the lookups of a tick into one call of a batch function, dataloader-style.
+
+    A lookup missing the cache joins the batch of the current event loop tick; the
+    batch is sent once the tick ends, in calls of at most `max_batch_size` keys, so
+    handling N messages concurrently costs one backend call instead of N. The keys
+    missing from the result of the batch function resolve to `None`, cached as a
+    miss.
+
+    Lookups of a key already being loaded share its pending result, in the batch or
+    in flight: a stampede of lookups of an expired hot key costs one backend call.
+    A failed batch fails the lookups waiting for it, and nothing is cached.
+
+    Example
+    -------
+    ```python
+    loader = DataLoader(fetch_users, cache=TTLCache(max_size=10000, ttl=300.0))
+    user, other = await asyncio.gather(loader.load(1), loader.load(2))
+    ```
+    """
+
+    def __init__(
+        self,
+        batch_load: Callable[[Sequence[K]], Awaitable[Mapping[K, V]]],
+        cache: TTLCache[K, V] | None = None,
+        max_batch_size: int = 100,
+    ) -> None:
+        """
+        Instantiate a `DataLoader` object.
+
+        Parameters
+        ----------
+        batch_load : Callable[[Sequence[K]], Awaitable[Mapping[K, V]]]
+            The coroutine function loading the values of some keys, omitting the
+            unknown ones.
+        cache : TTLCache[K, V], optional
+            The cache of the loaded values (default is None, do not cache).
+        max_batch_size : int, optional
+            The maximum number of keys per call of `batch_load` (default is 100).
+        """
+        if max_batch_size < 1:
+            raise ValueError("The maximum batch size should be at least 1")
+        self.cache = cache
+        self.max_batch_size = max_batch_size
+        self._batch_load = batch_load
+        self._batch: list[K] = []
+        self._inflight: dict[K, asyncio.Future[V | None]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._loads = 0
+        self._coalesced = 0
+        self._batches = 0
+
+    def stats(self) -> LoaderStats:
+        """Return the current metrics of the loader."""
+        return LoaderStats(
+            loads=self._loads,
+            coalesced=self._coalesced,
+            batches=self._batches,
+            inflight=len(self._inflight),
+        )
+
+    async def load(self, key: K) -> V | None:
+        """
+        Return the value of a key, from the cache or with the next batch.
+
+        Returns
+        -------
+        V | None
+            The value, or `None` if the backend does not know the key.
+        """
+        self._loads += 1
+        if self.cache is not None:
+            found, value = self.cache.get(key)
+            if found:
+                return value
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self._coalesced += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = self._inflight[key] = loop.create_future()
+            if not self._batch:
+                loop.call_soon(self._dispatch)
+            self._batch.append(key)
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        """Send the batch of the tick, in calls of at most `max_batch_size` keys."""
+        batch, self._batch = self._batch, []
+        for start in range(0, len(batch), self.max_batch_size):
+            task = asyncio.create_task(
+                self._load_batch(batch[start : start + self.max_batch_size])
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(self, keys: list[K]) -> None:
+        """Load a batch and resolve the futures of its keys."""
+        self._batches += 1
+        try:
+            values = await self._batch_load(keys)
+        except Exception as err:
+            for key in keys:
+                future = self._inflight.pop(key)
+                if not future.done():
+                    future.set_exception(err)
+                    # Retrieved here, as every waiter of the key may be gone.
+                    future.exception()
+            return
+        except BaseException:
+            for key in keys:
+                self._inflight.pop(key).cancel()
+            raise
+        for key in keys:
+            value = values.get(key)
+            if self.cache is not None:
+                self.cache.set(key, value)
+            future = self._inflight.pop(key)
+            if not future.done():
+                future.set_result(value)
@@ -0,0 +1,123 @@
+"""Module defines a size-bounded LRU cache whose entries expire."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Point-in-time metrics of a `TTLCache`."""
+
+    size: int
+    hits: int
+    negative_hits: int
+    misses: int
+    evictions: int
+
+
+class TTLCache(Generic[K, V]):
+    """
+    A least-recently-used cache of at most `max_size` entries, expiring after a TTL.
+
+    A value of `None` caches a miss of the backend, e.g. an unknown key, for the
+    shorter `negative_ttl`: repeated lookups of a key that does not exist are
+    answered from memory too, but a key created since is found soon. Expired
+    entries are dropped lazily, when looked up or evicted as the least recently
+    used.
+
+    Example
+    -------
+    ```python
+    cache: TTLCache[int, str] = TTLCache(max_size=1000, ttl=300.0)
+    cache.set(1, "value")
+    found, value = cache.get(1)
+    ```
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        negative_ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Instantiate a `TTLCache` object, empty.
+
+        Parameters
+        ----------
+        max_size : int
+            The maximum number of entries.
+        ttl : float
+            Seconds a value is cached.
+        negative_ttl : float, optional
+            Seconds a miss, a `None` value, is cached (default is None, `ttl`).
+        clock : Callable[[], float], optional
+            A monotonic clock returning seconds (default is `time.monotonic`).
+        """
+        if max_size < 1 or ttl <= 0:
+            raise ValueError("The maximum size and the TTL should be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V | None]] = OrderedDict()
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        """Return the number of entries, expired ones included."""
+        return len(self._entries)
+
+    def stats(self) -> CacheStats:
+        """Return the current metrics of the cache."""
+        return CacheStats(
+            size=len(self._entries),
+            hits=self._hits,
+            negative_hits=self._negative_hits,
+            misses=self._misses,
+            evictions=self._evictions,
+        )
+
+    def get(self, key: K) -> tuple[bool, V | None]:
+        """
+        Look a key up, marking it as the most recently used.
+
+        Returns
+        -------
+        tuple[bool, V | None]
+            Whether the key is cached, and its value: `None` for a cached miss.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self._clock():
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        if entry[1] is None:
+            self._negative_hits += 1
+        else:
+            self._hits += 1
+        return True, entry[1]
+
+    def set(self, key: K, value: V | None) -> None:
+        """Cache the value of a key, `None` for a miss, evicting the oldest entry."""
+        ttl = self.ttl if value is not None else self.negative_ttl
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """Drop the entry of a key, if cached."""
+        self._entries.pop(key, None)
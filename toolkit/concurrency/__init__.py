@@ -0,0 +1,4 @@
+from .connection_pool import ConnectionPool, ConnectionPoolStats
+from .worker_pool import WorkerPool
+
+__all__ = ["ConnectionPool", "ConnectionPoolStats", "WorkerPool"]
@@ -0,0 +1,124 @@
+"""Module defines a bounded pool of reusable connections."""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+C = TypeVar("C")
+
+
+@dataclass(frozen=True, slots=True)
+class ConnectionPoolStats:
+    """Point-in-time metrics of a `ConnectionPool`."""
+
+    size: int
+    opened: int
+    idle: int
+    connects: int
+
+
+class ConnectionPool(Generic[C]):
+    """
+    A bounded pool of connections reused across requests, e.g. keep-alive sockets.
+
+    At most `size` connections are open, and as many requests run at once; the
+    others wait for a connection to be released. Connections are opened lazily, on
+    demand, and the most recently used idle connection is reused first, so the idle
+    ones past a burst age out on the server side rather than every one staying
+    warm. A connection released by a failed request is closed instead of reused,
+    as its state is unknown.
+
+    Example
+    -------
+    ```python
+    pool = ConnectionPool(connect=open_socket, close=close_socket, size=10)
+    async with pool.connection() as connection:
+        await send(connection, request)
+    ```
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[C]],
+        close: Callable[[C], Awaitable[None]],
+        size: int,
+    ) -> None:
+        """
+        Instantiate a `ConnectionPool` object, with no connection open.
+
+        Parameters
+        ----------
+        connect : Callable[[], Awaitable[C]]
+            The coroutine function opening a connection.
+        close : Callable[[C], Awaitable[None]]
+            The coroutine function closing a connection.
+        size : int
+            The maximum number of open connections.
+        """
+        if size < 1:
+            raise ValueError("The pool size should be at least 1")
+        self.size = size
+        self._connect = connect
+        self._close = close
+        self._semaphore = asyncio.Semaphore(size)
+        self._idle: list[C] = []
+        self._closed = False
+        self._opened = 0
+        self._connects = 0
+
+    def stats(self) -> ConnectionPoolStats:
+        """Return the current metrics of the pool."""
+        return ConnectionPoolStats(
+            size=self.size,
+            opened=self._opened,
+            idle=len(self._idle),
+            connects=self._connects,
+        )
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[C]:
+        """
+        Hold a connection, reused or newly opened, until the end of the block.
+
+        Yields
+        ------
+        C
+            The connection, returned to the pool at the end of the block, or closed
+            if an exception escaped it.
+        """
+        async with self._semaphore:
+            if self._idle:
+                connection = self._idle.pop()
+            else:
+                connection = await self._connect()
+                self._opened += 1
+                self._connects += 1
+            try:
+                yield connection
+            except BaseException:
+                await self._discard(connection)
+                raise
+            if self._closed:
+                await self._discard(connection)
+            else:
+                self._idle.append(connection)
+
+    async def close(self) -> None:
+        """Close the idle connections; the ones in use are closed on release."""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            await self._discard(connection)
+
+    async def _discard(self, connection: C) -> None:
+        """Close a connection for good."""
+        self._opened -= 1
+        try:
+            await self._close(connection)
+        except Exception as err:
+            logger.debug("Failed to close a pooled connection: %r", err)
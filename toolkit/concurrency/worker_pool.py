@@ -0,0 +1,182 @@
+"""Module defines an asyncio worker pool whose size can change at runtime."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+from toolkit.memory import MemoryBudget
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerPool(Generic[T]):
+    """
+    A set of asyncio worker tasks handling the items submitted to a queue.
+
+    At most `size` items are handled concurrently. The pool can be resized while it
+    runs: growing it starts new workers right away, and shrinking it cancels idle
+    workers first, while busy workers retire once they finish their current item,
+    so no item is ever interrupted.
+
+    Example
+    -------
+    ```python
+    pool = WorkerPool(handler=process_message, size=10, name="orders")
+    pool.start()
+    await queue.consume(pool.submit)
+    ...
+    pool.resize(20)
+    ```
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[T], Awaitable[None]],
+        size: int,
+        maxsize: int = 0,
+        name: str = "worker",
+        budget: MemoryBudget | None = None,
+        sizeof: Callable[[T], int] = lambda item: 0,
+    ) -> None:
+        """
+        Instantiate a `WorkerPool` object.
+
+        Parameters
+        ----------
+        handler : Callable[[T], Awaitable[None]]
+            The coroutine function handling a submitted item.
+        size : int
+            The number of workers, i.e. of items handled concurrently.
+        maxsize : int, optional
+            The maximum number of items waiting for a worker, beyond which `submit`
+            waits (default is 0, unbounded).
+        name : str, optional
+            The prefix of the names of the worker tasks (default is "worker").
+        budget : MemoryBudget | None, optional
+            The memory budget of the items, from their submission to the end of
+            their handling, beyond which `submit` waits (default is None, unlimited).
+        sizeof : Callable[[T], int], optional
+            The function returning the bytes held by an item, accounted in `budget`.
+        """
+        if size < 1:
+            raise ValueError("The pool size should be at least 1")
+        self.name = name
+        self._handler = handler
+        self._size = size
+        self._budget = budget
+        self._sizeof = sizeof
+        self._queue: asyncio.Queue[T] = asyncio.Queue(maxsize=maxsize)
+        self._workers: set[asyncio.Task[None]] = set()
+        self._idle: set[asyncio.Task[None]] = set()
+        self._spawned = 0
+        self.processed = 0
+        self.failed = 0
+
+    @property
+    def size(self) -> int:
+        """Return the target number of workers."""
+        return self._size
+
+    @property
+    def workers(self) -> int:
+        """Return the number of workers, excluding those retiring."""
+        return len(self._workers)
+
+    @property
+    def pending(self) -> int:
+        """Return the number of items waiting for a worker."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Start the workers."""
+        while len(self._workers) < self._size:
+            self._spawn()
+
+    def resize(self, size: int) -> None:
+        """
+        Change the number of workers.
+
+        Parameters
+        ----------
+        size : int
+            The new number of workers.
+        """
+        if size < 1:
+            raise ValueError("The pool size should be at least 1")
+        logger.info("Resizing the %s pool from %d to %d", self.name, self._size, size)
+        self._size = size
+        if not self._workers:
+            return  # Not started yet.
+
+        self.start()
+        for task in list(self._idle)[: max(0, len(self._workers) - size)]:
+            self._retire(task)
+            task.cancel()
+
+    async def submit(self, item: T) -> None:
+        """Queue an item for the next available worker, once within the budget."""
+        if self._budget is None:
+            await self._queue.put(item)
+            return
+        size = self._sizeof(item)
+        await self._budget.acquire(size)
+        try:
+            await self._queue.put(item)
+        except BaseException:
+            self._budget.release(size)
+            raise
+
+    async def join(self) -> None:
+        """Wait until every submitted item has been handled."""
+        await self._queue.join()
+
+    async def stop(self) -> None:
+        """Cancel the workers, abandoning the items still queued."""
+        tasks = list(self._workers)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _spawn(self) -> None:
+        """Start a single worker task."""
+        self._spawned += 1
+        task = asyncio.create_task(
+            self._work(), name=f"{self.name}-worker-{self._spawned}"
+        )
+        self._workers.add(task)
+        task.add_done_callback(self._workers.discard)
+
+    async def _work(self) -> None:
+        """Handle items until the pool shrinks below this worker or is stopped."""
+        task = asyncio.current_task()
+        assert task is not None, "Workers should run as tasks"
+
+        while True:
+            if len(self._workers) > self._size:
+                self._retire(task)
+                return
+
+            self._idle.add(task)
+            try:
+                item = await self._queue.get()
+            finally:
+                self._idle.discard(task)
+
+            try:
+                await self._handler(item)
+                self.processed += 1
+            except Exception:
+                self.failed += 1
+                logger.exception("The %s pool failed to handle an item", self.name)
+            finally:
+                if self._budget is not None:
+                    self._budget.release(self._sizeof(item))
+                self._queue.task_done()
+
+    def _retire(self, task: asyncio.Task[None]) -> None:
+        """Stop counting `task` as a worker, before it actually exits."""
+        self._workers.discard(task)
+        self._idle.discard(task)
@@ -0,0 +1,11 @@
+from .budget import BudgetStats, MemoryAccountant, MemoryBudget
+from .snapshots import AllocationTracker, ModuleAllocations, get_module_names
+
+__all__ = [
+    "AllocationTracker",
+    "BudgetStats",
+    "MemoryAccountant",
+    "MemoryBudget",
+    "ModuleAllocations",
+    "get_module_names",
+]
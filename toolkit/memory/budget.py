@@ -0,0 +1,189 @@
+"""Module defines memory budgets, applying backpressure to the stages over them."""
+
+import asyncio
+import collections
+from collections.abc import AsyncIterator, Mapping
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, nullcontext
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class BudgetStats:
+    """Point-in-time metrics of a `MemoryBudget`."""
+
+    limit: int
+    used: int
+    peak: int
+    waiting: int
+    throttled: int
+
+
+class MemoryBudget:
+    """
+    A number of bytes a stage may hold, waited for when exhausted.
+
+    A stage acquires the size of an item before holding it and releases it once the
+    item is gone, e.g. handled or confirmed. An acquire that does not fit waits,
+    first in first out, so the stage stops taking new items while over budget: that
+    backpressure propagates upstream, to the broker through the prefetch window, or
+    to the producers through the publish calls.
+
+    An item larger than the whole budget is admitted once nothing else is held, so
+    it cannot wait forever.
+
+    Example
+    -------
+    ```python
+    budget = MemoryBudget("publish_window", limit=32 * 1024 * 1024)
+    async with budget.reserve(len(message.body)):
+        await exchange.publish(message, routing_key="orders")
+    ```
+    """
+
+    def __init__(self, name: str, limit: int) -> None:
+        """
+        Instantiate a `MemoryBudget` object.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage, for the logs and metrics.
+        limit : int
+            The bytes the stage may hold.
+        """
+        if limit <= 0:
+            raise ValueError("The limit should be positive")
+        self.name = name
+        self.limit = limit
+        self._used = 0
+        self._peak = 0
+        self._throttled = 0
+        self._waiters: collections.deque[tuple[int, asyncio.Future[None]]] = (
+            collections.deque()
+        )
+
+    @property
+    def used(self) -> int:
+        """Return the bytes held by the stage."""
+        return self._used
+
+    def stats(self) -> BudgetStats:
+        """Return the current metrics of the budget."""
+        return BudgetStats(
+            limit=self.limit,
+            used=self._used,
+            peak=self._peak,
+            waiting=len(self._waiters),
+            throttled=self._throttled,
+        )
+
+    def try_acquire(self, size: int) -> bool:
+        """Take `size` bytes if they fit right away, returning whether they did."""
+        if self._waiters or not self._fits(size):
+            return False
+        self._take(size)
+        return True
+
+    async def acquire(self, size: int) -> None:
+        """Take `size` bytes, waiting for releases while they do not fit."""
+        if self.try_acquire(size):
+            return
+        self._throttled += 1
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append((size, waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted while being cancelled: hand the bytes back.
+                self.release(size)
+            else:
+                if (size, waiter) in self._waiters:
+                    self._waiters.remove((size, waiter))
+                self._wake()
+            raise
+
+    def release(self, size: int) -> None:
+        """Give back `size` bytes, admitting the waiters that now fit."""
+        self._used = max(0, self._used - size)
+        self._wake()
+
+    @asynccontextmanager
+    async def reserve(self, size: int) -> AsyncIterator[None]:
+        """Hold `size` bytes for the duration of the body."""
+        await self.acquire(size)
+        try:
+            yield
+        finally:
+            self.release(size)
+
+    def _fits(self, size: int) -> bool:
+        """Return whether `size` more bytes fit, or nothing is held."""
+        return self._used + size <= self.limit or self._used == 0
+
+    def _take(self, size: int) -> None:
+        """Account for `size` more bytes held."""
+        self._used += size
+        self._peak = max(self._peak, self._used)
+
+    def _wake(self) -> None:
+        """Admit the waiters that fit, in order."""
+        while self._waiters and self._fits(self._waiters[0][0]):
+            size, waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._take(size)
+                waiter.set_result(None)
+
+
+class MemoryAccountant:
+    """
+    The memory budgets of the stages of a process, by stage name.
+
+    A stage without a budget is not limited: `reserve` is then a no-op, so the
+    stages can be instrumented unconditionally and budgeted from the settings.
+    """
+
+    def __init__(self) -> None:
+        """Instantiate a `MemoryAccountant` without budgets."""
+        self.budgets: dict[str, MemoryBudget] = {}
+
+    def configure(self, limits: Mapping[str, int]) -> None:
+        """Set the limit of every stage of `limits`, creating its budget if new."""
+        for stage, limit in limits.items():
+            budget = self.budgets.get(stage)
+            if budget is None:
+                self.budgets[stage] = MemoryBudget(stage, limit)
+            else:
+                budget.limit = limit
+                budget.release(0)  # Admit the waiters fitting a raised limit.
+
+    def get(self, stage: str) -> MemoryBudget | None:
+        """Return the budget of `stage`, if any."""
+        return self.budgets.get(stage)
+
+    def reserve(self, stage: str, size: int) -> AbstractAsyncContextManager[None]:
+        """Hold `size` bytes of the budget of `stage` for the duration of the body."""
+        budget = self.budgets.get(stage)
+        if budget is None:
+            return _UNLIMITED
+        return budget.reserve(size)
+
+    def stats(self) -> dict[str, BudgetStats]:
+        """Return the current metrics of every budget."""
+        return {stage: budget.stats() for stage, budget in self.budgets.items()}
+
+    def render(self) -> str:
+        """Return the metrics of every budget as a plain-text table."""
+        lines = [
+            f"{'stage':<16} {'used':>12} {'limit':>12} {'peak':>12} "
+            f"{'waiting':>8} {'throttled':>10}"
+        ]
+        for stage, stats in sorted(self.stats().items()):
+            lines.append(
+                f"{stage:<16} {stats.used:>12} {stats.limit:>12} {stats.peak:>12} "
+                f"{stats.waiting:>8} {stats.throttled:>10}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+_UNLIMITED: AbstractAsyncContextManager[None] = nullcontext()
@@ -0,0 +1,122 @@
+"""Module defines on-demand `tracemalloc` snapshots, diffed and grouped by module."""
+
+import collections
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True, slots=True)
+class ModuleAllocations:
+    """The change of the memory allocated by a module between two snapshots."""
+
+    module: str
+    size: int
+    size_diff: int
+    count: int
+    count_diff: int
+
+
+def get_module_names() -> dict[str, str]:
+    """Return the names of the imported modules, by resolved file path."""
+    module_names = {}
+    for name, module in list(sys.modules.items()):
+        file = getattr(module, "__file__", None)
+        if file:
+            module_names[str(Path(file).resolve())] = name
+    return module_names
+
+
+class AllocationTracker:
+    """
+    Take `tracemalloc` snapshots on demand and diff them by module.
+
+    Tracing allocations slows the whole process down, so it only starts with the
+    first `snapshot` and stops with `stop`. Every snapshot is compared with the
+    previous one, and the differences of its allocation sites are grouped by the
+    module owning their file: the modules whose memory keeps growing from one
+    snapshot to the next are the leak suspects.
+
+    Example
+    -------
+    ```python
+    tracker = AllocationTracker()
+    tracker.snapshot()  # Starts tracing, the baseline.
+    ...
+    print(tracker.render(tracker.snapshot()))
+    ```
+    """
+
+    def __init__(self, frames: int = 1) -> None:
+        """Instantiate an `AllocationTracker` storing `frames` frames per allocation."""
+        self.frames = frames
+        self._previous: tracemalloc.Snapshot | None = None
+        self._modules: dict[str, str] = {}
+
+    @property
+    def tracing(self) -> bool:
+        """Return whether allocations are being traced."""
+        return tracemalloc.is_tracing()
+
+    def snapshot(self) -> list[ModuleAllocations]:
+        """
+        Take a snapshot and return its differences with the previous one, by module.
+
+        The first snapshot starts tracing, so it is compared with an empty one.
+
+        Returns
+        -------
+        list[ModuleAllocations]
+            The allocations by module, the most grown first.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._previous = None
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        previous = self._previous or tracemalloc.Snapshot([], self.frames)
+        self._previous = snapshot
+        return self._group(snapshot.compare_to(previous, "filename"))
+
+    def stop(self) -> None:
+        """Stop tracing allocations and forget the snapshots."""
+        tracemalloc.stop()
+        self._previous = None
+
+    @staticmethod
+    def render(allocations: list[ModuleAllocations], top: int = 30) -> str:
+        """Return the `top` modules of a diff as a plain-text table."""
+        lines = [f"{'module':<48} {'size':>12} {'diff':>12} {'count':>9} {'diff':>9}"]
+        for item in allocations[:top]:
+            lines.append(
+                f"{item.module:<48} {item.size:>12} {item.size_diff:>+12} "
+                f"{item.count:>9} {item.count_diff:>+9}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def _group(
+        self, statistics: list[tracemalloc.StatisticDiff]
+    ) -> list[ModuleAllocations]:
+        """Sum the differences of the allocation sites by module."""
+        totals: dict[str, list[int]] = collections.defaultdict(lambda: [0, 0, 0, 0])
+        module_names: dict[str, str] | None = None
+        for statistic in statistics:
+            filename = statistic.traceback[0].filename
+            module = self._modules.get(filename)
+            if module is None:
+                if module_names is None:
+                    module_names = get_module_names()
+                module = module_names.get(str(Path(filename).resolve()), filename)
+                self._modules[filename] = module
+            total = totals[module]
+            total[0] += statistic.size
+            total[1] += statistic.size_diff
+            total[2] += statistic.count
+            total[3] += statistic.count_diff
+        allocations = [
+            ModuleAllocations(module, size, size_diff, count, count_diff)
+            for module, (size, size_diff, count, count_diff) in totals.items()
+        ]
+        return sorted(allocations, key=lambda item: (-item.size_diff, -item.size))
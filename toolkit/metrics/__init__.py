@@ -0,0 +1,26 @@
+from .exemplars import SlowestExemplars
+from .metrics import (
+    DEFAULT_BUCKETS,
+    Counter,
+    CounterChild,
+    Gauge,
+    GaugeChild,
+    Histogram,
+    HistogramChild,
+)
+from .registry import CONTENT_TYPE, MetricsRegistry
+from .server import MetricsServer
+
+__all__ = [
+    "CONTENT_TYPE",
+    "DEFAULT_BUCKETS",
+    "Counter",
+    "CounterChild",
+    "Gauge",
+    "GaugeChild",
+    "Histogram",
+    "HistogramChild",
+    "MetricsRegistry",
+    "MetricsServer",
+    "SlowestExemplars",
+]
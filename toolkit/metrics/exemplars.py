@@ -0,0 +1,58 @@
+"""Module defines a bounded store of the slowest observations, for tail latency."""
+
+import heapq
+import itertools
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SlowestExemplars(Generic[T]):
+    """
+    Keep the `capacity` observations with the highest values, with their exemplars.
+
+    Histograms tell how slow the tail is; exemplars tell which messages made it up.
+    The observations live in a min-heap bounded to `capacity` entries, so an
+    observation faster than the fastest one kept is rejected with one comparison,
+    and a slower one replaces it in O(log capacity).
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Instantiate a `SlowestExemplars` keeping `capacity` observations."""
+        if capacity < 1:
+            raise ValueError("The capacity should be at least 1")
+        self.capacity = capacity
+        self._heap: list[tuple[float, int, T]] = []
+        self._sequence = itertools.count()  # Breaks ties without comparing exemplars.
+
+    def __len__(self) -> int:
+        """Return the number of observations kept."""
+        return len(self._heap)
+
+    def offer(self, value: float, exemplar: T) -> bool:
+        """
+        Keep the observation if it is among the `capacity` slowest so far.
+
+        Returns
+        -------
+        bool
+            True if the observation was kept.
+        """
+        if len(self._heap) < self.capacity:
+            heapq.heappush(self._heap, (value, next(self._sequence), exemplar))
+            return True
+        if value <= self._heap[0][0]:
+            return False
+        heapq.heapreplace(self._heap, (value, next(self._sequence), exemplar))
+        return True
+
+    def snapshot(self) -> list[tuple[float, T]]:
+        """Return the observations kept, slowest first."""
+        return [
+            (value, exemplar)
+            for value, _, exemplar in sorted(self._heap, key=lambda item: -item[0])
+        ]
+
+    def clear(self) -> None:
+        """Drop every observation."""
+        self._heap.clear()
@@ -0,0 +1,247 @@
+"""Module defines counters, gauges and fixed-bucket histograms."""
+
+import bisect
+import math
+from collections.abc import Callable, Iterator, Sequence
+from typing import ClassVar, Generic, TypeVar
+
+ChildT = TypeVar("ChildT", "CounterChild", "GaugeChild", "HistogramChild")
+
+# Sample: (suffix, labels, value), rendered as `name<suffix>{labels} value`.
+Sample = tuple[str, tuple[tuple[str, str], ...], float]
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class CounterChild:
+    """A counter for a single combination of label values."""
+
+    __slots__ = ("_function", "value")
+
+    def __init__(self) -> None:
+        """Instantiate a `CounterChild` object."""
+        self.value = 0.0
+        self._function: Callable[[], float] | None = None
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter by `amount`."""
+        if amount < 0:
+            raise ValueError("A counter can only increase")
+        self.value += amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from `function` at collection, e.g. from a stats object."""
+        self._function = function
+
+    def collect(self) -> Iterator[Sample]:
+        """Yield the samples of the child, without labels."""
+        yield "", (), self.value if self._function is None else self._function()
+
+
+class GaugeChild(CounterChild):
+    """A gauge for a single combination of label values."""
+
+    __slots__ = ()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge by `amount`."""
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the gauge by `amount`."""
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        """Set the gauge to `value`."""
+        self.value = value
+
+
+class HistogramChild:
+    """A histogram for a single combination of label values."""
+
+    __slots__ = ("_counts", "_upper_bounds", "count", "sum")
+
+    def __init__(self, upper_bounds: Sequence[float]) -> None:
+        """Instantiate a `HistogramChild` with the given bucket upper bounds."""
+        self._upper_bounds = upper_bounds
+        self._counts = [0] * (len(upper_bounds) + 1)  # The last bucket is +Inf.
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Count `value` in the first bucket whose upper bound is not below it."""
+        self._counts[bisect.bisect_left(self._upper_bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def collect(self) -> Iterator[Sample]:
+        """Yield the cumulative buckets, the sum and the count, without labels."""
+        cumulative = 0
+        for upper_bound, count in zip(
+            (*self._upper_bounds, math.inf), self._counts, strict=True
+        ):
+            cumulative += count
+            yield "_bucket", (("le", format_value(upper_bound)),), cumulative
+        yield "_sum", (), self.sum
+        yield "_count", (), self.count
+
+
+class Metric(Generic[ChildT]):
+    """
+    Base class of a metric family: a name, a help text and labelled children.
+
+    `labels` returns the child of a combination of label values, creating it on the
+    first call. Hot paths should bind their children once, e.g. when a consumer
+    starts, and only call `inc` or `observe` on them: recording a value is then a
+    couple of attribute updates, with no lookup and no allocation.
+
+    Metrics are meant to be updated from the event loop thread and are not locked.
+    """
+
+    type: ClassVar[str]
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        """
+        Instantiate a metric.
+
+        Parameters
+        ----------
+        name : str
+            The name of the metric, e.g. "rabbitmq_publish_duration_seconds".
+        documentation : str
+            The help text of the metric.
+        labelnames : Sequence[str], optional
+            The names of the labels (default is no labels).
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], ChildT] = {}
+        self._unlabelled: ChildT | None = None if labelnames else self.labels()
+
+    def labels(self, *values: str) -> ChildT:
+        """Return the child of the given label values, creating it if needed."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects the labels {self.labelnames}, got {values}"
+                )
+            child = self._children[values] = self._new_child()
+        return child
+
+    def collect(self) -> Iterator[Sample]:
+        """Yield the samples of every child."""
+        for values, child in list(self._children.items()):
+            labels = tuple(zip(self.labelnames, values, strict=True))
+            for suffix, extra_labels, value in child.collect():
+                yield suffix, labels + extra_labels, value
+
+    @property
+    def unlabelled(self) -> ChildT:
+        """Return the single child of a metric without labels."""
+        if self._unlabelled is None:
+            raise ValueError(f"{self.name} has labels, use `labels` first")
+        return self._unlabelled
+
+    def _new_child(self) -> ChildT:
+        """Create the child of a new combination of label values."""
+        raise NotImplementedError
+
+
+class Counter(Metric[CounterChild]):
+    """A monotonically increasing value, e.g. the number of published messages."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase a counter without labels by `amount`."""
+        self.unlabelled.inc(amount)
+
+    def _new_child(self) -> CounterChild:
+        """Create a counter child."""
+        return CounterChild()
+
+
+class Gauge(Metric[GaugeChild]):
+    """A value that goes up and down, e.g. the number of messages in flight."""
+
+    type = "gauge"
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase a gauge without labels by `amount`."""
+        self.unlabelled.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease a gauge without labels by `amount`."""
+        self.unlabelled.dec(amount)
+
+    def set(self, value: float) -> None:
+        """Set a gauge without labels to `value`."""
+        self.unlabelled.set(value)
+
+    def _new_child(self) -> GaugeChild:
+        """Create a gauge child."""
+        return GaugeChild()
+
+
+class Histogram(Metric[HistogramChild]):
+    """The distribution of observed values, e.g. latencies, in fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """
+        Instantiate a histogram.
+
+        Parameters
+        ----------
+        name : str
+            The name of the metric, e.g. "rabbitmq_publish_duration_seconds".
+        documentation : str
+            The help text of the metric.
+        labelnames : Sequence[str], optional
+            The names of the labels (default is no labels).
+        buckets : Sequence[float], optional
+            The increasing upper bounds of the buckets; a `+Inf` bucket is always
+            added (default is `DEFAULT_BUCKETS`, suited to latencies in seconds).
+        """
+        if list(buckets) != sorted(set(buckets)):
+            raise ValueError("The buckets should be strictly increasing")
+        self.buckets = tuple(bucket for bucket in buckets if bucket != math.inf)
+        super().__init__(name=name, documentation=documentation, labelnames=labelnames)
+
+    def observe(self, value: float) -> None:
+        """Observe a value in a histogram without labels."""
+        self.unlabelled.observe(value)
+
+    def _new_child(self) -> HistogramChild:
+        """Create a histogram child."""
+        return HistogramChild(self.buckets)
+
+
+def format_value(value: float) -> str:
+    """Format a sample value or a bucket bound as Prometheus expects."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
@@ -0,0 +1,93 @@
+"""Module defines the registry of metrics and its Prometheus text exposition."""
+
+from collections.abc import Sequence
+from typing import TypeVar
+
+from .metrics import DEFAULT_BUCKETS, Counter, Gauge, Histogram, Metric, format_value
+
+MetricT = TypeVar("MetricT", bound=Metric)  # type: ignore[type-arg]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsRegistry:
+    """
+    A set of metrics, rendered together in the Prometheus text format.
+
+    Example
+    -------
+    ```python
+    registry = MetricsRegistry()
+    published = registry.counter(
+        "published_messages_total", "Published messages.", labelnames=["exchange"]
+    )
+    orders_published = published.labels("orders")  # Bound once, off the hot path.
+    orders_published.inc()
+    print(registry.render())
+    ```
+    """
+
+    def __init__(self) -> None:
+        """Instantiate an empty `MetricsRegistry` object."""
+        self._metrics: dict[str, Metric] = {}  # type: ignore[type-arg]
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Create and register a counter."""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        """Create and register a gauge."""
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def register(self, metric: MetricT) -> MetricT:
+        """
+        Register a metric.
+
+        Raises
+        ------
+        ValueError
+            If a metric with the same name is already registered.
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"A metric named {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Metric | None:  # type: ignore[type-arg]
+        """Return the metric registered under `name`, if any."""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for suffix, labels, value in metric.collect():
+                label_text = ",".join(
+                    f'{name}="{escape(label, quote=True)}"' for name, label in labels
+                )
+                if label_text:
+                    label_text = f"{{{label_text}}}"
+                lines.append(f"{metric.name}{suffix}{label_text} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def escape(text: str, quote: bool = False) -> str:
+    """Escape a help text, or a label value if `quote`, for the text format."""
+    text = text.replace("\\", r"\\").replace("\n", r"\n")
+    return text.replace('"', r"\"") if quote else text
@@ -0,0 +1,136 @@
+"""Module defines a minimal asyncio HTTP server exposing metrics to Prometheus."""
+
+import asyncio
+import logging
+from collections.abc import Callable, Mapping
+from types import TracebackType
+from typing import Self
+
+from .registry import CONTENT_TYPE, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsServer:
+    """
+    Serve `GET /metrics` in the Prometheus text format, on the running event loop.
+
+    It is a deliberately small HTTP/1.0-style server built on `asyncio.start_server`:
+    one request per connection, no keep-alive, and only the metrics path plus a few
+    optional plain-text `routes`. Rendering happens on the loop, so it costs the loop
+    a few milliseconds per scrape.
+
+    Example
+    -------
+    ```python
+    async with MetricsServer(registry, host="127.0.0.1", port=9100):
+        await consumer.consume_new_order()
+    ```
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        host: str = "127.0.0.1",
+        port: int = 9100,
+        path: str = "/metrics",
+        timeout: float = 5.0,
+        routes: Mapping[str, Callable[[], str]] | None = None,
+    ) -> None:
+        """
+        Instantiate a `MetricsServer` object.
+
+        Parameters
+        ----------
+        registry : MetricsRegistry
+            The metrics to serve.
+        host : str, optional
+            The interface to listen on (default is "127.0.0.1").
+        port : int, optional
+            The port to listen on, 0 picks a free one (default is 9100).
+        path : str, optional
+            The path of the metrics (default is "/metrics").
+        timeout : float, optional
+            Seconds a client may take to send its request (default is 5).
+        routes : Mapping[str, Callable[[], str]], optional
+            Extra plain-text pages by path, e.g. debugging reports, rendered on
+            request (default is None, no extra pages).
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.path = path
+        self.timeout = timeout
+        self.routes = dict(routes or {})
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        """Start listening, updating `port` with the bound port."""
+        self._server = await asyncio.start_server(
+            self._handle, host=self.host, port=self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(
+            "Serving metrics on http://%s:%d%s", self.host, self.port, self.path
+        )
+
+    async def stop(self) -> None:
+        """Stop listening and close the server."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> Self:
+        """Start the server."""
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the server."""
+        await self.stop()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer a single request."""
+        try:
+            async with asyncio.timeout(self.timeout):
+                head = await reader.readuntil(b"\r\n\r\n")
+            method, target, _ = head.split(b"\r\n", 1)[0].decode("latin-1").split(" ")
+            path = target.split("?", 1)[0]
+            if method != "GET":
+                status, content_type, body = "405 Method Not Allowed", "text/plain", ""
+            elif path == self.path:
+                status, content_type = "200 OK", CONTENT_TYPE
+                body = self.registry.render()
+            elif path in self.routes:
+                status, content_type = "200 OK", "text/plain; charset=utf-8"
+                body = self.routes[path]()
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", ""
+
+            payload = body.encode("utf-8")
+            headers = (
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n"
+            )
+            writer.write(headers.encode("latin-1") + payload)
+            await writer.drain()
+        except (
+            TimeoutError,
+            ValueError,
+            ConnectionError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+        ) as err:
+            logger.debug("Bad metrics request: %r", err)
+        finally:
+            writer.close()
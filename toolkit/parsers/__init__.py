@@ -1,2 +1,3 @@
 from .base import Parser as Parser
+from .cached_toml_parser import CachedTOMLParser as CachedTOMLParser
 from .toml_parser import TOMLParser as TOMLParser
@@ -0,0 +1,70 @@
+"""Contains the CachedTOMLParser class for fast, read-only parsing of TOML files."""
+
+import logging
+import threading
+import tomllib
+from pathlib import Path
+from typing import Any, ClassVar
+
+from .base import Parser
+from .helpers.exceptions import TOMLParseError
+
+logger = logging.getLogger(__name__)
+
+
+class CachedTOMLParser(Parser):
+    """
+    Parses TOML files with the standard `tomllib`, caching their content.
+
+    The cache is process-wide and keyed by the resolved path of the file, so every
+    parser reading the same file shares a single parse. An entry is reused as long
+    as the modification time and size of the file are unchanged; each `read` costs a
+    `stat` call, and an edited file is parsed again on the next `read`.
+
+    The content is returned as plain dictionaries shared by every reader, which must
+    treat them as read-only. Use `TOMLParser` to edit a file while preserving its
+    comments and formatting.
+    """
+
+    _cache: ClassVar[dict[Path, tuple[tuple[int, int], dict[str, Any]]]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def read(self) -> dict[str, Any]:
+        """
+        Read a TOML file and return its content as a dictionary.
+
+        Returns
+        -------
+        dict[str, Any]
+            The parsed content of the TOML file.
+
+        Raises
+        ------
+        TOMLParseError
+            If the file is not valid TOML.
+        """
+        path = self.file_path.resolve()
+        stat = path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            try:
+                with path.open(mode="rb") as file:
+                    content = tomllib.load(file)
+            except tomllib.TOMLDecodeError as err:
+                msg = f"Syntax Error in: `{self.file_path}`!"
+                logger.error(msg, exc_info=True)
+                raise TOMLParseError(msg) from err
+
+            self._cache[path] = (version, content)
+            return content
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop every cached parse."""
+        with cls._lock:
+            cls._cache.clear()
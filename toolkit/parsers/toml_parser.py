@@ -3,8 +3,6 @@
 import logging
 from typing import Any
 
-import tomlkit
-
 from .base import Parser
 from .helpers.exceptions import TOMLParseError
 
@@ -12,7 +10,13 @@ logger = logging.getLogger(__name__)
 
 
 class TOMLParser(Parser):
-    """Parses TOML files and loads their content."""
+    """
+    Parses TOML files and loads their content, preserving their style.
+
+    `tomlkit` keeps comments, ordering and formatting, so a document can be edited
+    and written back unchanged apart from the edit. It is much slower than the
+    standard `tomllib`; use `CachedTOMLParser` to only read settings.
+    """
 
     def read(self) -> Any:
         """
@@ -23,6 +27,8 @@ class TOMLParser(Parser):
         Any
             The parsed content of the TOML file.
         """
+        import tomlkit  # Imported on use, it is slow to import and rarely needed.
+
         try:
             with self.file_path.open(mode="rb") as file:
                 content = tomlkit.load(file)
@@ -31,3 +37,17 @@ class TOMLParser(Parser):
             msg = f"Syntax Error in: `{self.file_path}`!"
             logger.error(msg, exc_info=True)
             raise TOMLParseError(msg) from err
+
+    def write(self, content: Any) -> None:
+        """
+        Write a TOML document, e.g. one returned by `read` and edited, to the file.
+
+        Parameters
+        ----------
+        content : Any
+            The document to write.
+        """
+        import tomlkit
+
+        with self.file_path.open(mode="w") as file:
+            tomlkit.dump(content, file)
@@ -0,0 +1,4 @@
+from .phases import PhaseProfile
+from .sampler import SamplingProfiler, get_frame_name
+
+__all__ = ["PhaseProfile", "SamplingProfiler", "get_frame_name"]
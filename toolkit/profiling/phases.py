@@ -0,0 +1,69 @@
+"""Module defines the timing of the pipeline phases of the next consumed messages."""
+
+import collections
+import statistics
+import time
+
+from toolkit.tracing import Span, SpanKind
+
+
+class PhaseProfile:
+    """
+    Time every phase of the next `messages` consumed messages, from their spans.
+
+    It subscribes to a `Tracer`, which records every span while subscribed, and
+    groups the span durations by name: the consumer span, the broker wait, the
+    decode, the handler, the publishes and the ack. A message is counted when its
+    consumer span, the local root of its trace, ends.
+
+    Example
+    -------
+    ```python
+    profile = PhaseProfile(messages=100)
+    unsubscribe = tracer.subscribe(profile.add)
+    ...
+    if profile.done:
+        unsubscribe()
+        print(profile.render())
+    ```
+    """
+
+    def __init__(self, messages: int) -> None:
+        """Instantiate a `PhaseProfile` of the next `messages` consumed messages."""
+        self.messages = messages
+        self.seen = 0
+        self.started_at = time.time()
+        self.durations: dict[str, list[float]] = collections.defaultdict(list)
+
+    @property
+    def done(self) -> bool:
+        """Return whether `messages` messages were profiled."""
+        return self.seen >= self.messages
+
+    def add(self, span: Span) -> None:
+        """Count an ended span, until done."""
+        if self.done:
+            return
+        self.durations[span.name].append(span.duration)
+        if span.local_root and span.kind is SpanKind.CONSUMER:
+            self.seen += 1
+
+    def render(self) -> str:
+        """Return the statistics of every phase as a plain-text table, in ms."""
+        lines = [
+            f"{self.seen}/{self.messages} messages profiled",
+            f"{'phase':<24} {'count':>7} {'mean':>9} {'p50':>9} {'p99':>9} "
+            f"{'max':>9} {'total':>10}",
+        ]
+        for name, durations in sorted(
+            self.durations.items(), key=lambda item: -sum(item[1])
+        ):
+            ordered = sorted(durations)
+            p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+            lines.append(
+                f"{name:<24} {len(ordered):>7} "
+                f"{statistics.fmean(ordered) * 1e3:9.3f} "
+                f"{statistics.median(ordered) * 1e3:9.3f} {p99 * 1e3:9.3f} "
+                f"{ordered[-1] * 1e3:9.3f} {sum(ordered) * 1e3:10.1f}"
+            )
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,163 @@
+"""Module defines a statistical profiler sampling the stack of the event loop."""
+
+import asyncio
+import collections
+import sys
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from types import FrameType
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def get_frame_name(frame: FrameType) -> str:
+    """Return the `module:qualified name` of the function running in `frame`."""
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+class SamplingProfiler:
+    """
+    Sample the stack of a thread at a fixed interval, from a background thread.
+
+    Every `interval` seconds, the profiler thread reads the current frame of the
+    profiled thread (the event loop's, by default the main thread) and counts its
+    stack, root first, as a collapsed stack: the format of `flamegraph.pl`,
+    speedscope and most flame graph viewers. The sampled thread is never
+    interrupted; it only contends for the GIL while its stack is read, a few
+    microseconds per sample.
+
+    Samples are attributed to the asyncio task running on `loop` at the time, and
+    to the handler it runs, when wrapped by `attribute`: both are prepended to the
+    stack as `task:<name>` and `handler:<name>` frames.
+
+    Example
+    -------
+    ```python
+    profiler = SamplingProfiler(interval=0.01)
+    profiler.start(loop=asyncio.get_running_loop())
+    ...
+    Path("profile.collapsed").write_text(profiler.stop())
+    ```
+    """
+
+    def __init__(self, interval: float = 0.01, max_depth: int = 128) -> None:
+        """
+        Instantiate a `SamplingProfiler` object.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between two samples (default is 0.01, 100 Hz).
+        max_depth : int, optional
+            Frames kept per stack, the innermost ones (default is 128).
+        """
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: collections.Counter[str] = collections.Counter()
+        self.samples = 0
+        self.started_at: float | None = None
+        self._handlers: dict[asyncio.Task[Any], str] = {}
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        """Return whether the profiler is sampling."""
+        return self._thread is not None
+
+    def start(
+        self,
+        loop: asyncio.AbstractEventLoop | None = None,
+        thread_id: int | None = None,
+    ) -> None:
+        """
+        Start sampling, dropping the previous samples.
+
+        Parameters
+        ----------
+        loop : asyncio.AbstractEventLoop | None, optional
+            The loop whose running task the samples are attributed to (default is
+            None, no attribution).
+        thread_id : int | None, optional
+            The id of the thread to sample (default is None, the main thread).
+        """
+        if self._thread is not None:
+            return
+        self.stacks.clear()
+        self.samples = 0
+        self.started_at = time.time()
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(loop, thread_id or threading.main_thread().ident),
+            name="sampling-profiler",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> str:
+        """Stop sampling and return the samples as collapsed stacks."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+            self._handlers.clear()
+        return self.render()
+
+    def render(self) -> str:
+        """Return the samples as collapsed stacks, one `frame;frame count` per line."""
+        # A copy, as the profiler thread may be adding samples.
+        stacks = sorted(dict(self.stacks).items(), key=lambda item: -item[1])
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def attribute(
+        self, name: str, handler: Callable[[T], Awaitable[None]]
+    ) -> Callable[[T], Awaitable[None]]:
+        """
+        Wrap a handler so the samples taken while it runs are attributed to `name`.
+
+        Costs a single attribute check per call while the profiler is stopped.
+        """
+
+        async def attributed(item: T) -> None:
+            if self._thread is None:
+                await handler(item)
+                return
+            task = asyncio.current_task()
+            if task is not None:
+                self._handlers[task] = name
+            try:
+                await handler(item)
+            finally:
+                if task is not None:
+                    self._handlers.pop(task, None)
+
+        return attributed
+
+    def _run(self, loop: asyncio.AbstractEventLoop | None, thread_id: int) -> None:
+        """Take a sample every `interval` seconds, until stopped."""
+        while not self._stopping.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            self.stacks[self._collapse(frame, loop)] += 1
+            self.samples += 1
+
+    def _collapse(
+        self, frame: FrameType | None, loop: asyncio.AbstractEventLoop | None
+    ) -> str:
+        """Return the collapsed stack of `frame`, prefixed by its attribution."""
+        names: list[str] = []
+        while frame is not None and len(names) < self.max_depth:
+            names.append(get_frame_name(frame))
+            frame = frame.f_back
+        names.reverse()
+
+        task = asyncio.current_task(loop) if loop is not None else None
+        if task is not None:
+            handler = self._handlers.get(task, "-")
+            names[:0] = [f"task:{task.get_name()}", f"handler:{handler}"]
+        return ";".join(names)
@@ -0,0 +1,3 @@
+from .token_bucket import AdaptiveTokenBucket, TokenBucket
+
+__all__ = ["AdaptiveTokenBucket", "TokenBucket"]
@@ -0,0 +1,193 @@
+"""Module defines token-bucket rate limiters."""
+
+import asyncio
+import time
+from collections.abc import Callable
+
+
+class TokenBucket:
+    """
+    Classic token-bucket rate limiter.
+
+    The bucket holds up to `burst` tokens and is refilled continuously at `rate`
+    tokens per second. Every operation consumes tokens; when the bucket is empty the
+    caller either gives up (`try_acquire`) or waits for the refill (`acquire`).
+
+    The refill is computed lazily from the elapsed time on every call, so the bucket
+    needs no background task and costs a few arithmetic operations per call.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Instantiate a `TokenBucket` object, starting full.
+
+        Parameters
+        ----------
+        rate : float
+            The number of tokens added per second.
+        burst : float
+            The maximum number of tokens the bucket can hold.
+        clock : Callable[[], float], optional
+            A monotonic clock returning seconds (default is `time.monotonic`).
+        """
+        if rate <= 0 or burst <= 0:
+            raise ValueError("The rate and burst should be positive")
+        self._rate = rate
+        self._burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._updated_at = clock()
+
+    @property
+    def rate(self) -> float:
+        """Return the number of tokens added per second."""
+        return self._rate
+
+    @rate.setter
+    def rate(self, rate: float) -> None:
+        """Change the refill rate, keeping the tokens accumulated so far."""
+        if rate <= 0:
+            raise ValueError("The rate should be positive")
+        self._refill()
+        self._rate = rate
+
+    @property
+    def burst(self) -> float:
+        """Return the maximum number of tokens the bucket can hold."""
+        return self._burst
+
+    @property
+    def tokens(self) -> float:
+        """Return the number of tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Consume `tokens` if they are available, without waiting.
+
+        Returns
+        -------
+        bool
+            True if the tokens were consumed, False if the bucket had too few.
+        """
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    def delay(self, tokens: float = 1.0) -> float:
+        """Return the seconds to wait until `tokens` are available."""
+        self._refill()
+        return max(0.0, (tokens - self._tokens) / self._rate)
+
+    async def acquire(self, tokens: float = 1.0, timeout: float | None = None) -> bool:
+        """
+        Consume `tokens`, waiting for the bucket to refill if needed.
+
+        Parameters
+        ----------
+        tokens : float, optional
+            The number of tokens to consume (default is 1).
+        timeout : float, optional
+            The maximum number of seconds to wait (default is None, wait forever).
+
+        Returns
+        -------
+        bool
+            True if the tokens were consumed, False if they would not be available
+            within `timeout`.
+        """
+        if tokens > self._burst:
+            raise ValueError("Cannot acquire more tokens than the bucket holds")
+
+        deadline = None if timeout is None else self._clock() + timeout
+        while not self.try_acquire(tokens):
+            delay = self.delay(tokens)
+            if deadline is not None and self._clock() + delay > deadline:
+                return False
+            await asyncio.sleep(delay)
+        return True
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last call."""
+        now = self._clock()
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+            self._updated_at = now
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    Token bucket whose rate follows the observed latency of the guarded operation.
+
+    The rate is tuned with AIMD (additive increase, multiplicative decrease), the
+    same scheme TCP uses for congestion control: every observation below
+    `target_latency` nudges the rate up by `increase` tokens per second, and every
+    observation above it (or an explicit `penalize`) multiplies the rate by
+    `decrease`. The rate always stays within `[min_rate, max_rate]`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        min_rate: float,
+        max_rate: float,
+        target_latency: float,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Instantiate an `AdaptiveTokenBucket` object.
+
+        Parameters
+        ----------
+        rate : float
+            The initial number of tokens added per second.
+        burst : float
+            The maximum number of tokens the bucket can hold.
+        min_rate : float
+            The lower bound of the rate.
+        max_rate : float
+            The upper bound of the rate.
+        target_latency : float
+            The latency, in seconds, above which the rate is decreased.
+        increase : float, optional
+            Tokens per second added to the rate on a fast observation (default is 1).
+        decrease : float, optional
+            Factor applied to the rate on a slow observation (default is 0.5).
+        clock : Callable[[], float], optional
+            A monotonic clock returning seconds (default is `time.monotonic`).
+        """
+        if not 0 < min_rate <= rate <= max_rate:
+            raise ValueError(
+                "The rates should satisfy 0 < min_rate <= rate <= max_rate"
+            )
+        if not 0 < decrease < 1:
+            raise ValueError("The decrease factor should be between 0 and 1")
+        super().__init__(rate=rate, burst=burst, clock=clock)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+
+    def observe(self, latency: float) -> None:
+        """Adjust the rate after an operation that took `latency` seconds."""
+        if latency > self.target_latency:
+            self.penalize()
+        else:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def penalize(self) -> None:
+        """Multiplicatively decrease the rate, e.g. after a failure or a timeout."""
+        self.rate = max(self.min_rate, self.rate * self.decrease)
@@ -0,0 +1,3 @@
+from .circuit_breaker import BreakerState, BreakerStats, CircuitBreaker
+
+__all__ = ["BreakerState", "BreakerStats", "CircuitBreaker"]
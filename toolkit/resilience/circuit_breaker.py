@@ -0,0 +1,170 @@
+"""Module defines a circuit breaker, failing fast the calls to an unhealthy service."""
+
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import StrEnum
+
+from .helpers.exceptions import CircuitOpenError
+
+
+class BreakerState(StrEnum):
+    """States of a `CircuitBreaker`."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True, slots=True)
+class BreakerStats:
+    """Point-in-time metrics of a `CircuitBreaker`."""
+
+    state: BreakerState
+    failures: int
+    opened: int
+    rejected: int
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker: stop calling a failing service, and probe it to recover.
+
+    The breaker starts closed, letting every call through. `failure_threshold`
+    consecutive failures open it: the calls are then refused right away with
+    `CircuitOpenError`, instead of piling up on the unhealthy service. After
+    `reset_timeout` seconds it is half-open, letting `half_open_max_calls` probe
+    calls through: a successful probe closes it, a failed one opens it again for
+    another `reset_timeout`.
+
+    The state is computed lazily from the clock on every call, so the breaker needs
+    no background task.
+
+    Example
+    -------
+    ```python
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=10.0)
+    async with breaker.guard():
+        await call_gateway()
+    ```
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Instantiate a `CircuitBreaker` object, closed.
+
+        Parameters
+        ----------
+        failure_threshold : int, optional
+            Consecutive failures opening the breaker (default is 5).
+        reset_timeout : float, optional
+            Seconds the breaker stays open before probing (default is 10.0).
+        half_open_max_calls : int, optional
+            Probe calls let through at once when half-open (default is 1).
+        clock : Callable[[], float], optional
+            A monotonic clock returning seconds (default is `time.monotonic`).
+        """
+        if failure_threshold < 1 or half_open_max_calls < 1 or reset_timeout <= 0:
+            raise ValueError(
+                "The threshold, timeout and probe calls should be positive"
+            )
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> BreakerState:
+        """Return the state of the breaker, half-open once the reset timeout passed."""
+        if (
+            self._state is BreakerState.OPEN
+            and self._clock() >= self._opened_at + self.reset_timeout
+        ):
+            self._state = BreakerState.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        """Return the seconds until the breaker lets a probe through, if open."""
+        if self.state is not BreakerState.OPEN:
+            return 0.0
+        return self._opened_at + self.reset_timeout - self._clock()
+
+    def stats(self) -> BreakerStats:
+        """Return the current metrics of the breaker."""
+        return BreakerStats(
+            state=self.state,
+            failures=self._failures,
+            opened=self._opened,
+            rejected=self._rejected,
+        )
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        """
+        Run a call through the breaker, recording whether it failed.
+
+        An exception escaping the block is a failure; a cancellation is neither a
+        failure nor a success.
+
+        Raises
+        ------
+        CircuitOpenError
+            If the breaker is open, or half-open with every probe in flight.
+        """
+        probe = self._admit()
+        try:
+            yield
+        except Exception:
+            self._record(probe, success=False)
+            raise
+        except BaseException:
+            if probe:
+                self._probes -= 1
+            raise
+        self._record(probe, success=True)
+
+    def _admit(self) -> bool:
+        """Let a call through, returning whether it is a probe, or refuse it."""
+        state = self.state
+        if state is BreakerState.CLOSED:
+            return False
+        if state is BreakerState.HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return True
+        self._rejected += 1
+        raise CircuitOpenError(
+            f"The circuit is {state}, retry in {max(self.retry_after, 0.0):.1f}s"
+        )
+
+    def _record(self, probe: bool, success: bool) -> None:
+        """Record the outcome of a call, closing or opening the breaker."""
+        if probe:
+            self._probes -= 1
+        if success:
+            if self._state is not BreakerState.OPEN:
+                self._state = BreakerState.CLOSED
+                self._failures = 0
+            return
+        self._failures += 1
+        if probe or (
+            self._state is BreakerState.CLOSED
+            and self._failures >= self.failure_threshold
+        ):
+            self._state = BreakerState.OPEN
+            self._opened_at = self._clock()
+            self._opened += 1
@@ -0,0 +1,7 @@
+"""Module containing custom exceptions used by the resilience toolkit."""
+
+
+class CircuitOpenError(Exception):
+    """Raise when a call is refused because its circuit breaker is open."""
+
+    pass
@@ -0,0 +1,3 @@
+from .timing_wheel import TimingWheel
+
+__all__ = ["TimingWheel"]
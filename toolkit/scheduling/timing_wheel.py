@@ -0,0 +1,186 @@
+"""Module defines a hierarchical timing wheel, holding many timers cheaply."""
+
+import itertools
+import math
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class _Timer(Generic[T]):
+    """A scheduled item, in the bucket of the wheel covering its expiry tick."""
+
+    id: int
+    when: float
+    expiry: int
+    item: T
+    bucket: dict[int, "_Timer[T]"]
+
+
+class TimingWheel(Generic[T]):
+    """
+    A hierarchical timing wheel: timers are scheduled and cancelled in O(1).
+
+    Time advances by ticks of `tick` seconds. Every level of the wheel is a ring of
+    `slots` buckets: a bucket of level 0 holds the timers expiring on one tick, a
+    bucket of level 1 the ones expiring in a span of `slots` ticks, and so on, so
+    `levels` levels cover `slots ** levels` ticks. A timer is put in the bucket of
+    the lowest level covering its expiry; when the wheel reaches the span of a
+    bucket of an upper level, its timers cascade down to the lower ones, until
+    they reach level 0 and expire. Timers beyond the range of the wheel wait in an
+    overflow bucket, cascaded with the top level.
+
+    Scheduling or cancelling a timer is a dictionary insert or delete, whatever
+    the number of timers; advancing costs a bucket per tick, plus the cascades,
+    each timer moving down at most once per level. Timers expire in batches, with
+    a precision of one tick.
+
+    Example
+    -------
+    ```python
+    wheel: TimingWheel[str] = TimingWheel(tick=1.0, start=time.time())
+    timer_id = wheel.schedule("reminder", when=time.time() + 1800)
+    ...
+    for item in wheel.advance(time.time()):
+        ...
+    ```
+    """
+
+    def __init__(
+        self, tick: float = 1.0, slots: int = 64, levels: int = 4, start: float = 0.0
+    ) -> None:
+        """
+        Instantiate a `TimingWheel` object, with no timer.
+
+        Parameters
+        ----------
+        tick : float, optional
+            Seconds per tick, the precision of the timers (default is 1.0).
+        slots : int, optional
+            Buckets per level (default is 64).
+        levels : int, optional
+            Levels of the wheel (default is 4, covering 64 ** 4 ticks).
+        start : float, optional
+            The time the wheel starts at, in seconds (default is 0.0).
+        """
+        if tick <= 0 or slots < 2 or levels < 1:
+            raise ValueError("The tick, slots and levels should be positive")
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self._wheels: list[list[dict[int, _Timer[T]]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._overflow: dict[int, _Timer[T]] = {}
+        self._timers: dict[int, _Timer[T]] = {}
+        self._ids = itertools.count(1)
+        self._now = math.floor(start / tick)
+
+    def __len__(self) -> int:
+        """Return the number of pending timers."""
+        return len(self._timers)
+
+    @property
+    def now(self) -> float:
+        """Return the time the wheel advanced to, in seconds."""
+        return self._now * self.tick
+
+    def schedule(self, item: T, when: float) -> int:
+        """
+        Schedule an item to expire at a time.
+
+        Parameters
+        ----------
+        item : T
+            The item returned by `advance` once expired.
+        when : float
+            The time to expire at, in seconds; a time already past expires on the
+            next tick.
+
+        Returns
+        -------
+        int
+            The id of the timer, to cancel it.
+        """
+        timer_id = next(self._ids)
+        expiry = max(math.ceil(when / self.tick), self._now + 1)
+        timer = _Timer(id=timer_id, when=when, expiry=expiry, item=item, bucket={})
+        self._timers[timer_id] = timer
+        self._place(timer)
+        return timer_id
+
+    def cancel(self, timer_id: int) -> bool:
+        """Cancel a timer, returning whether it was still pending."""
+        timer = self._timers.pop(timer_id, None)
+        if timer is None:
+            return False
+        del timer.bucket[timer_id]
+        return True
+
+    def advance(self, now: float) -> list[T]:
+        """
+        Advance the wheel to a time, expiring the timers due by then.
+
+        Parameters
+        ----------
+        now : float
+            The current time, in seconds.
+
+        Returns
+        -------
+        list[T]
+            The expired items, by expiry tick.
+        """
+        target = math.floor(now / self.tick)
+        expired: list[T] = []
+        while self._now < target:
+            if not self._timers:
+                self._now = target
+                break
+            self._now += 1
+            self._cascade()
+            bucket = self._wheels[0][self._now % self.slots]
+            for timer in bucket.values():
+                del self._timers[timer.id]
+                expired.append(timer.item)
+            bucket.clear()
+        return expired
+
+    def pending(self) -> Iterator[tuple[float, T]]:
+        """Yield the time and item of every pending timer, e.g. to persist them."""
+        for timer in self._timers.values():
+            yield timer.when, timer.item
+
+    def _place(self, timer: _Timer[T]) -> None:
+        """Put a timer in the bucket of the lowest level covering its expiry."""
+        delta = timer.expiry - self._now
+        span = 1
+        for wheel in self._wheels:
+            if delta < span * self.slots:
+                bucket = wheel[(timer.expiry // span) % self.slots]
+                break
+            span *= self.slots
+        else:
+            bucket = self._overflow
+        bucket[timer.id] = timer
+        timer.bucket = bucket
+
+    def _cascade(self) -> None:
+        """Move the timers of the upper buckets the wheel reached down a level."""
+        span = self.slots ** (self.levels - 1)
+        if self._now % (span * self.slots) == 0:
+            self._reschedule(self._overflow)
+        for level in range(self.levels - 1, 0, -1):
+            if self._now % span == 0:
+                self._reschedule(self._wheels[level][(self._now // span) % self.slots])
+            span //= self.slots
+
+    def _reschedule(self, bucket: dict[int, _Timer[T]]) -> None:
+        """Empty a bucket, placing its timers again."""
+        timers = list(bucket.values())
+        bucket.clear()
+        for timer in timers:
+            self._place(timer)
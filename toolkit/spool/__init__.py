@@ -0,0 +1,3 @@
+from .ring_buffer import DropPolicy, MmapRingBuffer
+
+__all__ = ["DropPolicy", "MmapRingBuffer"]
@@ -0,0 +1,13 @@
+"""Module containing custom exceptions used by the spool toolkit."""
+
+
+class SpoolFullError(Exception):
+    """Raise when a record does not fit in the spool and cannot be dropped."""
+
+    pass
+
+
+class SpoolCorruptedError(Exception):
+    """Raise when the spool file on disk does not match the expected layout."""
+
+    pass
@@ -0,0 +1,249 @@
+"""Module defines a fixed-size, memory-mapped ring buffer persisted on local disk."""
+
+import mmap
+import struct
+from enum import StrEnum
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+from .helpers.exceptions import SpoolCorruptedError, SpoolFullError
+
+_MAGIC = b"RMQSPOOL"
+_HEADER = struct.Struct("<8sQQQQ")  # magic, capacity, head, tail, count
+_HEADER_SIZE = 64
+_LENGTH = struct.Struct("<I")
+
+
+class DropPolicy(StrEnum):
+    """Policies applied by `MmapRingBuffer` when an appended record does not fit."""
+
+    REJECT = "reject"
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+
+
+class MmapRingBuffer:
+    """
+    A FIFO of length-prefixed byte records, stored in a memory-mapped file.
+
+    The file holds a small header followed by `capacity` bytes of data. The header
+    stores two monotonically increasing offsets, `head` and `tail`; records live in
+    the data region between them, wrapping around its end. Appending and popping are
+    O(1) regardless of how many records are stored, and because the offsets are
+    written to the header after the record bytes, a crash never exposes a partially
+    written record: the ring is reopened exactly as it was after the last completed
+    operation.
+
+    Example
+    -------
+    ```python
+    with MmapRingBuffer("spool/publish.spool", capacity=1024 * 1024) as ring:
+        ring.append(b"first")
+        ring.append(b"second")
+        assert ring.pop() == b"first"
+    ```
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        capacity: int,
+        drop_policy: DropPolicy = DropPolicy.REJECT,
+        sync: bool = False,
+    ) -> None:
+        """
+        Open the ring buffer, creating its file if it does not exist yet.
+
+        Parameters
+        ----------
+        file_path : str
+            The path of the file backing the ring buffer.
+        capacity : int
+            The size of the data region in bytes. An existing file must have been
+            created with the same capacity.
+        drop_policy : DropPolicy, optional
+            What to do when an appended record does not fit (default is `REJECT`).
+        sync : bool, optional
+            Whether to flush the mapping to disk after every mutation (default is
+            False, which leaves write-back to the operating system).
+        """
+        if capacity <= _LENGTH.size:
+            raise ValueError(f"The capacity should be greater than {_LENGTH.size}")
+
+        self.file_path = Path(file_path)
+        self.drop_policy = DropPolicy(drop_policy)
+        self.dropped = 0
+        self._capacity = capacity
+        self._sync = sync
+
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_size = self.file_path.stat().st_size if self.file_path.exists() else 0
+        is_new = file_size == 0
+        if not is_new and file_size != _HEADER_SIZE + capacity:
+            raise SpoolCorruptedError(
+                f"`{self.file_path}` was not created with a capacity of {capacity} "
+                "bytes!"
+            )
+
+        self._file = self.file_path.open(mode="a+b")
+        if is_new:
+            self._file.truncate(_HEADER_SIZE + capacity)
+        self._mm = mmap.mmap(self._file.fileno(), _HEADER_SIZE + capacity)
+
+        if is_new:
+            self._head = self._tail = self._count = 0
+            self._write_header()
+        else:
+            self._load_header()
+
+    def __enter__(self) -> Self:
+        """Return the ring buffer itself, closing it when the block exits."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the ring buffer."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of records stored in the ring buffer."""
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        """Return the size of the data region in bytes."""
+        return self._capacity
+
+    @property
+    def used_bytes(self) -> int:
+        """Return the number of bytes occupied by stored records."""
+        return self._tail - self._head
+
+    @property
+    def free_bytes(self) -> int:
+        """Return the number of bytes available for new records."""
+        return self._capacity - self.used_bytes
+
+    def append(self, record: bytes) -> bool:
+        """
+        Append a record to the end of the ring buffer.
+
+        Parameters
+        ----------
+        record : bytes
+            The record to store.
+
+        Returns
+        -------
+        bool
+            True if the record was stored, False if it was discarded because of the
+            `DROP_NEWEST` policy.
+
+        Raises
+        ------
+        SpoolFullError
+            If the record does not fit and the policy is `REJECT`.
+        ValueError
+            If the record is larger than the whole ring buffer.
+        """
+        size = _LENGTH.size + len(record)
+        if size > self._capacity:
+            raise ValueError(
+                f"Record of {len(record)} bytes does not fit in a ring buffer of "
+                f"{self._capacity} bytes"
+            )
+
+        if size > self.free_bytes:
+            if self.drop_policy is DropPolicy.REJECT:
+                raise SpoolFullError(
+                    f"Spool `{self.file_path}` is full ({self.used_bytes} bytes used)"
+                )
+            if self.drop_policy is DropPolicy.DROP_NEWEST:
+                self.dropped += 1
+                return False
+            while size > self.free_bytes:
+                self._discard_head()
+                self.dropped += 1
+
+        self._write(self._tail, _LENGTH.pack(len(record)))
+        self._write(self._tail + _LENGTH.size, record)
+        self._tail += size
+        self._count += 1
+        self._write_header()
+        return True
+
+    def peek(self) -> bytes | None:
+        """Return the oldest record without removing it, or None if empty."""
+        if not self._count:
+            return None
+        (length,) = _LENGTH.unpack(self._read(self._head, _LENGTH.size))
+        return self._read(self._head + _LENGTH.size, length)
+
+    def pop(self) -> bytes | None:
+        """Remove and return the oldest record, or None if empty."""
+        record = self.peek()
+        if record is not None:
+            self._head += _LENGTH.size + len(record)
+            self._count -= 1
+            self._write_header()
+        return record
+
+    def flush(self) -> None:
+        """Flush the memory-mapped pages to disk."""
+        self._mm.flush()
+
+    def close(self) -> None:
+        """Flush and close the memory mapping and the underlying file."""
+        if self._mm.closed:
+            return
+        self._mm.flush()
+        self._mm.close()
+        self._file.close()
+
+    def _discard_head(self) -> None:
+        """Drop the oldest record without decoding its payload."""
+        (length,) = _LENGTH.unpack(self._read(self._head, _LENGTH.size))
+        self._head += _LENGTH.size + length
+        self._count -= 1
+
+    def _write(self, offset: int, data: bytes) -> None:
+        """Write `data` at the logical `offset`, wrapping around the data region."""
+        start = offset % self._capacity
+        first = min(len(data), self._capacity - start)
+        self._mm[_HEADER_SIZE + start : _HEADER_SIZE + start + first] = data[:first]
+        if first < len(data):
+            rest = len(data) - first
+            self._mm[_HEADER_SIZE : _HEADER_SIZE + rest] = data[first:]
+
+    def _read(self, offset: int, size: int) -> bytes:
+        """Read `size` bytes from the logical `offset`, wrapping if needed."""
+        start = offset % self._capacity
+        first = min(size, self._capacity - start)
+        data = self._mm[_HEADER_SIZE + start : _HEADER_SIZE + start + first]
+        if first < size:
+            data += self._mm[_HEADER_SIZE : _HEADER_SIZE + size - first]
+        return data
+
+    def _write_header(self) -> None:
+        """Persist the offsets, making the last mutation visible after a restart."""
+        self._mm[: _HEADER.size] = _HEADER.pack(
+            _MAGIC, self._capacity, self._head, self._tail, self._count
+        )
+        if self._sync:
+            self._mm.flush()
+
+    def _load_header(self) -> None:
+        """Read the offsets of an existing ring buffer and validate its layout."""
+        magic, capacity, head, tail, count = _HEADER.unpack(self._mm[: _HEADER.size])
+        if magic != _MAGIC or capacity != self._capacity:
+            self.close()
+            raise SpoolCorruptedError(f"`{self.file_path}` is not a valid spool file!")
+        if not 0 <= tail - head <= capacity:
+            self.close()
+            raise SpoolCorruptedError(f"`{self.file_path}` has corrupted offsets!")
+        self._head, self._tail, self._count = head, tail, count
@@ -0,0 +1,28 @@
+from .export import (
+    BatchSpanProcessor,
+    FileSpanExporter,
+    OTLPHttpSpanExporter,
+    SpanExporter,
+    to_otlp,
+)
+from .sampling import RatioSampler, TailSampler
+from .span import TRACEPARENT_HEADER, Span, SpanContext, SpanKind
+from .tracer import NonRecordingScope, SpanScope, Tracer, TracerStats
+
+__all__ = [
+    "TRACEPARENT_HEADER",
+    "BatchSpanProcessor",
+    "FileSpanExporter",
+    "NonRecordingScope",
+    "OTLPHttpSpanExporter",
+    "RatioSampler",
+    "Span",
+    "SpanContext",
+    "SpanExporter",
+    "SpanKind",
+    "SpanScope",
+    "TailSampler",
+    "Tracer",
+    "TracerStats",
+    "to_otlp",
+]
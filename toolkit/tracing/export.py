@@ -0,0 +1,256 @@
+"""Module exports finished spans, in the OTLP/JSON format, off the event loop."""
+
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from .span import Span
+
+logger = logging.getLogger(__name__)
+
+
+def _to_any_value(value: Any) -> dict[str, Any]:
+    """Encode an attribute value as an OTLP `AnyValue`."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _to_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    """Encode attributes as OTLP `KeyValue` pairs."""
+    return [
+        {"key": key, "value": _to_any_value(value)} for key, value in attributes.items()
+    ]
+
+
+def to_otlp(spans: Sequence[Span], service_name: str) -> dict[str, Any]:
+    """
+    Encode spans as an OTLP/JSON `ExportTraceServiceRequest`.
+
+    Parameters
+    ----------
+    spans : Sequence[Span]
+        The finished spans to encode.
+    service_name : str
+        The `service.name` resource attribute.
+
+    Returns
+    -------
+    dict[str, Any]
+        The request, ready to be serialized to JSON.
+    """
+    encoded = []
+    for span in spans:
+        item: dict[str, Any] = {
+            "traceId": span.context.trace_id,
+            "spanId": span.context.span_id,
+            "name": span.name,
+            "kind": int(span.kind),
+            "startTimeUnixNano": str(span.start_time),
+            "endTimeUnixNano": str(span.end_time or span.start_time),
+            "attributes": _to_attributes(span.attributes),
+            "status": (
+                {"code": 2, "message": span.error}
+                if span.error is not None
+                else {"code": 1}
+            ),
+        }
+        if span.parent_id is not None:
+            item["parentSpanId"] = span.parent_id
+        encoded.append(item)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _to_attributes({"service.name": service_name})
+                },
+                "scopeSpans": [
+                    {"scope": {"name": "toolkit.tracing"}, "spans": encoded}
+                ],
+            }
+        ]
+    }
+
+
+class SpanExporter(ABC):
+    """Base class of the span exporters, called from the export thread."""
+
+    def __init__(self, service_name: str) -> None:
+        """Instantiate a `SpanExporter` for the service `service_name`."""
+        self.service_name = service_name
+
+    @abstractmethod
+    def export(self, spans: Sequence[Span]) -> None:
+        """Export a batch of finished spans."""
+
+    def shutdown(self) -> None:
+        """Release the resources of the exporter."""
+
+
+class FileSpanExporter(SpanExporter):
+    """Append every batch to a file, as one OTLP/JSON request per line."""
+
+    def __init__(self, service_name: str, file_path: str) -> None:
+        """
+        Instantiate a `FileSpanExporter` object.
+
+        Parameters
+        ----------
+        service_name : str
+            The `service.name` resource attribute.
+        file_path : str
+            The path of the JSON lines file, created with its directory if missing.
+        """
+        super().__init__(service_name)
+        self.file_path = Path(file_path)
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.file_path.open(mode="a", encoding="utf-8")
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Append the batch to the file."""
+        request = to_otlp(spans, self.service_name)
+        self._file.write(json.dumps(request, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+class OTLPHttpSpanExporter(SpanExporter):
+    """POST every batch to an OTLP/HTTP collector, in the JSON encoding."""
+
+    def __init__(self, service_name: str, endpoint: str, timeout: float = 5.0) -> None:
+        """
+        Instantiate a `OTLPHttpSpanExporter` object.
+
+        Parameters
+        ----------
+        service_name : str
+            The `service.name` resource attribute.
+        endpoint : str
+            The traces URL of the collector, e.g. "http://127.0.0.1:4318/v1/traces".
+        timeout : float, optional
+            Seconds to wait for the collector (default is 5.0).
+        """
+        super().__init__(service_name)
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Send the batch to the collector."""
+        import urllib.request
+
+        body = json.dumps(to_otlp(spans, self.service_name)).encode()
+        request = urllib.request.Request(
+            self.endpoint,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class BatchSpanProcessor:
+    """
+    Hand finished spans to an exporter in batches, from a background thread.
+
+    Ending a span only puts it on a bounded queue, so the event loop never waits for
+    the file or the collector. A span that does not fit is dropped and counted, like
+    the records of `NonBlockingQueueHandler`. The thread exports a batch when it
+    reaches `max_batch_size` spans or `schedule_delay` seconds after its first span.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue_size: int = 2048,
+        max_batch_size: int = 512,
+        schedule_delay: float = 1.0,
+    ) -> None:
+        """
+        Instantiate a `BatchSpanProcessor` object and start its export thread.
+
+        Parameters
+        ----------
+        exporter : SpanExporter
+            The exporter of the batches.
+        max_queue_size : int, optional
+            Spans waiting for export before new ones are dropped (default is 2048).
+        max_batch_size : int, optional
+            Spans exported at once at most (default is 512).
+        schedule_delay : float, optional
+            Seconds a span may wait for its batch to fill (default is 1.0).
+        """
+        self.exporter = exporter
+        self.max_batch_size = max_batch_size
+        self.schedule_delay = schedule_delay
+        self.dropped = 0
+        self.exported = 0
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name="span-exporter", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def on_end(self, spans: Sequence[Span]) -> None:
+        """Queue finished spans for export, dropping those that do not fit."""
+        for span in spans:
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                self.dropped += 1
+
+    def shutdown(self) -> None:
+        """Export the queued spans and stop the thread."""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+            self.exporter.shutdown()
+
+    def _run(self) -> None:
+        """Collect batches from the queue and export them, until stopped."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.schedule_delay
+            try:
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    item = self._queue.get(timeout=timeout)
+                    if item is self._STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+            except queue.Empty:
+                pass
+            self._export(batch)
+
+    def _export(self, batch: list[Span]) -> None:
+        """Export a batch, logging the failures instead of losing the thread."""
+        try:
+            self.exporter.export(batch)
+        except Exception:
+            logger.exception("Failed to export %d spans", len(batch))
+        else:
+            self.exported += len(batch)
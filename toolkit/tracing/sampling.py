@@ -0,0 +1,55 @@
+"""Module defines the head and tail sampling decisions of traces."""
+
+from collections.abc import Sequence
+
+from .span import Span
+
+
+class RatioSampler:
+    """
+    Head sampling: keep a fixed ratio of traces, decided when a trace starts.
+
+    The decision is derived from the trace id, so every service sampling the same
+    trace id with the same ratio agrees, and the decision of the service starting a
+    trace is propagated to the others through the `traceparent` flags anyway.
+    """
+
+    def __init__(self, ratio: float) -> None:
+        """Instantiate a `RatioSampler` keeping `ratio` (0 to 1) of the traces."""
+        if not 0 <= ratio <= 1:
+            raise ValueError("The ratio should be between 0 and 1")
+        self.ratio = ratio
+        self._bound = round(ratio * (1 << 64))
+
+    def should_sample(self, trace_id: str) -> bool:
+        """Return whether the trace should be sampled."""
+        return int(trace_id[16:], 16) < self._bound
+
+
+class TailSampler:
+    """
+    Tail sampling: keep a trace not sampled at its head if it turned out interesting.
+
+    The spans of such traces are buffered until the local root span ends, then kept
+    if any of them failed or if the local root took longer than `latency_threshold`.
+    """
+
+    def __init__(self, latency_threshold: float, keep_errors: bool = True) -> None:
+        """
+        Instantiate a `TailSampler` object.
+
+        Parameters
+        ----------
+        latency_threshold : float
+            Seconds above which a local root span makes its trace kept.
+        keep_errors : bool, optional
+            Whether traces with a failed span are kept (default is True).
+        """
+        self.latency_threshold = latency_threshold
+        self.keep_errors = keep_errors
+
+    def should_keep(self, root: Span, spans: Sequence[Span]) -> bool:
+        """Return whether the buffered spans of a trace should be exported."""
+        if root.duration > self.latency_threshold:
+            return True
+        return self.keep_errors and any(span.error is not None for span in spans)
@@ -0,0 +1,95 @@
+"""Module defines spans and their W3C `traceparent` propagation format."""
+
+import random
+import re
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, NamedTuple
+
+TRACEPARENT_HEADER = "traceparent"
+
+_TRACEPARENT = re.compile(r"00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+
+class SpanKind(IntEnum):
+    """The role of a span, numbered as in OTLP."""
+
+    INTERNAL = 1
+    PRODUCER = 4
+    CONSUMER = 5
+
+
+class SpanContext(NamedTuple):
+    """
+    The identity of a span, as propagated to other services.
+
+    A named tuple rather than a frozen dataclass: one is created per span, and a
+    tuple is several times cheaper to build.
+    """
+
+    trace_id: str
+    span_id: str
+    sampled: bool
+    is_remote: bool = False
+
+    @classmethod
+    def new_trace_id(cls) -> str:
+        """Return a random 128-bit trace id, in hexadecimal."""
+        return random.randbytes(16).hex()
+
+    @classmethod
+    def new_span_id(cls) -> str:
+        """Return a random 64-bit span id, in hexadecimal."""
+        return random.randbytes(8).hex()
+
+    def to_traceparent(self) -> str:
+        """Return the W3C `traceparent` header value of the span."""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    @classmethod
+    def from_traceparent(cls, value: Any) -> "SpanContext | None":
+        """Parse a `traceparent` header value, returning None if it is invalid."""
+        if isinstance(value, bytes):
+            value = value.decode("latin-1")
+        if not isinstance(value, str):
+            return None
+        match = _TRACEPARENT.fullmatch(value)
+        if match is None:
+            return None
+        trace_id, span_id, flags = match.groups()
+        if trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+            return None
+        return cls(trace_id, span_id, bool(int(flags, 16) & 0x01), True)
+
+
+@dataclass(slots=True)
+class Span:
+    """A timed operation of a trace, with times in nanoseconds since the epoch."""
+
+    name: str
+    context: SpanContext
+    parent_id: str | None
+    start_time: int
+    kind: SpanKind = SpanKind.INTERNAL
+    end_time: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+    local_root: bool = False
+    recording: bool = True
+
+    @property
+    def duration(self) -> float:
+        """Return the duration of the span in seconds, zero while it runs."""
+        if self.end_time is None:
+            return 0.0
+        return (self.end_time - self.start_time) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute of the span."""
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        """Mark the span as failed by `error`."""
+        self.error = f"{type(error).__name__}: {error}"
@@ -0,0 +1,332 @@
+"""Module defines the Tracer, creating spans and propagating their context."""
+
+import contextvars
+import time
+from collections.abc import Callable, MutableMapping
+from dataclasses import dataclass
+from random import randbytes
+from types import TracebackType
+from typing import Any
+
+from .export import BatchSpanProcessor
+from .sampling import RatioSampler, TailSampler
+from .span import TRACEPARENT_HEADER, Span, SpanContext, SpanKind
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+@dataclass(frozen=True, slots=True)
+class TracerStats:
+    """Point-in-time metrics of a `Tracer`."""
+
+    started: int
+    exported: int
+    tail_kept: int
+    tail_discarded: int
+    pending_traces: int
+    evicted_traces: int
+
+
+class Tracer:
+    """
+    Create spans around operations and propagate their context through headers.
+
+    A trace is sampled at its head, by `sampler`, when its first span starts; the
+    decision travels with the `traceparent` header, so a trace is either recorded
+    by every service or by none. Traces not sampled at their head are dropped,
+    unless a `tail_sampler` is set: their spans are then buffered until their local
+    root span ends, and kept if it judges the trace interesting (slow or failed).
+    The buffer is bounded to `max_pending_traces` traces, the oldest being evicted
+    first.
+
+    Spans that will not be recorded, because their trace is dropped or the tracer
+    has no processor, are kept as cheap as possible: the local root still gets a
+    span, to propagate the context, but its children are not created at all.
+
+    Example
+    -------
+    ```python
+    tracer = Tracer(
+        sampler=RatioSampler(0.01),
+        tail_sampler=TailSampler(latency_threshold=1.0),
+        processor=BatchSpanProcessor(FileSpanExporter("orders", "traces.jsonl")),
+    )
+    with tracer.start_span("publish", kind=SpanKind.PRODUCER) as span:
+        tracer.inject(headers)
+    ```
+    """
+
+    def __init__(
+        self,
+        sampler: RatioSampler | None = None,
+        tail_sampler: TailSampler | None = None,
+        processor: BatchSpanProcessor | None = None,
+        max_pending_traces: int = 1000,
+    ) -> None:
+        """
+        Instantiate a `Tracer` object.
+
+        Parameters
+        ----------
+        sampler : RatioSampler | None, optional
+            The head sampler of new traces (default is None, sampling none).
+        tail_sampler : TailSampler | None, optional
+            The tail sampler of the traces not sampled at their head (default is
+            None, dropping them).
+        processor : BatchSpanProcessor | None, optional
+            The processor exporting the recorded spans (default is None, recording
+            nothing).
+        max_pending_traces : int, optional
+            Traces buffered for the tail sampler at most (default is 1000).
+        """
+        self.sampler = sampler or RatioSampler(0.0)
+        self.tail_sampler = tail_sampler
+        self.processor = processor
+        self.max_pending_traces = max_pending_traces
+        self._pending: dict[str, list[Span]] = {}
+        self._subscribers: list[Callable[[Span], None]] = []
+        self._started = 0
+        self._exported = 0
+        self._tail_kept = 0
+        self._tail_discarded = 0
+        self._evicted = 0
+
+    def stats(self) -> TracerStats:
+        """Return the current metrics of the tracer."""
+        return TracerStats(
+            started=self._started,
+            exported=self._exported,
+            tail_kept=self._tail_kept,
+            tail_discarded=self._tail_discarded,
+            pending_traces=len(self._pending),
+            evicted_traces=self._evicted,
+        )
+
+    def subscribe(self, callback: Callable[[Span], None]) -> Callable[[], None]:
+        """
+        Call `callback(span)` with every span ending, sampled or not.
+
+        Every span is recorded while a subscriber is registered, so subscriptions
+        are meant to be short-lived, e.g. to profile the next few messages.
+
+        Returns
+        -------
+        Callable[[], None]
+            A function removing the subscription.
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    @staticmethod
+    def current_span() -> Span | None:
+        """Return the span of the running operation, if any."""
+        return _current_span.get()
+
+    @staticmethod
+    def extract(headers: MutableMapping[str, Any] | None) -> SpanContext | None:
+        """Return the remote span context carried by message headers, if any."""
+        if not headers:
+            return None
+        return SpanContext.from_traceparent(headers.get(TRACEPARENT_HEADER))
+
+    @staticmethod
+    def inject(headers: MutableMapping[str, Any]) -> None:
+        """Stamp the context of the current span on message headers."""
+        span = _current_span.get()
+        if span is not None:
+            headers[TRACEPARENT_HEADER] = span.context.to_traceparent()
+
+    def start_span(
+        self,
+        name: str,
+        *,
+        kind: SpanKind = SpanKind.INTERNAL,
+        parent: SpanContext | None = None,
+        attributes: dict[str, Any] | None = None,
+    ) -> "SpanScope | NonRecordingScope":
+        """
+        Return a context manager running its body as a span, the current one.
+
+        Parameters
+        ----------
+        name : str
+            The name of the span.
+        kind : SpanKind, optional
+            The role of the span (default is `SpanKind.INTERNAL`).
+        parent : SpanContext | None, optional
+            The parent, e.g. extracted from a message (default is None, the current
+            span or none).
+        attributes : dict[str, Any] | None, optional
+            The initial attributes of the span.
+
+        Returns
+        -------
+        SpanScope | NonRecordingScope
+            The context manager of the span, started now. An exception escaping the
+            body marks the span as failed.
+        """
+        if parent is None:
+            current = _current_span.get()
+            if current is not None and not current.recording:
+                return _NON_RECORDING
+        return SpanScope(
+            self, self._create_span(name, kind, parent, attributes, time.time_ns())
+        )
+
+    def record_span(
+        self,
+        name: str,
+        start_time: int,
+        end_time: int,
+        *,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Record a finished span, child of the current one, from known timestamps.
+
+        Used for operations not run by this process, e.g. the wait of a message in
+        the broker, measured from its publish timestamp.
+        """
+        current = _current_span.get()
+        if current is not None and not current.recording:
+            return
+        span = self._create_span(name, kind, None, attributes, start_time)
+        span.end_time = max(start_time, end_time)
+        self._on_end(span)
+
+    def _create_span(
+        self,
+        name: str,
+        kind: SpanKind,
+        parent: SpanContext | None,
+        attributes: dict[str, Any] | None,
+        start_time: int,
+    ) -> Span:
+        """Create a span, child of `parent` or of the current span."""
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+        if parent is None:
+            trace_id = randbytes(16).hex()
+            sampled = self.sampler.should_sample(trace_id)
+        else:
+            trace_id, sampled = parent.trace_id, parent.sampled
+        self._started += 1
+        return Span(
+            name,
+            SpanContext(trace_id, randbytes(8).hex(), sampled),
+            parent.span_id if parent is not None else None,
+            start_time,
+            kind,
+            None,
+            attributes if attributes is not None else {},
+            None,
+            parent is None or parent.is_remote,
+            bool(self._subscribers)
+            or (
+                self.processor is not None
+                and (sampled or self.tail_sampler is not None)
+            ),
+        )
+
+    def _on_end(self, span: Span) -> None:
+        """Export or buffer an ended span, as the samplers decide."""
+        if not span.recording:
+            return
+        for callback in list(self._subscribers):
+            callback(span)
+        if self.processor is None:
+            return
+        if span.context.sampled:
+            self._export([span])
+            return
+        if self.tail_sampler is None:
+            return
+
+        trace_id = span.context.trace_id
+        spans = self._pending.get(trace_id)
+        if spans is None:
+            if len(self._pending) >= self.max_pending_traces:
+                del self._pending[next(iter(self._pending))]
+                self._evicted += 1
+            spans = self._pending[trace_id] = []
+        spans.append(span)
+        if not span.local_root:
+            return
+
+        del self._pending[trace_id]
+        if self.tail_sampler.should_keep(span, spans):
+            self._tail_kept += 1
+            self._export(spans)
+        else:
+            self._tail_discarded += 1
+
+    def _export(self, spans: list[Span]) -> None:
+        """Hand spans to the processor."""
+        if self.processor is not None:
+            self.processor.on_end(spans)
+            self._exported += len(spans)
+
+
+class SpanScope:
+    """
+    Context manager running its body as a span, returned by `Tracer.start_span`.
+
+    A class rather than a generator-based context manager, as one runs per span.
+    """
+
+    __slots__ = ("_token", "_tracer", "span")
+
+    def __init__(self, tracer: Tracer, span: Span) -> None:
+        """Prepare the scope of `span`, current from entry to exit."""
+        self._tracer = tracer
+        self._token: contextvars.Token[Span | None] | None = None
+        self.span = span
+
+    def __enter__(self) -> Span:
+        """Make the span the current one."""
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """End the span, failed if an exception escaped the body."""
+        if self._token is not None:
+            _current_span.reset(self._token)
+        span = self.span
+        if exc_value is not None:
+            span.record_error(exc_value)
+        span.end_time = time.time_ns()
+        self._tracer._on_end(span)
+
+
+class NonRecordingScope:
+    """
+    Context manager standing for the children of a span that is not recorded.
+
+    It keeps the parent as the current span, so its context is still propagated.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self) -> Span:
+        """Return the current span."""
+        return _current_span.get()  # type: ignore[return-value]
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Do nothing."""
+
+
+_NON_RECORDING = NonRecordingScope()
@@ -0,0 +1,3 @@
+from .segmented_log import SegmentedLog
+
+__all__ = ["SegmentedLog"]
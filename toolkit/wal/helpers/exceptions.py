@@ -0,0 +1,7 @@
+"""Module containing custom exceptions used by the write-ahead log toolkit."""
+
+
+class WalCorruptedError(Exception):
+    """Raise when a sealed segment of the log does not match the expected layout."""
+
+    pass
@@ -0,0 +1,199 @@
+"""Module defines an append-only log of records, split into segment files."""
+
+import os
+import struct
+import threading
+import zlib
+from bisect import bisect_right
+from collections.abc import Iterator
+from pathlib import Path
+
+from .helpers.exceptions import WalCorruptedError
+
+_RECORD_HEADER = struct.Struct("<II")  # payload length, crc32 of the payload
+_SUFFIX = ".wal"
+
+
+class SegmentedLog:
+    """
+    An append-only log of byte records, in segment files of about `segment_size`.
+
+    A record is stored with its length and checksum, at a logical offset growing
+    across segments: every segment file is named after the offset of its first
+    record, so a record is read back with a bisection and a single read. Once the
+    active segment grows past `segment_size`, the next record starts a new one.
+
+    Appending writes the record to the operating system, without waiting for the
+    disk: `sync` makes every record appended before it durable, and may run in
+    another thread while records are appended, so a caller can batch the syncs of
+    concurrent writers (group commit). Opening the log replays nothing by itself,
+    but drops the torn record a crash may leave at the end of the active segment.
+
+    Example
+    -------
+    ```python
+    log = SegmentedLog("ledger", segment_size=64 * 1024 * 1024)
+    offset = log.append(b"record")
+    log.sync()
+    assert log.read(offset) == b"record"
+    ```
+    """
+
+    def __init__(self, directory: str, segment_size: int = 64 * 1024 * 1024) -> None:
+        """
+        Open the log, creating its directory and first segment if needed.
+
+        Parameters
+        ----------
+        directory : str
+            The directory of the segment files.
+        segment_size : int, optional
+            The size in bytes past which a new segment is started (default is 64
+            MiB).
+
+        Raises
+        ------
+        WalCorruptedError
+            If a sealed segment, not the active one, holds an invalid record.
+        """
+        if segment_size <= _RECORD_HEADER.size:
+            raise ValueError(f"The segment size should exceed {_RECORD_HEADER.size}")
+        self.directory = Path(directory)
+        self.segment_size = segment_size
+        if not self.directory.is_dir():
+            self.directory.mkdir(parents=True)
+            self._sync_directory(self.directory.parent)
+        self._lock = threading.Lock()
+        self._retired: list[int] = []
+        self._bases = sorted(
+            int(path.stem) for path in self.directory.glob(f"*{_SUFFIX}")
+        ) or [0]
+
+        base = self._bases[-1]
+        size = self._recover(base)
+        self._fd = os.open(
+            self._get_path(base), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+        )
+        self._sync_directory(self.directory)
+        self._end = base + size
+
+    def __len__(self) -> int:
+        """Return the number of segments."""
+        return len(self._bases)
+
+    @property
+    def end(self) -> int:
+        """Return the offset the next record is appended at."""
+        return self._end
+
+    def append(self, payload: bytes) -> int:
+        """
+        Append a record, not durable before the next `sync`.
+
+        Returns
+        -------
+        int
+            The offset of the record.
+        """
+        if self._end - self._bases[-1] >= self.segment_size:
+            self._roll()
+        offset = self._end
+        record = _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        os.write(self._fd, record)
+        self._end += len(record)
+        return offset
+
+    def sync(self) -> None:
+        """Flush every record appended so far to the disk; thread-safe."""
+        with self._lock:
+            retired, self._retired = self._retired, []
+            fd = self._fd
+        for retired_fd in retired:
+            os.fsync(retired_fd)
+            os.close(retired_fd)
+        os.fsync(fd)
+
+    def read(self, offset: int) -> bytes:
+        """Return the payload of the record at an offset."""
+        base = self._bases[bisect_right(self._bases, offset) - 1]
+        with self._get_path(base).open(mode="rb") as file:
+            file.seek(offset - base)
+            length, _ = _RECORD_HEADER.unpack(file.read(_RECORD_HEADER.size))
+            return file.read(length)
+
+    def replay(self) -> Iterator[tuple[int, bytes]]:
+        """Yield the offset and payload of every record, in order."""
+        for base in self._bases:
+            with self._get_path(base).open(mode="rb") as file:
+                data = file.read()
+            for position, payload in self._scan(data):
+                yield base + position, payload
+
+    def close(self) -> None:
+        """Sync and close the segment files."""
+        if self._fd < 0:
+            return
+        self.sync()
+        os.close(self._fd)
+        self._fd = -1
+
+    def _roll(self) -> None:
+        """Start a new segment at the end offset."""
+        fd = os.open(
+            self._get_path(self._end), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+        )
+        # The entry of the segment must be durable before any of its records.
+        self._sync_directory(self.directory)
+        with self._lock:
+            self._retired.append(self._fd)
+            self._fd = fd
+        self._bases.append(self._end)
+
+    def _recover(self, base: int) -> int:
+        """Validate the segments, truncating a torn end of the active one."""
+        for sealed in self._bases[:-1]:
+            data = self._get_path(sealed).read_bytes()
+            if sum(
+                _RECORD_HEADER.size + len(payload) for _, payload in self._scan(data)
+            ) != len(data):
+                raise WalCorruptedError(
+                    f"`{self._get_path(sealed)}` holds an invalid record!"
+                )
+
+        path = self._get_path(base)
+        data = path.read_bytes() if path.exists() else b""
+        size = sum(
+            _RECORD_HEADER.size + len(payload) for _, payload in self._scan(data)
+        )
+        if size != len(data):
+            # A crash in the middle of an append: the record was never synced.
+            with path.open(mode="r+b") as file:
+                file.truncate(size)
+                os.fsync(file.fileno())
+        return size
+
+    @staticmethod
+    def _sync_directory(directory: Path) -> None:
+        """Flush the entries of a directory, e.g. a new segment, to the disk."""
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _scan(data: bytes) -> Iterator[tuple[int, bytes]]:
+        """Yield the position and payload of the valid records of a segment."""
+        position = 0
+        while position + _RECORD_HEADER.size <= len(data):
+            length, checksum = _RECORD_HEADER.unpack_from(data, position)
+            start = position + _RECORD_HEADER.size
+            payload = data[start : start + length]
+            if len(payload) != length or zlib.crc32(payload) != checksum:
+                return
+            yield position, payload
+            position = start + length
+
+    def _get_path(self, base: int) -> Path:
+        """Return the path of the segment starting at an offset."""
+        return self.directory / f"{base:020d}{_SUFFIX}"